@@ -3,19 +3,33 @@ API REST endpoints para SAD App v2.
 Implementa rotas FastAPI para os Use Cases refatorados.
 """
 
+import asyncio
+import json
+from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
+from app.core.config import settings
+from app.core.interfaces import IProgressReporter
 from app.core.logger import app_logger
-from app.domain.exceptions import SADError
-from app.infrastructure.repositories import (
-    FileRepository,
-    FileSystemManager,
-    ManifestRepository,
+from app.domain.entities import (
+    JobStatus,
+    OrganizationResult,
+    ProgressEvent,
+    ValidationResult,
 )
+from app.domain.exceptions import OrganizationError, SADError
+from app.domain.models import BackgroundJob
+from app.infrastructure.file_index import create_source_index
+from app.infrastructure.job_queue import JobProgress, job_queue
+from app.infrastructure.manifest_cache import create_manifest_repository
+from app.infrastructure.repositories import FileRepository, FileSystemManager
+from app.infrastructure.services import available_balancers
 from app.services.organization_service import OrganizationService
 from app.services.validation_service import ValidationService
 
@@ -35,6 +49,10 @@ class ValidationRequest(BaseModel):
     source_directory: str = Field(
         ..., description="Caminho absoluto do diretório com arquivos a validar"
     )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Sessão a revalidar (omitir para criar uma nova sessão)",
+    )
 
     @field_validator("manifest_path", "source_directory")
     @classmethod
@@ -46,11 +64,21 @@ class ValidationRequest(BaseModel):
         return v
 
 
+class CodeSuggestionResponse(BaseModel):
+    """Código do manifesto sugerido para um arquivo não reconhecido."""
+
+    document_code: str
+    score: float = Field(..., description="Similaridade com o nome do arquivo (0-1)")
+
+
 class ValidationResponse(BaseModel):
     """Response da validação de lote."""
 
     success: bool
     message: str
+    session_id: Optional[str] = Field(
+        default=None, description="Sessão com os documentos validados"
+    )
     validated_count: int
     unrecognized_count: int
     validated_files: List[str] = Field(
@@ -59,6 +87,19 @@ class ValidationResponse(BaseModel):
     unrecognized_files: List[str] = Field(
         default_factory=list, description="Lista de arquivos não reconhecidos"
     )
+    added_count: int = Field(
+        default=0, description="Arquivos novos desde a validação anterior"
+    )
+    changed_count: int = Field(
+        default=0, description="Arquivos alterados desde a validação anterior"
+    )
+    removed_count: int = Field(
+        default=0, description="Arquivos removidos desde a validação anterior"
+    )
+    suggestions: Dict[str, List[CodeSuggestionResponse]] = Field(
+        default_factory=dict,
+        description="Códigos parecidos por arquivo não reconhecido",
+    )
 
 
 class OrganizationRequest(BaseModel):
@@ -68,6 +109,10 @@ class OrganizationRequest(BaseModel):
         default_factory=list,
         description="Lista de caminhos (opcional se usando sessão)",
     )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Sessão retornada por /validate (omitir para a sessão atual)",
+    )
     output_directory: str = Field(..., description="Diretório de saída para os lotes")
     max_docs_per_lot: int = Field(
         default=100, ge=1, le=1000, description="Máximo de documentos por lote"
@@ -78,6 +123,32 @@ class OrganizationRequest(BaseModel):
     lot_name_pattern: str = Field(
         default="LOT_XXXX", description="Padrão de nome do lote (XXXX = sequência)"
     )
+    balancer_strategy: Optional[str] = Field(
+        default=None,
+        description="Estratégia de balanceamento: greedy, karmarkar_karp, ffd ou "
+        "discipline (omitir para o padrão da configuração)",
+    )
+
+    @field_validator("balancer_strategy")
+    @classmethod
+    def validate_balancer_strategy(cls, v: Optional[str]) -> Optional[str]:
+        """Valida que a estratégia está registrada (antes de criar diretórios ou jobs)."""
+        if v is not None and v not in available_balancers():
+            raise ValueError(
+                f"Unknown balancer strategy: {v} "
+                f"(available: {', '.join(available_balancers())})"
+            )
+        return v
+
+
+class LotTransferStatsResponse(BaseModel):
+    """Vazão da movimentação de um lote."""
+
+    lot_name: str
+    files: int
+    bytes_moved: int
+    seconds: float
+    bytes_per_second: float
 
 
 class OrganizationResponse(BaseModel):
@@ -87,6 +158,96 @@ class OrganizationResponse(BaseModel):
     message: str
     lots_created: int
     files_moved: int
+    lot_stats: List[LotTransferStatsResponse] = Field(
+        default_factory=list, description="Vazão da movimentação por lote"
+    )
+
+
+class ValidatedDocumentResponse(BaseModel):
+    """Documento validado persistido em uma sessão."""
+
+    id: int
+    path: str
+    filename: str
+    size_bytes: int
+    status: str
+    document_code: Optional[str] = None
+    revision: Optional[str] = None
+    title: Optional[str] = None
+    validated_at: datetime
+
+
+class DocumentPageResponse(BaseModel):
+    """Página de documentos validados (paginação por id)."""
+
+    session_id: str
+    items: List[ValidatedDocumentResponse]
+    next_after_id: Optional[int] = Field(
+        default=None,
+        description="Valor de after_id para a próxima página (null = última página)",
+    )
+
+
+class JobResponse(BaseModel):
+    """Estado, progresso e resultado de um job em segundo plano."""
+
+    job_id: str
+    kind: str
+    status: str = Field(
+        ..., description="queued, running, cancelling, succeeded, failed ou cancelled"
+    )
+    progress_current: int = 0
+    progress_total: Optional[int] = None
+    progress_message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Response de /validate ou /organize, quando concluído",
+    )
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @classmethod
+    def from_job(cls, job: BackgroundJob) -> "JobResponse":
+        return cls(
+            job_id=job.id,
+            kind=job.kind,
+            status=job.status,
+            progress_current=job.progress_current,
+            progress_total=job.progress_total,
+            progress_message=job.progress_message,
+            result=json.loads(job.result_json) if job.result_json else None,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+
+class ProgressEventResponse(BaseModel):
+    """Progresso de uma validação ou organização (contadores acumulados)."""
+
+    stage: str = Field(
+        ...,
+        description="scanning, reading_manifest, matching, suggesting, moving ou finished",
+    )
+    current: int
+    total: Optional[int] = None
+    files_scanned: int = 0
+    manifest_items: int = 0
+    files_matched: int = 0
+    files_unrecognized: int = 0
+    lots_total: int = 0
+    lots_moved: int = 0
+    files_total: int = 0
+    files_moved: int = 0
+    bytes_total: int = 0
+    bytes_moved: int = 0
+
+    @classmethod
+    def from_event(cls, event: ProgressEvent) -> "ProgressEventResponse":
+        return cls(current=event.current, total=event.total, **asdict(event))
 
 
 class HealthResponse(BaseModel):
@@ -105,10 +266,13 @@ from app.infrastructure.database import db_manager
 
 def get_validation_service() -> ValidationService:
     """Factory para criar ValidationService com dependências."""
-    manifest_repo = ManifestRepository()
+    manifest_repo = create_manifest_repository()
     file_repo = FileRepository()
     return ValidationService(
-        manifest_repo=manifest_repo, file_repo=file_repo, db_manager=db_manager
+        manifest_repo=manifest_repo,
+        file_repo=file_repo,
+        db_manager=db_manager,
+        source_index=create_source_index(db_manager, file_repo),
     )
 
 
@@ -118,6 +282,133 @@ def get_organization_service() -> OrganizationService:
     return OrganizationService(file_manager=file_manager, db_manager=db_manager)
 
 
+# === Conversões e execução compartilhadas (requisição direta e jobs) ===
+
+
+def _validation_response(result: ValidationResult) -> ValidationResponse:
+    """Converte o resultado da validação para o response da API."""
+    return ValidationResponse(
+        success=result.success,
+        message=result.message,
+        session_id=result.session_id,
+        validated_count=result.validated_count,
+        unrecognized_count=result.unrecognized_count,
+        validated_files=[str(f.path) for f in result.validated_files],
+        unrecognized_files=[str(f.path) for f in result.unrecognized_files],
+        added_count=result.added_count,
+        changed_count=result.changed_count,
+        removed_count=result.removed_count,
+        suggestions={
+            str(path): [
+                CodeSuggestionResponse(document_code=s.document_code, score=s.score)
+                for s in found
+            ]
+            for path, found in result.suggestions.items()
+        },
+    )
+
+
+def _organization_response(result: OrganizationResult) -> OrganizationResponse:
+    """Converte o resultado da organização para o response da API."""
+    return OrganizationResponse(
+        success=result.success,
+        message=result.message,
+        lots_created=result.lots_created,
+        files_moved=result.files_moved,
+        lot_stats=[
+            LotTransferStatsResponse(
+                lot_name=stats.lot_name,
+                files=stats.files,
+                bytes_moved=stats.bytes_moved,
+                seconds=stats.seconds,
+                bytes_per_second=stats.bytes_per_second,
+            )
+            for stats in result.lot_stats
+        ],
+    )
+
+
+async def _organize(
+    service: OrganizationService,
+    request: OrganizationRequest,
+    progress: Optional[IProgressReporter] = None,
+) -> OrganizationResult:
+    """Prepara o diretório de saída e organiza os lotes da sessão."""
+    # Validar se diretório de saída existe ou criar
+    output_dir = Path(request.output_directory)
+    if not output_dir.exists():
+        # Tentar criar? O ideal é o usuario criar, mas podemos tentar
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            app_logger.warning(
+                "Failed to create output directory",
+                extra={"error": str(e), "directory": str(output_dir)},
+            )
+            # Service vai lidar ou dar erro
+
+    return await service.organize_session_lots(
+        output_directory=output_dir,
+        max_docs_per_lot=request.max_docs_per_lot,
+        start_sequence_number=request.start_sequence_number,
+        lot_name_pattern=request.lot_name_pattern,
+        session_id=request.session_id,
+        balancer_strategy=request.balancer_strategy,
+        progress=progress,
+    )
+
+
+async def _run_validation_job(
+    request: ValidationRequest, progress: JobProgress
+) -> Dict[str, Any]:
+    result = await get_validation_service().validate_batch(
+        manifest_path=Path(request.manifest_path),
+        source_directory=Path(request.source_directory),
+        session_id=request.session_id,
+        progress=progress,
+    )
+    return _validation_response(result).model_dump(mode="json")
+
+
+async def _run_organization_job(
+    request: OrganizationRequest, progress: JobProgress
+) -> Dict[str, Any]:
+    result = await _organize(get_organization_service(), request, progress)
+    if not result.success:
+        raise OrganizationError(result.message)
+    return _organization_response(result).model_dump(mode="json")
+
+
+def _sse(event: str, payload: BaseModel) -> str:
+    """Mensagem no formato text/event-stream."""
+    return f"event: {event}\ndata: {payload.model_dump_json()}\n\n"
+
+
+async def _job_events(job_id: str) -> AsyncIterator[str]:
+    """
+    Progresso ao vivo do job (throttled) e, ao final, o estado do job.
+
+    O stream só é fechado depois que o estado final foi gravado: o evento
+    finished do caso de uso não encerra a leitura.
+    """
+    stream = job_queue.progress_stream(job_id)
+    if stream is not None:
+        async for event in stream.updates(settings.PROGRESS_STREAM_INTERVAL_SECONDS):
+            yield _sse("progress", ProgressEventResponse.from_event(event))
+    yield _sse("job", await _job_response(job_id))
+
+
+async def _job_response(job_id: str) -> JobResponse:
+    """Estado atual do job, ou 404."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": f"Job not found: {job_id}"},
+        )
+    return JobResponse.from_job(job)
+
+
 # === Endpoints ===
 
 
@@ -175,17 +466,11 @@ async def validate_batch(request: ValidationRequest):
         result = await service.validate_batch(
             manifest_path=Path(request.manifest_path),
             source_directory=Path(request.source_directory),
+            session_id=request.session_id,
         )
 
         # Converte resultado para response
-        return ValidationResponse(
-            success=result.success,
-            message=result.message,
-            validated_count=result.validated_count,
-            unrecognized_count=result.unrecognized_count,
-            validated_files=[str(f.path) for f in result.validated_files],
-            unrecognized_files=[str(f.path) for f in result.unrecognized_files],
-        )
+        return _validation_response(result)
 
     except SADError as e:
         app_logger.warning(
@@ -207,6 +492,65 @@ async def validate_batch(request: ValidationRequest):
         )
 
 
+@router.get(
+    "/sessions/{session_id}/documents",
+    response_model=DocumentPageResponse,
+    summary="List validated documents of a session",
+    description="Returns one keyset-paginated page of a session's validated documents",
+)
+async def list_session_documents(
+    session_id: str,
+    after_id: int = Query(
+        default=0, ge=0, description="Id do último documento da página anterior"
+    ),
+    limit: int = Query(default=500, ge=1, le=5000, description="Documentos por página"),
+):
+    """
+    Lista os documentos validados de uma sessão, uma página por vez.
+
+    Args:
+        session_id: ID da sessão
+        after_id: Continua após este id (0 = primeira página)
+        limit: Tamanho da página
+
+    Returns:
+        DocumentPageResponse com os documentos e o cursor da próxima página
+
+    Raises:
+        HTTPException: 404 se a sessão não existir
+    """
+    try:
+        loop = asyncio.get_event_loop()
+        session = await loop.run_in_executor(None, db_manager.get_session, session_id)
+        if session is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"error": f"Session not found: {session_id}"},
+            )
+        rows = await loop.run_in_executor(
+            None, db_manager.get_validated_documents_page, session_id, after_id, limit
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        app_logger.error(
+            "Internal error listing session documents",
+            extra={"error": str(e), "session_id": session_id},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Internal server error", "message": str(e)},
+        )
+
+    return DocumentPageResponse(
+        session_id=session_id,
+        items=[
+            ValidatedDocumentResponse.model_validate(row.model_dump()) for row in rows
+        ],
+        next_after_id=rows[-1].id if len(rows) == limit else None,
+    )
+
+
 @router.post(
     "/organize",
     response_model=OrganizationResponse,
@@ -232,9 +576,11 @@ async def organize_lots(request: OrganizationRequest):
         app_logger.info(
             "Organization request received",
             extra={
+                "session_id": request.session_id,
                 "files_count": len(request.validated_files),
                 "output_directory": request.output_directory,
                 "max_docs_per_lot": request.max_docs_per_lot,
+                "balancer_strategy": request.balancer_strategy,
             },
         )
 
@@ -243,32 +589,9 @@ async def organize_lots(request: OrganizationRequest):
 
         service = get_organization_service()
 
-        # Validar se diretório de saída existe ou criar
-        output_dir = Path(request.output_directory)
-        if not output_dir.exists():
-            # Tentar criar? O ideal é o usuario criar, mas podemos tentar
-            try:
-                output_dir.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                app_logger.warning(
-                    "Failed to create output directory",
-                    extra={"error": str(e), "directory": str(output_dir)},
-                )
-                # Service vai lidar ou dar erro
-
-        result = await service.organize_session_lots(
-            output_directory=output_dir,
-            max_docs_per_lot=request.max_docs_per_lot,
-            start_sequence_number=request.start_sequence_number,
-            lot_name_pattern=request.lot_name_pattern,
-        )
+        result = await _organize(service, request)
 
-        return OrganizationResponse(
-            success=result.success,
-            message=result.message,
-            lots_created=result.lots_created,
-            files_moved=result.files_moved,
-        )
+        return _organization_response(result)
 
     except HTTPException:
         raise
@@ -290,3 +613,119 @@ async def organize_lots(request: OrganizationRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": "Internal server error", "message": str(e)},
         )
+
+
+@router.post(
+    "/jobs/validate",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a validation job",
+    description="Queues a batch validation and returns the job to poll",
+)
+async def submit_validation_job(request: ValidationRequest):
+    """
+    Enfileira a validação de um lote; o resultado fica em GET /jobs/{job_id}.
+
+    Returns:
+        JobResponse com o job na fila
+    """
+    job_id = await job_queue.submit(
+        "validate",
+        request.model_dump(),
+        lambda progress: _run_validation_job(request, progress),
+    )
+    return await _job_response(job_id)
+
+
+@router.post(
+    "/jobs/organize",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit an organization job",
+    description="Queues the organization of a session into lots and returns the job",
+)
+async def submit_organization_job(request: OrganizationRequest):
+    """
+    Enfileira a organização em lotes; o resultado fica em GET /jobs/{job_id}.
+
+    Returns:
+        JobResponse com o job na fila
+    """
+    job_id = await job_queue.submit(
+        "organize",
+        request.model_dump(),
+        lambda progress: _run_organization_job(request, progress),
+    )
+    return await _job_response(job_id)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Get job status",
+    description="Returns status, progress and (when finished) the result of a job",
+)
+async def get_job(job_id: str):
+    """
+    Consulta um job (polling).
+
+    Raises:
+        HTTPException: 404 se o job não existir
+    """
+    return await _job_response(job_id)
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="Stream job progress",
+    description=(
+        "Server-sent events: 'progress' with the latest counters (throttled), "
+        "then a final 'job' event with the job state"
+    ),
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_job_events(job_id: str):
+    """
+    Acompanha um job por SSE, sem polling.
+
+    Raises:
+        HTTPException: 404 se o job não existir
+    """
+    await _job_response(job_id)
+    return StreamingResponse(
+        _job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.post(
+    "/jobs/{job_id}/cancel",
+    response_model=JobResponse,
+    summary="Cancel a job",
+    description=(
+        "Cancels a queued job; a running job becomes cancelling and stops at "
+        "its next progress event"
+    ),
+)
+async def cancel_job(job_id: str):
+    """
+    Cancela um job na fila ou em execução (ver JobQueue.cancel).
+
+    Raises:
+        HTTPException: 404 se o job não existir
+        HTTPException: 409 se o job já tiver terminado
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": f"Job not found: {job_id}"},
+        )
+    if JobStatus(job.status).finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": f"Job already {job.status}", "job_id": job_id},
+        )
+    await job_queue.cancel(job_id)
+    return await _job_response(job_id)
@@ -4,7 +4,7 @@ Carrega variáveis de ambiente do arquivo .env com defaults seguros para desenvo
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,6 +25,62 @@ class Settings(BaseSettings):
     DATABASE_PATH: str = "./data/sad_app.db"
     DATABASE_ECHO: bool = False  # SQL logging
 
+    # Perfil de armazenamento do SQLite (aplicado a cada nova conexão)
+    DATABASE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST"] = "WAL"
+    DATABASE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    DATABASE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB (0 desativa)
+    DATABASE_CACHE_SIZE_KB: int = 64 * 1024  # Cache de páginas por conexão
+    DATABASE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    DATABASE_BUSY_TIMEOUT_SECONDS: float = 30.0  # Espera por locks de escrita
+    # "queue": cada thread usa uma conexão própria do pool enquanto a sessão dura;
+    # "thread": conexão fixa por thread (até DATABASE_POOL_SIZE threads);
+    # "static": uma única conexão para o processo (comportamento anterior)
+    DATABASE_POOL: Literal["queue", "thread", "static"] = "queue"
+    DATABASE_POOL_SIZE: int = 8
+    DOCUMENTS_PAGE_SIZE: int = 1000  # Linhas por página na leitura de sessões
+
+    # Cache de manifestos parseados
+    MANIFEST_CACHE_ENABLED: bool = True
+    MANIFEST_CACHE_PATH: str = "./data/manifest_cache.db"
+    MANIFEST_CACHE_MAX_ENTRIES: int = 32
+    MANIFEST_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256MB
+
+    # Varredura de diretórios de origem
+    FILE_SCAN_WORKERS: int = 8  # Threads para varrer subárvores em paralelo
+    SOURCE_INDEX_ENABLED: bool = True  # Revalida apenas arquivos novos/alterados
+
+    # Sugestões de código para arquivos não reconhecidos
+    SUGGESTION_TOP_K: int = 3  # 0 desativa as sugestões
+    SUGGESTION_MIN_SCORE: float = 0.7  # Similaridade mínima (Dice de trigramas)
+
+    # Extração de texto (resolução de não reconhecidos)
+    PROFILES_CONFIG_PATH: str = "config/patterns.yaml"  # Perfis de códigos (regex)
+    EXTRACTION_WORKERS: int = 0  # Processos para extração em lote (0 = nº de CPUs)
+    EXTRACTION_CACHE_ENABLED: bool = True  # Texto extraído por hash do conteúdo
+    EXTRACTION_CACHE_PATH: str = "./data/extraction_cache.db"
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 5000
+    EXTRACTION_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 512MB
+
+    # Organização de lotes
+    ORGANIZE_MOVE_CONCURRENCY: int = 16  # Movimentações simultâneas por lote
+    ORGANIZE_MANIFEST_WORKERS: int = 2  # Manifestos gerados junto às movimentações
+    # Limites por lote (0 = sem limite); com algum deles, os lotes são
+    # empacotados respeitando também o máximo de documentos (arquivos)
+    LOT_MAX_BYTES: int = 0  # Ex: limite de tamanho da GRDT no sistema de transmittal
+    LOT_MAX_GROUPS: int = 0
+    # greedy, karmarkar_karp, ffd ou discipline; vazio = ffd se houver limite
+    # de bytes/grupos, senão greedy. Pode ser escolhida por requisição
+    LOT_BALANCER_STRATEGY: str = ""
+    # Saída em outro volume: cópia + fsync + remoção da origem
+    MOVE_COPY_BUFFER_BYTES: int = 8 * 1024 * 1024  # Bytes por chamada de cópia
+    MOVE_VERIFY_CHECKSUM: bool = False  # Compara também o hash (lê o arquivo 2x)
+
+    # Jobs em segundo plano (/api/jobs)
+    JOBS_MAX_CONCURRENT: int = 1  # Demais submissões aguardam na fila
+    JOBS_PROGRESS_INTERVAL_SECONDS: float = 0.5  # Gravações de progresso no banco
+    # Intervalo mínimo entre atualizações de progresso no SSE e no dashboard
+    PROGRESS_STREAM_INTERVAL_SECONDS: float = 0.25
+
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_PATH: str = "./logs"
@@ -48,6 +104,18 @@ class Settings(BaseSettings):
         path.parent.mkdir(parents=True, exist_ok=True)
         return path
 
+    def get_manifest_cache_path(self) -> Path:
+        """Retorna o caminho do banco de cache de manifestos."""
+        path = Path(self.MANIFEST_CACHE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def get_extraction_cache_path(self) -> Path:
+        """Retorna o caminho do banco de cache de texto extraído."""
+        path = Path(self.EXTRACTION_CACHE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
     def get_log_path(self) -> Path:
         """Retorna o caminho absoluto dos logs."""
         path = Path(self.LOG_PATH)
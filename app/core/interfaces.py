@@ -1,7 +1,14 @@
 from pathlib import Path
-from typing import List, Optional, Protocol
-
-from app.domain.entities import DocumentFile, DocumentGroup, ManifestItem, OutputLot
+from typing import AsyncIterator, Dict, List, Optional, Protocol
+
+from app.domain.entities import (
+    DocumentFile,
+    DocumentGroup,
+    ManifestItem,
+    OutputLot,
+    ProgressEvent,
+    SourceIndexDelta,
+)
 from app.domain.exceptions import (
     CodeNotInManifestError,
     ExtractionFailedError,
@@ -23,6 +30,10 @@ class IManifestRepository(Protocol):
         """Carrega dados de um arquivo e os transforma em entidades ManifestItem."""
         ...
 
+    def iter_items(self, file_path: Path) -> AsyncIterator[ManifestItem]:
+        """Lê o manifesto em streaming, entregando ManifestItem à medida que chega."""
+        ...
+
 
 class IFileRepository(Protocol):
     """Contrato para um repositório que lista arquivos em um diretório."""
@@ -32,6 +43,20 @@ class IFileRepository(Protocol):
         ...
 
 
+class ISourceIndex(Protocol):
+    """Contrato para um índice incremental dos arquivos de um diretório de origem."""
+
+    async def refresh(self, directory: Path, manifest_path: Path) -> SourceIndexDelta:
+        """Varre o diretório e retorna o delta em relação à validação anterior."""
+        ...
+
+    async def record_matches(
+        self, scan_id: str, matches: Dict[Path, Optional[ManifestItem]]
+    ) -> None:
+        """Persiste o item casado de cada arquivo da varredura `scan_id` (ver refresh)."""
+        ...
+
+
 class IContentExtractor(Protocol):
     """Contrato para um serviço que extrai conteúdo textual de um arquivo."""
 
@@ -48,6 +73,27 @@ class ICodeExtractor(Protocol):
         ...
 
 
+class ICodeLocator(Protocol):
+    """Contrato para um serviço que localiza o código lendo o arquivo aos poucos."""
+
+    async def locate_code(self, file: DocumentFile, profile_id: str) -> Optional[str]:
+        """Lê o arquivo incrementalmente e para assim que um padrão do perfil casa."""
+        ...
+
+
+class IProgressReporter(Protocol):
+    """Contrato para quem acompanha o progresso de um caso de uso."""
+
+    def report(self, event: ProgressEvent) -> None:
+        """
+        Recebe o progresso atual (chamado até uma vez por arquivo: deve ser barato).
+
+        Pode lançar asyncio.CancelledError para interromper o caso de uso (ex:
+        job cancelado); os eventos são reportados entre operações de arquivo.
+        """
+        ...
+
+
 class ILotBalancerService(Protocol):
     """Contrato para o serviço de lógica de negócio de balanceamento de lotes."""
 
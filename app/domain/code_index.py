@@ -0,0 +1,204 @@
+"""
+Índice de similaridade entre nomes de arquivo e códigos do manifesto.
+Sugere os códigos mais próximos para arquivos não reconhecidos, sem abrir o
+conteúdo dos arquivos.
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+from app.domain.entities import CodeSuggestion
+
+
+def _trigrams(text: str) -> FrozenSet[str]:
+    """Trigramas do texto normalizado, com bordas marcadas para valorizar início/fim."""
+    padded = f"  {text.upper()} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class CodeSimilarityIndex:
+    """
+    Índice invertido de trigramas sobre os códigos do manifesto.
+
+    A similaridade é um coeficiente de Dice ponderado por IDF: trigramas
+    presentes em muitos códigos (prefixos de projeto, separadores) pesam pouco.
+    Para atingir `min_score`, um código precisa compartilhar peso suficiente
+    com a consulta, então basta percorrer as listas dos trigramas mais raros
+    até que o peso restante não alcance mais o mínimo (filtro de prefixo). Os
+    candidatos são então refinados trigrama a trigrama, descartando os que
+    já não podem entrar entre as `limit` melhores sugestões.
+    """
+
+    def __init__(self, codes: Iterable[str]):
+        self._codes: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+
+        for code in dict.fromkeys(codes):
+            if not code:
+                continue
+            code_id = len(self._codes)
+            grams = _trigrams(code)
+            self._codes.append(code)
+            self._grams.append(grams)
+            for gram in grams:
+                postings[gram].append(code_id)
+
+        total = len(self._codes)
+        self._postings: Dict[str, List[int]] = dict(postings)
+        self._weights: Dict[str, float] = {
+            gram: math.log(1 + total / len(ids)) for gram, ids in postings.items()
+        }
+        # Peso de trigramas que não aparecem em nenhum código (df = 1)
+        self._unseen_weight = math.log(1 + total) if total else 0.0
+        self._code_weights: List[float] = [
+            sum(self._weights[gram] for gram in grams) for grams in self._grams
+        ]
+        self._min_code_weight = min(self._code_weights, default=0.0)
+        self._code_ids: Dict[str, int] = {
+            code: code_id for code_id, code in enumerate(self._codes)
+        }
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def similarity(self, name: str, code: str) -> float:
+        """Similaridade (0 a 1) entre `name` e um código indexado; 0 se ausente."""
+        code_id = self._code_ids.get(code)
+        if code_id is None:
+            return 0.0
+        query = _trigrams(name)
+        return self._score(query, self._query_weight(query), code_id)
+
+    def suggest(
+        self, name: str, limit: int = 3, min_score: float = 0.7
+    ) -> List[CodeSuggestion]:
+        """
+        Retorna até `limit` códigos mais parecidos com `name`.
+
+        Args:
+            name: Nome base do arquivo (sem extensão e sufixo de revisão)
+            limit: Quantidade máxima de sugestões
+            min_score: Similaridade mínima (0 a 1) para uma sugestão
+
+        Returns:
+            Sugestões ordenadas por similaridade decrescente
+        """
+        query = _trigrams(name)
+        if not query or limit <= 0 or not self._codes:
+            return []
+
+        query_weight = self._query_weight(query)
+
+        # Trigramas mais raros primeiro; os ausentes do índice não trazem candidatos
+        known = sorted(
+            (gram for gram in query if gram in self._postings),
+            key=self._weights.__getitem__,
+            reverse=True,
+        )
+        remaining = sum(self._weights[gram] for gram in known)
+
+        # 1. Filtro de prefixo. Para Dice >= t é preciso 2*W(q∩c) >= t*(W(q) + W(c)),
+        # com W(q∩c) <= W(c) e W(c) >= menor peso de código do índice. Um código
+        # fora das listas dos trigramas já percorridos só conta com o peso
+        # restante, então novos candidatos só surgem enquanto ele bastar.
+        # (a folga evita descartes por erro de ponto flutuante)
+        min_shared = (
+            max(
+                min_score * query_weight / (2 - min_score),
+                min_score * (query_weight + self._min_code_weight) / 2,
+            )
+            - 1e-9
+        )
+        shared: Dict[int, float] = defaultdict(float)
+        position = 0
+        while position < len(known) and remaining >= min_shared:
+            gram = known[position]
+            weight = self._weights[gram]
+            for code_id in self._postings[gram]:
+                shared[code_id] += weight
+            remaining -= weight
+            position += 1
+
+        # 2. Refinamento: os demais trigramas completam o peso compartilhado
+        # dos candidatos. O peso acumulado é um limite inferior e, somado ao
+        # restante, um limite superior do score; candidatos cujo limite superior
+        # não alcança o limiar (min_score ou o pior dos `limit` melhores limites
+        # inferiores) são descartados a cada passo.
+        # O primeiro corte (só por min_score) é o que elimina a maioria dos
+        # candidatos do prefixo; os totais só são guardados para os que restam.
+        code_weights = self._code_weights
+        cutoff = min_score - 1e-9
+        candidates = {
+            code_id: weight
+            for code_id, weight in shared.items()
+            if 2 * (weight + remaining)
+            >= cutoff * (query_weight + code_weights[code_id])
+        }
+        totals = {
+            code_id: query_weight + code_weights[code_id] for code_id in candidates
+        }
+        for gram in known[position:]:
+            if not candidates:
+                break
+            weight = self._weights[gram]
+            remaining -= weight
+            for code_id in candidates:
+                if gram in self._grams[code_id]:
+                    candidates[code_id] += weight
+            candidates = self._prune(candidates, totals, remaining, min_score, limit)
+
+        # Com todos os trigramas percorridos, o peso acumulado é exato
+        scored = []
+        for code_id, weight in candidates.items():
+            score = round(2 * weight / totals[code_id], 9)
+            if score >= min_score:
+                scored.append((score, self._codes[code_id]))
+
+        best = heapq.nsmallest(limit, scored, key=lambda s: (-s[0], s[1]))
+        return [
+            CodeSuggestion(document_code=code, score=round(score, 4))
+            for score, code in best
+        ]
+
+    @staticmethod
+    def _prune(
+        candidates: Dict[int, float],
+        totals: Dict[int, float],
+        remaining: float,
+        min_score: float,
+        limit: int,
+    ) -> Dict[int, float]:
+        """Mantém apenas os candidatos que ainda podem entrar nas sugestões."""
+        threshold = min_score
+        if len(candidates) >= limit:
+            lower_bounds = heapq.nlargest(
+                limit,
+                (
+                    2 * weight / totals[code_id]
+                    for code_id, weight in candidates.items()
+                ),
+            )
+            threshold = max(threshold, lower_bounds[-1])
+        threshold -= 1e-9
+        return {
+            code_id: weight
+            for code_id, weight in candidates.items()
+            if 2 * (weight + remaining) / totals[code_id] >= threshold
+        }
+
+    def _query_weight(self, query: FrozenSet[str]) -> float:
+        return sum(self._weights.get(gram, self._unseen_weight) for gram in query)
+
+    def _score(self, query: FrozenSet[str], query_weight: float, code_id: int) -> float:
+        # Soma na mesma ordem de `suggest` (mais raros primeiro), para scores idênticos
+        shared = sum(
+            sorted(
+                (self._weights[gram] for gram in query & self._grams[code_id]),
+                reverse=True,
+            )
+        )
+        total = query_weight + self._code_weights[code_id]
+        return round(2 * shared / total, 9) if total else 0.0
@@ -18,6 +18,22 @@ class DocumentStatus(enum.Enum):
     ERROR = "Erro"
 
 
+class JobStatus(enum.Enum):
+    """Estado de um job em segundo plano."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    CANCELLING = "cancelling"  # Cancelamento pedido; o job para no próximo evento
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def finished(self) -> bool:
+        """True se o job não vai mais mudar de estado."""
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
 @dataclass
 class ManifestItem:
     """Representa um item do manifesto de entrada (fonte da verdade)."""
@@ -77,6 +93,75 @@ class OutputLot:
         return sum(group.total_size_bytes for group in self.groups)
 
 
+@dataclass
+class LotPackingReport:
+    """Lotes usados por um empacotamento comparados ao mínimo teórico."""
+
+    lots_used: int
+    lower_bound: int
+    oversized_groups: int = 0  # Grupos que sozinhos excedem algum limite
+
+    @property
+    def excess_lots(self) -> int:
+        """Lotes acima do limite inferior."""
+        return self.lots_used - self.lower_bound
+
+
+@dataclass
+class LotTransferStats:
+    """Vazão da movimentação dos arquivos de um lote."""
+
+    lot_name: str
+    files: int
+    bytes_moved: int
+    seconds: float
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Bytes movidos por segundo (0 se nada foi medido)."""
+        return self.bytes_moved / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class ProgressEvent:
+    """
+    Progresso de uma validação ou organização, com contadores acumulados.
+
+    Etapas da validação: scanning, reading_manifest, matching, suggesting;
+    da organização: moving. Ambas terminam com finished.
+    """
+
+    stage: str
+    files_scanned: int = 0
+    manifest_items: int = 0
+    files_matched: int = 0
+    files_unrecognized: int = 0
+    lots_total: int = 0
+    lots_moved: int = 0
+    files_total: int = 0
+    files_moved: int = 0
+    bytes_total: int = 0
+    bytes_moved: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.stage == "finished"
+
+    @property
+    def current(self) -> int:
+        """Arquivos já processados (movidos ou classificados)."""
+        if self.lots_total:
+            return self.files_moved
+        return self.files_matched + self.files_unrecognized
+
+    @property
+    def total(self) -> Optional[int]:
+        """Arquivos a processar; None enquanto não se sabe."""
+        if self.lots_total:
+            return self.files_total
+        return self.files_scanned or None
+
+
 @dataclass
 class OrganizationResult:
     """Resultado da operação de organização de lotes."""
@@ -85,6 +170,57 @@ class OrganizationResult:
     files_moved: int = 0
     success: bool = True
     message: str = "Operation completed successfully"
+    lot_stats: List[LotTransferStats] = field(default_factory=list)
+
+
+@dataclass
+class ResolutionOutcome:
+    """Resultado da tentativa de resolução de um arquivo não reconhecido."""
+
+    file: DocumentFile
+    success: bool
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+
+@dataclass
+class CodeSuggestion:
+    """Código do manifesto sugerido para um arquivo não reconhecido."""
+
+    document_code: str
+    score: float
+
+
+@dataclass
+class CodeMatch:
+    """Código encontrado no conteúdo, com o perfil e o padrão que casaram."""
+
+    code: str
+    profile_id: str
+    pattern: str
+
+
+@dataclass
+class SourceIndexDelta:
+    """Diferença entre a varredura atual de um diretório e a anterior."""
+
+    added: List[DocumentFile] = field(default_factory=list)
+    changed: List[DocumentFile] = field(default_factory=list)
+    unchanged: List[DocumentFile] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
+    # Código casado na validação anterior, por caminho (apenas inalterados)
+    previous_codes: Dict[Path, Optional[str]] = field(default_factory=dict)
+    # Item do manifesto casado na validação anterior (inalterados reconhecidos)
+    previous_items: Dict[Path, ManifestItem] = field(default_factory=dict)
+    # True se o manifesto mudou desde a validação anterior
+    manifest_changed: bool = True
+    # Identifica esta varredura em ISourceIndex.record_matches
+    scan_id: str = ""
+
+    @property
+    def files(self) -> List[DocumentFile]:
+        """Todos os arquivos presentes no diretório na varredura atual."""
+        return self.unchanged + self.changed + self.added
 
 
 @dataclass
@@ -97,3 +233,11 @@ class ValidationResult:
     unrecognized_files: List[DocumentFile] = field(default_factory=list)
     success: bool = True
     message: str = "Validation completed successfully"
+    # Preenchidos quando a validação usa o índice incremental do diretório
+    added_count: int = 0
+    changed_count: int = 0
+    removed_count: int = 0
+    # Códigos mais parecidos para cada arquivo não reconhecido
+    suggestions: Dict[Path, List[CodeSuggestion]] = field(default_factory=dict)
+    # Sessão em que os documentos validados foram persistidos
+    session_id: Optional[str] = None
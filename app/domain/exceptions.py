@@ -103,6 +103,15 @@ class TemplateFillError(TemplateError):
     pass
 
 
+# === Exceções de Perfis de Extração ===
+
+
+class ProfileConfigError(InfrastructureError):
+    """Configuração de perfis de extração inválida (ex: regex que não compila)."""
+
+    pass
+
+
 # === Exceções de Validação ===
 
 
@@ -3,8 +3,28 @@ Módulo compartilhado para lógica de nomenclatura de arquivos.
 Consolida helpers que estavam duplicados em organize_lots.py e template_filler.py.
 """
 
+import os
+import re
 from pathlib import Path
 
+# Sufixos de revisão reconhecidos no fim do nome (RN-NEW-001), em um único
+# padrão pré-compilado. Todas as alternativas começam com "_" e não contêm
+# outro "_", então o sufixo só pode começar no último underscore do nome.
+_REVISION_SUFFIX = re.compile(
+    r"_(?:[A-Z]|rev\d+|\d+|final|temp|old|backup|draft|preliminary)$",
+    re.IGNORECASE,
+)
+
+# Caracteres que exigem o parsing completo do pathlib para obter o stem
+_PATH_SEPARATORS = re.compile(
+    "[%s]"
+    % re.escape(
+        "".join(
+            sep for sep in (os.sep, os.altsep, ":" if os.name == "nt" else None) if sep
+        )
+    )
+)
+
 
 def get_filename_with_revision(original_filename: str, revision: str) -> str:
     """
@@ -32,6 +52,37 @@ def get_filename_with_revision(original_filename: str, revision: str) -> str:
         return f"{original_filename}_{revision}"
 
 
+def _fast_stem(file_name: str) -> str:
+    """Equivalente a Path(file_name).stem, sem instanciar Path no caso comum."""
+    if not file_name or file_name in (".", "..") or _PATH_SEPARATORS.search(file_name):
+        return Path(file_name).stem
+    i = file_name.rfind(".")
+    return file_name[:i] if 0 < i < len(file_name) - 1 else file_name
+
+
+def strip_revision_suffix(file_name: str) -> str:
+    """
+    Extrai o nome base de um arquivo removendo extensão e sufixo de revisão.
+    Preserva underscores que fazem parte do nome (RN-NEW-001).
+
+    Examples:
+        >>> strip_revision_suffix("DOC-123_Rev0.pdf")
+        'DOC-123'
+        >>> strip_revision_suffix("COMPLEX_DOC_NAME_A.pdf")
+        'COMPLEX_DOC_NAME'
+        >>> strip_revision_suffix("DOC-123.pdf")
+        'DOC-123'
+    """
+    stem = _fast_stem(file_name)
+    idx = stem.rfind("_")
+    if idx < 0:
+        return stem
+    match = _REVISION_SUFFIX.match(stem, idx)
+    if match is None:
+        return stem
+    return stem[:idx] + stem[match.end() :]
+
+
 def generate_unique_filename(target_path: Path) -> Path:
     """
     Gera um nome de arquivo único quando o destino já existe.
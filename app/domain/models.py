@@ -6,12 +6,30 @@ Representam as entidades do banco de dados local.
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
+class ValidationSession(SQLModel, table=True):
+    """Sessão de validação: isola os documentos de cada lote/usuário."""
+
+    id: str = Field(primary_key=True)
+    manifest_path: Optional[str] = None
+    source_directory: Optional[str] = None
+    document_count: int = 0
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class ValidatedDocument(SQLModel, table=True):
     """Documento validado e persistido temporariamente."""
 
+    # Consultas por código dentro de uma sessão (organização, reconciliação)
+    __table_args__ = (
+        Index("ix_validateddocument_session_code", "session_id", "document_code"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     session_id: str = Field(index=True)
 
@@ -25,5 +43,54 @@ class ValidatedDocument(SQLModel, table=True):
     document_code: Optional[str] = None
     revision: Optional[str] = None
     title: Optional[str] = None
+    # Demais colunas do item do manifesto (DISCIPLINA, FORMATO...), em JSON
+    metadata_json: Optional[str] = None
 
     validated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class IndexedFile(SQLModel, table=True):
+    """Arquivo conhecido de um diretório de origem (índice incremental)."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source_root: str = Field(index=True)
+    path: str
+
+    # Identidade do arquivo na última varredura
+    size_bytes: int
+    mtime_ns: int
+    inode: int
+
+    # Código do manifesto casado na última validação (None = não reconhecido)
+    document_code: Optional[str] = None
+    # Item do manifesto casado (JSON), reaproveitado se o manifesto não mudou
+    manifest_item_json: Optional[str] = None
+
+
+class SourceIndexState(SQLModel, table=True):
+    """Estado da última validação incremental de um diretório de origem."""
+
+    source_root: str = Field(primary_key=True)
+    manifest_fingerprint: str
+    scanned_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class BackgroundJob(SQLModel, table=True):
+    """Job em segundo plano (validação/organização) com progresso e resultado."""
+
+    id: str = Field(primary_key=True)
+    kind: str  # "validate" ou "organize"
+    status: str = Field(index=True)  # Armazenar value do JobStatus
+    request_json: str
+
+    # Progresso informado pelo job (atualizado com intervalo mínimo)
+    progress_current: int = 0
+    progress_total: Optional[int] = None
+    progress_message: Optional[str] = None
+
+    result_json: Optional[str] = None
+    error: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
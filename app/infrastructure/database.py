@@ -2,27 +2,90 @@
 Gerenciador de banco de dados SQLite usando Repository Pattern.
 """
 
-from typing import List
+import uuid
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import delete, event, insert, inspect, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
 from sqlmodel import Session, SQLModel, create_engine, select
 
 from app.core.config import settings
 from app.core.logger import app_logger
-from app.domain.entities import DocumentFile
-from app.domain.models import ValidatedDocument
+from app.domain.entities import DocumentFile, JobStatus
+from app.domain.models import BackgroundJob, ValidatedDocument, ValidationSession
+from app.infrastructure.manifest_cache import encode_metadata
+
+# Linhas por executemany: limita a memória das listas de parâmetros
+SAVE_CHUNK_SIZE = 5000
+
+
+def sqlite_pragmas() -> List[str]:
+    """PRAGMAs do perfil de armazenamento configurado em Settings."""
+    return [
+        f"PRAGMA journal_mode={settings.DATABASE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.DATABASE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={int(settings.DATABASE_MMAP_SIZE)}",
+        # Valor negativo = tamanho em KiB, independente do tamanho de página
+        f"PRAGMA cache_size={-int(settings.DATABASE_CACHE_SIZE_KB)}",
+        f"PRAGMA temp_store={settings.DATABASE_TEMP_STORE}",
+    ]
+
+
+def create_database_engine(db_path: Path) -> Engine:
+    """
+    Cria o engine do SQLite com a estratégia de conexões e os PRAGMAs de Settings.
+
+    Com WAL, leituras não bloqueiam a escrita; com uma conexão por thread,
+    requisições concorrentes (validação e organização) deixam de disputar
+    a mesma conexão.
+    """
+    pool_options: Dict[str, Any] = {}
+    if settings.DATABASE_POOL == "static":
+        pool_options["poolclass"] = StaticPool
+    elif settings.DATABASE_POOL == "queue":
+        pool_options.update(
+            poolclass=QueuePool,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_POOL_SIZE,
+        )
+    else:
+        pool_options.update(
+            poolclass=SingletonThreadPool, pool_size=settings.DATABASE_POOL_SIZE
+        )
+
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        echo=settings.DATABASE_ECHO,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": settings.DATABASE_BUSY_TIMEOUT_SECONDS,
+        },
+        **pool_options,
+    )
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return engine
 
 
 class DatabaseManager:
     """Gerenciador do banco de dados local."""
 
     def __init__(self):
-        db_path = settings.get_database_path()
-        self.engine = create_engine(
-            f"sqlite:///{db_path}",
-            connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
-        )
+        self.engine = create_database_engine(settings.get_database_path())
         self._initialized = False
         self.current_session_id = "default_session"
 
@@ -32,21 +95,97 @@ class DatabaseManager:
             return
 
         SQLModel.metadata.create_all(self.engine)
+        # create_all não acrescenta colunas nem índices novos a tabelas que
+        # já existiam
+        self._add_missing_columns()
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         self._initialized = True
         app_logger.info(
-            "Database initialized", extra={"db_path": str(settings.get_database_path())}
+            "Database initialized",
+            extra={
+                "db_path": str(settings.get_database_path()),
+                "journal_mode": settings.DATABASE_JOURNAL_MODE,
+                "pool": settings.DATABASE_POOL,
+            },
         )
 
+    def _add_missing_columns(self) -> None:
+        """Acrescenta (ALTER TABLE) colunas anuláveis novas dos modelos."""
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in SQLModel.metadata.sorted_tables:
+                existing = {
+                    column["name"] for column in inspector.get_columns(table.name)
+                }
+                for column in table.columns:
+                    if column.name in existing or not column.nullable:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE "{table.name}" '
+                        f'ADD COLUMN "{column.name}" {column_type}'
+                    )
+                    app_logger.info(
+                        "Database column added",
+                        extra={"table": table.name, "column": column.name},
+                    )
+
     @property
     def session_id(self) -> str:
-        """Retorna o ID da sessão atual."""
+        """Retorna o ID da sessão atual (padrão para quem não informa uma sessão)."""
         return self.current_session_id
 
+    def create_session(
+        self,
+        manifest_path: Optional[Path] = None,
+        source_directory: Optional[Path] = None,
+    ) -> str:
+        """
+        Cria uma nova sessão de validação.
+
+        A sessão criada passa a ser a sessão atual, usada por clientes que não
+        informam o id; clientes que o informam não interferem entre si.
+
+        Returns:
+            ID da nova sessão
+        """
+        self.init_db()
+        session_id = uuid.uuid4().hex
+        with Session(self.engine) as db:
+            db.add(
+                ValidationSession(
+                    id=session_id,
+                    manifest_path=str(manifest_path) if manifest_path else None,
+                    source_directory=(
+                        str(source_directory) if source_directory else None
+                    ),
+                )
+            )
+            db.commit()
+
+        self.current_session_id = session_id
+        app_logger.info("Validation session created", extra={"session_id": session_id})
+        return session_id
+
+    def get_session(self, session_id: str) -> Optional[ValidationSession]:
+        """Busca uma sessão pelo id; None se não existir."""
+        self.init_db()
+        with Session(self.engine) as db:
+            return db.get(ValidationSession, session_id)
+
     def save_validated_documents(
         self, session_id: str, documents: List[DocumentFile]
     ) -> int:
         """
-        Salva uma lista de documentos validados.
+        Salva uma lista de documentos validados, substituindo os da sessão.
+
+        Uma lista vazia também limpa a sessão: uma revalidação sem documentos
+        válidos não pode deixar os da validação anterior para a organização.
+        A limpeza e a gravação acontecem em uma única transação, com um DELETE
+        por sessão e inserts em lote (executemany) de SAVE_CHUNK_SIZE linhas,
+        sem instanciar objetos ORM.
 
         Args:
             session_id: ID da sessão atual
@@ -55,45 +194,67 @@ class DatabaseManager:
         Returns:
             Quantidade de documentos salvos
         """
-        if not documents:
-            return 0
-
-        # Primeiro limpa validações anteriores desta sessão para evitar duplicatas
-        self.clear_validated_documents(session_id)
-
-        validated_docs = []
-        for doc in documents:
-            doc_code = None
-            revision = None
-            title = None
-
-            if doc.associated_manifest_item:
-                doc_code = doc.associated_manifest_item.document_code
-                revision = doc.associated_manifest_item.revision
-                title = doc.associated_manifest_item.title
-
-            validated_doc = ValidatedDocument(
-                session_id=session_id,
-                path=str(doc.path),
-                filename=doc.path.name,
-                size_bytes=doc.size_bytes,
-                status=doc.status.value,
-                document_code=doc_code,
-                revision=revision,
-                title=title,
-            )
-            validated_docs.append(validated_doc)
+        self.init_db()
+        table = ValidatedDocument.__table__
+        rows = self._validated_rows(session_id, documents)
+        saved = 0
 
         with Session(self.engine) as db:
-            for v_doc in validated_docs:
-                db.add(v_doc)
+            conn = db.connection()
+            # Limpa validações anteriores desta sessão para evitar duplicatas
+            conn.execute(delete(table).where(table.c.session_id == session_id))
+            while chunk := list(islice(rows, SAVE_CHUNK_SIZE)):
+                conn.execute(insert(table), chunk)
+                saved += len(chunk)
+            self._touch_session(conn, session_id, saved)
             db.commit()
 
         app_logger.info(
-            f"Saved {len(validated_docs)} validated documents",
+            f"Saved {saved} validated documents",
             extra={"session_id": session_id},
         )
-        return len(validated_docs)
+        return saved
+
+    @staticmethod
+    def _touch_session(conn: Connection, session_id: str, document_count: int) -> None:
+        """Registra a sessão (se ainda não existir) com a contagem atual."""
+        now = datetime.utcnow()
+        statement = sqlite_insert(ValidationSession.__table__).values(
+            id=session_id,
+            document_count=document_count,
+            created_at=now,
+            updated_at=now,
+        )
+        conn.execute(
+            statement.on_conflict_do_update(
+                index_elements=["id"],
+                set_={"document_count": document_count, "updated_at": now},
+            )
+        )
+
+    @staticmethod
+    def _validated_rows(
+        session_id: str, documents: Iterable[DocumentFile]
+    ) -> Iterator[dict]:
+        """Gera os parâmetros de insert de cada documento validado."""
+        # default_factory do modelo não se aplica a inserts Core
+        validated_at = datetime.utcnow()
+        for doc in documents:
+            item = doc.associated_manifest_item
+            yield {
+                "session_id": session_id,
+                "path": str(doc.path),
+                "filename": doc.path.name,
+                "size_bytes": doc.size_bytes,
+                "status": doc.status.value,
+                "document_code": item.document_code if item else None,
+                "revision": item.revision if item else None,
+                "title": item.title if item else None,
+                "metadata_json": (
+                    encode_metadata(item.metadata) if item and item.metadata else None
+                ),
+                "validated_at": validated_at,
+            }
 
     def get_validated_documents(self, session_id: str) -> List[ValidatedDocument]:
         """
@@ -111,6 +272,58 @@ class DatabaseManager:
             )
             return list(db.exec(statement).all())
 
+    def get_validated_documents_page(
+        self, session_id: str, after_id: int = 0, limit: Optional[int] = None
+    ) -> List[ValidatedDocument]:
+        """
+        Recupera uma página de documentos validados, em ordem de id (keyset).
+
+        A página seguinte começa após o id da última linha desta, sem OFFSET:
+        o custo de cada página não cresce com a posição na sessão.
+
+        Args:
+            session_id: ID da sessão
+            after_id: Id da última linha da página anterior (0 = início)
+            limit: Linhas por página (padrão: DOCUMENTS_PAGE_SIZE)
+
+        Returns:
+            Até `limit` ValidatedDocument com id > after_id
+        """
+        limit = limit or settings.DOCUMENTS_PAGE_SIZE
+        with Session(self.engine) as db:
+            statement = (
+                select(ValidatedDocument)
+                .where(
+                    ValidatedDocument.session_id == session_id,
+                    ValidatedDocument.id > after_id,
+                )
+                .order_by(ValidatedDocument.id)
+                .limit(limit)
+            )
+            return list(db.exec(statement).all())
+
+    def iter_validated_documents(
+        self, session_id: str, page_size: Optional[int] = None
+    ) -> Iterator[ValidatedDocument]:
+        """
+        Percorre os documentos validados da sessão página a página.
+
+        Apenas uma página fica em memória por vez; cada página é lida em uma
+        sessão curta, sem manter transação aberta entre elas.
+
+        Args:
+            session_id: ID da sessão
+            page_size: Linhas por página (padrão: DOCUMENTS_PAGE_SIZE)
+        """
+        page_size = page_size or settings.DOCUMENTS_PAGE_SIZE
+        after_id = 0
+        while True:
+            page = self.get_validated_documents_page(session_id, after_id, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1].id
+
     def clear_validated_documents(self, session_id: str) -> None:
         """
         Limpa documentos validados anteriores da sessão.
@@ -118,14 +331,105 @@ class DatabaseManager:
         Args:
             session_id: ID da sessão
         """
+        table = ValidatedDocument.__table__
+        sessions = ValidationSession.__table__
         with Session(self.engine) as db:
-            statement = select(ValidatedDocument).where(
-                ValidatedDocument.session_id == session_id
+            conn = db.connection()
+            conn.execute(delete(table).where(table.c.session_id == session_id))
+            conn.execute(
+                update(sessions)
+                .where(sessions.c.id == session_id)
+                .values(document_count=0, updated_at=datetime.utcnow())
+            )
+            db.commit()
+
+    def create_job(self, kind: str, request_json: str) -> str:
+        """
+        Registra um job em segundo plano na fila.
+
+        Returns:
+            ID do novo job
+        """
+        self.init_db()
+        job_id = uuid.uuid4().hex
+        with Session(self.engine) as db:
+            db.add(
+                BackgroundJob(
+                    id=job_id,
+                    kind=kind,
+                    status=JobStatus.QUEUED.value,
+                    request_json=request_json,
+                )
+            )
+            db.commit()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[BackgroundJob]:
+        """Busca um job pelo id; None se não existir."""
+        self.init_db()
+        with Session(self.engine) as db:
+            return db.get(BackgroundJob, job_id)
+
+    def update_job(self, job_id: str, **values: Any) -> None:
+        """Atualiza colunas de um job (estado, progresso, resultado...)."""
+        table = BackgroundJob.__table__
+        with Session(self.engine) as db:
+            db.connection().execute(
+                update(table).where(table.c.id == job_id).values(**values)
+            )
+            db.commit()
+
+    def mark_job_cancelling(self, job_id: str) -> bool:
+        """
+        Registra o pedido de cancelamento de um job em execução.
+
+        Só altera jobs ainda `running`: um estado final gravado antes não é
+        sobrescrito.
+
+        Returns:
+            True se o job foi marcado
+        """
+        table = BackgroundJob.__table__
+        with Session(self.engine) as db:
+            result = db.connection().execute(
+                update(table)
+                .where(table.c.id == job_id)
+                .where(table.c.status == JobStatus.RUNNING.value)
+                .values(status=JobStatus.CANCELLING.value)
+            )
+            db.commit()
+        return result.rowcount > 0
+
+    def fail_unfinished_jobs(self, error: str) -> int:
+        """
+        Marca como falhos os jobs que ficaram na fila ou em execução (ex: a
+        aplicação foi encerrada no meio deles).
+
+        Returns:
+            Quantidade de jobs marcados
+        """
+        self.init_db()
+        table = BackgroundJob.__table__
+        with Session(self.engine) as db:
+            result = db.connection().execute(
+                update(table)
+                .where(
+                    table.c.status.in_(
+                        [
+                            JobStatus.QUEUED.value,
+                            JobStatus.RUNNING.value,
+                            JobStatus.CANCELLING.value,
+                        ]
+                    )
+                )
+                .values(
+                    status=JobStatus.FAILED.value,
+                    error=error,
+                    finished_at=datetime.utcnow(),
+                )
             )
-            results = db.exec(statement).all()
-            for res in results:
-                db.delete(res)
             db.commit()
+        return result.rowcount
 
 
 # Singleton global
@@ -0,0 +1,305 @@
+"""
+Cache persistente em disco (SQLite) para resultados caros de recalcular.
+Cada entrada é composta por chunks binários ordenados, com despejo LRU.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from app.core.logger import app_logger
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        source TEXT NOT NULL,
+        meta TEXT NOT NULL,
+        size_bytes INTEGER NOT NULL,
+        chunk_count INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cache_chunks (
+        key TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        payload BLOB NOT NULL,
+        PRIMARY KEY (key, seq)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_cache_entries_last_access"
+    " ON cache_entries (last_access)",
+    "CREATE INDEX IF NOT EXISTS idx_cache_entries_source ON cache_entries (source)",
+)
+
+
+def file_content_hash(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calcula o hash (BLAKE2b, 128 bits) do conteúdo de um arquivo.
+
+    Args:
+        file_path: Arquivo a ser lido
+        chunk_size: Tamanho dos blocos de leitura
+
+    Returns:
+        Digest hexadecimal do conteúdo
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """Metadados de uma entrada armazenada no cache."""
+
+    key: str
+    source: str
+    chunk_count: int
+    size_bytes: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class ChunkedDiskCache:
+    """
+    Armazena entradas (sequências de chunks binários) em um arquivo SQLite.
+
+    O despejo é LRU: ao exceder `max_entries` ou `max_bytes`, as entradas
+    acessadas há mais tempo são removidas. Seguro para uso a partir de
+    várias threads do mesmo processo.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int, max_entries: int):
+        self._db_path = db_path
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._write_lock = threading.Lock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão curta: commit ao final do bloco e fechamento garantido."""
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        Busca os metadados de uma entrada e marca o acesso (LRU).
+
+        Returns:
+            A entrada, ou None se não estiver no cache
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT source, meta, size_bytes, chunk_count"
+                " FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        source, meta, size_bytes, chunk_count = row
+        return CacheEntry(
+            key=key,
+            source=source,
+            chunk_count=chunk_count,
+            size_bytes=size_bytes,
+            meta=json.loads(meta),
+        )
+
+    def read_chunk(self, key: str, seq: int) -> Optional[bytes]:
+        """Lê um chunk específico de uma entrada."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM cache_chunks WHERE key = ? AND seq = ?",
+                (key, seq),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        """Lê, em ordem, todos os chunks de uma entrada."""
+        entry = self.get_entry(key)
+        if entry is None:
+            return
+        for seq in range(entry.chunk_count):
+            chunk = self.read_chunk(key, seq)
+            if chunk is None:
+                return
+            yield chunk
+
+    def put(
+        self,
+        key: str,
+        source: str,
+        chunks: Iterable[bytes],
+        meta: Optional[Dict[str, Any]] = None,
+        replace_source: bool = True,
+    ) -> None:
+        """
+        Grava uma entrada completa em uma única transação.
+
+        Args:
+            key: Chave da entrada
+            source: Origem dos dados (ex: caminho do arquivo), para invalidação
+            chunks: Chunks binários, na ordem de leitura
+            meta: Metadados livres (serializáveis em JSON)
+            replace_source: Remove entradas antigas da mesma origem
+        """
+        now = time.time()
+        with self._write_lock, self._connect() as conn:
+            stale_keys = [key]
+            if replace_source:
+                stale_keys += [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT key FROM cache_entries WHERE source = ? AND key != ?",
+                        (source, key),
+                    )
+                ]
+            self._delete_keys(conn, stale_keys)
+
+            size_bytes = 0
+            chunk_count = 0
+            for seq, payload in enumerate(chunks):
+                conn.execute(
+                    "INSERT INTO cache_chunks (key, seq, payload) VALUES (?, ?, ?)",
+                    (key, seq, payload),
+                )
+                size_bytes += len(payload)
+                chunk_count += 1
+
+            conn.execute(
+                "INSERT INTO cache_entries"
+                " (key, source, meta, size_bytes, chunk_count, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    source,
+                    json.dumps(meta or {}),
+                    size_bytes,
+                    chunk_count,
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn, keep_key=key)
+
+    def append(
+        self,
+        key: str,
+        source: str,
+        chunks: Iterable[bytes],
+        expected_start: int,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Acrescenta chunks ao fim de uma entrada (criando-a se não existir).
+
+        Args:
+            key: Chave da entrada
+            source: Origem dos dados, usada se a entrada for criada
+            chunks: Novos chunks, na ordem de leitura
+            expected_start: Quantidade de chunks que a entrada deve ter hoje;
+                se outro escritor já a alterou, nada é gravado
+            meta: Novos metadados (substituem os anteriores)
+
+        Returns:
+            True se os chunks foram gravados
+        """
+        now = time.time()
+        with self._write_lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT size_bytes, chunk_count FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            size_bytes, chunk_count = row if row else (0, 0)
+            if chunk_count != expected_start:
+                return False
+
+            for seq, payload in enumerate(chunks, start=chunk_count):
+                conn.execute(
+                    "INSERT INTO cache_chunks (key, seq, payload) VALUES (?, ?, ?)",
+                    (key, seq, payload),
+                )
+                size_bytes += len(payload)
+                chunk_count += 1
+
+            conn.execute(
+                "INSERT INTO cache_entries"
+                " (key, source, meta, size_bytes, chunk_count, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET meta = excluded.meta,"
+                " size_bytes = excluded.size_bytes,"
+                " chunk_count = excluded.chunk_count,"
+                " last_access = excluded.last_access",
+                (
+                    key,
+                    source,
+                    json.dumps(meta or {}),
+                    size_bytes,
+                    chunk_count,
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn, keep_key=key)
+        return True
+
+    def delete(self, key: str) -> None:
+        """Remove uma entrada do cache."""
+        with self._write_lock, self._connect() as conn:
+            self._delete_keys(conn, [key])
+
+    def _delete_keys(self, conn: sqlite3.Connection, keys: Iterable[str]) -> None:
+        for key in keys:
+            conn.execute("DELETE FROM cache_chunks WHERE key = ?", (key,))
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _evict(self, conn: sqlite3.Connection, keep_key: str) -> None:
+        """Remove as entradas menos usadas até respeitar os limites."""
+        total_entries, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM cache_entries"
+        ).fetchone()
+        if total_entries <= self._max_entries and total_bytes <= self._max_bytes:
+            return
+
+        evicted = 0
+        for key, size_bytes in conn.execute(
+            "SELECT key, size_bytes FROM cache_entries"
+            " WHERE key != ? ORDER BY last_access ASC",
+            (keep_key,),
+        ).fetchall():
+            if total_entries <= self._max_entries and total_bytes <= self._max_bytes:
+                break
+            self._delete_keys(conn, [key])
+            total_entries -= 1
+            total_bytes -= size_bytes
+            evicted += 1
+
+        app_logger.debug(
+            "Cache entries evicted",
+            extra={"db_path": str(self._db_path), "evicted": evicted},
+        )
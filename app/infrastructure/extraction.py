@@ -1,68 +1,290 @@
 """
 Serviços de extração de conteúdo e identificação de códigos de documentos.
-Implementa IContentExtractor e ICodeExtractor de forma assíncrona.
+Implementa IContentExtractor, ICodeExtractor e ICodeLocator de forma assíncrona.
 """
 
 import asyncio
-import re
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import docx
-import yaml
 from PyPDF2 import PdfReader
 
-from app.core.interfaces import ICodeExtractor, IContentExtractor
+from app.core.config import settings
+from app.core.interfaces import ICodeExtractor, ICodeLocator, IContentExtractor
 from app.core.logger import app_logger
-from app.domain.entities import DocumentFile
+from app.domain.entities import CodeMatch, DocumentFile
 from app.domain.exceptions import FileReadError
+from app.infrastructure.extraction_cache import CachedPages, ExtractionCache
+from app.infrastructure.extraction_profiles import (
+    AUTO_PROFILE,
+    PatternSet,
+    build_combined_matcher,
+    compile_pattern_set,
+    compile_profiles,
+    load_profiles_config,
+)
 
 
-class ProfiledExtractorService(IContentExtractor, ICodeExtractor):
+def extract_pdf_pages(file_path: Path, start_page: int = 0) -> List[str]:
+    """Extrai o texto de cada página de um PDF, a partir de `start_page` (CPU intensive)."""
+    with open(file_path, "rb") as f:
+        reader = PdfReader(f)
+        return [page.extract_text() or "" for page in reader.pages[start_page:]]
+
+
+def extract_text_from_pdf(file_path: Path) -> str:
+    """Extrai o texto de todas as páginas de um PDF (CPU intensive)."""
+    return "".join(extract_pdf_pages(file_path))
+
+
+def extract_text_from_docx(file_path: Path) -> str:
+    """Extrai o texto dos parágrafos de um DOCX (CPU intensive)."""
+    doc = docx.Document(file_path)
+    return "\n".join([para.text for para in doc.paragraphs])
+
+
+# Caracteres do fim da página anterior reavaliados com a página seguinte, para
+# códigos que atravessam a quebra de página
+PAGE_OVERLAP_CHARS = 256
+
+
+def _is_final(patterns: PatternSet, found: Optional[Tuple[str, int]]) -> bool:
+    """
+    Indica se o código encontrado não pode mais ser superado por páginas seguintes.
+
+    No modo ordenado, só o padrão de maior prioridade encerra a leitura: um
+    padrão anterior na lista, em uma página seguinte, prevaleceria. No modo
+    combinado vale a ocorrência mais à esquerda, então a primeira encerra.
+    """
+    return found is not None and (patterns.combined is not None or found[1] == 0)
+
+
+def _scan_pages(
+    patterns: PatternSet,
+    pages: Sequence[str],
+    tail: str = "",
+    found: Optional[Tuple[str, int]] = None,
+) -> Tuple[Optional[Tuple[str, int]], str]:
+    """
+    Avalia páginas já extraídas, em ordem, com a sobreposição entre páginas.
+
+    A prioridade dos padrões vale para o documento inteiro: um padrão de
+    menor prioridade fica guardado enquanto as páginas seguintes podem
+    trazer um de maior prioridade.
+
+    Returns:
+        Tupla (melhor (código, índice do padrão) encontrado ou None, fim da
+        última página avaliada)
+    """
+    for text in pages:
+        if _is_final(patterns, found):
+            break
+        window = tail + text
+        match = patterns.search(window)
+        if match and (found is None or match[1] < found[1]):
+            found = match
+        tail = window[-PAGE_OVERLAP_CHARS:]
+    return found, tail
+
+
+def scan_pdf_pages(
+    file_path: Path,
+    patterns: Tuple[str, ...],
+    max_pages: Optional[int] = None,
+    start_page: int = 0,
+    tail: str = "",
+    combined: bool = False,
+    found: Optional[Tuple[str, int]] = None,
+) -> Tuple[Optional[Tuple[str, int]], List[str], bool]:
+    """
+    Extrai o texto do PDF página a página, até não haver código melhor a encontrar.
+
+    Cada página é avaliada junto com o fim da anterior (PAGE_OVERLAP_CHARS).
+    A leitura para quando o padrão de maior prioridade casa (ou, no modo
+    combinado, na primeira ocorrência); um padrão de menor prioridade só é
+    definitivo ao fim do documento ou de `max_pages`. A leitura pode continuar
+    de onde uma anterior parou (`start_page`/`tail`/`found`).
+
+    Args:
+        file_path: PDF a ser lido
+        patterns: Padrões do perfil, na ordem de prioridade
+        max_pages: Máximo de páginas lidas nesta chamada (None = todas)
+        start_page: Primeira página a ler
+        tail: Fim do texto da página anterior a `start_page`
+        combined: Avalia todos os padrões em uma única passada (modo AUTO)
+        found: Melhor (código, índice do padrão) das páginas anteriores
+
+    Returns:
+        Tupla (melhor (código, índice do padrão) ou None, texto das páginas
+        lidas, True se a leitura chegou ao fim do documento)
+    """
+    compiled = compile_pattern_set(patterns, combined)
+    pages: List[str] = []
+    with open(file_path, "rb") as f:
+        reader = PdfReader(f)
+        total = len(reader.pages)
+        for index in range(start_page, total):
+            if _is_final(compiled, found):
+                return found, pages, False
+            if max_pages is not None and len(pages) >= max_pages:
+                return found, pages, False
+            text = reader.pages[index].extract_text() or ""
+            pages.append(text)
+            found, tail = _scan_pages(compiled, (text,), tail, found)
+    return found, pages, True
+
+
+def locate_code_in_pdf(
+    file_path: Path, patterns: Tuple[str, ...], max_pages: Optional[int] = None
+) -> Tuple[Optional[str], int]:
+    """
+    Localiza o código em um PDF sem extrair o documento inteiro.
+
+    Vale o padrão de maior prioridade em qualquer página lida, como na busca
+    sobre o texto completo.
+
+    Args:
+        file_path: PDF a ser lido
+        patterns: Padrões do perfil, na ordem de prioridade
+        max_pages: Máximo de páginas lidas (None = todas)
+
+    Returns:
+        Tupla (código encontrado ou None, páginas lidas)
+    """
+    found, pages, _ = scan_pdf_pages(file_path, patterns, max_pages)
+    return (found[0] if found else None), len(pages)
+
+
+def create_extraction_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Cria o pool de processos para extração de texto.
+
+    O parsing de PDF/DOCX é CPU-bound e serializado pelo GIL em threads;
+    em processos separados, a extração em lote escala com o número de núcleos.
+
+    Args:
+        max_workers: Quantidade de processos (padrão: EXTRACTION_WORKERS ou nº de CPUs)
+    """
+    workers = max_workers or settings.EXTRACTION_WORKERS or os.cpu_count() or 1
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+# Pool compartilhado pela UI, encerrado no shutdown da aplicação
+_shared_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos compartilhado, criando-o no primeiro uso.
+
+    Os processos são iniciados sob demanda e reaproveitados entre chamadas.
+    Um pool quebrado (processo filho encerrado abruptamente) é substituído.
+    """
+    global _shared_pool
+    # _broken: o ProcessPoolExecutor não expõe esse estado publicamente
+    if _shared_pool is None or getattr(_shared_pool, "_broken", False):
+        _shared_pool = create_extraction_pool()
+    return _shared_pool
+
+
+async def shutdown_extraction_pool() -> None:
+    """Encerra o pool compartilhado sem bloquear o event loop."""
+    global _shared_pool
+    pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, pool.shutdown)
+
+
+class ProfiledExtractorService(IContentExtractor, ICodeExtractor, ICodeLocator):
     """
     Implementação que extrai conteúdo e códigos de arquivos
     baseado em perfis de configuração.
     """
 
-    def __init__(self, config_path: Path):
+    def __init__(
+        self,
+        config_path: Path,
+        executor: Optional[Executor] = None,
+        cache: Optional[ExtractionCache] = None,
+    ):
+        """
+        Args:
+            config_path: Arquivo YAML com os perfis de extração
+            executor: Executor para o parsing (ex: create_extraction_pool());
+                se omitido, usa o thread pool padrão do event loop
+            cache: Cache do texto extraído (ex: create_extraction_cache());
+                se omitido, todo arquivo é parseado a cada chamada
+
+        Raises:
+            ProfileConfigError: Se algum perfil tiver padrão ou limite inválido
+        """
         self._profiles = self._load_profiles(config_path)
+        # Padrões validados e compilados uma única vez, no carregamento
+        self._compiled = compile_profiles(self._profiles)
+        self._combined = build_combined_matcher(self._compiled)
+        self._executor = executor
+        self._cache = cache
 
     def _load_profiles(self, config_path: Path) -> Dict[str, Any]:
         """Carrega os perfis de extração do arquivo YAML."""
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f).get("profiles", {})
-        except FileNotFoundError:
-            app_logger.warning(
-                "Profiles config file not found", extra={"path": str(config_path)}
-            )
-            return {}
-        except yaml.YAMLError as e:
-            app_logger.error(
-                "Error parsing profiles config",
-                extra={"path": str(config_path), "error": str(e)},
-            )
-            return {}
+        return load_profiles_config(config_path)
+
+    def _pattern_set(
+        self, profile_id: str
+    ) -> Optional[Tuple[PatternSet, Optional[int], Tuple[str, ...]]]:
+        """
+        Padrões compilados de um perfil.
+
+        Returns:
+            Tupla (padrões, limite de páginas, perfil de cada padrão), ou None
+            se o perfil não existir. AUTO avalia todos os perfis de uma vez,
+            a menos que exista um perfil configurado com esse id.
+        """
+        profile = self._compiled.get(profile_id)
+        if profile is None:
+            if profile_id != AUTO_PROFILE or not self._combined.owners:
+                return None
+            combined = self._combined
+            return combined.patterns, combined.max_pages, combined.owners
+
+        owners = (profile_id,) * len(profile.patterns.sources)
+        return profile.patterns, profile.max_pages, owners
 
     async def extract_text(self, file: DocumentFile, profile_id: str) -> str:
         """
         Extrai texto de um arquivo (PDF ou DOCX) de forma assíncrona.
         Usa thread pool para não bloquear o event loop durante I/O e processamento.
         """
+        suffix = file.path.suffix.lower()
+        if suffix not in (".pdf", ".docx"):
+            # Se o perfil precisar, podemos adicionar outros extratores (txt, etc.)
+            return ""
+
+        key = await self._cache_key(file)
+        cached = await self._cache_load(key)
+        if cached is not None and cached.complete:
+            return "".join(cached.pages)
+
         try:
             loop = asyncio.get_event_loop()
 
-            if file.path.suffix.lower() == ".pdf":
-                return await loop.run_in_executor(
-                    None, self._extract_text_from_pdf, file.path
-                )
-            elif file.path.suffix.lower() == ".docx":
-                return await loop.run_in_executor(
-                    None, self._extract_text_from_docx, file.path
+            if suffix == ".pdf":
+                # Uma busca de código anterior pode já ter lido as primeiras páginas
+                start = len(cached.pages) if cached is not None else 0
+                pages = await loop.run_in_executor(
+                    self._executor, extract_pdf_pages, file.path, start
                 )
             else:
-                # Se o perfil precisar, podemos adicionar outros extratores (txt, etc.)
-                return ""
+                start = 0
+                pages = [
+                    await loop.run_in_executor(
+                        self._executor, extract_text_from_docx, file.path
+                    )
+                ]
         except Exception as e:
             app_logger.error(
                 "Failed to extract text",
@@ -70,48 +292,155 @@ class ProfiledExtractorService(IContentExtractor, ICodeExtractor):
             )
             raise FileReadError(f"Falha ao ler o conteúdo de {file.path.name}: {e}")
 
-    def _extract_text_from_pdf(self, file_path: Path) -> str:
-        """Lógica específica para extração de texto de PDF (CPU intensive)."""
-        text = ""
-        with open(file_path, "rb") as f:
-            reader = PdfReader(f)
-            # Extrai texto de todas as páginas
-            for page in reader.pages:
-                text += page.extract_text() or ""
-        return text
-
-    def _extract_text_from_docx(self, file_path: Path) -> str:
-        """Lógica específica para extração de texto de DOCX (CPU intensive)."""
-        doc = docx.Document(file_path)
-        return "\n".join([para.text for para in doc.paragraphs])
+        await self._cache_store(key, file, pages, start, complete=True)
+        previous = cached.pages if start else []
+        return "".join(previous + pages)
 
-    async def find_code(self, text: str, profile_id: str) -> Optional[str]:
-        """Encontra um código em um texto usando os padrões de um perfil."""
-        # Operação de CPU leve, mas pode ser promovida a executor se perfis forem muito complexos
-        profile = self._profiles.get(profile_id)
-        if not profile or not text:
+    async def locate_code(self, file: DocumentFile, profile_id: str) -> Optional[str]:
+        """
+        Localiza o código do documento sem extrair o arquivo inteiro.
+
+        PDFs são lidos página a página (até `max_pages` do perfil) e a leitura
+        para quando o padrão de maior prioridade casar; um padrão de menor
+        prioridade não impede a leitura das páginas seguintes, e a prioridade
+        vale para o documento inteiro. DOCX é extraído e avaliado de uma vez.
+        Páginas já em cache são avaliadas sem reabrir o arquivo.
+        """
+        resolved = self._pattern_set(profile_id)
+        if resolved is None:
             return None
 
-        patterns: List[str] = profile.get("patterns", [])
-        for pattern in patterns:
-            # re.IGNORECASE para ignorar maiúsculas/minúsculas
-            # re.MULTILINE para que ^ e $ funcionem em cada linha
+        suffix = file.path.suffix.lower()
+        if suffix != ".pdf":
+            text = await self.extract_text(file, profile_id)
+            return await self.find_code(text, profile_id)
+
+        pattern_set, max_pages, _ = resolved
+
+        key = await self._cache_key(file)
+        cached = await self._cache_load(key) or CachedPages()
+        found, tail = _scan_pages(pattern_set, cached.pages[:max_pages], "")
+
+        pages: List[str] = []
+        start = len(cached.pages)
+        budget = None if max_pages is None else max_pages - start
+        searching = not _is_final(pattern_set, found) and not cached.complete
+        if searching and (budget is None or budget > 0):
             try:
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-                if match:
-                    # Se o padrão tem um grupo de captura (parênteses), retorna o grupo.
-                    # Senão, retorna a correspondência inteira.
-                    code = match.group(1) if match.groups() else match.group(0)
-                    app_logger.debug(
-                        "Code found",
-                        extra={"code": code, "pattern": pattern, "profile": profile_id},
-                    )
-                    return code
-            except re.error as e:
-                app_logger.warning(
-                    "Invalid regex pattern",
-                    extra={"pattern": pattern, "error": str(e)},
+                loop = asyncio.get_event_loop()
+                found, pages, complete = await loop.run_in_executor(
+                    self._executor,
+                    scan_pdf_pages,
+                    file.path,
+                    pattern_set.sources,
+                    budget,
+                    start,
+                    tail,
+                    pattern_set.combined is not None,
+                    found,
+                )
+            except Exception as e:
+                app_logger.error(
+                    "Failed to extract text",
+                    extra={"file": str(file.path), "error": str(e)},
                 )
-                continue
+                raise FileReadError(f"Falha ao ler o conteúdo de {file.path.name}: {e}")
+            await self._cache_store(key, file, pages, start, complete)
+
+        app_logger.debug(
+            "Code lookup finished",
+            extra={
+                "file": str(file.path),
+                "profile": profile_id,
+                "pages_cached": start,
+                "pages_read": len(pages),
+                "found": found is not None,
+            },
+        )
+        return found[0] if found else None
 
-        return None
+    async def find_code(self, text: str, profile_id: str) -> Optional[str]:
+        """Encontra um código em um texto usando os padrões de um perfil."""
+        match = await self.find_code_match(text, profile_id)
+        return match.code if match else None
+
+    async def find_code_match(self, text: str, profile_id: str) -> Optional[CodeMatch]:
+        """
+        Encontra um código e informa o perfil e o padrão que casaram.
+
+        Em um perfil, vale o primeiro padrão (na ordem do YAML) que casar. No
+        modo AUTO, os padrões de todos os perfis formam uma única alternação
+        e o texto é percorrido uma só vez: vale a ocorrência mais à esquerda.
+        """
+        # Operação de CPU leve: os padrões já estão compilados
+        resolved = self._pattern_set(profile_id)
+        if resolved is None or not text:
+            return None
+
+        pattern_set, _, owners = resolved
+        found = pattern_set.search(text)
+        if not found:
+            return None
+
+        code, index = found
+        match = CodeMatch(
+            code=code, profile_id=owners[index], pattern=pattern_set.sources[index]
+        )
+        app_logger.debug(
+            "Code found",
+            extra={
+                "code": code,
+                "profile": profile_id,
+                "matched_profile": match.profile_id,
+            },
+        )
+        return match
+
+    async def _cache_key(self, file: DocumentFile) -> Optional[str]:
+        """Chave do arquivo no cache; None sem cache ou se o hash falhar."""
+        if self._cache is None:
+            return None
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._cache.key_for, file.path)
+        except OSError as e:
+            app_logger.warning(
+                "Failed to hash file for extraction cache",
+                extra={"file": str(file.path), "error": str(e)},
+            )
+            return None
+
+    async def _cache_load(self, key: Optional[str]) -> Optional[CachedPages]:
+        if self._cache is None or key is None:
+            return None
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._cache.load, key)
+        except Exception as e:
+            # Falha no cache nunca deve impedir a extração
+            app_logger.warning(
+                "Failed to read extraction cache",
+                extra={"key": key, "error": str(e)},
+            )
+            return None
+
+    async def _cache_store(
+        self,
+        key: Optional[str],
+        file: DocumentFile,
+        pages: List[str],
+        start: int,
+        complete: bool,
+    ) -> None:
+        if self._cache is None or key is None or (not pages and not complete):
+            return
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None, self._cache.store, key, file.path, pages, start, complete
+            )
+        except Exception as e:
+            app_logger.warning(
+                "Failed to store extracted text in cache",
+                extra={"file": str(file.path), "error": str(e)},
+            )
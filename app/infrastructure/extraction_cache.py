@@ -0,0 +1,139 @@
+"""
+Cache persistente do texto extraído de documentos.
+Evita reabrir e reparsear o mesmo PDF/DOCX em novas tentativas de resolução,
+trocas de perfil e reexecuções sobre os mesmos arquivos.
+"""
+
+import hashlib
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.infrastructure.disk_cache import ChunkedDiskCache, file_content_hash
+
+# Incrementar quando a extração de texto mudar, invalidando o cache existente
+EXTRACTOR_VERSION = 1
+
+
+def encode_page(text: str) -> bytes:
+    """Serializa o texto de uma página (um chunk por página)."""
+    return zlib.compress(text.encode("utf-8"), 1)
+
+
+def decode_page(payload: bytes) -> str:
+    """Reconstrói o texto de uma página serializada por encode_page."""
+    return zlib.decompress(payload).decode("utf-8")
+
+
+@dataclass
+class CachedPages:
+    """Texto das páginas já extraídas de um documento."""
+
+    pages: List[str] = field(default_factory=list)
+    complete: bool = False  # False = apenas as primeiras páginas foram lidas
+
+
+class ExtractionCache:
+    """
+    Texto extraído por página, sobre um ChunkedDiskCache.
+
+    A chave é o hash do conteúdo do arquivo mais a versão do extrator: o mesmo
+    documento copiado ou renomeado continua sendo um acerto. Uma busca de
+    código que parou nas primeiras páginas grava só essas páginas; leituras
+    posteriores continuam a partir delas (`append`).
+    """
+
+    def __init__(self, cache: ChunkedDiskCache):
+        self._cache = cache
+
+    @staticmethod
+    def key_for(file_path: Path) -> str:
+        """Chave do arquivo: hash do conteúdo + tamanho + versão do extrator."""
+        parts = [
+            file_content_hash(file_path),
+            str(file_path.stat().st_size),
+            str(EXTRACTOR_VERSION),
+        ]
+        return hashlib.blake2b(
+            "|".join(parts).encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def load(self, key: str) -> Optional[CachedPages]:
+        """
+        Lê as páginas em cache de um documento.
+
+        Returns:
+            CachedPages, ou None se o documento não estiver no cache
+        """
+        entry = self._cache.get_entry(key)
+        if entry is None:
+            return None
+
+        pages = []
+        for seq in range(entry.chunk_count):
+            payload = self._cache.read_chunk(key, seq)
+            if payload is None:
+                # Entrada despejada durante a leitura: trata como ausente
+                return None
+            pages.append(decode_page(payload))
+        return CachedPages(pages=pages, complete=bool(entry.meta.get("complete")))
+
+    def store(
+        self,
+        key: str,
+        source: Path,
+        pages: Sequence[str],
+        start: int = 0,
+        complete: bool = True,
+    ) -> bool:
+        """
+        Grava páginas extraídas a partir da página `start`.
+
+        Args:
+            key: Chave obtida com key_for
+            source: Arquivo de origem
+            pages: Texto das páginas lidas, em ordem
+            start: Índice da primeira página de `pages` no documento
+            complete: True se `pages` chega ao fim do documento
+
+        Returns:
+            True se as páginas foram gravadas (False se outro leitor já
+            alterou a entrada nesse meio tempo)
+        """
+        chunks = [encode_page(text) for text in pages]
+        meta = {"complete": complete, "extractor": EXTRACTOR_VERSION}
+        if start == 0:
+            # Mesmo arquivo com outro conteúdo não tem mais utilidade
+            self._cache.put(key, source=str(source.resolve()), chunks=chunks, meta=meta)
+            return True
+        return self._cache.append(
+            key,
+            source=str(source.resolve()),
+            chunks=chunks,
+            expected_start=start,
+            meta=meta,
+        )
+
+
+def create_extraction_cache() -> Optional[ExtractionCache]:
+    """Factory do cache de extração; None se desabilitado ou indisponível."""
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return None
+
+    try:
+        cache = ChunkedDiskCache(
+            settings.get_extraction_cache_path(),
+            max_bytes=settings.EXTRACTION_CACHE_MAX_BYTES,
+            max_entries=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+        )
+    except Exception as e:
+        app_logger.warning(
+            "Extraction cache unavailable, parsing documents directly",
+            extra={"error": str(e)},
+        )
+        return None
+
+    return ExtractionCache(cache)
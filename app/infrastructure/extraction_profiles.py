@@ -0,0 +1,308 @@
+"""
+Perfis de extração de código compilados.
+Valida e compila os padrões de config/patterns.yaml uma única vez, no
+carregamento, e oferece a busca em uma só passada sobre todos os perfis.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Pattern, Tuple
+
+import yaml
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+from app.core.logger import app_logger
+from app.domain.exceptions import ProfileConfigError
+
+# Modo que avalia os padrões de todos os perfis de uma vez. Um perfil
+# configurado com o mesmo id tem precedência sobre o modo combinado.
+AUTO_PROFILE = "AUTO"
+
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Referências por número/nome mudam de sentido quando o padrão é combinado
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Padrão que começa (dentro de grupos simples) com uma classe repetida: `([A-Z0-9]+...`
+_LEADING_CLASS_RUN = re.compile(r"(?:\((?:\?:)?)*(\[(?:[^\]\\]|\\.)+\])\+(?![?+])")
+
+
+@dataclass(frozen=True)
+class PatternSet:
+    """
+    Padrões de busca já compilados.
+
+    Em modo ordenado (`combined` = None), vale o primeiro padrão, na ordem de
+    prioridade, que casar em qualquer ponto do texto. Em modo combinado, os
+    padrões formam uma única alternação e o texto é percorrido uma só vez:
+    vale a ocorrência mais à esquerda (empates resolvidos pela ordem).
+    """
+
+    sources: Tuple[str, ...]
+    patterns: Tuple[Pattern[str], ...]
+    combined: Optional[Pattern[str]] = None
+    # Por grupo externo da alternação: (índice do padrão, grupo do código)
+    groups: Tuple[Tuple[int, int], ...] = ()
+
+    def search(self, text: str) -> Optional[Tuple[str, int]]:
+        """
+        Busca um código no texto.
+
+        Returns:
+            Tupla (código, índice do padrão que casou) ou None; o código é o
+            grupo 1 do padrão, ou o match inteiro se ele não tiver grupos
+        """
+        if self.combined is None:
+            for index, pattern in enumerate(self.patterns):
+                match = pattern.search(text)
+                if match:
+                    return (match.group(1) if match.groups() else match.group(0)), index
+            return None
+
+        match = self.combined.search(text)
+        if not match:
+            return None
+        # O grupo externo fecha por último: lastindex identifica o padrão
+        index, group = self.groups[match.lastindex]
+        return match.group(group), index
+
+
+def _starts_with_class_run(source: str) -> bool:
+    """Confirma na árvore da regex que o primeiro elemento é `[C]+` sem alternativas."""
+    items = sre_parse.parse(source, PATTERN_FLAGS)
+    while len(items):
+        op, av = items[0]
+        if op is sre_parse.SUBPATTERN:
+            items = av[-1]
+            continue
+        if op is sre_parse.MAX_REPEAT:
+            low, high, body = av
+            return (
+                low >= 1
+                and high == sre_parse.MAXREPEAT
+                and len(body) == 1
+                and body[0][0] is sre_parse.IN
+            )
+        return False
+    return False
+
+
+def optimize_pattern(source: str) -> str:
+    """
+    Evita tentativas inúteis no meio de palavras para padrões que começam com `[C]+`.
+
+    Se um padrão assim casa a partir de uma posição precedida por um caractere
+    de C, ele também casa uma posição antes. Como a busca devolve a ocorrência
+    mais à esquerda, essas tentativas nunca decidem o resultado, mas custam ao
+    motor de regex o tamanho da sequência cada uma. O lookbehind `(?<![C])` as
+    descarta em O(1), sem alterar o que é encontrado nem a numeração dos grupos.
+    """
+    match = _LEADING_CLASS_RUN.match(source)
+    if match is None or _BACKREFERENCE.search(source):
+        return source
+    if not _starts_with_class_run(source):
+        return source
+    return f"(?<!{match.group(1)}){source}"
+
+
+def compile_pattern(source: str, profile_id: str = "") -> Pattern[str]:
+    """
+    Compila um padrão de perfil.
+
+    Raises:
+        ProfileConfigError: Se o padrão não for uma regex válida
+    """
+    try:
+        return re.compile(source, PATTERN_FLAGS)
+    except (re.error, TypeError) as e:
+        raise ProfileConfigError(
+            f"Padrão inválido no perfil '{profile_id}': {source!r} ({e})"
+        ) from e
+
+
+@lru_cache(maxsize=64)
+def compile_pattern_set(sources: Tuple[str, ...], combined: bool = False) -> PatternSet:
+    """
+    Compila (uma vez por processo) um conjunto de padrões.
+
+    Chamado também nos processos de extração, que recebem só as strings.
+
+    Args:
+        sources: Padrões, na ordem de prioridade
+        combined: Monta uma única alternação para busca em uma passada; se algum
+            padrão não puder ser combinado (ex: retrorreferências), usa o modo
+            ordenado
+
+    Raises:
+        ProfileConfigError: Se algum padrão for inválido
+    """
+    for source in sources:
+        compile_pattern(source)
+    patterns = tuple(
+        re.compile(optimize_pattern(source), PATTERN_FLAGS) for source in sources
+    )
+    if not combined or not sources:
+        return PatternSet(sources=sources, patterns=patterns)
+
+    if any(_BACKREFERENCE.search(source) for source in sources):
+        app_logger.info(
+            "Patterns with backreferences, combined search disabled",
+            extra={"patterns": len(sources)},
+        )
+        return PatternSet(sources=sources, patterns=patterns)
+
+    parts: List[str] = []
+    groups: List[Tuple[int, int]] = [(-1, 0)]  # grupo 0 não identifica padrão
+    for index, pattern in enumerate(patterns):
+        outer = len(groups)
+        parts.append(f"({pattern.pattern})")
+        code_group = outer + 1 if pattern.groups else outer
+        groups.append((index, code_group))
+        groups.extend([(index, code_group)] * pattern.groups)
+
+    try:
+        alternation = re.compile("|".join(parts), PATTERN_FLAGS)
+    except re.error as e:
+        # Ex: nomes de grupo repetidos entre padrões ou flags inline
+        app_logger.info(
+            "Patterns cannot be combined, using ordered search",
+            extra={"error": str(e)},
+        )
+        return PatternSet(sources=sources, patterns=patterns)
+
+    return PatternSet(
+        sources=sources,
+        patterns=patterns,
+        combined=alternation,
+        groups=tuple(groups),
+    )
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """Perfil de extração validado, com os padrões compilados."""
+
+    profile_id: str
+    patterns: PatternSet
+    max_pages: Optional[int] = None
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class CombinedMatcher:
+    """Padrões de todos os perfis em uma única alternação (modo AUTO)."""
+
+    patterns: PatternSet
+    owners: Tuple[str, ...]  # Perfil de cada padrão
+    max_pages: Optional[int] = None
+
+
+def compile_profiles(raw_profiles: Mapping[str, Any]) -> Dict[str, CompiledProfile]:
+    """
+    Valida e compila os perfis carregados do YAML.
+
+    Raises:
+        ProfileConfigError: Se algum perfil estiver malformado ou tiver regex inválida
+    """
+    if not isinstance(raw_profiles, Mapping):
+        raise ProfileConfigError("A chave 'profiles' deve ser um mapeamento")
+
+    compiled: Dict[str, CompiledProfile] = {}
+    for profile_id, profile in raw_profiles.items():
+        if not isinstance(profile, Mapping):
+            raise ProfileConfigError(f"Perfil '{profile_id}' deve ser um mapeamento")
+
+        sources = profile.get("patterns") or []
+        if not isinstance(sources, list) or not all(
+            isinstance(source, str) for source in sources
+        ):
+            raise ProfileConfigError(
+                f"Perfil '{profile_id}': 'patterns' deve ser uma lista de strings"
+            )
+        for source in sources:
+            compile_pattern(source, profile_id)
+
+        max_pages = profile.get("max_pages")
+        if max_pages is not None and (
+            isinstance(max_pages, bool)
+            or not isinstance(max_pages, int)
+            or max_pages < 1
+        ):
+            raise ProfileConfigError(
+                f"Perfil '{profile_id}': 'max_pages' deve ser um inteiro positivo"
+            )
+
+        compiled[profile_id] = CompiledProfile(
+            profile_id=profile_id,
+            patterns=compile_pattern_set(tuple(sources)),
+            max_pages=max_pages,
+            description=profile.get("description", ""),
+        )
+    return compiled
+
+
+def build_combined_matcher(
+    profiles: Mapping[str, CompiledProfile],
+) -> CombinedMatcher:
+    """
+    Une os padrões de todos os perfis, sem repetições, na ordem do arquivo.
+
+    O limite de páginas é o maior entre os perfis (None se algum perfil não
+    tiver limite).
+    """
+    owners: Dict[str, str] = {}
+    for profile in profiles.values():
+        for source in profile.patterns.sources:
+            owners.setdefault(source, profile.profile_id)
+
+    limits = [profile.max_pages for profile in profiles.values()]
+    max_pages = None if None in limits or not limits else max(limits)
+
+    return CombinedMatcher(
+        patterns=compile_pattern_set(tuple(owners), combined=True),
+        owners=tuple(owners.values()),
+        max_pages=max_pages,
+    )
+
+
+def load_profiles_config(config_path: Path) -> Dict[str, Any]:
+    """
+    Lê os perfis (sem compilar) do arquivo YAML.
+
+    Arquivo ausente ou YAML ilegível resultam em nenhum perfil.
+    """
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            return (yaml.safe_load(f) or {}).get("profiles", {}) or {}
+    except FileNotFoundError:
+        app_logger.warning(
+            "Profiles config file not found", extra={"path": str(config_path)}
+        )
+        return {}
+    except yaml.YAMLError as e:
+        app_logger.error(
+            "Error parsing profiles config",
+            extra={"path": str(config_path), "error": str(e)},
+        )
+        return {}
+
+
+def validate_profiles_config(config_path: Path) -> Dict[str, CompiledProfile]:
+    """
+    Carrega e compila os perfis; usado na inicialização para falhar cedo.
+
+    Raises:
+        ProfileConfigError: Se algum perfil for inválido
+    """
+    profiles = compile_profiles(load_profiles_config(config_path))
+    app_logger.info(
+        "Extraction profiles loaded",
+        extra={"path": str(config_path), "profiles": len(profiles)},
+    )
+    return profiles
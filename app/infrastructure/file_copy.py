@@ -0,0 +1,237 @@
+"""
+Cópia de arquivos sem passar os dados pelo Python.
+Escolhe, por par de volumes, a estratégia mais barata disponível: reflink
+(clonagem copy-on-write), copy_file_range, sendfile e, por último, leitura e
+escrita com um buffer grande. Também implementa a movimentação entre volumes
+diferentes, usada quando um rename falha com EXDEV.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Set, Tuple
+
+from app.domain.exceptions import FileOperationError
+from app.infrastructure.disk_cache import file_content_hash
+
+DEFAULT_BUFFER_SIZE = 8 * 1024 * 1024  # 8MB
+
+# ioctl FICLONE do Linux (_IOW(0x94, 9, int)): Btrfs, XFS, bcachefs, OCFS2...
+_FICLONE = 0x40049409
+
+# Erros que indicam que o sistema de arquivos (ou o kernel) não oferece a
+# chamada para este par de volumes: a estratégia não é mais tentada nele
+_UNSUPPORTED_ERRNOS = frozenset(
+    {
+        errno.ENOSYS,
+        errno.EXDEV,
+        errno.ENOTSUP,
+        errno.EOPNOTSUPP,
+        errno.ENOTTY,
+    }
+)
+
+# Erros que podem depender só deste arquivo (ex: arquivo especial, imutável ou
+# aberto com flags incompatíveis): a cópia recomeça com a estratégia seguinte,
+# mas a estratégia continua valendo para os próximos arquivos
+_FALLBACK_ERRNOS = frozenset({errno.EINVAL, errno.EBADF, errno.EPERM})
+
+# (estratégia, volume de origem, volume de destino) que já falharam: não são
+# tentadas de novo, evitando uma chamada de sistema perdida por cópia
+_unsupported: Set[Tuple[str, int, int]] = set()
+_unsupported_lock = threading.Lock()
+
+
+def _clone(src_fd: int, dst_fd: int, buffer_size: int) -> int:
+    """Reflink: o destino compartilha os blocos da origem até ser alterado."""
+    import fcntl
+
+    fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+    return os.fstat(src_fd).st_size
+
+
+def _copy_with_copy_file_range(src_fd: int, dst_fd: int, buffer_size: int) -> int:
+    """Cópia dentro do kernel (Linux 4.5+; entre sistemas de arquivos desde o 5.3)."""
+    offset = 0
+    while True:
+        copied = os.copy_file_range(src_fd, dst_fd, buffer_size, offset, offset)
+        if copied == 0:
+            return offset
+        offset += copied
+
+
+def _copy_with_sendfile(src_fd: int, dst_fd: int, buffer_size: int) -> int:
+    """Cópia dentro do kernel via sendfile (Linux 2.6.33+ aceita arquivo como destino)."""
+    offset = 0
+    while True:
+        copied = os.sendfile(dst_fd, src_fd, offset, buffer_size)
+        if copied == 0:
+            return offset
+        offset += copied
+
+
+def _copy_with_buffer(src_fd: int, dst_fd: int, buffer_size: int) -> int:
+    """
+    Cópia em espaço de usuário, com um único buffer grande reaproveitado.
+
+    Último recurso em qualquer plataforma (no Windows, a única estratégia):
+    usa só readinto e os.write, disponíveis em todas.
+    """
+    view = memoryview(bytearray(buffer_size))
+    total = 0
+    with open(src_fd, "rb", buffering=0, closefd=False) as src:
+        while True:
+            read = src.readinto(view)
+            if not read:
+                return total
+            written = 0
+            while written < read:
+                written += os.write(dst_fd, view[written:read])
+            total += read
+
+
+def _copy_strategies() -> Tuple[Tuple[str, Callable[[int, int, int], int]], ...]:
+    strategies = []
+    if sys.platform.startswith("linux"):
+        strategies.append(("reflink", _clone))
+    if hasattr(os, "copy_file_range"):
+        strategies.append(("copy_file_range", _copy_with_copy_file_range))
+    if hasattr(os, "sendfile"):
+        strategies.append(("sendfile", _copy_with_sendfile))
+    strategies.append(("buffer", _copy_with_buffer))
+    return tuple(strategies)
+
+
+def zero_copy_available() -> bool:
+    """True se a plataforma oferece alguma cópia feita pelo kernel."""
+    return len(_copy_strategies()) > 1
+
+
+def copy_contents(src_fd: int, dst_fd: int, buffer_size: int) -> Tuple[int, str]:
+    """
+    Copia todo o conteúdo de `src_fd` para `dst_fd` (ambos posicionados no início).
+
+    Tenta reflink, copy_file_range, sendfile e por fim leitura/escrita com
+    buffer; uma estratégia que falha recomeça a cópia com a seguinte. Só a
+    não suportada pelo sistema de arquivos (_UNSUPPORTED_ERRNOS) deixa de ser
+    tentada para o mesmo par de volumes.
+
+    Returns:
+        Tupla (bytes copiados, estratégia usada)
+    """
+    devices = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+    strategies = [
+        (name, strategy)
+        for name, strategy in _copy_strategies()
+        if (name, *devices) not in _unsupported
+    ]
+    for index, (name, strategy) in enumerate(strategies):
+        try:
+            return strategy(src_fd, dst_fd, buffer_size), name
+        except OSError as e:
+            fallback = e.errno in _UNSUPPORTED_ERRNOS or e.errno in _FALLBACK_ERRNOS
+            if not fallback or index == len(strategies) - 1:
+                raise
+            if e.errno in _UNSUPPORTED_ERRNOS:
+                with _unsupported_lock:
+                    _unsupported.add((name, *devices))
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def copy_file(
+    source: Path, destination: Path, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> Tuple[int, str]:
+    """
+    Copia o conteúdo de um arquivo (destino existente é sobrescrito).
+
+    Returns:
+        Tupla (bytes copiados, estratégia usada)
+
+    Raises:
+        FileOperationError: Se o tamanho da cópia não conferir com a origem
+        OSError: Em erros de leitura/escrita
+    """
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        expected = os.fstat(src.fileno()).st_size
+        copied, strategy = copy_contents(src.fileno(), dst.fileno(), buffer_size)
+        written = os.fstat(dst.fileno()).st_size
+
+    _check_copy_size(source, expected, copied, written)
+    return copied, strategy
+
+
+def _check_copy_size(source: Path, expected: int, copied: int, written: int) -> None:
+    """Confere os bytes copiados e o tamanho gravado com o tamanho da origem."""
+    if copied != expected or written != expected:
+        raise FileOperationError(
+            f"Cópia incompleta de {source}: {written} de {expected} bytes"
+        )
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persiste a entrada do diretório (no-op onde diretórios não abrem, ex: Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def move_across_devices(
+    source: Path,
+    destination: Path,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    verify_checksum: bool = False,
+) -> int:
+    """
+    Move um arquivo para outro volume: copia, sincroniza, verifica e remove a origem.
+
+    A cópia é gravada em um arquivo temporário ao lado do destino e só então
+    renomeada para o nome final, como um rename faria (destino existente é
+    substituído). A origem só é removida depois que a cópia estiver em disco.
+
+    Args:
+        source: Arquivo de origem
+        destination: Caminho final (o diretório já deve existir)
+        buffer_size: Bytes por chamada de cópia
+        verify_checksum: Além do tamanho, compara o hash do conteúdo
+
+    Returns:
+        Bytes copiados
+
+    Raises:
+        FileOperationError: Se a cópia não conferir com a origem
+        OSError: Em erros de leitura/escrita
+    """
+    partial = destination.with_name(f".{destination.name}.partial")
+    try:
+        with open(source, "rb") as src, open(partial, "wb") as dst:
+            expected = os.fstat(src.fileno()).st_size
+            copied, _ = copy_contents(src.fileno(), dst.fileno(), buffer_size)
+            os.fsync(dst.fileno())
+            written = os.fstat(dst.fileno()).st_size
+
+        _check_copy_size(source, expected, copied, written)
+        if verify_checksum and file_content_hash(source) != file_content_hash(partial):
+            raise FileOperationError(f"Conteúdo divergente na cópia de {source}")
+
+        shutil.copystat(source, partial)
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    _fsync_directory(destination.parent)
+    source.unlink()
+    return copied
@@ -0,0 +1,302 @@
+"""
+Índice persistente dos diretórios de origem.
+Guarda caminho, tamanho, mtime, inode e o item do manifesto casado de cada
+arquivo no banco local para que uma revalidação só precise recasar os arquivos
+novos ou alterados.
+"""
+
+import asyncio
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.domain.entities import DocumentFile, ManifestItem, SourceIndexDelta
+from app.domain.models import IndexedFile, SourceIndexState
+from app.infrastructure.database import DatabaseManager
+from app.infrastructure.manifest_cache import decode_manifest_item, encode_manifest_item
+from app.infrastructure.repositories import FileRepository
+from app.infrastructure.scanner import ScannedEntry
+
+# Limite de parâmetros por instrução (SQLite aceita no mínimo 999)
+_BULK_CHUNK_SIZE = 500
+
+# Gravações do índice não se intercalam: cada requisição cria seu próprio
+# FileIndexRepository, e o diff de uma gravação depende das linhas atuais
+_record_lock = threading.Lock()
+
+# (id, size_bytes, mtime_ns, inode, document_code, manifest_item_json)
+_IndexedRow = Tuple[int, int, int, int, Optional[str], Optional[str]]
+
+
+@dataclass
+class _PendingScan:
+    """Varredura aguardando o resultado do casamento para ser persistida."""
+
+    source_root: str
+    manifest_fingerprint: str
+    entries: Dict[str, ScannedEntry]
+    previous: Dict[str, _IndexedRow]
+    # scanned_at do SourceIndexState lido em `previous` (None = sem estado)
+    state_scanned_at: Optional[datetime]
+
+
+def manifest_fingerprint(manifest_path: Path) -> str:
+    """Identidade do manifesto: caminho resolvido, tamanho e mtime."""
+    stat = manifest_path.stat()
+    return f"{manifest_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+class FileIndexRepository:
+    """
+    Índice incremental de diretórios de origem sobre o DatabaseManager.
+
+    O fluxo tem duas etapas: `refresh` varre o diretório e devolve o delta em
+    relação à validação anterior; `record_matches` grava o resultado do
+    casamento, tornando a varredura atual a nova referência.
+
+    Cada varredura pendente é identificada pelo `scan_id` do delta: duas
+    validações do mesmo diretório (ex: manifestos diferentes, em jobs
+    simultâneos) não trocam varreduras nem fingerprints entre si.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        file_repo: Optional[FileRepository] = None,
+    ):
+        self._db_manager = db_manager
+        self._file_repo = file_repo or FileRepository()
+        self._pending: Dict[str, _PendingScan] = {}
+        self._lock = threading.Lock()
+
+    async def refresh(self, directory: Path, manifest_path: Path) -> SourceIndexDelta:
+        """
+        Varre o diretório e compara com o índice persistido.
+
+        Args:
+            directory: Diretório de origem
+            manifest_path: Manifesto usado na validação atual
+
+        Returns:
+            SourceIndexDelta com arquivos novos, alterados, inalterados e
+            removidos; seu `scan_id` é passado a `record_matches`
+
+        Raises:
+            SourceDirectoryNotFoundError: Se o diretório não existir
+            FileReadError: Se houver erro ao ler os arquivos
+        """
+        entries = await self._file_repo.scan_entries(directory)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, self._refresh_sync, directory, manifest_path, entries
+        )
+
+    async def record_matches(
+        self, scan_id: str, matches: Dict[Path, Optional[ManifestItem]]
+    ) -> None:
+        """
+        Persiste a varredura pendente com o item casado de cada arquivo.
+
+        Args:
+            scan_id: `scan_id` do delta retornado pelo `refresh`
+            matches: Item do manifesto por caminho (None = não reconhecido)
+        """
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._record_sync, scan_id, matches)
+
+    @staticmethod
+    def _load_rows(db: Session, root: str) -> Dict[str, _IndexedRow]:
+        """Linhas do índice de um diretório, por caminho relativo."""
+        return {
+            path: (row_id, size_bytes, mtime_ns, inode, code, item_json)
+            for row_id, path, size_bytes, mtime_ns, inode, code, item_json in db.exec(
+                select(
+                    IndexedFile.id,
+                    IndexedFile.path,
+                    IndexedFile.size_bytes,
+                    IndexedFile.mtime_ns,
+                    IndexedFile.inode,
+                    IndexedFile.document_code,
+                    IndexedFile.manifest_item_json,
+                ).where(IndexedFile.source_root == root)
+            )
+        }
+
+    def _refresh_sync(
+        self, directory: Path, manifest_path: Path, entries: List[ScannedEntry]
+    ) -> SourceIndexDelta:
+        self._db_manager.init_db()
+        root = str(directory.resolve())
+        fingerprint = manifest_fingerprint(manifest_path)
+
+        with Session(self._db_manager.engine) as db:
+            state = db.get(SourceIndexState, root)
+            previous = self._load_rows(db, root)
+
+        # Caminhos relativos à raiz: o índice independe da forma como o
+        # diretório foi informado (relativo, absoluto, com links)
+        delta = SourceIndexDelta(
+            manifest_changed=state is None or state.manifest_fingerprint != fingerprint,
+            scan_id=uuid.uuid4().hex,
+        )
+        current: Dict[str, ScannedEntry] = {}
+        for entry in entries:
+            rel = entry.path.relative_to(directory).as_posix()
+            current[rel] = entry
+            file = DocumentFile(path=entry.path, size_bytes=entry.size_bytes)
+            known = previous.get(rel)
+            if known is None:
+                delta.added.append(file)
+            elif known[1:4] != (entry.size_bytes, entry.mtime_ns, entry.inode):
+                delta.changed.append(file)
+            else:
+                delta.unchanged.append(file)
+                delta.previous_codes[entry.path] = known[4]
+                if known[5] is not None:
+                    delta.previous_items[entry.path] = decode_manifest_item(known[5])
+
+        delta.removed = [directory / rel for rel in previous if rel not in current]
+
+        with self._lock:
+            self._pending[delta.scan_id] = _PendingScan(
+                root,
+                fingerprint,
+                current,
+                previous,
+                state.scanned_at if state is not None else None,
+            )
+
+        app_logger.info(
+            "Source index refreshed",
+            extra={
+                "source_root": root,
+                "added": len(delta.added),
+                "changed": len(delta.changed),
+                "unchanged": len(delta.unchanged),
+                "removed": len(delta.removed),
+                "manifest_changed": delta.manifest_changed,
+            },
+        )
+        return delta
+
+    def _record_sync(
+        self, scan_id: str, matches: Dict[Path, Optional[ManifestItem]]
+    ) -> None:
+        with self._lock:
+            pending = self._pending.pop(scan_id, None)
+        if pending is None:
+            app_logger.warning("No pending scan to record", extra={"scan_id": scan_id})
+            return
+        with _record_lock:
+            self._record_pending(pending, matches)
+
+    def _record_pending(
+        self, pending: _PendingScan, matches: Dict[Path, Optional[ManifestItem]]
+    ) -> None:
+        root = pending.source_root
+        table = IndexedFile.__table__
+        stale_ids: List[int] = []
+        new_rows: List[dict] = []
+        code_updates: List[dict] = []
+
+        with Session(self._db_manager.engine) as db:
+            state = db.get(SourceIndexState, root)
+            previous = pending.previous
+            if (state.scanned_at if state is not None else None) != (
+                pending.state_scanned_at
+            ):
+                # Outra validação do diretório gravou o índice depois do
+                # refresh: o diff parte das linhas atuais, não das lidas antes
+                previous = self._load_rows(db, root)
+
+            for rel, entry in pending.entries.items():
+                item = matches.get(entry.path)
+                code = item.document_code if item is not None else None
+                item_json = encode_manifest_item(item) if item is not None else None
+                known = previous.get(rel)
+                if known is not None and known[1:4] == (
+                    entry.size_bytes,
+                    entry.mtime_ns,
+                    entry.inode,
+                ):
+                    if known[4:6] != (code, item_json):
+                        code_updates.append(
+                            {"row_id": known[0], "code": code, "item_json": item_json}
+                        )
+                    continue
+                if known is not None:
+                    stale_ids.append(known[0])
+                new_rows.append(
+                    {
+                        "source_root": root,
+                        "path": rel,
+                        "size_bytes": entry.size_bytes,
+                        "mtime_ns": entry.mtime_ns,
+                        "inode": entry.inode,
+                        "document_code": code,
+                        "manifest_item_json": item_json,
+                    }
+                )
+            stale_ids.extend(
+                known[0]
+                for rel, known in previous.items()
+                if rel not in pending.entries
+            )
+
+            conn = db.connection()
+            for start in range(0, len(stale_ids), _BULK_CHUNK_SIZE):
+                conn.execute(
+                    delete(table).where(
+                        table.c.id.in_(stale_ids[start : start + _BULK_CHUNK_SIZE])
+                    )
+                )
+            if new_rows:
+                conn.execute(insert(table), new_rows)
+            if code_updates:
+                conn.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("row_id"))
+                    .values(
+                        document_code=bindparam("code"),
+                        manifest_item_json=bindparam("item_json"),
+                    ),
+                    code_updates,
+                )
+
+            if state is None:
+                state = SourceIndexState(
+                    source_root=root,
+                    manifest_fingerprint=pending.manifest_fingerprint,
+                )
+            else:
+                state.manifest_fingerprint = pending.manifest_fingerprint
+                state.scanned_at = datetime.utcnow()
+            db.add(state)
+            db.commit()
+
+        app_logger.info(
+            "Source index recorded",
+            extra={
+                "source_root": root,
+                "inserted": len(new_rows),
+                "deleted": len(stale_ids),
+                "codes_updated": len(code_updates),
+            },
+        )
+
+
+def create_source_index(
+    db_manager: DatabaseManager, file_repo: Optional[FileRepository] = None
+) -> Optional[FileIndexRepository]:
+    """Factory do índice incremental; None se desabilitado nas configurações."""
+    if not settings.SOURCE_INDEX_ENABLED:
+        return None
+    return FileIndexRepository(db_manager, file_repo)
@@ -0,0 +1,351 @@
+"""
+Fila de jobs em segundo plano no próprio processo.
+Validações e organizações longas rodam fora da requisição HTTP: o cliente
+recebe o id do job e consulta estado, progresso e resultado, que ficam no
+SQLite (tabela BackgroundJob).
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.domain.entities import JobStatus, ProgressEvent
+from app.domain.models import BackgroundJob
+from app.infrastructure.database import DatabaseManager, db_manager
+from app.infrastructure.progress import ProgressStream
+
+
+class JobProgress:
+    """
+    Progresso de um job em execução.
+
+    `update` pode ser chamado a cada arquivo: a gravação no banco acontece no
+    máximo uma vez por intervalo, com uma única escrita em andamento por vez.
+    Também implementa IProgressReporter: os eventos dos casos de uso vão
+    para o banco e para `stream` (lido pelo endpoint SSE).
+
+    Com `cancel_requested`, o próximo evento interrompe o caso de uso: os
+    eventos chegam entre operações de arquivo, então nada que já esteja no
+    thread pool continua depois que o job termina como cancelado.
+    """
+
+    def __init__(self, db: DatabaseManager, job_id: str, interval_seconds: float):
+        self._db = db
+        self._job_id = job_id
+        self._interval = interval_seconds
+        self._last_write = float("-inf")
+        self._writing: Optional["asyncio.Future[None]"] = None
+        self._dirty = False
+        self.current = 0
+        self.total: Optional[int] = None
+        self.message: Optional[str] = None
+        self.stream = ProgressStream()
+        self.cancel_requested = False
+
+    def check_cancelled(self) -> None:
+        """
+        Raises:
+            asyncio.CancelledError: Se o cancelamento do job foi pedido
+        """
+        if self.cancel_requested:
+            raise asyncio.CancelledError()
+
+    def report(self, event: ProgressEvent) -> None:
+        """Recebe um evento do caso de uso (IProgressReporter)."""
+        self.check_cancelled()
+        self.stream.report(event)
+        self.update(current=event.current, total=event.total, message=event.stage)
+
+    def update(
+        self,
+        current: Optional[int] = None,
+        total: Optional[int] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Registra o progresso atual (gravado no banco com intervalo mínimo)."""
+        if current is not None:
+            self.current = current
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        self._dirty = True
+        if time.monotonic() - self._last_write >= self._interval:
+            self._write()
+
+    def _write(self) -> None:
+        if self._writing is not None and not self._writing.done():
+            return  # A escrita em andamento regrava ao terminar, se preciso
+        self._dirty = False
+        self._last_write = time.monotonic()
+        loop = asyncio.get_event_loop()
+        self._writing = loop.run_in_executor(None, self._write_sync, self._values())
+        self._writing.add_done_callback(self._after_write)
+
+    def _after_write(self, future: "asyncio.Future[None]") -> None:
+        if future.exception() is not None:
+            app_logger.warning(
+                "Failed to save job progress",
+                extra={"job_id": self._job_id, "error": str(future.exception())},
+            )
+        if self._dirty and time.monotonic() - self._last_write >= self._interval:
+            self._write()
+
+    def _values(self) -> Dict[str, Any]:
+        return {
+            "progress_current": self.current,
+            "progress_total": self.total,
+            "progress_message": self.message,
+        }
+
+    def _write_sync(self, values: Dict[str, Any]) -> None:
+        self._db.update_job(self._job_id, **values)
+
+    async def flush(self) -> Dict[str, Any]:
+        """Aguarda a escrita em andamento; retorna o progresso final."""
+        if self._writing is not None:
+            await asyncio.wait([self._writing])
+        self._dirty = False
+        return self._values()
+
+
+# Executa o job: recebe o progresso e retorna o resultado (serializável em JSON)
+JobRunner = Callable[[JobProgress], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue:
+    """
+    Executa jobs em segundo plano com concorrência limitada.
+
+    Até `max_concurrent_jobs` jobs rodam ao mesmo tempo; os demais aguardam
+    na fila. Assim várias submissões não disputam o thread pool (varredura
+    de diretórios, movimentação de arquivos, manifestos) ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        max_concurrent_jobs: int = 1,
+        progress_interval_seconds: float = 0.5,
+    ):
+        """
+        Args:
+            db: Banco onde estado, progresso e resultado são gravados
+            max_concurrent_jobs: Jobs executados simultaneamente
+            progress_interval_seconds: Intervalo mínimo entre gravações de progresso
+        """
+        self._db = db
+        self._max_concurrent = max(1, max_concurrent_jobs)
+        self._progress_interval = progress_interval_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: "Optional[asyncio.Queue[str]]" = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._pending: Dict[str, JobRunner] = {}
+        self._running: Dict[str, "asyncio.Task[None]"] = {}
+        self._progress: Dict[str, JobProgress] = {}
+        self._recovered = False
+
+    async def start(self) -> None:
+        """
+        Inicia os workers e marca como falhos os jobs que uma execução
+        anterior da aplicação deixou inacabados.
+        """
+        if not self._recovered:
+            self._recovered = True
+            loop = asyncio.get_event_loop()
+            interrupted = await loop.run_in_executor(
+                None,
+                self._db.fail_unfinished_jobs,
+                "Interrupted: the application stopped before the job finished",
+            )
+            if interrupted:
+                app_logger.warning(
+                    "Unfinished jobs marked as failed",
+                    extra={"jobs_count": interrupted},
+                )
+        self._ensure_workers()
+
+    async def shutdown(self) -> None:
+        """
+        Cancela os jobs em execução e na fila e encerra os workers.
+
+        Jobs em execução são interrompidos no ponto de espera atual, sem
+        aguardar o próximo evento de progresso.
+        """
+        for job_id in list(self._pending):
+            await self.cancel(job_id)
+        for task in list(self._running.values()):
+            task.cancel()
+            await asyncio.wait([task])
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._loop = None
+
+    async def submit(
+        self, kind: str, request: Dict[str, Any], runner: JobRunner
+    ) -> str:
+        """
+        Enfileira um job.
+
+        Args:
+            kind: Tipo do job (ex: "validate", "organize")
+            request: Parâmetros do job, gravados junto com ele
+            runner: Corrotina que executa o job
+
+        Returns:
+            ID do job
+        """
+        await self.start()
+        loop = asyncio.get_event_loop()
+        job_id = await loop.run_in_executor(
+            None, self._db.create_job, kind, json.dumps(request, default=str)
+        )
+        self._pending[job_id] = runner
+        self._progress[job_id] = JobProgress(self._db, job_id, self._progress_interval)
+        self._queue.put_nowait(job_id)
+        app_logger.info("Job queued", extra={"job_id": job_id, "kind": kind})
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[BackgroundJob]:
+        """Estado atual do job; None se não existir."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._db.get_job, job_id)
+
+    def progress_stream(self, job_id: str) -> Optional[ProgressStream]:
+        """Progresso ao vivo de um job na fila ou em execução; None se terminou."""
+        progress = self._progress.get(job_id)
+        return progress.stream if progress is not None else None
+
+    async def cancel(self, job_id: str) -> Optional[BackgroundJob]:
+        """
+        Cancela um job na fila ou em execução.
+
+        Um job na fila é cancelado na hora. Um job em execução passa a
+        `cancelling` e para no próximo evento de progresso (entre arquivos,
+        antes de gravar a sessão validada): o trabalho já em andamento no
+        thread pool termina antes de o job ficar `cancelled`. Se o job
+        terminar antes de chegar a esse ponto, o estado final é o dele. Jobs
+        já concluídos não mudam.
+
+        Returns:
+            Estado do job após o pedido de cancelamento; None se não existir
+        """
+        if self._pending.pop(job_id, None) is not None:
+            self._progress.pop(job_id).stream.close()
+            await self._finish(job_id, JobStatus.CANCELLED)
+        elif job_id in self._running and job_id in self._progress:
+            # Sem _progress, o job está terminando: o estado final vale
+            self._progress[job_id].cancel_requested = True
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._db.mark_job_cancelling, job_id)
+        return await self.get(job_id)
+
+    def _ensure_workers(self) -> None:
+        """Cria os workers no loop atual (de novo, se o loop anterior acabou)."""
+        loop = asyncio.get_event_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        for job_id in self._pending:
+            self._queue.put_nowait(job_id)
+        self._workers = [
+            asyncio.ensure_future(self._worker()) for _ in range(self._max_concurrent)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            runner = self._pending.pop(job_id, None)
+            if runner is None:
+                continue  # Cancelado enquanto aguardava na fila
+            task = asyncio.ensure_future(self._execute(job_id, runner))
+            self._running[job_id] = task
+            try:
+                # wait, e não await: o cancelamento do job não encerra o worker
+                await asyncio.wait([task])
+            finally:
+                self._running.pop(job_id, None)
+
+    async def _execute(self, job_id: str, runner: JobRunner) -> None:
+        loop = asyncio.get_event_loop()
+        progress = self._progress[job_id]
+        started = time.perf_counter()
+        try:
+            await loop.run_in_executor(
+                None,
+                lambda: self._db.update_job(
+                    job_id,
+                    status=JobStatus.RUNNING.value,
+                    started_at=datetime.utcnow(),
+                ),
+            )
+            app_logger.info("Job started", extra={"job_id": job_id})
+            progress.check_cancelled()
+            result = await runner(progress)
+        except asyncio.CancelledError:
+            await self._finish(job_id, JobStatus.CANCELLED, await progress.flush())
+        except Exception as e:
+            app_logger.error(
+                "Job failed",
+                extra={
+                    "job_id": job_id,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+                exc_info=True,
+            )
+            await self._finish(
+                job_id,
+                JobStatus.FAILED,
+                await progress.flush(),
+                error=f"{type(e).__name__}: {e}",
+            )
+        else:
+            await self._finish(
+                job_id,
+                JobStatus.SUCCEEDED,
+                await progress.flush(),
+                result_json=json.dumps(result, default=str),
+            )
+        finally:
+            self._progress.pop(job_id, None)
+            progress.stream.close()
+        app_logger.info(
+            "Job finished",
+            extra={
+                "job_id": job_id,
+                "seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+
+    async def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        progress: Optional[Dict[str, Any]] = None,
+        **values: Any,
+    ) -> None:
+        values.update(progress or {})
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            None,
+            lambda: self._db.update_job(
+                job_id, status=status.value, finished_at=datetime.utcnow(), **values
+            ),
+        )
+
+
+# Singleton global
+job_queue = JobQueue(
+    db_manager,
+    max_concurrent_jobs=settings.JOBS_MAX_CONCURRENT,
+    progress_interval_seconds=settings.JOBS_PROGRESS_INTERVAL_SECONDS,
+)
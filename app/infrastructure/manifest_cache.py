@@ -0,0 +1,250 @@
+"""
+Cache persistente de manifestos já parseados.
+Evita reabrir o .xlsx com openpyxl quando o manifesto não mudou entre validações.
+"""
+
+import asyncio
+import datetime as dt
+import hashlib
+import json
+import zlib
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+from app.core.config import settings
+from app.core.interfaces import IManifestRepository
+from app.core.logger import app_logger
+from app.domain.entities import ManifestItem
+from app.domain.exceptions import ManifestReadError
+from app.infrastructure.disk_cache import ChunkedDiskCache, file_content_hash
+from app.infrastructure.repositories import ManifestRepository
+
+# Incrementar quando o parser do manifesto mudar, invalidando o cache existente
+MANIFEST_PARSER_VERSION = 1
+
+
+def _encode_value(value: Any) -> Any:
+    """Serializa valores de célula que o JSON não suporta nativamente."""
+    if isinstance(value, dt.datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, dt.date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, dt.time):
+        return {"$t": value.isoformat()}
+    if isinstance(value, dt.timedelta):
+        return {"$td": value.total_seconds()}
+    return str(value)
+
+
+def _decode_value(obj: dict) -> Any:
+    """Reconstrói os valores serializados por _encode_value."""
+    if len(obj) == 1:
+        if "$dt" in obj:
+            return dt.datetime.fromisoformat(obj["$dt"])
+        if "$d" in obj:
+            return dt.date.fromisoformat(obj["$d"])
+        if "$t" in obj:
+            return dt.time.fromisoformat(obj["$t"])
+        if "$td" in obj:
+            return dt.timedelta(seconds=obj["$td"])
+    return obj
+
+
+def encode_metadata(metadata: Dict[str, Any]) -> str:
+    """Serializa os metadados de um item (datas em ISO, reconstruídas por decode_metadata)."""
+    return json.dumps(metadata, ensure_ascii=False, default=_encode_value)
+
+
+def decode_metadata(payload: str) -> Dict[str, Any]:
+    """Reconstrói os metadados serializados por encode_metadata."""
+    return json.loads(payload, object_hook=_decode_value)
+
+
+def encode_manifest_item(item: ManifestItem) -> str:
+    """Serializa um item do manifesto (reconstruído por decode_manifest_item)."""
+    return json.dumps(
+        [item.document_code, item.revision, item.title, item.metadata],
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_encode_value,
+    )
+
+
+def decode_manifest_item(payload: str) -> ManifestItem:
+    """Reconstrói um item serializado por encode_manifest_item."""
+    code, revision, title, metadata = json.loads(payload, object_hook=_decode_value)
+    return ManifestItem(code, revision, title, metadata)
+
+
+def encode_manifest_chunk(items: List[ManifestItem]) -> bytes:
+    """Serializa um chunk de itens em JSON compacto comprimido."""
+    rows = [
+        [item.document_code, item.revision, item.title, item.metadata] for item in items
+    ]
+    payload = json.dumps(
+        rows, ensure_ascii=False, separators=(",", ":"), default=_encode_value
+    )
+    return zlib.compress(payload.encode("utf-8"), 1)
+
+
+def decode_manifest_chunk(payload: bytes) -> List[ManifestItem]:
+    """Reconstrói os itens de um chunk serializado por encode_manifest_chunk."""
+    rows = json.loads(zlib.decompress(payload), object_hook=_decode_value)
+    return [
+        ManifestItem(document_code=code, revision=rev, title=title, metadata=metadata)
+        for code, rev, title, metadata in rows
+    ]
+
+
+class CachedManifestRepository(IManifestRepository):
+    """
+    Decorator de IManifestRepository com cache em disco.
+
+    A chave combina caminho, tamanho, mtime e hash do conteúdo do arquivo.
+    Em um acerto, os itens são lidos do cache sem abrir o openpyxl.
+    """
+
+    def __init__(
+        self,
+        inner: IManifestRepository,
+        cache: ChunkedDiskCache,
+        chunk_size: int = ManifestRepository.STREAM_CHUNK_SIZE,
+    ):
+        self._inner = inner
+        self._cache = cache
+        self._chunk_size = chunk_size
+
+    async def load_from_file(self, file_path: Path) -> List[ManifestItem]:
+        """Carrega todos os itens do manifesto, usando o cache quando possível."""
+        return [item async for item in self.iter_items(file_path)]
+
+    async def iter_items(self, file_path: Path) -> AsyncIterator[ManifestItem]:
+        """Lê o manifesto em streaming, a partir do cache ou do arquivo original."""
+        if not file_path.exists():
+            app_logger.error(
+                "Manifest file not found", extra={"file_path": str(file_path)}
+            )
+            raise ManifestReadError(f"Manifest file not found: {file_path}")
+
+        loop = asyncio.get_event_loop()
+        key = await loop.run_in_executor(None, self._cache_key, file_path)
+        try:
+            entry = await loop.run_in_executor(None, self._cache.get_entry, key)
+        except Exception as e:
+            # Falha no cache nunca deve quebrar a validação
+            app_logger.warning(
+                "Failed to read manifest cache, reading manifest directly",
+                extra={"file_path": str(file_path), "error": str(e)},
+            )
+            entry = None
+
+        # Itens já entregues a partir do cache antes de uma falha de leitura
+        served = 0
+        if entry is not None:
+            app_logger.info(
+                "Manifest cache hit",
+                extra={
+                    "file_path": str(file_path),
+                    "items_count": entry.meta.get("items"),
+                },
+            )
+            for seq in range(entry.chunk_count):
+                try:
+                    items = await loop.run_in_executor(None, self._read_chunk, key, seq)
+                except Exception as e:
+                    app_logger.warning(
+                        "Failed to read manifest cache, reading manifest directly",
+                        extra={
+                            "file_path": str(file_path),
+                            "served_items": served,
+                            "error": str(e),
+                        },
+                    )
+                    break
+                for item in items:
+                    served += 1
+                    yield item
+            else:
+                return
+
+        # Cache miss: lê do repositório original e grava os chunks ao final.
+        # Os chunks comprimidos são bem menores que os itens em memória.
+        chunks: List[bytes] = []
+        pending: List[ManifestItem] = []
+        items_count = 0
+        # Após uma falha no cache, o arquivo (mesma chave, mesmo conteúdo) é
+        # relido do início e os itens já entregues são pulados.
+        async for item in self._inner.iter_items(file_path):
+            pending.append(item)
+            items_count += 1
+            if len(pending) >= self._chunk_size:
+                chunks.append(encode_manifest_chunk(pending))
+                pending = []
+            if items_count > served:
+                yield item
+        if pending:
+            chunks.append(encode_manifest_chunk(pending))
+
+        try:
+            await loop.run_in_executor(
+                None,
+                lambda: self._cache.put(
+                    key,
+                    source=str(file_path.resolve()),
+                    chunks=chunks,
+                    meta={"items": items_count, "parser": MANIFEST_PARSER_VERSION},
+                ),
+            )
+            app_logger.info(
+                "Manifest cached",
+                extra={"file_path": str(file_path), "items_count": items_count},
+            )
+        except Exception as e:
+            # Falha no cache nunca deve quebrar a validação
+            app_logger.warning(
+                "Failed to store manifest in cache",
+                extra={"file_path": str(file_path), "error": str(e)},
+            )
+
+    def _read_chunk(self, key: str, seq: int) -> List[ManifestItem]:
+        """Lê e decodifica um chunk do cache."""
+        payload = self._cache.read_chunk(key, seq)
+        if payload is None:
+            raise ManifestReadError(f"Manifest cache chunk {seq} is missing")
+        return decode_manifest_chunk(payload)
+
+    def _cache_key(self, file_path: Path) -> str:
+        """Monta a chave de cache: caminho + tamanho + mtime + hash do conteúdo."""
+        stat = file_path.stat()
+        parts = [
+            str(file_path.resolve()),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            file_content_hash(file_path),
+            str(MANIFEST_PARSER_VERSION),
+        ]
+        return hashlib.blake2b(
+            "|".join(parts).encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+
+def create_manifest_repository() -> IManifestRepository:
+    """Factory do repositório de manifesto, com cache em disco se habilitado."""
+    repository = ManifestRepository()
+    if not settings.MANIFEST_CACHE_ENABLED:
+        return repository
+
+    try:
+        cache = ChunkedDiskCache(
+            settings.get_manifest_cache_path(),
+            max_bytes=settings.MANIFEST_CACHE_MAX_BYTES,
+            max_entries=settings.MANIFEST_CACHE_MAX_ENTRIES,
+        )
+    except Exception as e:
+        app_logger.warning(
+            "Manifest cache unavailable, reading manifests directly",
+            extra={"error": str(e)},
+        )
+        return repository
+
+    return CachedManifestRepository(repository, cache)
@@ -0,0 +1,58 @@
+"""
+Distribuição do progresso dos casos de uso para a API (SSE) e a interface.
+Os casos de uso podem reportar a cada arquivo; os consumidores leem só o
+evento mais recente, no próprio ritmo, sem fila acumulando eventos.
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+from app.domain.entities import ProgressEvent
+
+
+class ProgressStream:
+    """
+    Último ProgressEvent de uma execução (implementa IProgressReporter).
+
+    `report` só guarda o evento e acorda quem espera: o custo por arquivo
+    não depende de quantos consumidores existem nem da velocidade deles.
+    """
+
+    def __init__(self):
+        self.latest: Optional[ProgressEvent] = None
+        self.version = 0  # Incrementa a cada evento recebido
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    def report(self, event: ProgressEvent) -> None:
+        self.latest = event
+        self.version += 1
+        self._changed.set()
+
+    def close(self) -> None:
+        """Encerra os consumidores (execução terminou, com ou sem finished)."""
+        self.closed = True
+        self._changed.set()
+
+    async def updates(self, interval_seconds: float) -> AsyncIterator[ProgressEvent]:
+        """
+        Entrega o evento mais recente, no máximo um a cada `interval_seconds`.
+
+        Eventos intermediários são descartados; o último sempre é entregue.
+        Termina só quando o stream é fechado: o evento finished do caso de uso
+        pode chegar antes do fim da execução (ex: gravação da sessão).
+        """
+        seen = 0
+        while True:
+            if self.version == seen:
+                if self.closed:
+                    return
+                # Um Event já disparado é trocado, não limpo: consumidores
+                # esperando nele já foram acordados
+                if self._changed.is_set():
+                    self._changed = asyncio.Event()
+                await self._changed.wait()
+                continue
+            seen = self.version
+            yield self.latest
+            await asyncio.sleep(interval_seconds)
@@ -4,14 +4,26 @@ Implementa padrão Repository com I/O não bloqueante.
 """
 
 import asyncio
+import errno
 import os
+import threading
 from pathlib import Path
-from typing import List
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import aiofiles
 import openpyxl
 from openpyxl.worksheet.worksheet import Worksheet
 
+from app.core.config import settings
 from app.core.interfaces import IFileRepository, IFileSystemManager, IManifestRepository
 from app.core.logger import app_logger
 from app.domain.entities import DocumentFile, ManifestItem
@@ -22,11 +34,29 @@ from app.domain.exceptions import (
     ManifestReadError,
     SourceDirectoryNotFoundError,
 )
+from app.infrastructure.file_copy import (
+    copy_file,
+    move_across_devices,
+    zero_copy_available,
+)
+from app.infrastructure.scanner import ParallelDirectoryScanner, ScannedEntry
 
 
 class ManifestRepository(IManifestRepository):
     """Repositório para leitura de manifestos Excel de forma assíncrona."""
 
+    # Palavras-chave para identificar colunas (lower case)
+    HEADER_KEYWORDS = {
+        "document_code": ["documento", "código", "codigo", "code", "doc"],
+        "revision": ["revisão", "revisao", "rev", "revision"],
+        "title": ["título", "titulo", "title", "descrição", "descricao"],
+    }
+
+    # Quantidade de itens entregues por vez ao consumidor do streaming
+    STREAM_CHUNK_SIZE = 1000
+    # Quantos chunks podem ficar prontos aguardando consumo (backpressure)
+    STREAM_MAX_PENDING_CHUNKS = 4
+
     async def load_from_file(self, file_path: Path) -> List[ManifestItem]:
         """
         Carrega itens do manifesto de um arquivo Excel.
@@ -41,11 +71,7 @@ class ManifestRepository(IManifestRepository):
             ManifestReadError: Se o arquivo não existir ou houver erro de leitura
             ManifestParseError: Se houver erro ao parsear os dados
         """
-        if not file_path.exists():
-            app_logger.error(
-                "Manifest file not found", extra={"file_path": str(file_path)}
-            )
-            raise ManifestReadError(f"Manifest file not found: {file_path}")
+        self._ensure_exists(file_path)
 
         try:
             # openpyxl não é nativo async, então rodamos em executor
@@ -67,10 +93,101 @@ class ManifestRepository(IManifestRepository):
             )
             raise ManifestParseError(f"Error parsing manifest: {e}")
 
+    async def iter_items(
+        self, file_path: Path, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[ManifestItem]:
+        """
+        Lê o manifesto em streaming, entregando os itens à medida que são lidos.
+
+        A leitura roda em thread pool e envia chunks de itens por uma fila limitada,
+        de modo que a memória não cresce com o tamanho do manifesto e o consumidor
+        pode começar a trabalhar antes da última linha ser lida.
+
+        Args:
+            file_path: Caminho para o arquivo Excel do manifesto
+            chunk_size: Quantidade de itens por chunk (padrão: STREAM_CHUNK_SIZE)
+
+        Yields:
+            Itens do manifesto, na ordem das linhas da planilha
+
+        Raises:
+            ManifestReadError: Se o arquivo não existir
+            ManifestParseError: Se houver erro ao parsear os dados
+        """
+        self._ensure_exists(file_path)
+
+        chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        loop = asyncio.get_event_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.STREAM_MAX_PENDING_CHUNKS)
+        stop_event = threading.Event()
+
+        def _put(message) -> None:
+            # Bloqueia a thread leitora enquanto a fila estiver cheia
+            asyncio.run_coroutine_threadsafe(queue.put(message), loop).result()
+
+        def _produce() -> None:
+            chunk: List[ManifestItem] = []
+            try:
+                for item in self._iter_excel_sync(file_path):
+                    if stop_event.is_set():
+                        return
+                    chunk.append(item)
+                    if len(chunk) >= chunk_size:
+                        _put(chunk)
+                        chunk = []
+                if chunk and not stop_event.is_set():
+                    _put(chunk)
+            except Exception as e:
+                if not stop_event.is_set():
+                    _put(e)
+                return
+            if not stop_event.is_set():
+                _put(None)  # Sentinela de fim de leitura
+
+        producer = loop.run_in_executor(None, _produce)
+        items_count = 0
+
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                if isinstance(message, Exception):
+                    raise message
+                items_count += len(message)
+                for item in message:
+                    yield item
+
+            app_logger.info(
+                "Manifest streamed successfully",
+                extra={"file_path": str(file_path), "items_count": items_count},
+            )
+
+        except Exception as e:
+            app_logger.error(
+                "Error parsing manifest",
+                extra={"file_path": str(file_path), "error": str(e)},
+            )
+            raise ManifestParseError(f"Error parsing manifest: {e}")
+
+        finally:
+            # Consumidor encerrou (fim, erro ou abandono): libera a thread leitora
+            stop_event.set()
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.shield(producer)
+
+    def _ensure_exists(self, file_path: Path) -> None:
+        """Garante que o arquivo de manifesto exista antes da leitura."""
+        if not file_path.exists():
+            app_logger.error(
+                "Manifest file not found", extra={"file_path": str(file_path)}
+            )
+            raise ManifestReadError(f"Manifest file not found: {file_path}")
+
     def _read_excel_sync(self, file_path: Path) -> List[ManifestItem]:
         """
         Leitura síncrona do Excel (executada em thread pool).
-        Suporta formato dinâmico detectando cabeçalho.
 
         Args:
             file_path: Caminho do arquivo Excel
@@ -78,28 +195,64 @@ class ManifestRepository(IManifestRepository):
         Returns:
             Lista de itens do manifesto
         """
+        return list(self._iter_excel_sync(file_path))
+
+    def _iter_excel_sync(self, file_path: Path) -> Iterator[ManifestItem]:
+        """
+        Leitura síncrona e incremental do Excel (executada em thread pool).
+        Suporta formato dinâmico detectando cabeçalho.
+
+        Args:
+            file_path: Caminho do arquivo Excel
+
+        Yields:
+            Itens do manifesto, linha a linha
+        """
         workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-        sheet: Worksheet = workbook.active
+        try:
+            sheet: Worksheet = workbook.active
+            header_row_idx, col_map = self._detect_header(sheet)
+
+            # Obter lista de cabeçalhos para metadados
+            # Precisamos ler a linha de cabeçalho novamente para ter os nomes originais
+            header_cells = []
+            for row in sheet.iter_rows(
+                min_row=header_row_idx, max_row=header_row_idx, values_only=True
+            ):
+                header_cells = [
+                    str(cell).strip() if cell else f"Column_{i}"
+                    for i, cell in enumerate(row)
+                ]
+                break
+
+            # 2. Ler dados
+            for row in sheet.iter_rows(min_row=header_row_idx + 1, values_only=True):
+                item = self._parse_row(row, col_map, header_cells)
+                if item is not None:
+                    yield item
+        finally:
+            workbook.close()
+
+    def _detect_header(self, sheet: Worksheet) -> Tuple[int, Dict[str, int]]:
+        """
+        Detecta a linha de cabeçalho e o mapa de colunas principais.
 
-        items: List[ManifestItem] = []
+        Args:
+            sheet: Planilha ativa do manifesto
 
+        Returns:
+            Tupla (índice 1-based da linha de cabeçalho, mapa campo -> índice da coluna)
+        """
         # Configurações de detecção
         MAX_HEADER_SCAN = 20
         header_row_idx = 0
 
         # Mapa de colunas (nome -> índice)
-        col_map = {}
-
-        # Palavras-chave para identificar colunas (lower case)
-        KEYWORDS = {
-            "document_code": ["documento", "código", "codigo", "code", "doc"],
-            "revision": ["revisão", "revisao", "rev", "revision"],
-            "title": ["título", "titulo", "title", "descrição", "descricao"],
-        }
+        col_map: Dict[str, int] = {}
 
         # 1. Detectar linha de cabeçalho (Melhor Match)
         best_header_row = 0
-        best_col_map = {}
+        best_col_map: Dict[str, int] = {}
         max_matches = 0
 
         for i, row in enumerate(
@@ -109,7 +262,7 @@ class ManifestRepository(IManifestRepository):
 
             # Tenta encontrar colunas obrigatórias
             found_cols = {}
-            for target_field, keywords in KEYWORDS.items():
+            for target_field, keywords in self.HEADER_KEYWORDS.items():
                 for idx, cell_res in enumerate(row_values):
                     if any(k == cell_res or k in cell_res for k in keywords):
                         # Evitar sobrescrever se já encontrou match exato/melhor
@@ -146,103 +299,93 @@ class ManifestRepository(IManifestRepository):
                 "Header not detected dynamically, using legacy fallback (A=Code, B=Rev, C=Title)"
             )
 
-        # Obter lista de cabeçalhos para metadados
-        # Precisamos ler a linha de cabeçalho novamente para ter os nomes originais
-        header_cells = []
-        for row in sheet.iter_rows(
-            min_row=header_row_idx, max_row=header_row_idx, values_only=True
-        ):
-            header_cells = [
-                str(cell).strip() if cell else f"Column_{i}"
-                for i, cell in enumerate(row)
-            ]
-            break
-
-        # 2. Ler dados
-        for row in sheet.iter_rows(min_row=header_row_idx + 1, values_only=True):
-            # Ignora linhas totalmente vazias
-            if not any(row):
-                continue
-
-            # Extrair campos principais usando o mapa
-            try:
-                # Code
-                idx_code = col_map.get("document_code")
-                raw_code = (
-                    row[idx_code]
-                    if idx_code is not None and idx_code < len(row)
-                    else None
-                )
-                document_code = str(raw_code).strip() if raw_code else ""
-
-                # Ignora se não tiver código (linha inválida ou de formatação)
-                if not document_code or len(document_code) < 3:
-                    continue
-
-                # Validar se é um código real (ex: ignorar linhas que repetem cabeçalho ou são notas)
-                # Heurística simples: não deve ser igual ao nome da coluna
-                # E também não deve ser igual keywords de outras colunas (ex: "Revisão")
-                is_header_repeat = False
-                doc_lower = document_code.lower()
-                for k_list in KEYWORDS.values():
-                    if doc_lower in k_list:
-                        is_header_repeat = True
-                        break
-
-                if is_header_repeat:
-                    continue
-
-                # Revision
-                idx_rev = col_map.get("revision")
-                raw_rev = (
-                    row[idx_rev] if idx_rev is not None and idx_rev < len(row) else None
-                )
-                revision = str(raw_rev).strip() if raw_rev else "0"
-
-                # Title
-                idx_title = col_map.get("title")
-                raw_title = (
-                    row[idx_title]
-                    if idx_title is not None and idx_title < len(row)
-                    else None
-                )
-                title = str(raw_title).strip() if raw_title else ""
-
-                # Metadata: tudo que não é coluna principal mapeada
-                metadata = {}
-                main_indices = set(col_map.values())
-                for i, val in enumerate(row):
-                    if (
-                        i not in main_indices
-                        and i < len(header_cells)
-                        and val is not None
-                    ):
-                        metadata[header_cells[i]] = val
-
-                items.append(
-                    ManifestItem(
-                        document_code=document_code,
-                        revision=revision,
-                        title=title,
-                        metadata=metadata,
-                    )
-                )
+        return header_row_idx, col_map
 
-            except Exception as e:
-                # Logar e continuar (best effort)
-                app_logger.warning(
-                    f"Error parsing row in manifest: {e}",
-                    extra={"row_content": str(row)[:100]},
-                )
-                continue
+    def _parse_row(
+        self, row: tuple, col_map: Dict[str, int], header_cells: List[str]
+    ) -> Optional[ManifestItem]:
+        """
+        Converte uma linha de dados em ManifestItem.
+
+        Returns:
+            O item do manifesto, ou None se a linha deve ser ignorada
+        """
+        # Ignora linhas totalmente vazias
+        if not any(row):
+            return None
+
+        # Extrair campos principais usando o mapa
+        try:
+            # Code
+            idx_code = col_map.get("document_code")
+            raw_code = (
+                row[idx_code] if idx_code is not None and idx_code < len(row) else None
+            )
+            document_code = str(raw_code).strip() if raw_code else ""
+
+            # Ignora se não tiver código (linha inválida ou de formatação)
+            if not document_code or len(document_code) < 3:
+                return None
+
+            # Validar se é um código real (ex: ignorar linhas que repetem cabeçalho ou são notas)
+            # Heurística simples: não deve ser igual ao nome da coluna
+            # E também não deve ser igual keywords de outras colunas (ex: "Revisão")
+            doc_lower = document_code.lower()
+            for k_list in self.HEADER_KEYWORDS.values():
+                if doc_lower in k_list:
+                    return None
+
+            # Revision
+            idx_rev = col_map.get("revision")
+            raw_rev = (
+                row[idx_rev] if idx_rev is not None and idx_rev < len(row) else None
+            )
+            revision = str(raw_rev).strip() if raw_rev else "0"
+
+            # Title
+            idx_title = col_map.get("title")
+            raw_title = (
+                row[idx_title]
+                if idx_title is not None and idx_title < len(row)
+                else None
+            )
+            title = str(raw_title).strip() if raw_title else ""
+
+            # Metadata: tudo que não é coluna principal mapeada
+            metadata = {}
+            main_indices = set(col_map.values())
+            for i, val in enumerate(row):
+                if i not in main_indices and i < len(header_cells) and val is not None:
+                    metadata[header_cells[i]] = val
+
+            return ManifestItem(
+                document_code=document_code,
+                revision=revision,
+                title=title,
+                metadata=metadata,
+            )
 
-        workbook.close()
-        return items
+        except Exception as e:
+            # Logar e continuar (best effort)
+            app_logger.warning(
+                f"Error parsing row in manifest: {e}",
+                extra={"row_content": str(row)[:100]},
+            )
+            return None
 
 
 class FileRepository(IFileRepository):
     """Repositório para operações com arquivos do sistema de forma assíncrona."""
 
+    def __init__(self, scanner: Optional[ParallelDirectoryScanner] = None):
+        """
+        Args:
+            scanner: Scanner de diretórios (padrão: paralelo com FILE_SCAN_WORKERS)
+        """
+        self._scanner = scanner or ParallelDirectoryScanner(
+            max_workers=settings.FILE_SCAN_WORKERS
+        )
+
     async def list_files(self, directory: Path) -> List[DocumentFile]:
         """
         Lista todos os arquivos em um diretório recursivamente.
@@ -257,6 +400,21 @@ class FileRepository(IFileRepository):
             SourceDirectoryNotFoundError: Se o diretório não existir
             FileReadError: Se houver erro ao ler os arquivos
         """
+        return await self._run_scan(directory, self._list_files_sync)
+
+    async def scan_entries(self, directory: Path) -> List[ScannedEntry]:
+        """
+        Varre um diretório recursivamente retornando os dados de stat de cada arquivo
+        (tamanho, mtime e inode), usados pelo índice incremental.
+
+        Raises:
+            SourceDirectoryNotFoundError: Se o diretório não existir
+            FileReadError: Se houver erro ao ler os arquivos
+        """
+        return await self._run_scan(directory, self._scanner.scan)
+
+    async def _run_scan(self, directory: Path, scan_fn: Callable[[Path], list]) -> list:
+        """Valida o diretório e executa a varredura em thread pool."""
         if not directory.exists():
             app_logger.error(
                 "Source directory not found", extra={"directory": str(directory)}
@@ -270,7 +428,7 @@ class FileRepository(IFileRepository):
         try:
             # Listagem de arquivos em thread pool (operação I/O)
             loop = asyncio.get_event_loop()
-            files = await loop.run_in_executor(None, self._list_files_sync, directory)
+            files = await loop.run_in_executor(None, scan_fn, directory)
 
             app_logger.info(
                 "Files listed successfully",
@@ -297,27 +455,38 @@ class FileRepository(IFileRepository):
         Returns:
             Lista de DocumentFile
         """
-        found_files: List[DocumentFile] = []
-
-        # .rglob('*') busca recursivamente por todos os arquivos
-        for path in directory.rglob("*"):
-            if path.is_file():
-                try:
-                    size_bytes = path.stat().st_size
-                    found_files.append(DocumentFile(path=path, size_bytes=size_bytes))
-                except OSError as e:
-                    app_logger.warning(
-                        "Could not read file stats",
-                        extra={"file": str(path), "error": str(e)},
-                    )
-                    continue
-
-        return found_files
+        # Varredura paralela com os.scandir: um único stat por arquivo
+        return [
+            DocumentFile(path=entry.path, size_bytes=entry.size_bytes)
+            for entry in self._scanner.scan(directory)
+        ]
 
 
 class FileSystemManager(IFileSystemManager):
     """Gerenciador de operações do sistema de arquivos de forma assíncrona."""
 
+    def __init__(
+        self,
+        copy_buffer_size: Optional[int] = None,
+        verify_checksum: Optional[bool] = None,
+    ) -> None:
+        """
+        Args:
+            copy_buffer_size: Bytes por chamada na cópia entre volumes
+                (padrão: settings.MOVE_COPY_BUFFER_BYTES)
+            verify_checksum: Compara o hash do conteúdo após a cópia entre
+                volumes (padrão: settings.MOVE_VERIFY_CHECKSUM)
+        """
+        self._copy_buffer_size = copy_buffer_size or settings.MOVE_COPY_BUFFER_BYTES
+        self._verify_checksum = (
+            settings.MOVE_VERIFY_CHECKSUM
+            if verify_checksum is None
+            else verify_checksum
+        )
+        # Diretórios já criados por esta instância: movimentações para eles
+        # dispensam o mkdir (um por arquivo, no comportamento anterior)
+        self._known_dirs: Set[Path] = set()
+
     async def create_directory(self, path: Path) -> None:
         """
         Cria um diretório e todos os pais necessários.
@@ -330,9 +499,7 @@ class FileSystemManager(IFileSystemManager):
         """
         try:
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, lambda: path.mkdir(parents=True, exist_ok=True)
-            )
+            await loop.run_in_executor(None, self._ensure_directory, path)
 
             app_logger.debug("Directory created", extra={"directory": str(path)})
 
@@ -347,6 +514,11 @@ class FileSystemManager(IFileSystemManager):
         """
         Move um arquivo de origem para destino.
 
+        O diretório de destino é criado se necessário; a criação e a
+        renomeação acontecem em uma única passagem pelo thread pool. Se origem
+        e destino estiverem em volumes diferentes (EXDEV), o arquivo é copiado,
+        sincronizado e verificado antes de a origem ser removida.
+
         Args:
             source: Caminho do arquivo de origem
             destination: Caminho de destino
@@ -355,12 +527,8 @@ class FileSystemManager(IFileSystemManager):
             FileOperationError: Se houver erro ao mover o arquivo
         """
         try:
-            # Garante que o diretório de destino exista
-            await self.create_directory(destination.parent)
-
-            # Move o arquivo em thread pool
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, source.rename, destination)
+            await loop.run_in_executor(None, self._move_sync, source, destination)
 
             app_logger.debug(
                 "File moved",
@@ -378,9 +546,48 @@ class FileSystemManager(IFileSystemManager):
             )
             raise FileOperationError(f"Failed to move {source} to {destination}: {e}")
 
+    def _ensure_directory(self, path: Path) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        self._known_dirs.add(path)
+
+    def _move_sync(self, source: Path, destination: Path) -> None:
+        parent = destination.parent
+        if parent not in self._known_dirs:
+            self._ensure_directory(parent)
+            self._relocate(source, destination)
+            return
+        try:
+            self._relocate(source, destination)
+        except FileNotFoundError:
+            # O diretório pode ter sido removido por fora: recria e tenta de novo
+            self._known_dirs.discard(parent)
+            self._ensure_directory(parent)
+            self._relocate(source, destination)
+
+    def _relocate(self, source: Path, destination: Path) -> None:
+        try:
+            source.rename(destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            copied = move_across_devices(
+                source,
+                destination,
+                buffer_size=self._copy_buffer_size,
+                verify_checksum=self._verify_checksum,
+            )
+            app_logger.debug(
+                "File copied across devices",
+                extra={"destination": str(destination), "bytes": copied},
+            )
+
     async def copy_file(self, source: Path, destination: Path) -> None:
         """
-        Copia um arquivo usando aiofiles para I/O assíncrono.
+        Copia um arquivo.
+
+        Com cópia pelo kernel disponível (reflink, copy_file_range ou
+        sendfile), a criação do diretório e a cópia inteira acontecem em uma
+        única passagem pelo thread pool; caso contrário, copia com aiofiles.
 
         Args:
             source: Caminho do arquivo de origem
@@ -390,18 +597,22 @@ class FileSystemManager(IFileSystemManager):
             FileOperationError: Se houver erro ao copiar o arquivo
         """
         try:
-            # Garante que o diretório de destino exista
-            await self.create_directory(destination.parent)
-
-            # Copia arquivo de forma assíncrona
-            async with aiofiles.open(source, "rb") as src:
-                async with aiofiles.open(destination, "wb") as dst:
-                    while chunk := await src.read(1024 * 1024):  # 1MB chunks
-                        await dst.write(chunk)
+            if zero_copy_available():
+                loop = asyncio.get_event_loop()
+                copied, strategy = await loop.run_in_executor(
+                    None, self._copy_sync, source, destination
+                )
+            else:
+                copied, strategy = await self._copy_with_aiofiles(source, destination)
 
             app_logger.debug(
                 "File copied",
-                extra={"source": str(source), "destination": str(destination)},
+                extra={
+                    "source": str(source),
+                    "destination": str(destination),
+                    "bytes": copied,
+                    "strategy": strategy,
+                },
             )
 
         except Exception as e:
@@ -415,6 +626,31 @@ class FileSystemManager(IFileSystemManager):
             )
             raise FileOperationError(f"Failed to copy {source} to {destination}: {e}")
 
+    def _copy_sync(self, source: Path, destination: Path) -> Tuple[int, str]:
+        parent = destination.parent
+        if parent in self._known_dirs:
+            try:
+                return copy_file(source, destination, self._copy_buffer_size)
+            except FileNotFoundError:
+                # Diretório removido por fora (ou origem ausente: falha de novo)
+                self._known_dirs.discard(parent)
+        self._ensure_directory(parent)
+        return copy_file(source, destination, self._copy_buffer_size)
+
+    async def _copy_with_aiofiles(
+        self, source: Path, destination: Path
+    ) -> Tuple[int, str]:
+        # Garante que o diretório de destino exista
+        await self.create_directory(destination.parent)
+
+        copied = 0
+        async with aiofiles.open(source, "rb") as src:
+            async with aiofiles.open(destination, "wb") as dst:
+                while chunk := await src.read(1024 * 1024):  # 1MB chunks
+                    await dst.write(chunk)
+                    copied += len(chunk)
+        return copied, "aiofiles"
+
     async def rename_file(self, source: Path, new_name: str) -> Path:
         """
         Renomeia um arquivo de forma segura, resolvendo conflitos de nome.
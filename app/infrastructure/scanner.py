@@ -0,0 +1,112 @@
+"""
+Varredura paralela de diretórios baseada em os.scandir.
+Aproveita o cache de tipo/inode do DirEntry para reduzir chamadas de sistema
+por arquivo, processando subárvores em um pool de threads limitado.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+from app.core.logger import app_logger
+
+
+class ScannedEntry(NamedTuple):
+    """Arquivo encontrado na varredura, com os dados de stat já coletados."""
+
+    path: Path
+    size_bytes: int
+    mtime_ns: int
+    inode: int
+
+
+def _scan_directory(directory: Path) -> Tuple[List[ScannedEntry], List[Path]]:
+    """
+    Lista um único diretório (sem recursão).
+
+    Returns:
+        Tupla (arquivos encontrados, subdiretórios a visitar)
+    """
+    files: List[ScannedEntry] = []
+    subdirs: List[Path] = []
+
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    # Mesma semântica do rglob: não segue links para diretórios,
+                    # mas aceita links que apontam para arquivos. O Path filho é
+                    # montado a partir do pai já parseado, mais barato que
+                    # reparsear a string completa de entry.path.
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(directory / entry.name)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files.append(
+                            ScannedEntry(
+                                path=directory / entry.name,
+                                size_bytes=stat.st_size,
+                                mtime_ns=stat.st_mtime_ns,
+                                inode=entry.inode(),
+                            )
+                        )
+                except OSError as e:
+                    app_logger.warning(
+                        "Could not read file stats",
+                        extra={"file": entry.path, "error": str(e)},
+                    )
+    except PermissionError as e:
+        # rglob também ignora diretórios sem permissão de leitura
+        app_logger.warning(
+            "Directory not readable, skipping",
+            extra={"directory": str(directory), "error": str(e)},
+        )
+
+    return files, subdirs
+
+
+class ParallelDirectoryScanner:
+    """Varre uma árvore de diretórios distribuindo subárvores entre threads."""
+
+    def __init__(self, max_workers: int = 8):
+        self._max_workers = max(1, max_workers)
+
+    def scan(self, root: Path) -> List[ScannedEntry]:
+        """
+        Varre recursivamente `root` e retorna todos os arquivos encontrados.
+
+        Args:
+            root: Diretório raiz da varredura
+
+        Returns:
+            Lista de ScannedEntry (ordem não garantida entre diretórios)
+        """
+        if self._max_workers == 1:
+            return self._scan_sequential(root)
+
+        results: List[ScannedEntry] = []
+        with ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="dir-scan"
+        ) as pool:
+            pending: Dict[Future, Path] = {pool.submit(_scan_directory, root): root}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    files, subdirs = future.result()
+                    results.extend(files)
+                    for subdir in subdirs:
+                        pending[pool.submit(_scan_directory, subdir)] = subdir
+
+        return results
+
+    def _scan_sequential(self, root: Path) -> List[ScannedEntry]:
+        """Varredura em profundidade na thread atual (sem pool)."""
+        results: List[ScannedEntry] = []
+        stack = [root]
+        while stack:
+            files, subdirs = _scan_directory(stack.pop())
+            results.extend(files)
+            stack.extend(subdirs)
+        return results
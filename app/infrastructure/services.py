@@ -2,11 +2,24 @@
 Serviços de domínio da infraestrutura.
 """
 
+import heapq
 import math
-from typing import List
+from itertools import count
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Tuple
 
+from app.core.config import settings
 from app.core.interfaces import ILotBalancerService
-from app.domain.entities import DocumentGroup, OutputLot
+from app.core.logger import app_logger
+from app.domain.entities import DocumentGroup, LotPackingReport, OutputLot
+from app.domain.exceptions import OrganizationError
+
+
+def _lot_count(groups: List[DocumentGroup], max_docs_per_lot: int) -> int:
+    """Número de lotes da regra original: grupos / máximo por lote."""
+    if max_docs_per_lot <= 0:
+        return 1
+    return max(1, math.ceil(len(groups) / max_docs_per_lot))
 
 
 class GreedyLotBalancerService(ILotBalancerService):
@@ -18,14 +31,15 @@ class GreedyLotBalancerService(ILotBalancerService):
         if not groups:
             return []
 
-        # 1. Ordena os grupos de documentos do maior para o menor
-        sorted_groups = sorted(
-            groups, key=lambda g: sum(f.size_bytes for f in g.files), reverse=True
-        )
+        # 1. Ordena os grupos de documentos do maior para o menor (tamanho
+        #    calculado uma vez por grupo; sort estável mantém a ordem de empate)
+        size_of = attrgetter("size_bytes")
+        sizes = [sum(map(size_of, g.files)) for g in groups]
+        order = sorted(range(len(groups)), key=sizes.__getitem__, reverse=True)
 
         # 2. Determina o número de lotes necessários
         if max_docs_per_lot <= 0:
-            max_docs_per_lot = len(sorted_groups) or 1
+            max_docs_per_lot = len(groups) or 1
 
         # Lógica original usava max_docs por lote como referência de QUANTIDADE de grupos
         # Mas a assinatura sugere número de documentos?
@@ -36,7 +50,7 @@ class GreedyLotBalancerService(ILotBalancerService):
         # Vamos manter a lógica original "Greedy" que tenta distribuir o PESO (bytes) uniformemente
         # entre N lotes fixos baseados na contagem inicial.
 
-        num_lots = math.ceil(len(sorted_groups) / max_docs_per_lot)
+        num_lots = math.ceil(len(groups) / max_docs_per_lot)
         if num_lots < 1:
             num_lots = 1
 
@@ -45,9 +59,468 @@ class GreedyLotBalancerService(ILotBalancerService):
             OutputLot(lot_name=f"Lote_{i + 1}") for i in range(num_lots)
         ]
 
-        # 4. Distribui os grupos para o lote atualmente mais leve (em bytes)
-        for group in sorted_groups:
-            lightest_lot = min(lots, key=lambda lot: lot.total_size_bytes)
-            lightest_lot.groups.append(group)
+        # 4. Distribui os grupos para o lote atualmente mais leve (em bytes).
+        #    Cada entrada do heap codifica (tamanho acumulado, índice do lote)
+        #    num único inteiro, tamanho * num_lots + índice: em empate vence o
+        #    lote de menor índice, como min() sobre a lista de lotes.
+        heap = list(range(num_lots))
+        lot_groups = [lot.groups for lot in lots]
+        replace = heapq.heapreplace
+        for index in order:
+            key = heap[0]
+            lot_groups[key % num_lots].append(groups[index])
+            replace(heap, key + sizes[index] * num_lots)
+
+        return lots
+
+
+class _Partition:
+    """
+    Partição parcial do Karmarkar-Karp: até k subconjuntos de grupos, num
+    min-heap de [bytes, sequência, grupos]. Subconjuntos vazios ficam implícitos.
+    """
+
+    __slots__ = ("subsets", "largest")
+
+    def __init__(self, subsets: List[list], largest: int):
+        self.subsets = subsets
+        self.largest = largest
+
+    def difference(self, k: int) -> int:
+        """Diferença entre o maior e o menor subconjunto."""
+        smallest = self.subsets[0][0] if len(self.subsets) == k else 0
+        return self.largest - smallest
+
+
+class KarmarkarKarpLotBalancerService(ILotBalancerService):
+    """
+    Balanceia os bytes dos lotes pelo método da diferenciação de
+    Karmarkar-Karp (largest differencing method) para k lotes.
+
+    Cada grupo começa como uma partição própria; as duas partições com maior
+    diferença entre o maior e o menor subconjunto são combinadas, juntando o
+    maior subconjunto de uma ao menor da outra, até restar uma só. O número
+    de lotes segue a mesma regra do balanceador guloso.
+    """
+
+    def balance_lots(
+        self, groups: List[DocumentGroup], max_docs_per_lot: int
+    ) -> List[OutputLot]:
+        if not groups:
+            return []
+
+        num_lots = _lot_count(groups, max_docs_per_lot)
+        sequence = count()
+        heap = []
+        for group in groups:
+            size_bytes = _group_totals(group)[1]
+            partition = _Partition([[size_bytes, next(sequence), [group]]], size_bytes)
+            heap.append((-size_bytes, next(sequence), partition))
+        heapq.heapify(heap)
+
+        while len(heap) > 1:
+            first = heapq.heappop(heap)[2]
+            second = heapq.heappop(heap)[2]
+            merged = self._combine(first, second, num_lots)
+            heapq.heappush(heap, (-merged.difference(num_lots), next(sequence), merged))
+
+        subsets = sorted(heap[0][2].subsets, key=lambda subset: -subset[0])
+        return [
+            OutputLot(lot_name=f"Lote_{i + 1}", groups=subset[2])
+            for i, subset in enumerate(subsets)
+        ]
+
+    @staticmethod
+    def _combine(first: _Partition, second: _Partition, k: int) -> _Partition:
+        """Junta o maior subconjunto de uma partição ao menor da outra, e assim por diante."""
+        if len(first.subsets) < len(second.subsets):
+            first, second = second, first
+
+        # Cabem lado a lado: os subconjuntos de uma ocupam os vazios da outra
+        if len(first.subsets) + len(second.subsets) <= k:
+            for subset in second.subsets:
+                heapq.heappush(first.subsets, subset)
+            first.largest = max(first.largest, second.largest)
+            return first
+
+        # Os maiores subconjuntos da menor partição vão para os menores da
+        # maior: primeiro os vazios implícitos, depois os menores existentes.
+        # Os subconjuntos maiores de `first` não mudam, então só os `m`
+        # menores saem do heap (O(m log k) em vez de ordenar os k)
+        incoming = sorted(second.subsets, key=lambda subset: -subset[0])
+        empty_slots = k - len(first.subsets)
+        for subset in incoming[:empty_slots]:
+            heapq.heappush(first.subsets, subset)
+        remaining = incoming[empty_slots:]
+        smallest = [heapq.heappop(first.subsets) for _ in remaining]
+        for target, source in zip(smallest, remaining):
+            target[0] += source[0]
+            target[2].extend(source[2])
+            heapq.heappush(first.subsets, target)
+            first.largest = max(first.largest, target[0])
+        first.largest = max(first.largest, second.largest)
+        return first
+
+
+class DisciplineLotBalancerService(ILotBalancerService):
+    """
+    Separa os grupos por disciplina (metadado do item do manifesto) e
+    balanceia cada disciplina em lotes próprios: um lote nunca mistura
+    disciplinas. Grupos sem o metadado formam uma disciplina à parte.
+    """
+
+    def __init__(
+        self,
+        metadata_key: str = "DISCIPLINA",
+        balancer: Optional[ILotBalancerService] = None,
+    ):
+        """
+        Args:
+            metadata_key: Coluna do manifesto usada para separar os lotes
+            balancer: Balanceamento dentro de cada disciplina (padrão: guloso)
+        """
+        self._metadata_key = metadata_key
+        self._balancer = balancer or GreedyLotBalancerService()
+
+    def balance_lots(
+        self, groups: List[DocumentGroup], max_docs_per_lot: int
+    ) -> List[OutputLot]:
+        by_discipline: Dict[str, List[DocumentGroup]] = {}
+        for group in groups:
+            by_discipline.setdefault(self._discipline(group), []).append(group)
+
+        lots: List[OutputLot] = []
+        for discipline in sorted(by_discipline):
+            lots.extend(
+                self._balancer.balance_lots(by_discipline[discipline], max_docs_per_lot)
+            )
+        for i, lot in enumerate(lots):
+            lot.lot_name = f"Lote_{i + 1}"
+        return lots
+
+    def _discipline(self, group: DocumentGroup) -> str:
+        for file in group.files:
+            item = file.associated_manifest_item
+            if item is not None:
+                return str(item.metadata.get(self._metadata_key) or "").strip()
+        return ""
+
+
+def _group_totals(group: DocumentGroup) -> Tuple[int, int]:
+    """(arquivos, bytes) de um grupo."""
+    return len(group.files), sum(file.size_bytes for file in group.files)
+
+
+class _PackedLot:
+    """Lote em construção com os totais acumulados."""
+
+    __slots__ = ("groups", "files", "size_bytes")
+
+    def __init__(self) -> None:
+        self.groups: List[DocumentGroup] = []
+        self.files = 0
+        self.size_bytes = 0
+
+    def add(self, group: DocumentGroup, files: int, size_bytes: int) -> None:
+        self.groups.append(group)
+        self.files += files
+        self.size_bytes += size_bytes
+
+    def remove(self, group: DocumentGroup, files: int, size_bytes: int) -> None:
+        # Por identidade: grupos distintos podem ser iguais como dataclass
+        index = next(i for i, g in enumerate(self.groups) if g is group)
+        del self.groups[index]
+        self.files -= files
+        self.size_bytes -= size_bytes
+
+
+class _FreeCapacityTree:
+    """
+    Árvore de segmentos com a maior folga de arquivos, bytes e grupos por
+    faixa de lotes, para achar o primeiro lote em que um grupo cabe sem
+    percorrer todos os lotes abertos.
+    """
+
+    def __init__(self, max_files: float, max_bytes: float, max_groups: float):
+        self._capacity = (max_files, max_bytes, max_groups)
+        self._size = 1
+        self._files = [max_files] * 2
+        self._bytes = [max_bytes] * 2
+        self._groups = [max_groups] * 2
+
+    def first_fit(self, files: int, size_bytes: int) -> int:
+        """Posição do primeiro lote com folga para mais um grupo deste tamanho."""
+        free_files, free_bytes, free_groups = self._files, self._bytes, self._groups
+        size = self._size
+        # Busca em profundidade, à esquerda primeiro: a folga máxima de um nó
+        # é necessária mas não suficiente (pode vir de lotes diferentes)
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            if (
+                free_files[node] < files
+                or free_bytes[node] < size_bytes
+                or free_groups[node] < 1
+            ):
+                continue
+            if node >= size:
+                return node - size
+            stack.append(2 * node + 1)
+            stack.append(2 * node)
+        # Todas as posições ocupadas: as novas têm a capacidade inteira
+        self._grow()
+        return size
+
+    def consume(self, position: int, files: int, size_bytes: int) -> None:
+        """Desconta um grupo da folga do lote e atualiza os ancestrais."""
+        free_files, free_bytes, free_groups = self._files, self._bytes, self._groups
+        node = position + self._size
+        free_files[node] -= files
+        free_bytes[node] -= size_bytes
+        free_groups[node] -= 1
+        node //= 2
+        while node:
+            left, right = 2 * node, 2 * node + 1
+            files_max = max(free_files[left], free_files[right])
+            bytes_max = max(free_bytes[left], free_bytes[right])
+            groups_max = max(free_groups[left], free_groups[right])
+            if (files_max, bytes_max, groups_max) == (
+                free_files[node],
+                free_bytes[node],
+                free_groups[node],
+            ):
+                # Folga máxima inalterada: os ancestrais também não mudam
+                return
+            free_files[node] = files_max
+            free_bytes[node] = bytes_max
+            free_groups[node] = groups_max
+            node //= 2
+
+    def _grow(self) -> None:
+        """Dobra o número de posições (as novas com capacidade inteira)."""
+        old, size = self._size, self._size * 2
+
+        def rebuild(free: List[float], limit: float) -> List[float]:
+            tree = [limit] * (2 * size)
+            tree[size : size + old] = free[old:]
+            for node in range(size - 1, 0, -1):
+                tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            return tree
+
+        max_files, max_bytes, max_groups = self._capacity
+        self._files = rebuild(self._files, max_files)
+        self._bytes = rebuild(self._bytes, max_bytes)
+        self._groups = rebuild(self._groups, max_groups)
+        self._size = size
+
+
+class ConstrainedLotBalancerService(ILotBalancerService):
+    """
+    Empacota grupos em lotes respeitando, ao mesmo tempo, o máximo de arquivos,
+    de bytes e de grupos por lote.
+
+    Usa first-fit decreasing (grupos ordenados pela dimensão que mais ocupa
+    de um lote) seguido de uma etapa de reparo que tenta esvaziar os lotes
+    menos ocupados redistribuindo seus grupos. Um grupo nunca é dividido:
+    se sozinho excede algum limite, vai para um lote próprio.
+    """
+
+    def __init__(
+        self,
+        max_bytes_per_lot: int = 0,
+        max_groups_per_lot: int = 0,
+        repair_attempts: int = 32,
+    ):
+        """
+        Args:
+            max_bytes_per_lot: Máximo de bytes por lote (0 = sem limite)
+            max_groups_per_lot: Máximo de grupos por lote (0 = sem limite)
+            repair_attempts: Lotes (os menos ocupados) que o reparo tenta esvaziar
+        """
+        self._max_bytes = max_bytes_per_lot if max_bytes_per_lot > 0 else math.inf
+        self._max_groups = max_groups_per_lot if max_groups_per_lot > 0 else math.inf
+        self._repair_attempts = max(0, repair_attempts)
+        self.last_report: Optional[LotPackingReport] = None
+
+    def balance_lots(
+        self, groups: List[DocumentGroup], max_docs_per_lot: int
+    ) -> List[OutputLot]:
+        """
+        Distribui os grupos em lotes; `max_docs_per_lot` limita os arquivos
+        por lote (0 = sem limite).
+        """
+        max_files = max_docs_per_lot if max_docs_per_lot > 0 else math.inf
+        items = [(g, *_group_totals(g)) for g in groups]
+
+        fits_alone = [
+            item
+            for item in items
+            if item[1] <= max_files and item[2] <= self._max_bytes
+        ]
+        oversized = [
+            item for item in items if item[1] > max_files or item[2] > self._max_bytes
+        ]
+        if oversized:
+            app_logger.warning(
+                "Grupos excedem sozinhos o limite do lote",
+                extra={
+                    "groups": [item[0].document_code for item in oversized[:20]],
+                    "count": len(oversized),
+                },
+            )
+
+        # 1. First-fit decreasing pela maior fração ocupada de um lote
+        def weight(item: Tuple[DocumentGroup, int, int]) -> Tuple[float, int]:
+            _, files, size_bytes = item
+            share = max(
+                files / max_files, size_bytes / self._max_bytes, 1 / self._max_groups
+            )
+            return share, size_bytes
+
+        fits_alone.sort(key=weight, reverse=True)
+        packed = self._first_fit(fits_alone, max_files)
+
+        # 2. Reparo: esvazia os lotes menos ocupados, se os grupos couberem
+        lower_bound = self._lower_bound(fits_alone, max_files)
+        self._repair(packed, max_files, lower_bound)
 
+        lots = [OutputLot(lot_name="", groups=lot.groups) for lot in packed]
+        lots.extend(OutputLot(lot_name="", groups=[group]) for group, _, _ in oversized)
+        for i, lot in enumerate(lots):
+            lot.lot_name = f"Lote_{i + 1}"
+
+        self.last_report = LotPackingReport(
+            lots_used=len(lots),
+            lower_bound=lower_bound + len(oversized),
+            oversized_groups=len(oversized),
+        )
+        app_logger.info(
+            "Lotes empacotados",
+            extra={
+                "lots_used": self.last_report.lots_used,
+                "lower_bound": self.last_report.lower_bound,
+                "oversized_groups": len(oversized),
+            },
+        )
         return lots
+
+    def _fits(self, lot: _PackedLot, files: int, size_bytes: int, max_files) -> bool:
+        return (
+            lot.files + files <= max_files
+            and lot.size_bytes + size_bytes <= self._max_bytes
+            and len(lot.groups) < self._max_groups
+        )
+
+    def _first_fit(
+        self, items: List[Tuple[DocumentGroup, int, int]], max_files
+    ) -> List[_PackedLot]:
+        # A árvore aponta o primeiro lote com folga; posições ainda sem lote
+        # têm a capacidade inteira, então "nenhum lote serve" abre um novo
+        tree = _FreeCapacityTree(max_files, self._max_bytes, self._max_groups)
+        packed: List[_PackedLot] = []
+        for group, files, size_bytes in items:
+            position = tree.first_fit(files, size_bytes)
+            if position == len(packed):
+                packed.append(_PackedLot())
+            packed[position].add(group, files, size_bytes)
+            tree.consume(position, files, size_bytes)
+        return packed
+
+    def _repair(self, packed: List[_PackedLot], max_files, lower_bound: int) -> None:
+        """
+        Tenta esvaziar os lotes menos ocupados movendo cada grupo para o
+        primeiro outro lote em que caiba; uma tentativa sem sucesso é desfeita.
+        Para ao atingir o limite inferior.
+        """
+
+        def occupancy(lot: _PackedLot) -> float:
+            return max(
+                lot.files / max_files,
+                lot.size_bytes / self._max_bytes,
+                len(lot.groups) / self._max_groups,
+            )
+
+        candidates = sorted(packed, key=occupancy)[: self._repair_attempts]
+        for candidate in candidates:
+            if len(packed) <= lower_bound:
+                return
+            others = [lot for lot in packed if lot is not candidate]
+            relocated = []
+            for group in sorted(candidate.groups, key=_group_totals, reverse=True):
+                files, size_bytes = _group_totals(group)
+                target = next(
+                    (
+                        lot
+                        for lot in others
+                        if self._fits(lot, files, size_bytes, max_files)
+                    ),
+                    None,
+                )
+                if target is None:
+                    break
+                target.add(group, files, size_bytes)
+                relocated.append((target, group, files, size_bytes))
+            else:
+                packed.remove(candidate)
+                continue
+
+            # Desfaz as realocações parciais
+            for target, group, files, size_bytes in relocated:
+                target.remove(group, files, size_bytes)
+
+    def _lower_bound(
+        self, items: List[Tuple[DocumentGroup, int, int]], max_files
+    ) -> int:
+        """Mínimo de lotes exigido pelos totais de arquivos, bytes e grupos."""
+        if not items:
+            return 0
+        total_files = sum(files for _, files, _ in items)
+        total_bytes = sum(size_bytes for _, _, size_bytes in items)
+        bounds = [
+            math.ceil(total / limit)
+            for total, limit in (
+                (total_files, max_files),
+                (total_bytes, self._max_bytes),
+                (len(items), self._max_groups),
+            )
+            if limit != math.inf
+        ]
+        return max([1, *bounds])
+
+
+# Estratégias de balanceamento selecionáveis por nome (ex: em /api/organize)
+_BALANCER_STRATEGIES: Dict[str, Callable[[], ILotBalancerService]] = {
+    "greedy": GreedyLotBalancerService,
+    "karmarkar_karp": KarmarkarKarpLotBalancerService,
+    "ffd": lambda: ConstrainedLotBalancerService(
+        max_bytes_per_lot=settings.LOT_MAX_BYTES,
+        max_groups_per_lot=settings.LOT_MAX_GROUPS,
+    ),
+    "discipline": DisciplineLotBalancerService,
+}
+
+
+def register_balancer(name: str, factory: Callable[[], ILotBalancerService]) -> None:
+    """Registra (ou substitui) uma estratégia de balanceamento."""
+    _BALANCER_STRATEGIES[name] = factory
+
+
+def available_balancers() -> List[str]:
+    """Nomes das estratégias registradas."""
+    return sorted(_BALANCER_STRATEGIES)
+
+
+def create_balancer(name: str) -> ILotBalancerService:
+    """
+    Cria o balanceador da estratégia informada.
+
+    Raises:
+        OrganizationError: Se a estratégia não estiver registrada
+    """
+    factory = _BALANCER_STRATEGIES.get(name)
+    if factory is None:
+        raise OrganizationError(
+            f"Unknown balancer strategy: {name} "
+            f"(available: {', '.join(available_balancers())})"
+        )
+    return factory()
@@ -4,11 +4,17 @@ Implementa ITemplateFiller de forma assíncrona.
 """
 
 import asyncio
+import threading
+from copy import copy
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 import openpyxl
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell.cell import Cell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.worksheet.page import PageMargins
 from openpyxl.worksheet.worksheet import Worksheet
 
 from app.core.interfaces import IFileSystemManager, ITemplateFiller
@@ -17,12 +23,318 @@ from app.domain.entities import DocumentGroup
 from app.domain.exceptions import TemplateFillError, TemplateNotFoundError
 from app.domain.file_naming import get_filename_with_revision
 
+# (tamanho, mtime) do arquivo de template quando foi lido
+_Fingerprint = Tuple[int, int]
+
+# Formatação aplicada aos manifestos: estilos nomeados, registrados uma vez
+# por planilha e aplicados às células por referência
+_NUM_COLUMNS = 9
+_HEADER_STYLE = "Manifesto - Cabeçalho"
+_DATA_STYLE = "Manifesto - Dados"
+# Atributos que a formatação original não alterava: mantidos em cada célula
+# depois de aplicar o estilo nomeado (ex: formato de data dos metadados)
+_HEADER_KEPT = ("number_format", "protection")
+_DATA_KEPT = ("font", "fill", "number_format", "protection")
+_COLUMN_WIDTHS = {
+    "A": 35,
+    "B": 10,
+    "C": 60,
+    "D": 35,
+    "E": 10,
+    "F": 20,
+    "G": 20,
+    "H": 20,
+    "I": 20,
+}
+
+# Configuração de impressão reproduzida nos manifestos gerados pelo modelo
+_PAGE_SETUP_ATTRIBUTES = (
+    "orientation",
+    "paperSize",
+    "scale",
+    "fitToWidth",
+    "fitToHeight",
+)
+
+
+@dataclass(frozen=True)
+class TemplateCell:
+    """Valor e estilo de uma célula do template."""
+
+    column: int
+    value: Any
+    font: Optional[Font] = None
+    fill: Optional[PatternFill] = None
+    border: Optional[Border] = None
+    alignment: Optional[Alignment] = None
+    number_format: str = "General"
+
+
+@dataclass(frozen=True)
+class ParsedTemplate:
+    """
+    Template de manifesto lido uma única vez.
+
+    Guarda as linhas antes do marcador "FIM" (cabeçalho), as linhas a partir
+    dele (rodapé), mesclagens, alturas de linha e larguras de coluna. Cada
+    manifesto de lote é montado a partir deste modelo em uma planilha nova,
+    com os dados entre cabeçalho e rodapé, sem reabrir o arquivo.
+    """
+
+    sheet_title: str
+    insert_row: int  # Linha do template onde os dados entram
+    head_rows: Tuple[Tuple[TemplateCell, ...], ...]
+    tail_rows: Tuple[Tuple[TemplateCell, ...], ...]
+    merged_ranges: Tuple[
+        Tuple[int, int, int, int], ...
+    ]  # min_row, min_col, max_row, max_col
+    row_heights: Tuple[Tuple[int, float], ...]
+    column_widths: Tuple[Tuple[str, int, int, float], ...]  # letra, min, max, largura
+    freeze_panes: Optional[str] = None
+    print_title_rows: Optional[str] = None
+    page_setup: Tuple[Tuple[str, Any], ...] = ()
+    page_margins: Optional[PageMargins] = None
+    fit_to_page: Optional[bool] = None
+
+    def render(self, rows: List[List[Any]]) -> openpyxl.Workbook:
+        """Monta a planilha do lote: cabeçalho, `rows` e rodapé deslocado."""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = self.sheet_title
+        shift = len(rows)
+
+        for row_num, cells in enumerate(self.head_rows, start=1):
+            _write_template_row(sheet, row_num, cells)
+        for i, values in enumerate(rows):
+            for col_num, value in enumerate(values, 1):
+                sheet.cell(row=self.insert_row + i, column=col_num, value=value)
+        for offset, cells in enumerate(self.tail_rows):
+            _write_template_row(sheet, self.insert_row + shift + offset, cells)
+
+        for min_row, min_col, max_row, max_col in self.merged_ranges:
+            if min_row >= self.insert_row:
+                min_row, max_row = min_row + shift, max_row + shift
+            sheet.merge_cells(
+                start_row=min_row,
+                start_column=min_col,
+                end_row=max_row,
+                end_column=max_col,
+            )
+        for row_num, height in self.row_heights:
+            if row_num >= self.insert_row:
+                row_num += shift
+            sheet.row_dimensions[row_num].height = height
+        for col_letter, min_col, max_col, width in self.column_widths:
+            dimension = sheet.column_dimensions[col_letter]
+            dimension.min, dimension.max = min_col, max_col
+            dimension.width = width
+        if self.freeze_panes:
+            sheet.freeze_panes = self.freeze_panes
+        if self.print_title_rows:
+            sheet.print_title_rows = self.print_title_rows
+        for attribute, value in self.page_setup:
+            setattr(sheet.page_setup, attribute, value)
+        if self.page_margins is not None:
+            sheet.page_margins = copy(self.page_margins)
+        if self.fit_to_page is not None:
+            sheet.sheet_properties.pageSetUpPr.fitToPage = self.fit_to_page
+        return workbook
+
+
+def _write_template_row(
+    sheet: Worksheet, row_num: int, cells: Tuple[TemplateCell, ...]
+) -> None:
+    for template_cell in cells:
+        cell = sheet.cell(row=row_num, column=template_cell.column)
+        cell.value = template_cell.value
+        if template_cell.font is not None:
+            cell.font = template_cell.font
+            cell.fill = template_cell.fill
+            cell.border = template_cell.border
+            cell.alignment = template_cell.alignment
+            cell.number_format = template_cell.number_format
+
+
+def _find_insert_row(sheet: Worksheet) -> int:
+    """Linha do marcador "FIM" (os dados entram antes dele); 2 se não houver."""
+    for row_num in range(2, sheet.max_row + 1):
+        cell_value = sheet.cell(row=row_num, column=1).value
+        if cell_value and str(cell_value).upper() == "FIM":
+            return row_num
+    return 2
+
+
+def _snapshot_row(sheet: Worksheet, row_num: int) -> Tuple[TemplateCell, ...]:
+    cells = []
+    for cell in sheet[row_num]:
+        if cell.value is None and not cell.has_style:
+            continue
+        if cell.has_style:
+            cells.append(
+                TemplateCell(
+                    column=cell.column,
+                    value=cell.value,
+                    font=copy(cell.font),
+                    fill=copy(cell.fill),
+                    border=copy(cell.border),
+                    alignment=copy(cell.alignment),
+                    number_format=cell.number_format,
+                )
+            )
+        else:
+            cells.append(TemplateCell(column=cell.column, value=cell.value))
+    return tuple(cells)
+
+
+def parse_template(template_path: Path) -> Optional[ParsedTemplate]:
+    """
+    Lê o template e monta o modelo usado para gerar os manifestos.
+
+    Returns:
+        ParsedTemplate, ou None se o template tiver recursos que o modelo não
+        reproduz (mais de uma aba, imagens, gráficos, validação de dados,
+        formatação condicional); nesse caso o template é copiado e preenchido
+        a cada lote
+    """
+    workbook = openpyxl.load_workbook(template_path)
+    try:
+        sheet: Worksheet = workbook.active
+        if (
+            len(workbook.worksheets) != 1
+            or sheet._images
+            or sheet._charts
+            or sheet.data_validations.dataValidation
+            or len(sheet.conditional_formatting)
+        ):
+            return None
+
+        insert_row = _find_insert_row(sheet)
+        return ParsedTemplate(
+            sheet_title=sheet.title,
+            insert_row=insert_row,
+            head_rows=tuple(
+                _snapshot_row(sheet, row_num) for row_num in range(1, insert_row)
+            ),
+            tail_rows=tuple(
+                _snapshot_row(sheet, row_num)
+                for row_num in range(insert_row, sheet.max_row + 1)
+            ),
+            merged_ranges=tuple(
+                (r.min_row, r.min_col, r.max_row, r.max_col)
+                for r in sheet.merged_cells.ranges
+            ),
+            row_heights=tuple(
+                (row_num, dim.height)
+                for row_num, dim in sheet.row_dimensions.items()
+                if dim.height is not None
+            ),
+            column_widths=tuple(
+                (col_letter, dim.min, dim.max, dim.width)
+                for col_letter, dim in sheet.column_dimensions.items()
+                if dim.customWidth
+            ),
+            freeze_panes=sheet.freeze_panes,
+            print_title_rows=sheet.print_title_rows,
+            page_setup=tuple(
+                (attribute, getattr(sheet.page_setup, attribute))
+                for attribute in _PAGE_SETUP_ATTRIBUTES
+                if getattr(sheet.page_setup, attribute) is not None
+            ),
+            page_margins=copy(sheet.page_margins),
+            fit_to_page=(
+                sheet.sheet_properties.pageSetUpPr.fitToPage
+                if sheet.sheet_properties.pageSetUpPr is not None
+                else None
+            ),
+        )
+    finally:
+        workbook.close()
+
+
+def _apply_named_style(cell: Cell, name: str, kept: Tuple[str, ...]) -> None:
+    """
+    Aplica o estilo nomeado mantendo os atributos `kept` da célula.
+
+    O estilo nomeado substitui todos os atributos; células sem estilo próprio
+    (a maioria) não têm o que preservar.
+    """
+    if not cell.has_style:
+        cell.style = name
+        return
+    values = [copy(getattr(cell, attr)) for attr in kept]
+    cell.style = name
+    for attr, value in zip(kept, values):
+        setattr(cell, attr, value)
+
+
+def _register_named_styles(workbook: openpyxl.Workbook) -> None:
+    """Registra os estilos do manifesto (um conjunto novo por planilha)."""
+    thin = Side(style="thin")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    styles = (
+        NamedStyle(
+            name=_HEADER_STYLE,
+            font=Font(bold=True),
+            fill=PatternFill(
+                start_color="FFFF00", end_color="FFFF00", fill_type="solid"
+            ),
+            border=border,
+            alignment=Alignment(horizontal="center", vertical="center"),
+        ),
+        NamedStyle(
+            name=_DATA_STYLE,
+            font=copy(DEFAULT_FONT),
+            border=border,
+            alignment=Alignment(horizontal="left", vertical="center"),
+        ),
+    )
+    for style in styles:
+        if style.name not in workbook.named_styles:
+            workbook.add_named_style(style)
+
+
+def _manifest_rows(data: List[DocumentGroup]) -> List[List[Any]]:
+    """Linhas do manifesto de lote: uma por arquivo com item do manifesto."""
+    all_rows_data = []
+    for group in data:
+        manifest_info = group.files[0].associated_manifest_item
+        if not manifest_info:
+            continue
+
+        for file in group.files:
+            revision = manifest_info.revision
+            filename_with_revision = get_filename_with_revision(
+                file.path.name, revision
+            )
+
+            row_data = [
+                manifest_info.document_code,
+                manifest_info.revision,
+                manifest_info.title,
+                filename_with_revision,
+                manifest_info.metadata.get("FORMATO", "A4"),
+                manifest_info.metadata.get("DISCIPLINA", ""),
+                manifest_info.metadata.get("TIPO DE DOCUMENTO", ""),
+                manifest_info.metadata.get("PROPÓSITO", ""),
+                manifest_info.metadata.get("CAMINHO DATABOOK", ""),
+            ]
+            all_rows_data.append(row_data)
+    return all_rows_data
+
 
 class OpenpyxlTemplateFiller(ITemplateFiller):
-    """Implementação que usa openpyxl para preencher templates Excel."""
+    """
+    Implementação que usa openpyxl para preencher templates Excel.
+
+    O template é lido uma vez por instância (e relido se o arquivo mudar);
+    cada manifesto é montado em memória a partir dele e gravado uma única
+    vez, sem cópia prévia do template para o destino.
+    """
 
     def __init__(self, file_manager: IFileSystemManager):
         self._file_manager = file_manager
+        self._templates: Dict[Path, Tuple[_Fingerprint, Optional[ParsedTemplate]]] = {}
+        self._templates_lock = threading.Lock()
 
     async def fill_and_save(
         self, template_path: Path, output_path: Path, data: List[DocumentGroup]
@@ -39,15 +351,26 @@ class OpenpyxlTemplateFiller(ITemplateFiller):
             )
 
         try:
-            # 1. Copia o template para o local de saída (async)
-            await self._file_manager.copy_file(template_path, output_path)
-
-            # 2. Abre e preenche em executor (CPU/IO intensive)
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, self._fill_workbook_sync, output_path, data
+            template = await loop.run_in_executor(
+                None, self._get_template, template_path
             )
 
+            if template is not None:
+                # Monta e grava o manifesto em memória, a partir do modelo
+                await self._file_manager.create_directory(output_path.parent)
+                await loop.run_in_executor(
+                    None, self._render_workbook_sync, template, output_path, data
+                )
+            else:
+                # 1. Copia o template para o local de saída (async)
+                await self._file_manager.copy_file(template_path, output_path)
+
+                # 2. Abre e preenche em executor (CPU/IO intensive)
+                await loop.run_in_executor(
+                    None, self._fill_workbook_sync, output_path, data
+                )
+
             app_logger.info(
                 "Template filled successfully",
                 extra={"output_path": str(output_path), "groups_count": len(data)},
@@ -62,50 +385,52 @@ class OpenpyxlTemplateFiller(ITemplateFiller):
             )
             raise TemplateFillError(f"Falha ao preencher o template {output_path}: {e}")
 
+    def _get_template(self, template_path: Path) -> Optional[ParsedTemplate]:
+        """Modelo do template, lido na primeira vez (ou se o arquivo mudou)."""
+        stat = template_path.stat()
+        fingerprint = (stat.st_size, stat.st_mtime_ns)
+        with self._templates_lock:
+            cached = self._templates.get(template_path)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+            template = parse_template(template_path)
+            self._templates[template_path] = (fingerprint, template)
+
+        app_logger.info(
+            "Manifest template parsed",
+            extra={
+                "path": str(template_path),
+                "in_memory": template is not None,
+            },
+        )
+        return template
+
+    def _render_workbook_sync(
+        self, template: ParsedTemplate, output_path: Path, data: List[DocumentGroup]
+    ) -> None:
+        """Gera o manifesto do lote a partir do template já lido."""
+        all_rows_data = _manifest_rows(data)
+        workbook = template.render(all_rows_data)
+        self._apply_formatting(workbook.active, template.insert_row, len(all_rows_data))
+        workbook.save(output_path)
+        workbook.close()
+
     def _fill_workbook_sync(self, output_path: Path, data: List[DocumentGroup]) -> None:
-        """Lógica síncrona de preenchimento do Excel."""
+        """Preenche uma cópia do template (templates que o modelo não reproduz)."""
         workbook = openpyxl.load_workbook(output_path)
         sheet: Worksheet = workbook.active
 
         # Encontrar onde inserir os dados (após cabeçalho, antes de "FIM")
-        insert_row = 2
-        for row_num in range(2, sheet.max_row + 1):
-            cell_value = sheet.cell(row=row_num, column=1).value
-            if cell_value and str(cell_value).upper() == "FIM":
-                insert_row = row_num
-                break
+        insert_row = _find_insert_row(sheet)
 
         # Preparar dados
-        all_rows_data = []
-        for group in data:
-            manifest_info = group.files[0].associated_manifest_item
-            if not manifest_info:
-                continue
-
-            for file in group.files:
-                revision = manifest_info.revision
-                filename_with_revision = get_filename_with_revision(
-                    file.path.name, revision
-                )
-
-                row_data = [
-                    manifest_info.document_code,
-                    manifest_info.revision,
-                    manifest_info.title,
-                    filename_with_revision,
-                    manifest_info.metadata.get("FORMATO", "A4"),
-                    manifest_info.metadata.get("DISCIPLINA", ""),
-                    manifest_info.metadata.get("TIPO DE DOCUMENTO", ""),
-                    manifest_info.metadata.get("PROPÓSITO", ""),
-                    manifest_info.metadata.get("CAMINHO DATABOOK", ""),
-                ]
-                all_rows_data.append(row_data)
+        all_rows_data = _manifest_rows(data)
 
         # Inserir e Preencher
         if all_rows_data:
             # Insere linhas
-            if len(all_rows_data) > 0:
-                sheet.insert_rows(insert_row, amount=len(all_rows_data))
+            sheet.insert_rows(insert_row, amount=len(all_rows_data))
 
             # Preenche dados
             for i, row_data in enumerate(all_rows_data):
@@ -122,46 +447,25 @@ class OpenpyxlTemplateFiller(ITemplateFiller):
     def _apply_formatting(
         self, sheet: Worksheet, data_start_row: int, num_data_rows: int
     ):
-        """Aplica formatação básica."""
-        num_columns = 9
-
-        # Helper para borda fina
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
+        """
+        Aplica formatação básica.
+
+        Cada célula recebe um estilo nomeado por referência, em vez de novos
+        objetos Border/Alignment que o openpyxl teria de comparar um a um.
+        """
+        _register_named_styles(sheet.parent)
 
         # Cabeçalho (amarelo)
-        header_fill = PatternFill(
-            start_color="FFFF00", end_color="FFFF00", fill_type="solid"
-        )
-        for col in range(1, num_columns + 1):
-            cell = sheet.cell(row=1, column=col)
-            cell.fill = header_fill
-            cell.border = thin_border
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        for col in range(1, _NUM_COLUMNS + 1):
+            _apply_named_style(
+                sheet.cell(row=1, column=col), _HEADER_STYLE, _HEADER_KEPT
+            )
 
         # Dados
         for r in range(data_start_row, data_start_row + num_data_rows):
-            for c in range(1, num_columns + 1):
-                cell = sheet.cell(row=r, column=c)
-                cell.border = thin_border
-                cell.alignment = Alignment(horizontal="left", vertical="center")
+            for c in range(1, _NUM_COLUMNS + 1):
+                _apply_named_style(sheet.cell(row=r, column=c), _DATA_STYLE, _DATA_KEPT)
 
         # Ajustar larguras
-        widths = {
-            "A": 35,
-            "B": 10,
-            "C": 60,
-            "D": 35,
-            "E": 10,
-            "F": 20,
-            "G": 20,
-            "H": 20,
-            "I": 20,
-        }
-        for col_letter, width in widths.items():
+        for col_letter, width in _COLUMN_WIDTHS.items():
             sheet.column_dimensions[col_letter].width = width
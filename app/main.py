@@ -3,16 +3,30 @@ Ponto de entrada da aplicação.
 Integra NiceGUI em modo nativo (desktop).
 """
 
+import sys
+from pathlib import Path
+
 from nicegui import app, ui
 
 from app.api.endpoints import router as api_router
 from app.core.config import settings
 from app.core.logger import app_logger
+from app.domain.exceptions import ProfileConfigError
+from app.infrastructure.extraction import shutdown_extraction_pool
+from app.infrastructure.extraction_profiles import validate_profiles_config
+from app.infrastructure.job_queue import job_queue
 from app.ui.pages.dashboard import ValidationDashboard
 
 # Registra rotas da API
 app.include_router(api_router)
 
+# Fila de jobs (/api/jobs): recupera jobs interrompidos e inicia os workers
+app.on_startup(job_queue.start)
+app.on_shutdown(job_queue.shutdown)
+
+# Pool de processos da resolução de exceções (criado no primeiro uso)
+app.on_shutdown(shutdown_extraction_pool)
+
 # ... (skip to Line 101)
 
 
@@ -26,6 +40,15 @@ def main_page():
 
 def run():
     """Executa a aplicação."""
+    # Perfis com regex inválida impedem a inicialização, em vez de falhar na
+    # resolução. Não usa app.on_startup: o NiceGUI captura as exceções dos
+    # handlers de startup e o servidor subiria mesmo assim
+    try:
+        validate_profiles_config(Path(settings.PROFILES_CONFIG_PATH))
+    except ProfileConfigError as e:
+        app_logger.error("Invalid extraction profiles", extra={"error": str(e)})
+        sys.exit(1)
+
     ui.run(
         title=settings.APP_NAME,
         native=False,  # Modo browser (bypass pywebview issue)
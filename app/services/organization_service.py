@@ -1,6 +1,9 @@
+import asyncio
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
+from app.core.config import settings
+from app.core.interfaces import ILotBalancerService, IProgressReporter
 from app.core.logger import app_logger
 from app.domain.entities import (
     DocumentFile,
@@ -9,9 +12,11 @@ from app.domain.entities import (
     OrganizationResult,
 )
 from app.domain.exceptions import OrganizationError
+from app.domain.models import ValidatedDocument
 from app.infrastructure.database import DatabaseManager
+from app.infrastructure.manifest_cache import decode_metadata
 from app.infrastructure.repositories import FileSystemManager
-from app.infrastructure.services import GreedyLotBalancerService
+from app.infrastructure.services import create_balancer
 from app.infrastructure.template_filler import OpenpyxlTemplateFiller
 from app.use_cases.organize_lots import OrganizeLotsUseCase
 
@@ -31,15 +36,33 @@ class OrganizationService:
 
         # Instanciando dependências adicionais aqui para manter compatibilidade
         # com a assinatura atual do construtor que é usada pelo endpoint
-        self._balancer = GreedyLotBalancerService()
+        self._balancer = create_balancer(self.default_balancer_strategy())
         self._template_filler = OpenpyxlTemplateFiller(file_manager)
 
         self._use_case = OrganizeLotsUseCase(
             balancer=self._balancer,
             file_manager=self._file_manager,
             template_filler=self._template_filler,
+            max_concurrent_moves=settings.ORGANIZE_MOVE_CONCURRENCY,
+            max_concurrent_fills=settings.ORGANIZE_MANIFEST_WORKERS,
         )
 
+    @staticmethod
+    def default_balancer_strategy() -> str:
+        """
+        Estratégia de LOT_BALANCER_STRATEGY; se vazia, "ffd" quando há limite
+        de bytes ou de grupos por lote, senão "greedy".
+        """
+        if settings.LOT_BALANCER_STRATEGY:
+            return settings.LOT_BALANCER_STRATEGY
+        if settings.LOT_MAX_BYTES > 0 or settings.LOT_MAX_GROUPS > 0:
+            return "ffd"
+        return "greedy"
+
+    def _balancer_for(self, strategy: Optional[str]) -> ILotBalancerService:
+        """Balanceador da estratégia pedida (None = padrão do service)."""
+        return create_balancer(strategy) if strategy else self._balancer
+
     async def organize_session_lots(
         self,
         output_directory: Path,
@@ -47,21 +70,73 @@ class OrganizationService:
         start_sequence_number: int,
         lot_name_pattern: str,
         master_template_path: Path = Path("templates/manifest_template.xlsx"),
+        session_id: Optional[str] = None,
+        balancer_strategy: Optional[str] = None,
+        progress: Optional[IProgressReporter] = None,
     ) -> OrganizationResult:
         """
-        Organiza documentos validados da sessão atual em lotes.
+        Organiza documentos validados de uma sessão em lotes.
+
+        Args:
+            session_id: Sessão retornada pela validação (padrão: sessão atual)
+            balancer_strategy: Estratégia de balanceamento registrada
+                (padrão: default_balancer_strategy())
+            progress: Recebe o progresso da movimentação (ver OrganizeLotsUseCase)
+
+        Raises:
+            OrganizationError: Se a sessão não existir, não tiver documentos
+                ou a estratégia for desconhecida
         """
-        # 1. Recuperar Docs do Banco
-        validated_docs_db = self._db_manager.get_validated_documents(
-            self._db_manager.session_id
+        balancer = self._balancer_for(balancer_strategy)
+        loop = asyncio.get_event_loop()
+        if session_id is not None:
+            session = await loop.run_in_executor(
+                None, self._db_manager.get_session, session_id
+            )
+            if session is None:
+                raise OrganizationError(f"Session not found: {session_id}")
+        session_id = session_id or self._db_manager.session_id
+
+        # 1-2. Recuperar Docs do Banco, página a página, e converter para
+        # Entidades de Domínio (DocumentFile) à medida que as páginas chegam:
+        # só uma página de linhas do banco fica em memória. A leitura roda fora
+        # do event loop, compartilhado com os jobs e a interface
+        validated_files = await loop.run_in_executor(
+            None, self._load_document_files, session_id
         )
 
-        if not validated_docs_db:
+        if not validated_files:
             raise OrganizationError("No validated documents found in current session.")
 
-        # 2. Converter para Entidades de Domínio (DocumentFile)
-        validated_files = []
-        for v_doc in validated_docs_db:
+        # 3. Delegar para Use Case
+        try:
+            return await self._use_case.execute(
+                validated_files=validated_files,
+                output_directory=output_directory,
+                master_template_path=master_template_path,
+                max_docs_per_lot=max_docs_per_lot,
+                start_sequence_number=start_sequence_number,
+                lot_name_pattern=lot_name_pattern,
+                balancer=balancer,
+                progress=progress,
+            )
+        except Exception as e:
+            raise OrganizationError(f"Organization failed: {e}")
+
+    def _load_document_files(self, session_id: str) -> List[DocumentFile]:
+        """Lê os documentos validados da sessão (bloqueante: chamar no executor)."""
+        return list(
+            self._to_document_files(
+                self._db_manager.iter_validated_documents(session_id)
+            )
+        )
+
+    @staticmethod
+    def _to_document_files(
+        rows: Iterable[ValidatedDocument],
+    ) -> Iterator[DocumentFile]:
+        """Converte linhas persistidas em DocumentFile (com o ManifestItem, se houver)."""
+        for v_doc in rows:
             doc = DocumentFile(
                 path=Path(v_doc.path),
                 size_bytes=v_doc.size_bytes,
@@ -77,21 +152,13 @@ class OrganizationService:
                     document_code=v_doc.document_code,
                     revision=v_doc.revision or "",
                     title=v_doc.title or "",
+                    metadata=(
+                        decode_metadata(v_doc.metadata_json)
+                        if v_doc.metadata_json
+                        else {}
+                    ),
                 )
-            validated_files.append(doc)
-
-        # 3. Delegar para Use Case
-        try:
-            return await self._use_case.execute(
-                validated_files=validated_files,
-                output_directory=output_directory,
-                master_template_path=master_template_path,
-                max_docs_per_lot=max_docs_per_lot,
-                start_sequence_number=start_sequence_number,
-                lot_name_pattern=lot_name_pattern,
-            )
-        except Exception as e:
-            raise OrganizationError(f"Organization failed: {e}")
+            yield doc
 
     async def organize_and_generate_lots(
         self,
@@ -101,11 +168,14 @@ class OrganizationService:
         start_sequence_number: int,
         lot_name_pattern: str,
         master_template_path: Path = Path("templates/manifest_template.xlsx"),
+        balancer_strategy: Optional[str] = None,
+        progress: Optional[IProgressReporter] = None,
     ) -> OrganizationResult:
         """
         Organiza arquivos validados em lotes e move para diretório de saída.
         Delaga para o Use Case.
         """
+        balancer = self._balancer_for(balancer_strategy)
         try:
             return await self._use_case.execute(
                 validated_files=validated_files,
@@ -114,6 +184,8 @@ class OrganizationService:
                 max_docs_per_lot=max_docs_per_lot,
                 start_sequence_number=start_sequence_number,
                 lot_name_pattern=lot_name_pattern,
+                balancer=balancer,
+                progress=progress,
             )
         except Exception as e:
             # O use case já loga erros, service faz wrap para exceção de domínio esperada pela API
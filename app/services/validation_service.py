@@ -1,10 +1,14 @@
+import asyncio
 from pathlib import Path
+from typing import Optional
 
+from app.core.config import settings
+from app.core.interfaces import IManifestRepository, IProgressReporter, ISourceIndex
 from app.core.logger import app_logger
 from app.domain.entities import ValidationResult
 from app.domain.exceptions import ValidationError
 from app.infrastructure.database import DatabaseManager
-from app.infrastructure.repositories import FileRepository, ManifestRepository
+from app.infrastructure.repositories import FileRepository
 from app.use_cases.validate_batch import ValidateBatchUseCase
 
 
@@ -16,32 +20,82 @@ class ValidationService:
 
     def __init__(
         self,
-        manifest_repo: ManifestRepository,
+        manifest_repo: IManifestRepository,
         file_repo: FileRepository,
         db_manager: DatabaseManager,
+        source_index: Optional[ISourceIndex] = None,
     ):
         """
         Inicializa o service com injeção de dependências.
         """
-        self._Use_case = ValidateBatchUseCase(manifest_repo, file_repo)
+        self._Use_case = ValidateBatchUseCase(
+            manifest_repo,
+            file_repo,
+            source_index,
+            suggestion_limit=settings.SUGGESTION_TOP_K,
+            suggestion_min_score=settings.SUGGESTION_MIN_SCORE,
+        )
         self._db_manager = db_manager
 
     async def validate_batch(
-        self, manifest_path: Path, source_directory: Path
+        self,
+        manifest_path: Path,
+        source_directory: Path,
+        session_id: Optional[str] = None,
+        progress: Optional[IProgressReporter] = None,
     ) -> ValidationResult:
         """
         Executa validação de lote de documentos delegando para o caso de uso.
 
         Persiste os resultados validados no banco de dados para passos subsequentes.
+
+        Args:
+            manifest_path: Manifesto Excel
+            source_directory: Diretório com os arquivos a validar
+            session_id: Sessão a revalidar (seus documentos são substituídos);
+                se omitido, uma nova sessão é criada
+            progress: Recebe o progresso da validação (ver ValidateBatchUseCase)
+
+        Returns:
+            ValidationResult com o id da sessão em `session_id`
         """
         try:
-            result = await self._Use_case.execute(manifest_path, source_directory)
+            loop = asyncio.get_event_loop()
+            if session_id is not None:
+                session = await loop.run_in_executor(
+                    None, self._db_manager.get_session, session_id
+                )
+                if session is None:
+                    raise ValidationError(f"Session not found: {session_id}")
+
+            result = await self._Use_case.execute(
+                manifest_path, source_directory, progress
+            )
+            if not result.success:
+                # Validação que falhou não vira sessão nem substitui os
+                # documentos de uma sessão existente
+                return result
 
-            # Persiste documentos validados se houver sucesso parcial ou total
-            if result.validated_files:
-                self._db_manager.save_validated_documents(
-                    self._db_manager.session_id, result.validated_files
+            # O evento finished do caso de uso é o último ponto em que um job
+            # cancelado para: a partir daqui a sessão é gravada por inteiro
+            if session_id is None:
+                session_id = await loop.run_in_executor(
+                    None,
+                    self._db_manager.create_session,
+                    manifest_path,
+                    source_directory,
                 )
+            result.session_id = session_id
+
+            # Persiste os documentos validados, substituindo os da sessão mesmo
+            # sem nenhum válido (fora do event loop: outras requisições seguem
+            # atendidas)
+            await loop.run_in_executor(
+                None,
+                self._db_manager.save_validated_documents,
+                session_id,
+                result.validated_files,
+            )
 
             return result
         except Exception as e:
@@ -0,0 +1,85 @@
+from typing import Optional
+
+from nicegui import ui
+
+from app.domain.entities import ProgressEvent
+from app.infrastructure.progress import ProgressStream
+
+STAGE_LABELS = {
+    "scanning": "Listando arquivos da pasta...",
+    "reading_manifest": "Lendo manifesto",
+    "matching": "Cruzando arquivos com o manifesto",
+    "suggesting": "Sugerindo códigos para não reconhecidos...",
+    "moving": "Movendo arquivos para os lotes",
+    "finished": "Finalizando...",
+}
+
+
+def describe(event: ProgressEvent) -> str:
+    """Human-readable line for a progress event."""
+    text = STAGE_LABELS.get(event.stage, event.stage)
+    if event.stage == "reading_manifest" and event.manifest_items:
+        return f"{text}: {event.manifest_items:,} itens"
+    if event.stage == "moving":
+        return (
+            f"{text}: {event.files_moved:,}/{event.files_total:,} arquivos, "
+            f"lote {event.lots_moved}/{event.lots_total}, "
+            f"{event.bytes_moved / 2**20:,.1f} MB"
+        )
+    if event.total:
+        return f"{text}: {event.current:,}/{event.total:,} arquivos"
+    return text
+
+
+class ProgressPanel(ui.column):
+    """
+    Progress bar + caption bound to a ProgressStream.
+
+    The use case may report once per file; the panel only redraws on a timer
+    tick, and only when a newer event arrived, so a 100k-file run costs at most
+    one UI update per interval.
+    """
+
+    def __init__(self, interval_seconds: float):
+        super().__init__()
+        self.classes("w-full gap-1")
+        self._stream: Optional[ProgressStream] = None
+        self._rendered_version = 0
+
+        with self:
+            self.bar = ui.linear_progress(value=0, show_value=False).props(
+                "rounded color=primary"
+            )
+            self.caption = ui.label("").classes("text-xs text-gray-500")
+            self._timer = ui.timer(interval_seconds, self._render, active=False)
+        self.set_visibility(False)
+
+    def track(self) -> ProgressStream:
+        """Starts showing a new run; pass the returned stream to the service."""
+        self._stream = ProgressStream()
+        self._rendered_version = 0
+        self.bar.value = 0
+        self.bar.props(add="indeterminate")
+        self.caption.text = ""
+        self.set_visibility(True)
+        self._timer.activate()
+        return self._stream
+
+    def stop(self) -> None:
+        """Renders the last event and stops the timer."""
+        self._render()
+        self._timer.deactivate()
+        self.set_visibility(False)
+
+    def _render(self) -> None:
+        stream = self._stream
+        if stream is None or stream.version == self._rendered_version:
+            return
+        self._rendered_version = stream.version
+        event = stream.latest
+        self.caption.text = describe(event)
+        if event.total:
+            self.bar.props(remove="indeterminate")
+            self.bar.value = event.current / event.total
+        else:
+            self.bar.props(add="indeterminate")
@@ -100,8 +100,11 @@ class ResultsList(GlassCard):
         # Unrecognized Files (with checkboxes)
         if self._unrecognized_files:
             self.action_bar.classes(remove="hidden")
+            suggestions = result.suggestions
             for i, file in enumerate(self._unrecognized_files):
-                self._create_unrecognized_item(file, (i * 50) + 200)
+                self._create_unrecognized_item(
+                    file, (i * 50) + 200, suggestions.get(file.path)
+                )
         else:
             self.action_bar.classes(add="hidden")
 
@@ -127,7 +130,9 @@ class ResultsList(GlassCard):
             }}, {delay_ms});
         """)
 
-    def _create_unrecognized_item(self, file: DocumentFile, delay_ms: int):
+    def _create_unrecognized_item(
+        self, file: DocumentFile, delay_ms: int, suggestions=None
+    ):
         """Creates an unrecognized item row with checkbox and slide-in animation."""
         with self.list_container:
             with ui.row().classes(
@@ -140,6 +145,15 @@ class ResultsList(GlassCard):
                 ui.label(file.path.name).classes(
                     "text-sm font-medium text-gray-700 truncate flex-1"
                 )
+                if suggestions:
+                    best = suggestions[0]
+                    ui.label(f"Sugestão: {best.document_code}").classes(
+                        "text-xs text-gray-500 truncate"
+                    ).tooltip(
+                        ", ".join(
+                            f"{s.document_code} ({s.score:.0%})" for s in suggestions
+                        )
+                    )
 
         ui.run_javascript(f"""
             setTimeout(() => {{
@@ -8,16 +8,16 @@ from typing import Optional
 
 from nicegui import run, ui
 
+from app.core.config import settings
 from app.core.logger import app_logger
 from app.domain.exceptions import SADError
-from app.infrastructure.repositories import (
-    FileRepository,
-    FileSystemManager,
-    ManifestRepository,
-)
+from app.infrastructure.file_index import create_source_index
+from app.infrastructure.manifest_cache import create_manifest_repository
+from app.infrastructure.repositories import FileRepository, FileSystemManager
 from app.services.validation_service import ValidationService
 from app.ui.components.atoms.button import AppleButton
 from app.ui.components.molecules.file_picker import FilePickerMolecule
+from app.ui.components.molecules.progress_panel import ProgressPanel
 from app.ui.components.organisms.hero import HeroHeader
 from app.ui.components.organisms.results import ResultsList
 from app.ui.theme.design_system import design
@@ -38,6 +38,7 @@ class ValidationDashboard:
         # Refs
         self.results_section = None
         self.status_label = None
+        self.progress_panel = None
 
     async def pick_manifest(self):
         """Opens file picker for Excel."""
@@ -113,18 +114,22 @@ class ValidationDashboard:
             # Service Call
             from app.infrastructure.database import db_manager
 
-            manifest_repo = ManifestRepository()
+            manifest_repo = create_manifest_repository()
             file_repo = FileRepository()
             service = ValidationService(
-                manifest_repo=manifest_repo, file_repo=file_repo, db_manager=db_manager
+                manifest_repo=manifest_repo,
+                file_repo=file_repo,
+                db_manager=db_manager,
+                source_index=create_source_index(db_manager, file_repo),
             )
 
             self._update_status("Processando arquivos e cruzando dados...")
 
-            # Note: For even richer feedback (percentages), we'd need a callback in the service
+            # Progress is rendered by the panel's timer, not per event
             result = await service.validate_batch(
                 manifest_path=Path(self.manifest_path),
                 source_directory=Path(self.source_directory),
+                progress=self.progress_panel.track(),
             )
 
             # Update UI
@@ -167,43 +172,58 @@ class ValidationDashboard:
             dialog.open()
 
         finally:
+            self.progress_panel.stop()
             self.btn_validate.props(remove="loading")
 
     async def resolve_selected(self, selected_files):
         """Resolves selected unrecognized files via UC-02."""
-        from app.infrastructure.extraction import ProfiledExtractorService
+        from app.infrastructure.extraction import (
+            ProfiledExtractorService,
+            get_extraction_pool,
+        )
+        from app.infrastructure.extraction_cache import create_extraction_cache
         from app.use_cases.resolve_exception import ResolveExceptionUseCase
 
         if not selected_files:
             return
 
-        config_path = Path("config/patterns.yaml")
-        extractor = ProfiledExtractorService(config_path)
-        file_manager = FileSystemManager()
+        config_path = Path(settings.PROFILES_CONFIG_PATH)
+        success_count = 0
+        fail_count = 0
 
+        # Extração em processos: o parsing de PDF escala com os núcleos. O pool
+        # é compartilhado e encerrado no shutdown da aplicação (app.main)
+        extractor = ProfiledExtractorService(
+            config_path,
+            executor=get_extraction_pool(),
+            cache=create_extraction_cache(),
+        )
         use_case = ResolveExceptionUseCase(
             content_extractor=extractor,
             code_extractor=extractor,
-            file_manager=file_manager,
+            file_manager=FileSystemManager(),
+            code_locator=extractor,
         )
 
-        success_count = 0
-        fail_count = 0
-
-        for file in selected_files:
-            try:
-                await use_case.execute(
-                    file_to_resolve=file,
-                    profile_id="RIR",
-                    all_manifest_items=self._manifest_items,
-                )
+        async for outcome in use_case.execute_batch(
+            files=list(selected_files),
+            profile_id="RIR",
+            all_manifest_items=self._manifest_items,
+        ):
+            if outcome.success:
                 success_count += 1
-            except Exception as e:
+            else:
                 fail_count += 1
                 app_logger.warning(
                     "Falha na resolução",
-                    extra={"file": file.path.name, "error": str(e)},
+                    extra={
+                        "file": outcome.file.path.name,
+                        "error": outcome.error,
+                    },
                 )
+            self._update_status(
+                f"Resolvendo: {success_count + fail_count}/{len(selected_files)}"
+            )
 
         if success_count > 0:
             ui.notify(
@@ -273,6 +293,10 @@ class ValidationDashboard:
                                     on_click=self.run_validation,
                                 )
 
+                        self.progress_panel = ProgressPanel(
+                            settings.PROGRESS_STREAM_INTERVAL_SECONDS
+                        )
+
                 # 3. Results Section
                 self.results_section = ResultsList(on_resolve=self.resolve_selected)
 
@@ -3,12 +3,26 @@ UC-03: Organizar e Gerar Lotes de Saída.
 Distribui documentos validados em lotes balanceados e move para diretório de saída.
 """
 
+import asyncio
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 
-from app.core.interfaces import IFileSystemManager, ILotBalancerService, ITemplateFiller
+from app.core.interfaces import (
+    IFileSystemManager,
+    ILotBalancerService,
+    IProgressReporter,
+    ITemplateFiller,
+)
 from app.core.logger import app_logger
-from app.domain.entities import DocumentFile, DocumentGroup, OrganizationResult
+from app.domain.entities import (
+    DocumentFile,
+    DocumentGroup,
+    LotTransferStats,
+    OrganizationResult,
+    OutputLot,
+    ProgressEvent,
+)
 from app.domain.file_naming import get_filename_with_revision
 
 
@@ -22,6 +36,8 @@ class OrganizeLotsUseCase:
         balancer: ILotBalancerService,
         file_manager: IFileSystemManager,
         template_filler: ITemplateFiller,
+        max_concurrent_moves: int = 16,
+        max_concurrent_fills: int = 2,
     ):
         """
         Inicializa o caso de uso com as dependências.
@@ -30,10 +46,15 @@ class OrganizeLotsUseCase:
             balancer: Serviço de balanceamento de lotes
             file_manager: Gerenciador de operações do sistema de arquivos
             template_filler: Serviço de preenchimento de templates Excel
+            max_concurrent_moves: Movimentações de arquivo simultâneas por lote
+            max_concurrent_fills: Manifestos de lote preenchidos simultaneamente,
+                em paralelo às movimentações dos lotes seguintes
         """
         self._balancer = balancer
         self._file_manager = file_manager
         self._template_filler = template_filler
+        self._max_concurrent_moves = max(1, max_concurrent_moves)
+        self._max_concurrent_fills = max(1, max_concurrent_fills)
 
     async def execute(
         self,
@@ -43,6 +64,8 @@ class OrganizeLotsUseCase:
         max_docs_per_lot: int,
         start_sequence_number: int,
         lot_name_pattern: str,
+        balancer: Optional[ILotBalancerService] = None,
+        progress: Optional[IProgressReporter] = None,
     ) -> OrganizationResult:
         """
         Executa o fluxo principal do caso de uso.
@@ -54,6 +77,9 @@ class OrganizeLotsUseCase:
             max_docs_per_lot: Máximo de documentos por lote
             start_sequence_number: Número inicial da sequência de lotes
             lot_name_pattern: Padrão de nome do lote (usar XXXX para sequência)
+            balancer: Balanceamento desta execução (padrão: o do construtor)
+            progress: Recebe um ProgressEvent a cada arquivo movido e a cada
+                lote concluído
 
         Returns:
             OrganizationResult com estatísticas da operação
@@ -90,53 +116,108 @@ class OrganizeLotsUseCase:
             app_logger.debug("Arquivos agrupados", extra={"groups_count": len(groups)})
 
             # 2. Balanceamento em lotes
-            output_lots = self._balancer.balance_lots(groups, max_docs_per_lot)
+            output_lots = (balancer or self._balancer).balance_lots(
+                groups, max_docs_per_lot
+            )
             app_logger.debug(
                 "Lotes balanceados", extra={"lots_count": len(output_lots)}
             )
 
             files_moved_count = 0
+            lot_stats: List[LotTransferStats] = []
+
+            counts = {
+                "lots_total": len(output_lots),
+                "lots_moved": 0,
+                "files_total": sum(
+                    len(g.files) for lot in output_lots for g in lot.groups
+                ),
+                "files_moved": 0,
+                "bytes_total": sum(lot.total_size_bytes for lot in output_lots),
+                "bytes_moved": 0,
+            }
+
+            def report(stage: str) -> None:
+                if progress is not None:
+                    progress.report(ProgressEvent(stage, **counts))
+
+            def file_moved(file: DocumentFile) -> None:
+                counts["files_moved"] += 1
+                counts["bytes_moved"] += file.size_bytes
+                report("moving")
+
+            report("moving")
 
             # 3. Loop de Execução (Nomenclatura, Movimentação, Preenchimento)
-            for i, lot in enumerate(output_lots):
-                seq_number = start_sequence_number + i
-                lot_name = lot_name_pattern.replace("XXXX", f"{seq_number:04d}")
-                lot.lot_name = lot_name
-
-                lot_directory_path = output_directory / lot_name
-
-                # 3a. Criação de Diretório
-                await self._file_manager.create_directory(lot_directory_path)
-
-                # 3b. Movimentação dos Arquivos
-                for group in lot.groups:
-                    for file in group.files:
-                        # Obter informações do manifesto
-                        manifest_item = file.associated_manifest_item
-                        revision = manifest_item.revision if manifest_item else "0"
-
-                        # Construir novo nome do arquivo com revisão
-                        new_filename = get_filename_with_revision(
-                            file.path.name, revision
-                        )
+            # Os manifestos são preenchidos em segundo plano: enquanto o Excel
+            # de um lote é gerado, os arquivos dos lotes seguintes já são movidos
+            fill_slots = asyncio.Semaphore(self._max_concurrent_fills)
+            stop_fills = asyncio.Event()
+            fills: List["asyncio.Future[None]"] = []
+            try:
+                for i, lot in enumerate(output_lots):
+                    seq_number = start_sequence_number + i
+                    lot_name = lot_name_pattern.replace("XXXX", f"{seq_number:04d}")
+                    lot.lot_name = lot_name
+
+                    lot_directory_path = output_directory / lot_name
+
+                    # 3a. Criação de Diretório
+                    await self._file_manager.create_directory(lot_directory_path)
 
-                        destination_path = lot_directory_path / new_filename
-                        await self._file_manager.move_file(file.path, destination_path)
-                        files_moved_count += 1
+                    # 3b. Movimentação dos Arquivos (concorrente, limitada)
+                    started = time.perf_counter()
+                    moved = await self._move_lot_files(
+                        lot, lot_directory_path, file_moved
+                    )
+                    counts["lots_moved"] += 1
+                    report("moving")
+                    files_moved_count += moved
+                    stats = LotTransferStats(
+                        lot_name=lot_name,
+                        files=moved,
+                        bytes_moved=lot.total_size_bytes,
+                        seconds=time.perf_counter() - started,
+                    )
+                    lot_stats.append(stats)
+                    app_logger.info(
+                        "Arquivos do lote movidos",
+                        extra={
+                            "lot_name": lot_name,
+                            "files_moved": moved,
+                            "bytes_moved": stats.bytes_moved,
+                            "seconds": round(stats.seconds, 3),
+                            "bytes_per_second": round(stats.bytes_per_second),
+                        },
+                    )
 
-                # 3c. Preenchimento do Manifesto de Lote
-                output_manifest_path = lot_directory_path / f"{lot_name}.xlsx"
-                await self._template_filler.fill_and_save(
-                    master_template_path, output_manifest_path, lot.groups
-                )
+                    # Manifesto com falha interrompe os lotes seguintes
+                    for fill in fills:
+                        if fill.done():
+                            fill.result()
 
-                app_logger.debug(
-                    "Lote processado",
-                    extra={
-                        "lot_name": lot_name,
-                        "files_moved": len(lot.files),
-                    },
-                )
+                    # 3c. Preenchimento do Manifesto de Lote (após os arquivos)
+                    fills.append(
+                        asyncio.ensure_future(
+                            self._fill_lot_manifest(
+                                fill_slots,
+                                stop_fills,
+                                master_template_path,
+                                lot_directory_path / f"{lot_name}.xlsx",
+                                lot,
+                            )
+                        )
+                    )
+
+                await asyncio.gather(*fills)
+                report("finished")
+            except BaseException:
+                # Manifestos ainda não iniciados não começam; os que já estão
+                # sendo gravados terminam antes de o erro (ou o cancelamento
+                # do job) seguir
+                stop_fills.set()
+                await asyncio.gather(*fills, return_exceptions=True)
+                raise
 
             app_logger.info(
                 "Organização de lotes concluída",
@@ -150,6 +231,7 @@ class OrganizeLotsUseCase:
                 lots_created=len(output_lots),
                 files_moved=files_moved_count,
                 success=True,
+                lot_stats=lot_stats,
                 message=f"Criados {len(output_lots)} lotes com {files_moved_count} arquivos",
             )
 
@@ -165,3 +247,98 @@ class OrganizeLotsUseCase:
                 success=False,
                 message=f"Erro na organização: {str(e)}",
             )
+
+    async def _fill_lot_manifest(
+        self,
+        slots: asyncio.Semaphore,
+        stop: asyncio.Event,
+        master_template_path: Path,
+        output_manifest_path: Path,
+        lot: OutputLot,
+    ) -> None:
+        """
+        Preenche o manifesto de um lote cujos arquivos já foram movidos.
+
+        Não começa se `stop` já tiver sido sinalizado ao obter a vaga.
+        """
+        async with slots:
+            if stop.is_set():
+                return
+            await self._template_filler.fill_and_save(
+                master_template_path, output_manifest_path, lot.groups
+            )
+
+        app_logger.debug(
+            "Lote processado",
+            extra={
+                "lot_name": lot.lot_name,
+                "files_moved": len(lot.files),
+            },
+        )
+
+    async def _move_lot_files(
+        self,
+        lot: OutputLot,
+        lot_directory: Path,
+        on_moved: Optional[Callable[[DocumentFile], None]] = None,
+    ) -> int:
+        """
+        Move os arquivos de um lote para o diretório (já criado) do lote.
+
+        As movimentações rodam em paralelo, no máximo `max_concurrent_moves`
+        por vez, e o método só retorna quando todas terminarem: o manifesto do
+        lote só é gerado depois dos arquivos. `on_moved` é chamado a cada
+        arquivo movido. Arquivos que resultam no mesmo nome de destino são
+        movidos em sequência, na ordem original, como no processamento um a um.
+
+        Returns:
+            Quantidade de arquivos movidos
+
+        Raises:
+            FileOperationError: Na primeira falha; as movimentações ainda não
+                iniciadas não começam e as em andamento terminam antes
+            asyncio.CancelledError: Se `on_moved` interromper (job cancelado),
+                com a mesma espera pelas movimentações em andamento
+        """
+        chains: Dict[Path, List[DocumentFile]] = {}
+        for group in lot.groups:
+            for file in group.files:
+                # Obter informações do manifesto
+                manifest_item = file.associated_manifest_item
+                revision = manifest_item.revision if manifest_item else "0"
+
+                # Construir novo nome do arquivo com revisão
+                new_filename = get_filename_with_revision(file.path.name, revision)
+                chains.setdefault(lot_directory / new_filename, []).append(file)
+
+        # Um conjunto fixo de workers consome as cadeias: no máximo
+        # `max_concurrent_moves` movimentações em andamento, sem criar uma
+        # tarefa por arquivo
+        pending = iter(chains.items())
+        moved = 0
+        stopped = False
+
+        async def worker() -> None:
+            nonlocal moved
+            for destination, sources in pending:
+                for source in sources:
+                    if stopped:
+                        return
+                    await self._file_manager.move_file(source.path, destination)
+                    moved += 1
+                    if on_moved is not None:
+                        on_moved(source)
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self._max_concurrent_moves, len(chains)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # Nenhuma movimentação nova começa; as que estão no thread pool
+            # terminam antes de o erro seguir, e nenhum arquivo é movido depois
+            stopped = True
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return moved
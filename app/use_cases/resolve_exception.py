@@ -3,18 +3,26 @@ UC-02: Resolver Arquivo Não Reconhecido.
 Tenta extrair código de arquivo não identificado usando algoritmos de IA/Regex.
 """
 
+import asyncio
+import contextlib
 import re
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
 
 from app.core.interfaces import (
     CodeNotInManifestError,
     ExtractionFailedError,
     ICodeExtractor,
+    ICodeLocator,
     IContentExtractor,
     IFileSystemManager,
 )
 from app.core.logger import app_logger
-from app.domain.entities import DocumentFile, DocumentStatus, ManifestItem
+from app.domain.entities import (
+    DocumentFile,
+    DocumentStatus,
+    ManifestItem,
+    ResolutionOutcome,
+)
 from app.domain.file_naming import get_filename_with_revision
 
 
@@ -26,13 +34,18 @@ class ResolveExceptionUseCase:
         content_extractor: IContentExtractor,
         code_extractor: ICodeExtractor,
         file_manager: IFileSystemManager,
+        code_locator: Optional[ICodeLocator] = None,
     ):
         """
         Inicializa com serviços de extração e gerenciador de arquivos.
+
+        Com `code_locator`, o código é procurado lendo o arquivo aos poucos
+        (parando no primeiro match) em vez de extrair o texto inteiro.
         """
         self._content_extractor = content_extractor
         self._code_extractor = code_extractor
         self._file_manager = file_manager
+        self._code_locator = code_locator
 
     def _sanitize_code(self, code: str) -> str:
         """
@@ -63,6 +76,68 @@ class ResolveExceptionUseCase:
             ExtractionFailedError: Se não encontrar código
             CodeNotInManifestError: Se detectar código mas não estiver no manifesto
         """
+        manifest_map = {item.document_code: item for item in all_manifest_items}
+        return await self._resolve(file_to_resolve, profile_id, manifest_map)
+
+    async def execute_batch(
+        self,
+        files: List[DocumentFile],
+        profile_id: str,
+        all_manifest_items: List[ManifestItem],
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[ResolutionOutcome]:
+        """
+        Resolve vários arquivos concorrentemente, entregando cada resultado
+        assim que o respectivo arquivo termina (não na ordem de entrada).
+
+        A extração roda no executor do extrator de conteúdo (ex: pool de
+        processos); erros de um arquivo não interrompem os demais.
+
+        Args:
+            files: Arquivos não reconhecidos a resolver
+            profile_id: ID do perfil de extração
+            all_manifest_items: Lista completa do manifesto para busca
+            max_concurrency: Arquivos em processamento simultâneo (padrão: todos)
+
+        Yields:
+            ResolutionOutcome por arquivo
+        """
+        manifest_map = {item.document_code: item for item in all_manifest_items}
+        semaphore = asyncio.Semaphore(max_concurrency or max(1, len(files)))
+        # A verificação de conflito de nome e o rename não são atômicos:
+        # dois arquivos com o mesmo código não podem ser renomeados juntos
+        rename_lock = asyncio.Lock()
+
+        async def _resolve_one(file: DocumentFile) -> ResolutionOutcome:
+            async with semaphore:
+                try:
+                    await self._resolve(file, profile_id, manifest_map, rename_lock)
+                    return ResolutionOutcome(file=file, success=True)
+                except Exception as e:
+                    return ResolutionOutcome(
+                        file=file,
+                        success=False,
+                        error=str(e),
+                        error_type=type(e).__name__,
+                    )
+
+        tasks = [asyncio.ensure_future(_resolve_one(file)) for file in files]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumidor desistiu no meio: não deixa tarefas órfãs
+            for task in tasks:
+                task.cancel()
+
+    async def _resolve(
+        self,
+        file_to_resolve: DocumentFile,
+        profile_id: str,
+        manifest_map: Dict[str, ManifestItem],
+        rename_lock: Optional[asyncio.Lock] = None,
+    ) -> DocumentFile:
+        """Fluxo de resolução de um arquivo, com o manifesto já indexado."""
         try:
             app_logger.info(
                 "Iniciando resolução de exceção",
@@ -72,13 +147,19 @@ class ResolveExceptionUseCase:
                 },
             )
 
-            # 1. Extração de Conteúdo (IO Bound - Async)
-            text = await self._content_extractor.extract_text(
-                file_to_resolve, profile_id
-            )
+            if self._code_locator is not None:
+                # 1-2. Extração incremental, interrompida no primeiro código
+                found_code = await self._code_locator.locate_code(
+                    file_to_resolve, profile_id
+                )
+            else:
+                # 1. Extração de Conteúdo (IO Bound - Async)
+                text = await self._content_extractor.extract_text(
+                    file_to_resolve, profile_id
+                )
 
-            # 2. Extração de Código (CPU Bound - pode ser síncrono ou async, assumindo async pela interface)
-            found_code = await self._code_extractor.find_code(text, profile_id)
+                # 2. Extração de Código (CPU Bound - pode ser síncrono ou async, assumindo async pela interface)
+                found_code = await self._code_extractor.find_code(text, profile_id)
 
             if not found_code:
                 app_logger.warning("Nenhum código encontrado no arquivo")
@@ -91,7 +172,6 @@ class ResolveExceptionUseCase:
             sanitized_code = self._sanitize_code(found_code)
 
             # 4. Busca no Manifesto
-            manifest_map = {item.document_code: item for item in all_manifest_items}
             matched_item = manifest_map.get(sanitized_code)
 
             if not matched_item:
@@ -113,9 +193,10 @@ class ResolveExceptionUseCase:
                 matched_item.document_code + file_to_resolve.path.suffix,
                 matched_item.revision,
             )
-            new_path = await self._file_manager.rename_file(
-                file_to_resolve.path, expected_name
-            )
+            async with rename_lock or contextlib.nullcontext():
+                new_path = await self._file_manager.rename_file(
+                    file_to_resolve.path, expected_name
+                )
             file_to_resolve.path = new_path
 
             app_logger.info(
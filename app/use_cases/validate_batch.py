@@ -3,18 +3,30 @@ UC-01: Validar Lote de Documentos.
 Compara arquivos no disco com um manifesto Excel.
 """
 
-import re
+import asyncio
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from app.core.interfaces import IFileRepository, IManifestRepository
+from app.core.interfaces import (
+    IFileRepository,
+    IManifestRepository,
+    IProgressReporter,
+    ISourceIndex,
+)
 from app.core.logger import app_logger
+from app.domain.code_index import CodeSimilarityIndex
 from app.domain.entities import (
+    CodeSuggestion,
     DocumentFile,
     DocumentStatus,
     ManifestItem,
+    ProgressEvent,
     ValidationResult,
 )
+from app.domain.file_naming import strip_revision_suffix
+
+# Itens do manifesto / arquivos classificados entre dois eventos de progresso
+PROGRESS_BATCH_SIZE = 1000
 
 
 class ValidateBatchUseCase:
@@ -23,13 +35,30 @@ class ValidateBatchUseCase:
     Orquestra os repositórios para comparar arquivos no disco com um manifesto.
     """
 
-    def __init__(self, manifest_repo: IManifestRepository, file_repo: IFileRepository):
+    def __init__(
+        self,
+        manifest_repo: IManifestRepository,
+        file_repo: IFileRepository,
+        source_index: Optional[ISourceIndex] = None,
+        suggestion_limit: int = 3,
+        suggestion_min_score: float = 0.7,
+    ):
         """
         Inicializa o caso de uso com as dependências (repositórios).
         Isso é Injeção de Dependência.
+
+        Com `source_index`, apenas os arquivos novos ou alterados desde a
+        validação anterior são recasados; os demais reaproveitam o item casado
+        (se o manifesto não mudou). Sem nada a recasar nem sugestões a calcular,
+        o manifesto não é lido.
+        Arquivos não reconhecidos recebem até `suggestion_limit` códigos parecidos
+        (0 desativa as sugestões).
         """
         self._manifest_repo = manifest_repo
         self._file_repo = file_repo
+        self._source_index = source_index
+        self._suggestion_limit = suggestion_limit
+        self._suggestion_min_score = suggestion_min_score
 
     def _get_file_base_name(self, file_name: str) -> str:
         """
@@ -42,33 +71,49 @@ class ValidateBatchUseCase:
         - 'DOC-123_Rev0.pdf' -> 'DOC-123'
         - 'DOC-123.pdf' -> 'DOC-123'
         """
-        name_without_ext = Path(file_name).stem
-
-        # Padrões de sufixos de revisão típicos
-        revision_patterns = [
-            r"_[A-Z]$",  # _A, _B, _C, etc.
-            r"_Rev\d+$",  # _Rev0, _Rev1, _Rev2, etc.
-            r"_rev\d+$",  # _rev0, _rev1, _rev2, etc.
-            r"_\d+$",  # _0, _1, _2, etc.
-            r"_final$",  # _final
-            r"_temp$",  # _temp
-            r"_old$",  # _old
-            r"_backup$",  # _backup
-            r"_draft$",  # _draft
-            r"_preliminary$",  # _preliminary
-        ]
-
-        # Verifica se há um sufixo de revisão no final
-        for pattern in revision_patterns:
-            if re.search(pattern, name_without_ext, re.IGNORECASE):
-                # Remove o sufixo encontrado
-                return re.sub(pattern, "", name_without_ext, flags=re.IGNORECASE)
-
-        # Se não encontrou nenhum sufixo conhecido, retorna o nome completo
-        return name_without_ext
+        return strip_revision_suffix(file_name)
+
+    def _suggest_codes(
+        self, manifest_codes: List[str], unrecognized_files: List[DocumentFile]
+    ) -> Dict[Path, List[CodeSuggestion]]:
+        """Sugere códigos do manifesto para os arquivos não reconhecidos."""
+        index = CodeSimilarityIndex(manifest_codes)
+        suggestions: Dict[Path, List[CodeSuggestion]] = {}
+        for file in unrecognized_files:
+            found = index.suggest(
+                self._get_file_base_name(file.path.name),
+                limit=self._suggestion_limit,
+                min_score=self._suggestion_min_score,
+            )
+            if found:
+                suggestions[file.path] = found
+        return suggestions
+
+    async def _record_matches(
+        self,
+        source_directory: Path,
+        scan_id: str,
+        validated_files: List[DocumentFile],
+        unrecognized_files: List[DocumentFile],
+    ) -> None:
+        """Grava o resultado no índice; uma falha aqui não invalida a validação."""
+        matches: Dict[Path, Optional[ManifestItem]] = {
+            f.path: f.associated_manifest_item for f in validated_files
+        }
+        matches.update((f.path, None) for f in unrecognized_files)
+        try:
+            await self._source_index.record_matches(scan_id, matches)
+        except Exception as e:
+            app_logger.warning(
+                "Falha ao atualizar o índice do diretório",
+                extra={"source_directory": str(source_directory), "error": str(e)},
+            )
 
     async def execute(
-        self, manifest_path: Path, source_directory: Path
+        self,
+        manifest_path: Path,
+        source_directory: Path,
+        progress: Optional[IProgressReporter] = None,
     ) -> ValidationResult:
         """
         Executa o fluxo principal do caso de uso.
@@ -76,6 +121,8 @@ class ValidateBatchUseCase:
         Args:
             manifest_path: Caminho do arquivo de manifesto Excel
             source_directory: Diretório com os arquivos a validar
+            progress: Recebe um ProgressEvent a cada etapa e a cada
+                PROGRESS_BATCH_SIZE itens do manifesto / arquivos classificados
 
         Returns:
             ValidationResult com arquivos validados e não reconhecidos
@@ -84,6 +131,12 @@ class ValidateBatchUseCase:
             ManifestReadError: Se houver erro ao ler o manifesto
             SourceDirectoryNotFoundError: Se o diretório não existir
         """
+        counts: Dict[str, int] = {}
+
+        def report(stage: str) -> None:
+            if progress is not None:
+                progress.report(ProgressEvent(stage, **counts))
+
         try:
             app_logger.info(
                 "Iniciando validação de lote",
@@ -93,33 +146,90 @@ class ValidateBatchUseCase:
                 },
             )
 
-            # 1. Carrega os dados do manifesto e do sistema de arquivos
-            manifest_items = await self._manifest_repo.load_from_file(manifest_path)
-            disk_files = await self._file_repo.list_files(source_directory)
+            # 1. Lista os arquivos do disco e calcula o nome base de cada um.
+            # Com o índice incremental e o manifesto igual, arquivos inalterados
+            # reaproveitam o item casado na validação anterior (sem consultar o
+            # manifesto) e os antes não reconhecidos continuam não reconhecidos.
+            report("scanning")
+            delta = None
+            previous_codes: Dict[Path, Optional[str]] = {}
+            previous_items: Dict[Path, ManifestItem] = {}
+            if self._source_index is not None:
+                delta = await self._source_index.refresh(
+                    source_directory, manifest_path
+                )
+                disk_files = delta.files
+                if not delta.manifest_changed:
+                    previous_codes = delta.previous_codes
+                    previous_items = delta.previous_items
+            else:
+                disk_files = await self._file_repo.list_files(source_directory)
+
+            base_names = [
+                (
+                    None
+                    if f.path in previous_items
+                    else (
+                        previous_codes[f.path]
+                        if f.path in previous_codes
+                        else self._get_file_base_name(f.path.name)
+                    )
+                )
+                for f in disk_files
+            ]
+            wanted_codes = {name for name in base_names if name is not None}
+            counts["files_scanned"] = len(disk_files)
+
+            # O manifesto só é lido se há códigos a buscar ou sugestões a
+            # calcular para arquivos não reconhecidos
+            needs_manifest = bool(wanted_codes) or (
+                self._suggestion_limit > 0
+                and any(
+                    name is None and f.path not in previous_items
+                    for f, name in zip(disk_files, base_names)
+                )
+            )
+
+            # 2. Consome o manifesto em streaming, casando os itens à medida que chegam.
+            # Apenas os itens com arquivo correspondente no disco são mantidos em memória.
+            # Em códigos duplicados no manifesto, o último item prevalece.
+            # Os códigos (apenas strings) alimentam o índice de sugestões.
+            matched_items: Dict[str, ManifestItem] = {}
+            manifest_codes: List[str] = []
+            if needs_manifest:
+                report("reading_manifest")
+                async for item in self._manifest_repo.iter_items(manifest_path):
+                    manifest_codes.append(item.document_code)
+                    if item.document_code in wanted_codes:
+                        matched_items[item.document_code] = item
+                    if len(manifest_codes) % PROGRESS_BATCH_SIZE == 0:
+                        counts["manifest_items"] = len(manifest_codes)
+                        report("reading_manifest")
+                counts["manifest_items"] = len(manifest_codes)
 
             app_logger.debug(
                 "Dados carregados",
                 extra={
-                    "manifest_items": len(manifest_items),
+                    "manifest_items": len(manifest_codes),
+                    "manifest_read": needs_manifest,
                     "disk_files": len(disk_files),
+                    "reused_matches": len(previous_items),
                 },
             )
 
-            # 2. Cria um dicionário para busca rápida dos itens do manifesto
-            manifest_map: Dict[str, ManifestItem] = {
-                item.document_code: item for item in manifest_items
-            }
-
             # 3. Inicializa as listas de resultado
             validated_files: List[DocumentFile] = []
             unrecognized_files: List[DocumentFile] = []
 
-            # 4. Itera sobre os arquivos do disco para validação
-            for file in disk_files:
-                base_name = self._get_file_base_name(file.path.name)
-
-                # 5. Tenta encontrar a correspondência no manifesto
-                matched_item = manifest_map.get(base_name)
+            # 4. Classifica os arquivos do disco, preservando a ordem da listagem
+            report("matching")
+            for position, (file, base_name) in enumerate(
+                zip(disk_files, base_names), 1
+            ):
+                # 5. Verifica se houve correspondência no manifesto
+                matched_item = previous_items.get(file.path) or matched_items.get(
+                    base_name
+                )
 
                 if matched_item:
                     # Sucesso: A correspondência foi encontrada
@@ -131,11 +241,34 @@ class ValidateBatchUseCase:
                     file.status = DocumentStatus.UNRECOGNIZED
                     unrecognized_files.append(file)
 
+                if position % PROGRESS_BATCH_SIZE == 0:
+                    counts["files_matched"] = len(validated_files)
+                    counts["files_unrecognized"] = len(unrecognized_files)
+                    report("matching")
+            counts["files_matched"] = len(validated_files)
+            counts["files_unrecognized"] = len(unrecognized_files)
+
+            # 6. Sugere códigos parecidos para os não reconhecidos (CPU, fora do loop)
+            suggestions: Dict[Path, List[CodeSuggestion]] = {}
+            if unrecognized_files and self._suggestion_limit > 0:
+                report("suggesting")
+                loop = asyncio.get_event_loop()
+                suggestions = await loop.run_in_executor(
+                    None, self._suggest_codes, manifest_codes, unrecognized_files
+                )
+
+            if delta is not None:
+                await self._record_matches(
+                    source_directory, delta.scan_id, validated_files, unrecognized_files
+                )
+
+            report("finished")
             app_logger.info(
                 "Validação de lote concluída",
                 extra={
                     "validated_count": len(validated_files),
                     "unrecognized_count": len(unrecognized_files),
+                    "suggested_count": len(suggestions),
                 },
             )
 
@@ -146,6 +279,10 @@ class ValidateBatchUseCase:
                 unrecognized_files=unrecognized_files,
                 success=True,
                 message=f"Validados {len(validated_files)} arquivos, {len(unrecognized_files)} não reconhecidos",
+                added_count=len(delta.added) if delta else 0,
+                changed_count=len(delta.changed) if delta else 0,
+                removed_count=len(delta.removed) if delta else 0,
+                suggestions=suggestions,
             )
 
         except Exception as e:
@@ -0,0 +1,75 @@
+"""
+Benchmark: extração do nome base (remoção do sufixo de revisão).
+
+Compara strip_revision_suffix com a implementação anterior de
+ValidateBatchUseCase._get_file_base_name (dez re.search + re.sub por arquivo).
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_base_name --files 500000
+"""
+
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from app.domain.file_naming import strip_revision_suffix
+
+LEGACY_REVISION_PATTERNS = [
+    r"_[A-Z]$",
+    r"_Rev\d+$",
+    r"_rev\d+$",
+    r"_\d+$",
+    r"_final$",
+    r"_temp$",
+    r"_old$",
+    r"_backup$",
+    r"_draft$",
+    r"_preliminary$",
+]
+
+
+def legacy_base_name(file_name: str) -> str:
+    """Implementação anterior de ValidateBatchUseCase._get_file_base_name."""
+    name_without_ext = Path(file_name).stem
+    for pattern in LEGACY_REVISION_PATTERNS:
+        if re.search(pattern, name_without_ext, re.IGNORECASE):
+            return re.sub(pattern, "", name_without_ext, flags=re.IGNORECASE)
+    return name_without_ext
+
+
+def build_names(count: int, seed: int = 42) -> List[str]:
+    """Nomes no formato real dos lotes, com mistura de sufixos de revisão."""
+    rng = random.Random(seed)
+    suffixes = ["", "_A", "_B", "_Rev0", "_rev2", "_0", "_final", "_draft"]
+    extensions = [".pdf", ".docx", ".dwg", ".xlsx"]
+    return [
+        f"CZ6_RNEST_U22_3.1.1.1_ELE_RIR_ELE-{i:07d}-FL{i % 50:02d}"
+        f"{rng.choice(suffixes)}{rng.choice(extensions)}"
+        for i in range(count)
+    ]
+
+
+def timed(label: str, fn: Callable[[str], str], names: List[str]) -> List[str]:
+    start = time.perf_counter()
+    result = [fn(name) for name in names]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.3f}s  {elapsed / len(names) * 1e6:8.2f} µs/arquivo")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500_000)
+    args = parser.parse_args()
+
+    names = build_names(args.files)
+    baseline = timed("re.search/re.sub (legado)", legacy_base_name, names)
+    optimized = timed("strip_revision_suffix", strip_revision_suffix, names)
+    assert optimized == baseline
+
+
+if __name__ == "__main__":
+    main()
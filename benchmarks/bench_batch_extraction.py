@@ -0,0 +1,69 @@
+"""
+Benchmark: extração de texto em lote (thread pool padrão x pool de processos).
+
+Gera documentos DOCX sintéticos e mede a extração de todos eles pelo
+ProfiledExtractorService com o executor padrão e com create_extraction_pool.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_batch_extraction --files 200
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import docx
+
+from app.domain.entities import DocumentFile
+from app.infrastructure.extraction import (
+    ProfiledExtractorService,
+    create_extraction_pool,
+)
+
+
+def build_files(root: Path, count: int, paragraphs: int) -> List[DocumentFile]:
+    template = root / "template.docx"
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"Linha {i} do relatório de inspeção e recebimento")
+    document.save(template)
+
+    data = template.read_bytes()
+    files = []
+    for i in range(count):
+        path = root / f"RIR_{i:05d}.docx"
+        path.write_bytes(data)
+        files.append(DocumentFile(path=path, size_bytes=len(data)))
+    return files
+
+
+async def extract_all(files: List[DocumentFile], executor: Optional[object]) -> float:
+    service = ProfiledExtractorService(Path("config/patterns.yaml"), executor=executor)
+    start = time.perf_counter()
+    await asyncio.gather(*(service.extract_text(f, "RIR") for f in files))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="docflow-extract-") as tmp:
+        files = build_files(Path(tmp), args.files, args.paragraphs)
+
+        elapsed = asyncio.run(extract_all(files, None))
+        print(f"{'thread pool (padrão)':<24} {elapsed:8.2f}s")
+
+        with create_extraction_pool(args.workers) as pool:
+            elapsed = asyncio.run(extract_all(files, pool))
+        print(f"{'pool de processos':<24} {elapsed:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: localização do código em PDFs grandes (extração completa x incremental).
+
+Gera um "databook" sintético com o código na primeira página e compara
+extract_text_from_pdf + find_code com locate_code_in_pdf.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_code_lookup --pages 300
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from app.infrastructure.extraction import extract_text_from_pdf, locate_code_in_pdf
+from app.infrastructure.extraction_profiles import compile_pattern_set
+
+PATTERNS = ("Codigo do Documento: ([A-Z0-9_-]+)",)
+
+
+def build_pdf(path: Path, pages: List[str]) -> None:
+    """Grava um PDF mínimo com uma linha de texto (Helvetica) por página."""
+    count = len(pages)
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(count))
+    font_id = 3 + 2 * count
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>".encode(),
+    ]
+    for i, text in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources"
+            f" << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode()
+        )
+        lines = " ".join(f"({text} linha {n}) Tj 0 -12 Td" for n in range(50)).encode()
+        stream = b"BT /F1 10 Tf 72 760 Td " + lines + b" ET"
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        data += b"%010d 00000 n \n" % offset
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(data))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="docflow-lookup-") as tmp:
+        pdf = Path(tmp) / "databook.pdf"
+        pages = ["Codigo do Documento: CZ6_RNEST_U22_RIR_B-22026A"] + [
+            f"Anexo {i}" for i in range(1, args.pages)
+        ]
+        build_pdf(pdf, pages)
+
+        start = time.perf_counter()
+        full_code, _ = compile_pattern_set(PATTERNS).search(extract_text_from_pdf(pdf))
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        code, pages_read = locate_code_in_pdf(pdf, PATTERNS)
+        incremental = time.perf_counter() - start
+
+        assert code == full_code
+        print(
+            f"{'extração completa':<22} {full * 1e3:10.1f} ms  ({args.pages} páginas)"
+        )
+        print(
+            f"{'incremental':<22} {incremental * 1e3:10.1f} ms  ({pages_read} página)"
+        )
+
+
+if __name__ == "__main__":
+    main()
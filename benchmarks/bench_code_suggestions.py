@@ -0,0 +1,84 @@
+"""
+Benchmark: sugestão de códigos para arquivos não reconhecidos.
+
+Monta um CodeSimilarityIndex sobre códigos sintéticos no formato real dos
+manifestos (prefixo de projeto comum) e mede o tempo de construção e de
+consulta para nomes com erros de digitação.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_code_suggestions --codes 500000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+from app.domain.code_index import CodeSimilarityIndex
+
+DISCIPLINES = ["ELE", "MEC", "CIV", "INS", "TUB", "EST"]
+
+
+def build_codes(count: int, rng: random.Random) -> List[str]:
+    return [
+        f"CZ6_RNEST_U22_3.1.1.{i % 9}_{rng.choice(DISCIPLINES)}_RIR_"
+        f"{rng.choice(DISCIPLINES)}-{rng.randint(100, 999)}-CHZ-{i:06d}-FL{i % 40:02d}"
+        for i in range(count)
+    ]
+
+
+def mutate(code: str, rng: random.Random) -> str:
+    """Simula um erro comum: troca, remoção ou inserção de um caractere."""
+    pos = rng.randrange(len(code))
+    op = rng.choice(("replace", "delete", "insert"))
+    if op == "replace":
+        return code[:pos] + rng.choice("0O1l_-") + code[pos + 1 :]
+    if op == "delete":
+        return code[:pos] + code[pos + 1 :]
+    return code[:pos] + rng.choice("0O1l_-") + code[pos:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--codes", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=3)
+    parser.add_argument("--min-score", type=float, default=0.7)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    codes = build_codes(args.codes, rng)
+
+    start = time.perf_counter()
+    index = CodeSimilarityIndex(codes)
+    print(
+        f"Construção do índice ({len(index):,} códigos): "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+
+    targets = [rng.choice(codes) for _ in range(args.queries)]
+    queries = [mutate(code, rng) for code in targets]
+
+    latencies = []
+    hits = 0
+    for target, query in zip(targets, queries):
+        start = time.perf_counter()
+        found = index.suggest(query, limit=args.limit, min_score=args.min_score)
+        latencies.append(time.perf_counter() - start)
+        hits += any(s.document_code == target for s in found)
+
+    latencies.sort()
+    print(
+        f"Consultas: {len(queries):,}  acerto no top-{args.limit}: "
+        f"{hits / len(queries):.1%}"
+    )
+    print(
+        f"Latência  mediana {statistics.median(latencies) * 1e3:.3f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1e3:.3f} ms  "
+        f"máx {latencies[-1] * 1e3:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: movimentação entre volumes diferentes (rename falha com EXDEV).
+
+Compara shutil.move (copy2 em blocos de 64KB-1MB + unlink, sem fsync) com
+FileSystemManager.move_file, que cai para copy_file_range/sendfile, fsync,
+verificação de tamanho e remoção da origem, um arquivo por vez e com 16
+movimentações simultâneas (como em OrganizeLotsUseCase). As duas raízes
+precisam estar em montagens diferentes (por padrão /dev/shm e o diretório
+temporário).
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_cross_device_move \\
+        --files 200 --size-mb 4 --source-root /dev/shm
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from app.infrastructure.repositories import FileSystemManager
+
+
+def build_files(root: Path, count: int, size: int) -> List[Path]:
+    root.mkdir(parents=True, exist_ok=True)
+    payload = os.urandom(size)
+    files = []
+    for i in range(count):
+        path = root / f"DOC-{i:05d}.pdf"
+        path.write_bytes(payload)
+        files.append(path)
+    return files
+
+
+def timed(label: str, move: Callable[[List[Path], Path], None], files, target, size):
+    target.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    move(files, target)
+    elapsed = time.perf_counter() - start
+    total = len(files) * size
+    assert sum(f.stat().st_size for f in target.iterdir()) == total
+    print(f"{label:<34} {elapsed:8.2f}s  {total / elapsed / 2**20:10,.1f} MB/s")
+
+
+def shutil_move(files: List[Path], target: Path) -> None:
+    for path in files:
+        shutil.move(path, target / path.name)
+
+
+def manager_move(files: List[Path], target: Path, concurrency: int = 1) -> None:
+    manager = FileSystemManager()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def move(path: Path) -> None:
+        async with slots:
+            await manager.move_file(path, target / path.name)
+
+    async def run() -> None:
+        await asyncio.gather(*(move(path) for path in files))
+
+    asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--source-root", default="/dev/shm")
+    args = parser.parse_args()
+    size = int(args.size_mb * 2**20)
+
+    with tempfile.TemporaryDirectory(
+        prefix="docflow-xdev-src-", dir=args.source_root
+    ) as src, tempfile.TemporaryDirectory(prefix="docflow-xdev-dst-") as dst:
+        if os.stat(src).st_dev == os.stat(dst).st_dev:
+            raise SystemExit("Origem e destino estão no mesmo volume")
+
+        runs = (
+            ("shutil.move", shutil_move),
+            ("FileSystemManager (1 por vez)", manager_move),
+            (
+                "FileSystemManager (16 simultâneos)",
+                lambda files, target: manager_move(files, target, 16),
+            ),
+        )
+        for run, (label, move) in enumerate(runs):
+            files = build_files(Path(src) / f"run_{run}", args.files, size)
+            timed(label, move, files, Path(dst) / f"run_{run}", size)
+
+
+if __name__ == "__main__":
+    main()
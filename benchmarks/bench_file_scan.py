@@ -0,0 +1,76 @@
+"""
+Benchmark: varredura de diretório (rglob legado x scandir paralelo).
+
+Cria uma árvore sintética e compara o tempo de FileRepository._list_files_sync
+com a implementação anterior baseada em Path.rglob + is_file + stat.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_file_scan --files 100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from app.domain.entities import DocumentFile
+from app.infrastructure.repositories import FileRepository
+from app.infrastructure.scanner import ParallelDirectoryScanner
+
+
+def legacy_rglob_list(directory: Path) -> List[DocumentFile]:
+    """Implementação anterior de FileRepository._list_files_sync."""
+    found_files: List[DocumentFile] = []
+    for path in directory.rglob("*"):
+        if path.is_file():
+            try:
+                found_files.append(
+                    DocumentFile(path=path, size_bytes=path.stat().st_size)
+                )
+            except OSError:
+                continue
+    return found_files
+
+
+def build_tree(root: Path, total_files: int, files_per_dir: int) -> None:
+    """Cria `total_files` arquivos pequenos distribuídos em subpastas de 2 níveis."""
+    for i in range(total_files):
+        dir_idx = i // files_per_dir
+        folder = root / f"area_{dir_idx // 50:03d}" / f"lote_{dir_idx:05d}"
+        if i % files_per_dir == 0:
+            folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"CZ6_RNEST_U22_DOC-{i:07d}_A.pdf").write_bytes(b"%PDF")
+
+
+def timed(label: str, fn, directory: Path) -> List[DocumentFile]:
+    start = time.perf_counter()
+    files = fn(directory)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {len(files) / elapsed:12,.0f} files/s")
+    return files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--files-per-dir", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="docflow-scan-") as tmp:
+        root = Path(tmp)
+        print(f"Criando {args.files:,} arquivos em {root} ...")
+        build_tree(root, args.files, args.files_per_dir)
+
+        baseline = timed("rglob (legado)", legacy_rglob_list, root)
+        expected = {(str(f.path), f.size_bytes) for f in baseline}
+
+        for workers in args.workers:
+            repo = FileRepository(scanner=ParallelDirectoryScanner(max_workers=workers))
+            files = timed(f"scandir ({workers} workers)", repo._list_files_sync, root)
+            assert {(str(f.path), f.size_bytes) for f in files} == expected
+
+
+if __name__ == "__main__":
+    main()
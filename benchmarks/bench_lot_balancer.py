@@ -0,0 +1,111 @@
+"""
+Benchmark: balanceamento de grupos em lotes (GreedyLotBalancerService).
+
+Compara a implementação anterior (min() sobre todos os lotes a cada grupo,
+recalculando total_size_bytes de cada lote) com a atual (tamanhos calculados
+uma vez e lotes num heap). As duas devem produzir a mesma atribuição; a
+anterior só é medida até --legacy-max-files, pois cresce muito mais rápido.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_lot_balancer \\
+        --files 1000000 --lots 10000
+"""
+
+import argparse
+import math
+import random
+import time
+from pathlib import Path
+from typing import List
+
+from app.domain.entities import DocumentFile, DocumentGroup, OutputLot
+from app.infrastructure.services import GreedyLotBalancerService
+
+
+class LegacyLotBalancer:
+    """Implementação anterior de GreedyLotBalancerService."""
+
+    def balance_lots(
+        self, groups: List[DocumentGroup], max_docs_per_lot: int
+    ) -> List[OutputLot]:
+        if not groups:
+            return []
+
+        sorted_groups = sorted(
+            groups, key=lambda g: sum(f.size_bytes for f in g.files), reverse=True
+        )
+
+        if max_docs_per_lot <= 0:
+            max_docs_per_lot = len(sorted_groups) or 1
+
+        num_lots = math.ceil(len(sorted_groups) / max_docs_per_lot)
+        if num_lots < 1:
+            num_lots = 1
+
+        lots: List[OutputLot] = [
+            OutputLot(lot_name=f"Lote_{i + 1}") for i in range(num_lots)
+        ]
+
+        for group in sorted_groups:
+            lightest_lot = min(lots, key=lambda lot: lot.total_size_bytes)
+            lightest_lot.groups.append(group)
+
+        return lots
+
+
+def build_groups(files: int, seed: int = 0) -> List[DocumentGroup]:
+    """Grupos de 1 a 3 arquivos (PDF e nativos), com tamanhos variados."""
+    rng = random.Random(seed)
+    groups = []
+    created = 0
+    while created < files:
+        count = min(rng.randint(1, 3), files - created)
+        code = f"DOC-{len(groups):07d}"
+        groups.append(
+            DocumentGroup(
+                document_code=code,
+                files=[
+                    DocumentFile(
+                        path=Path(f"{code}_{j}.pdf"),
+                        size_bytes=rng.randint(10_000, 50_000_000),
+                    )
+                    for j in range(count)
+                ],
+            )
+        )
+        created += count
+    return groups
+
+
+def timed(balancer, groups: List[DocumentGroup], per_lot: int):
+    start = time.perf_counter()
+    lots = balancer.balance_lots(groups, per_lot)
+    return lots, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--lots", type=int, default=10_000)
+    parser.add_argument("--legacy-max-files", type=int, default=5_000)
+    args = parser.parse_args()
+
+    for files in sorted({min(args.files, args.legacy_max_files), args.files}):
+        groups = build_groups(files)
+        # Mesma proporção arquivos/lote em todas as escalas
+        lots_wanted = max(1, args.lots * files // args.files)
+        per_lot = math.ceil(len(groups) / lots_wanted)
+
+        lots, current = timed(GreedyLotBalancerService(), groups, per_lot)
+        line = f"{files:>9,} arquivos / {len(lots):>6,} lotes  heap: {current:8.3f}s"
+        if files <= args.legacy_max_files:
+            legacy_lots, legacy = timed(LegacyLotBalancer(), groups, per_lot)
+            assert [[g.document_code for g in lot.groups] for lot in lots] == [
+                [g.document_code for g in lot.groups] for lot in legacy_lots
+            ]
+            line += f"  min() (legado): {legacy:8.3f}s  ({legacy / current:,.0f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
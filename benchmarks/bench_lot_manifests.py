@@ -0,0 +1,262 @@
+"""
+Benchmark: geração dos manifestos Excel dos lotes.
+
+Compara o caminho anterior (copiar o template para o lote, reabrir com
+load_workbook, inserir linhas, formatar e salvar) com o atual, em que o
+template é lido uma vez e cada manifesto é montado em memória e gravado uma
+única vez. O template sintético tem cabeçalho, marcador FIM e rodapé.
+
+Também mede só a formatação (mais o save) de uma planilha grande: objetos de
+estilo criados célula a célula (anterior) contra estilos nomeados do workbook
+aplicados por referência (atual).
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_lot_manifests --lots 500 --rows 100 \\
+        --format-rows 20000
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import openpyxl
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.worksheet.worksheet import Worksheet
+
+from app.domain.entities import DocumentFile, DocumentGroup, ManifestItem
+from app.domain.file_naming import get_filename_with_revision
+from app.infrastructure.repositories import FileSystemManager
+from app.infrastructure.template_filler import OpenpyxlTemplateFiller
+
+HEADER = [
+    "CÓDIGO",
+    "REVISÃO",
+    "TÍTULO",
+    "ARQUIVO",
+    "FORMATO",
+    "DISCIPLINA",
+    "TIPO DE DOCUMENTO",
+    "PROPÓSITO",
+    "CAMINHO DATABOOK",
+]
+
+
+def build_template(path: Path) -> Path:
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Manifesto"
+    sheet.append(HEADER)
+    for cell in sheet[1]:
+        cell.font = Font(bold=True)
+    sheet.append(["FIM"])
+    sheet.append(["Emitido por", None, "Engenharia"])
+    sheet["C3"].fill = PatternFill("solid", start_color="DDDDDD")
+    workbook.save(path)
+    return path
+
+
+def build_groups(rows: int) -> List[DocumentGroup]:
+    groups = []
+    for i in range(rows):
+        item = ManifestItem(
+            f"CZ6-RNEST-U22-DOC-{i:05d}",
+            "B",
+            f"Documento técnico número {i} da unidade 22",
+            {"FORMATO": "A1", "DISCIPLINA": "Elétrica", "PROPÓSITO": "Para construção"},
+        )
+        file = DocumentFile(
+            Path(f"/origem/CZ6-RNEST-U22-DOC-{i:05d}.pdf"),
+            size_bytes=1024,
+            associated_manifest_item=item,
+        )
+        groups.append(DocumentGroup(item.document_code, [file]))
+    return groups
+
+
+class LegacyTemplateFiller:
+    """Implementação anterior de OpenpyxlTemplateFiller (após a cópia do template)."""
+
+    def _fill_workbook_sync(self, output_path: Path, data: List[DocumentGroup]) -> None:
+        """Lógica síncrona de preenchimento do Excel."""
+        workbook = openpyxl.load_workbook(output_path)
+        sheet: Worksheet = workbook.active
+
+        # Encontrar onde inserir os dados (após cabeçalho, antes de "FIM")
+        insert_row = 2
+        for row_num in range(2, sheet.max_row + 1):
+            cell_value = sheet.cell(row=row_num, column=1).value
+            if cell_value and str(cell_value).upper() == "FIM":
+                insert_row = row_num
+                break
+
+        # Preparar dados
+        all_rows_data = []
+        for group in data:
+            manifest_info = group.files[0].associated_manifest_item
+            if not manifest_info:
+                continue
+
+            for file in group.files:
+                revision = manifest_info.revision
+                filename_with_revision = get_filename_with_revision(
+                    file.path.name, revision
+                )
+
+                row_data = [
+                    manifest_info.document_code,
+                    manifest_info.revision,
+                    manifest_info.title,
+                    filename_with_revision,
+                    manifest_info.metadata.get("FORMATO", "A4"),
+                    manifest_info.metadata.get("DISCIPLINA", ""),
+                    manifest_info.metadata.get("TIPO DE DOCUMENTO", ""),
+                    manifest_info.metadata.get("PROPÓSITO", ""),
+                    manifest_info.metadata.get("CAMINHO DATABOOK", ""),
+                ]
+                all_rows_data.append(row_data)
+
+        # Inserir e Preencher
+        if all_rows_data:
+            # Insere linhas
+            if len(all_rows_data) > 0:
+                sheet.insert_rows(insert_row, amount=len(all_rows_data))
+
+            # Preenche dados
+            for i, row_data in enumerate(all_rows_data):
+                target_row = insert_row + i
+                for col_num, value in enumerate(row_data, 1):
+                    sheet.cell(row=target_row, column=col_num, value=value)
+
+        # Formatação
+        self._apply_formatting(sheet, insert_row, len(all_rows_data))
+
+        workbook.save(output_path)
+        workbook.close()
+
+    def _apply_formatting(
+        self, sheet: Worksheet, data_start_row: int, num_data_rows: int
+    ):
+        """Aplica formatação básica."""
+        num_columns = 9
+
+        # Helper para borda fina
+        thin_border = Border(
+            left=Side(style="thin"),
+            right=Side(style="thin"),
+            top=Side(style="thin"),
+            bottom=Side(style="thin"),
+        )
+
+        # Cabeçalho (amarelo)
+        header_fill = PatternFill(
+            start_color="FFFF00", end_color="FFFF00", fill_type="solid"
+        )
+        for col in range(1, num_columns + 1):
+            cell = sheet.cell(row=1, column=col)
+            cell.fill = header_fill
+            cell.border = thin_border
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+
+        # Dados
+        for r in range(data_start_row, data_start_row + num_data_rows):
+            for c in range(1, num_columns + 1):
+                cell = sheet.cell(row=r, column=c)
+                cell.border = thin_border
+                cell.alignment = Alignment(horizontal="left", vertical="center")
+
+        # Ajustar larguras
+        widths = {
+            "A": 35,
+            "B": 10,
+            "C": 60,
+            "D": 35,
+            "E": 10,
+            "F": 20,
+            "G": 20,
+            "H": 20,
+            "I": 20,
+        }
+        for col_letter, width in widths.items():
+            sheet.column_dimensions[col_letter].width = width
+
+
+def legacy_fill(
+    filler: LegacyTemplateFiller, template: Path, output: Path, data
+) -> None:
+    """Caminho anterior: cópia do template + load_workbook + insert_rows."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(template, output)
+    filler._fill_workbook_sync(output, data)
+
+
+async def current_fill(
+    filler: OpenpyxlTemplateFiller, template: Path, output: Path, data
+) -> None:
+    await filler.fill_and_save(template, output, data)
+
+
+def time_formatting(apply_formatting, rows: int, output: Path) -> float:
+    """Preenche `rows` linhas, formata e salva; mede formatação + save."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for i in range(rows):
+        sheet.append([f"DOC-{i:05d}", "B", "Título", f"DOC-{i:05d}_B.pdf", "A1"])
+    start = time.perf_counter()
+    apply_formatting(sheet, 2, rows)
+    workbook.save(output)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lots", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--format-rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    data = build_groups(args.rows)
+    with tempfile.TemporaryDirectory(prefix="docflow-manifests-") as tmp:
+        root = Path(tmp)
+        template = build_template(root / "manifest_template.xlsx")
+
+        legacy_filler = LegacyTemplateFiller()
+        start = time.perf_counter()
+        for i in range(args.lots):
+            legacy_fill(
+                legacy_filler, template, root / "legado" / f"L{i:04d}.xlsx", data
+            )
+        legacy = time.perf_counter() - start
+        print(f"{'cópia + load_workbook':<24} {legacy:8.2f}s")
+
+        filler = OpenpyxlTemplateFiller(FileSystemManager())
+
+        async def run() -> None:
+            for i in range(args.lots):
+                await current_fill(
+                    filler, template, root / "atual" / f"L{i:04d}.xlsx", data
+                )
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        current = time.perf_counter() - start
+        print(f"{'modelo em memória':<24} {current:8.2f}s  ({legacy / current:.1f}x)")
+
+        print(f"\nformatação + save de {args.format_rows} linhas")
+        legacy = time_formatting(
+            legacy_filler._apply_formatting, args.format_rows, root / "fmt_legado.xlsx"
+        )
+        print(f"{'estilos por célula':<24} {legacy:8.2f}s")
+        current = time_formatting(
+            filler._apply_formatting, args.format_rows, root / "fmt_atual.xlsx"
+        )
+        print(f"{'estilos nomeados':<24} {current:8.2f}s  ({legacy / current:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: qualidade e tempo das estratégias de balanceamento de lotes.
+
+Roda cada estratégia registrada (greedy, karmarkar_karp, ffd, discipline...)
+sobre distribuições sintéticas de tamanhos e informa, por estratégia: lotes
+gerados, desequilíbrio (bytes do maior lote / bytes do menor), maior número
+de arquivos num lote e tempo. Os grupos têm de 1 a 3 arquivos e uma
+disciplina (metadado DISCIPLINA do manifesto).
+
+Observação: "ffd" trata --max-docs-per-lot como limite de arquivos por lote
+(e respeita --max-mb); as demais derivam o número de lotes da contagem de
+grupos, como o balanceador guloso original.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_lot_strategies \\
+        --files 100000 --max-docs-per-lot 200 --max-mb 4096
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.domain.entities import DocumentFile, DocumentGroup, ManifestItem
+from app.infrastructure.services import (
+    ConstrainedLotBalancerService,
+    available_balancers,
+    create_balancer,
+)
+
+MB = 2**20
+
+DISCIPLINES = [
+    "Elétrica",
+    "Civil",
+    "Mecânica",
+    "Tubulação",
+    "Instrumentação",
+    "Processo",
+]
+DISCIPLINE_WEIGHTS = [30, 25, 15, 15, 10, 5]
+
+
+def uniform(rng: random.Random) -> int:
+    return rng.randint(10_000, 50 * MB)
+
+
+def lognormal(rng: random.Random) -> int:
+    """Muitos PDFs pequenos e uma cauda longa de arquivos grandes."""
+    return max(1_000, int(rng.lognormvariate(13.5, 1.5)))
+
+
+def bimodal(rng: random.Random) -> int:
+    """95% documentos de texto, 5% desenhos/modelos de centenas de MB."""
+    if rng.random() < 0.05:
+        return rng.randint(200 * MB, 1024 * MB)
+    return rng.randint(100_000, 2 * MB)
+
+
+DISTRIBUTIONS: Dict[str, Callable[[random.Random], int]] = {
+    "uniforme": uniform,
+    "lognormal": lognormal,
+    "bimodal": bimodal,
+}
+
+
+def build_groups(
+    files: int, size: Callable[[random.Random], int], seed: int = 0
+) -> List[DocumentGroup]:
+    rng = random.Random(seed)
+    groups = []
+    created = 0
+    while created < files:
+        count = min(rng.randint(1, 3), files - created)
+        code = f"DOC-{len(groups):07d}"
+        item = ManifestItem(
+            code,
+            "A",
+            "",
+            {"DISCIPLINA": rng.choices(DISCIPLINES, DISCIPLINE_WEIGHTS)[0]},
+        )
+        groups.append(
+            DocumentGroup(
+                document_code=code,
+                files=[
+                    DocumentFile(
+                        path=Path(f"{code}_{j}.pdf"),
+                        size_bytes=size(rng),
+                        associated_manifest_item=item,
+                    )
+                    for j in range(count)
+                ],
+            )
+        )
+        created += count
+    return groups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--max-docs-per-lot", type=int, default=200)
+    parser.add_argument("--max-mb", type=int, default=4096)
+    parser.add_argument(
+        "--strategies", nargs="+", default=None, help="padrão: todas as registradas"
+    )
+    args = parser.parse_args()
+
+    strategies = args.strategies or available_balancers()
+    print(
+        f"{'distribuição':<12} {'estratégia':<15} {'lotes':>6} "
+        f"{'maior/menor':>12} {'arq. máx.':>9} {'tempo':>9}"
+    )
+    for name, size in DISTRIBUTIONS.items():
+        groups = build_groups(args.files, size)
+        for strategy in strategies:
+            if strategy == "ffd":
+                balancer = ConstrainedLotBalancerService(
+                    max_bytes_per_lot=args.max_mb * MB
+                )
+            else:
+                balancer = create_balancer(strategy)
+
+            start = time.perf_counter()
+            lots = balancer.balance_lots(groups, args.max_docs_per_lot)
+            elapsed = time.perf_counter() - start
+
+            sizes = [lot.total_size_bytes for lot in lots]
+            imbalance = max(sizes) / min(sizes) if min(sizes) else float("inf")
+            most_files = max(len(lot.files) for lot in lots)
+            print(
+                f"{name:<12} {strategy:<15} {len(lots):>6} {imbalance:>12.4f} "
+                f"{most_files:>9} {elapsed:>8.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
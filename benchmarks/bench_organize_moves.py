@@ -0,0 +1,183 @@
+"""
+Benchmark: movimentação de arquivos na organização de lotes.
+
+Compara o caminho anterior (um arquivo por vez, com create_directory do
+diretório pai antes de cada rename) com OrganizeLotsUseCase, que cria cada
+diretório de lote uma vez e move os arquivos em paralelo, com limite de
+concorrência. Origem e destino ficam no mesmo volume (rename). Os lotes são
+fatias consecutivas dos grupos, para medir só as movimentações.
+
+Com --manifests, cada lote também gera seu manifesto Excel (openpyxl): no
+caminho anterior o lote seguinte espera o manifesto; no atual os manifestos
+são preenchidos enquanto os lotes seguintes são movidos.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_organize_moves --files 50000
+    SECRET_KEY=bench python -m benchmarks.bench_organize_moves --files 20000 \
+        --manifests --concurrency 16
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import openpyxl
+
+from app.core.interfaces import ITemplateFiller
+from app.domain.entities import DocumentFile, DocumentGroup, ManifestItem, OutputLot
+from app.domain.file_naming import get_filename_with_revision
+from app.infrastructure.repositories import FileSystemManager
+from app.infrastructure.template_filler import OpenpyxlTemplateFiller
+from app.use_cases.organize_lots import OrganizeLotsUseCase
+
+
+class SliceBalancer:
+    """Lotes com `max_docs_per_lot` grupos consecutivos."""
+
+    def balance_lots(
+        self, groups: List[DocumentGroup], max_docs_per_lot: int
+    ) -> List[OutputLot]:
+        return [
+            OutputLot(lot_name="", groups=groups[i : i + max_docs_per_lot])
+            for i in range(0, len(groups), max_docs_per_lot)
+        ]
+
+
+class NullTemplateFiller:
+    """Não gera manifestos: o benchmark mede só as movimentações."""
+
+    async def fill_and_save(self, template_path, output_path, data) -> None:
+        return None
+
+
+def build_template(path: Path) -> Path:
+    """Template mínimo: cabeçalho e marcador FIM."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["CÓDIGO", "REVISÃO", "TÍTULO", "ARQUIVO", "FORMATO"])
+    sheet.append(["FIM"])
+    workbook.save(path)
+    return path
+
+
+def make_filler(
+    manager: FileSystemManager, template: Optional[Path]
+) -> ITemplateFiller:
+    return OpenpyxlTemplateFiller(manager) if template else NullTemplateFiller()
+
+
+async def legacy_organize(
+    files: List[DocumentFile],
+    output: Path,
+    max_docs_per_lot: int,
+    template: Optional[Path] = None,
+) -> int:
+    """Laço anterior de OrganizeLotsUseCase: await sequencial por arquivo."""
+    manager = FileSystemManager()
+    filler = make_filler(manager, template)
+    groups = [
+        DocumentGroup(document_code=f.associated_manifest_item.document_code, files=[f])
+        for f in files
+    ]
+    lots = SliceBalancer().balance_lots(groups, max_docs_per_lot)
+    moved = 0
+    loop = asyncio.get_event_loop()
+    for i, lot in enumerate(lots):
+        lot_dir = output / f"LOTE_{i + 1:04d}"
+        await manager.create_directory(lot_dir)
+        for file in lot.files:
+            destination = lot_dir / get_filename_with_revision(file.path.name, "A")
+            await manager.create_directory(destination.parent)
+            await loop.run_in_executor(None, file.path.rename, destination)
+            moved += 1
+        await filler.fill_and_save(
+            template or Path("unused.xlsx"),
+            lot_dir / f"{lot_dir.name}.xlsx",
+            lot.groups,
+        )
+    return moved
+
+
+async def concurrent_organize(
+    files: List[DocumentFile],
+    output: Path,
+    max_docs_per_lot: int,
+    concurrency: int,
+    template: Optional[Path] = None,
+) -> int:
+    manager = FileSystemManager()
+    use_case = OrganizeLotsUseCase(
+        balancer=SliceBalancer(),
+        file_manager=manager,
+        template_filler=make_filler(manager, template),
+        max_concurrent_moves=concurrency,
+    )
+    result = await use_case.execute(
+        validated_files=files,
+        output_directory=output,
+        master_template_path=template or Path("unused.xlsx"),
+        max_docs_per_lot=max_docs_per_lot,
+        start_sequence_number=1,
+        lot_name_pattern="LOTE_XXXX",
+    )
+    assert result.success, result.message
+    return result.files_moved
+
+
+def build_files(source: Path, count: int) -> List[DocumentFile]:
+    source.mkdir(parents=True, exist_ok=True)
+    files = []
+    for i in range(count):
+        path = source / f"DOC-{i:06d}.pdf"
+        path.write_bytes(b"%PDF")
+        files.append(
+            DocumentFile(
+                path=path,
+                size_bytes=4,
+                associated_manifest_item=ManifestItem(f"DOC-{i:06d}", "A", ""),
+            )
+        )
+    return files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--max-docs-per-lot", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--manifests", action="store_true")
+    args = parser.parse_args()
+
+    runs = [("sequencial (legado)", None)] + [
+        (f"concorrente ({c})", c) for c in args.concurrency
+    ]
+    with tempfile.TemporaryDirectory(prefix="docflow-moves-") as tmp:
+        template = (
+            build_template(Path(tmp) / "template.xlsx") if args.manifests else None
+        )
+        for run, (label, concurrency) in enumerate(runs):
+            root = Path(tmp) / f"run_{run}"
+            files = build_files(root / "origem", args.files)
+            output = root / "saida"
+
+            start = time.perf_counter()
+            if concurrency is None:
+                moved = asyncio.run(
+                    legacy_organize(files, output, args.max_docs_per_lot, template)
+                )
+            else:
+                moved = asyncio.run(
+                    concurrent_organize(
+                        files, output, args.max_docs_per_lot, concurrency, template
+                    )
+                )
+            elapsed = time.perf_counter() - start
+            assert moved == args.files
+            print(f"{label:<22} {elapsed:8.2f}s  {moved / elapsed:10,.0f} arquivos/s")
+
+
+if __name__ == "__main__":
+    main()
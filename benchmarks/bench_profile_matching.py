@@ -0,0 +1,80 @@
+"""
+Benchmark: busca de códigos em todos os perfis de config/patterns.yaml.
+
+Compara a busca anterior (perfil a perfil, um re.search por padrão sem
+otimização) com o modo AUTO, que avalia os padrões otimizados de todos os
+perfis em uma única alternação, sobre textos do tamanho de uma página extraída.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_profile_matching --texts 2000
+"""
+
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+
+from app.infrastructure.extraction_profiles import (
+    PATTERN_FLAGS,
+    build_combined_matcher,
+    validate_profiles_config,
+)
+
+FILLER = "Relatorio de inspecao de recebimento item conforme norma tecnica "
+
+
+def build_text(rng: random.Random, with_code: bool) -> str:
+    words = (FILLER * 60).split()
+    rng.shuffle(words)
+    text = " ".join(words)
+    if with_code:
+        code = f"CZ6_RNEST_U22_3.1.1.{rng.randint(1, 9)}_CVL_RIR_B-{rng.randint(1000, 99999)}A"
+        pos = rng.randrange(len(text))
+        text = text[:pos] + f" {code} " + text[pos:]
+    return text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--config", type=Path, default=Path("config/patterns.yaml"))
+    parser.add_argument("--texts", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    texts = [build_text(rng, with_code=i % 4 == 0) for i in range(args.texts)]
+    profiles = validate_profiles_config(args.config)
+    matcher = build_combined_matcher(profiles)
+
+    raw = [
+        re.compile(source, PATTERN_FLAGS)
+        for profile in profiles.values()
+        for source in profile.patterns.sources
+    ]
+
+    start = time.perf_counter()
+    per_profile = []
+    for text in texts:
+        match = next(filter(None, (pattern.search(text) for pattern in raw)), None)
+        per_profile.append(match.group(1) if match else None)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    combined = []
+    for text in texts:
+        found = matcher.patterns.search(text)
+        combined.append(found[0] if found else None)
+    one_pass = time.perf_counter() - start
+
+    assert sum(c is not None for c in combined) >= sum(
+        c is not None for c in per_profile
+    )
+    patterns = sum(len(p.patterns.sources) for p in profiles.values())
+    print(f"{len(profiles)} perfis, {patterns} padrões, {len(texts)} textos")
+    print(f"Perfil a perfil:     {sequential * 1000:.1f} ms")
+    print(f"AUTO (1 passada):    {one_pass * 1000:.1f} ms")
+    print(f"Speedup:             {sequential / one_pass:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
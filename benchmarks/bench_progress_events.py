@@ -0,0 +1,133 @@
+"""
+Benchmark: custo do progresso nos casos de uso.
+
+Roda ValidateBatchUseCase (repositórios em memória) e OrganizeLotsUseCase
+(movimentação simulada) sem reporter e com um ProgressStream lido por um
+consumidor no intervalo do SSE, como em /api/jobs/{id}/events. Mostra o
+tempo extra e quantas atualizações chegam ao consumidor.
+
+Uso:
+    SECRET_KEY=bench LOG_LEVEL=WARNING python -m benchmarks.bench_progress_events \\
+        --files 100000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from app.domain.entities import DocumentFile, DocumentGroup, ManifestItem, OutputLot
+from app.infrastructure.progress import ProgressStream
+from app.use_cases.organize_lots import OrganizeLotsUseCase
+from app.use_cases.validate_batch import ValidateBatchUseCase
+
+
+class MemoryManifest:
+    def __init__(self, items: List[ManifestItem]):
+        self._items = items
+
+    async def iter_items(self, file_path: Path):
+        for item in self._items:
+            yield item
+
+
+class MemoryFiles:
+    def __init__(self, files: List[DocumentFile]):
+        self._files = files
+
+    async def list_files(self, directory: Path) -> List[DocumentFile]:
+        return list(self._files)
+
+
+class NoopFileManager:
+    async def create_directory(self, path: Path) -> None:
+        pass
+
+    async def move_file(self, source: Path, destination: Path) -> None:
+        await asyncio.sleep(0)
+
+
+class NoopFiller:
+    async def fill_and_save(self, template_path, output_path, data) -> None:
+        pass
+
+
+class ChunkBalancer:
+    def balance_lots(self, groups, max_docs_per_lot):
+        return [
+            OutputLot(lot_name="", groups=groups[i : i + max_docs_per_lot])
+            for i in range(0, len(groups), max_docs_per_lot)
+        ]
+
+
+async def consume(stream: ProgressStream, interval: float) -> int:
+    return sum([1 async for _ in stream.updates(interval)])
+
+
+async def timed(run, progress: Optional[ProgressStream], interval: float):
+    consumer = asyncio.ensure_future(consume(progress, interval)) if progress else None
+    start = time.perf_counter()
+    await run(progress)
+    elapsed = time.perf_counter() - start
+    if consumer is None:
+        return elapsed, 0
+    progress.close()
+    return elapsed, await consumer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--interval", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    items = [ManifestItem(f"DOC-{i:06d}", "A", "") for i in range(args.files)]
+    files = [
+        DocumentFile(
+            Path(f"/origem/DOC-{i:06d}_A.pdf"), 1024, associated_manifest_item=item
+        )
+        for i, item in enumerate(items)
+    ]
+    groups = [
+        DocumentGroup(f.associated_manifest_item.document_code, [f]) for f in files
+    ]
+
+    validate = ValidateBatchUseCase(
+        MemoryManifest(items), MemoryFiles(files), suggestion_limit=0
+    )
+    organize = OrganizeLotsUseCase(ChunkBalancer(), NoopFileManager(), NoopFiller())
+
+    async def run_validate(progress):
+        await validate.execute(Path("m.xlsx"), Path("/origem"), progress)
+
+    async def run_organize(progress):
+        await organize.execute(
+            [f for g in groups for f in g.files],
+            Path("/saida"),
+            Path("t.xlsx"),
+            1000,
+            1,
+            "LOTE_XXXX",
+            progress=progress,
+        )
+
+    for name, run in (("validação", run_validate), ("organização", run_organize)):
+        # Melhor de `--repeat` execuções (a primeira paga o aquecimento)
+        base = min(
+            asyncio.run(timed(run, None, args.interval))[0] for _ in range(args.repeat)
+        )
+        runs = [
+            asyncio.run(timed(run, ProgressStream(), args.interval))
+            for _ in range(args.repeat)
+        ]
+        with_progress, updates = min(runs)
+        print(
+            f"{name:<12} sem progresso {base:7.2f}s  com progresso {with_progress:7.2f}s"
+            f"  (+{(with_progress - base) / base:5.1%})  {updates} atualizações"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: persistência de documentos validados.
+
+Compara o caminho anterior (limpeza linha a linha pelo ORM + um objeto
+ValidatedDocument por arquivo) com DatabaseManager.save_validated_documents
+(DELETE único + inserts em lote na mesma transação), regravando a mesma
+sessão como em uma revalidação.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_save_documents --files 100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.domain.entities import DocumentFile, DocumentStatus, ManifestItem
+from app.domain.models import ValidatedDocument
+from app.infrastructure.database import DatabaseManager
+
+SESSION_ID = "bench_session"
+
+
+def legacy_save(manager: DatabaseManager, documents: List[DocumentFile]) -> int:
+    """Implementação anterior de save_validated_documents."""
+    with Session(manager.engine) as db:
+        for row in db.exec(
+            select(ValidatedDocument).where(ValidatedDocument.session_id == SESSION_ID)
+        ).all():
+            db.delete(row)
+        db.commit()
+
+    with Session(manager.engine) as db:
+        for doc in documents:
+            item = doc.associated_manifest_item
+            db.add(
+                ValidatedDocument(
+                    session_id=SESSION_ID,
+                    path=str(doc.path),
+                    filename=doc.path.name,
+                    size_bytes=doc.size_bytes,
+                    status=doc.status.value,
+                    document_code=item.document_code if item else None,
+                    revision=item.revision if item else None,
+                    title=item.title if item else None,
+                )
+            )
+        db.commit()
+    return len(documents)
+
+
+def build_documents(count: int) -> List[DocumentFile]:
+    return [
+        DocumentFile(
+            path=Path(f"/origem/lote_{i // 1000:03d}/DOC-{i:06d}_A.pdf"),
+            size_bytes=1024 + i,
+            status=DocumentStatus.VALIDATED,
+            associated_manifest_item=ManifestItem(
+                document_code=f"DOC-{i:06d}", revision="A", title=f"Documento {i}"
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label: str, fn, documents: List[DocumentFile]) -> float:
+    # Duas gravações: a segunda inclui a limpeza das linhas da primeira
+    fn(documents)
+    start = time.perf_counter()
+    fn(documents)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:8.2f}s  {len(documents) / elapsed:10,.0f} linhas/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    args = parser.parse_args()
+
+    documents = build_documents(args.files)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.DATABASE_PATH = str(Path(tmp) / "bench.db")
+        manager = DatabaseManager()
+        manager.init_db()
+
+        legacy = timed("anterior", lambda d: legacy_save(manager, d), documents)
+        bulk = timed(
+            "em lote",
+            lambda d: manager.save_validated_documents(SESSION_ID, d),
+            documents,
+        )
+        print(f"Speedup: {legacy / bulk:.1f}x")
+        manager.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
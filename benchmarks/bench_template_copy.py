@@ -0,0 +1,86 @@
+"""
+Benchmark: cópia de arquivos por FileSystemManager.copy_file.
+
+Compara a implementação anterior (aiofiles em blocos de 1MB: cada leitura e
+escrita é uma passagem pelo thread pool) com a atual (uma única chamada ao
+executor, com reflink/copy_file_range/sendfile). Mede cópias repetidas do
+template mestre, como na geração de milhares de manifestos de lote, e a
+cópia de um arquivo grande.
+
+Uso:
+    SECRET_KEY=bench python -m benchmarks.bench_template_copy --copies 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import aiofiles
+
+from app.infrastructure.repositories import FileSystemManager
+
+
+async def legacy_copy(
+    manager: FileSystemManager, source: Path, destination: Path
+) -> None:
+    """Implementação anterior de FileSystemManager.copy_file."""
+    await manager.create_directory(destination.parent)
+    async with aiofiles.open(source, "rb") as src:
+        async with aiofiles.open(destination, "wb") as dst:
+            while chunk := await src.read(1024 * 1024):
+                await dst.write(chunk)
+
+
+async def run(copy, source: Path, target: Path, copies: int) -> float:
+    start = time.perf_counter()
+    for i in range(copies):
+        await copy(source, target / f"LOTE_{i:05d}" / source.name)
+    return time.perf_counter() - start
+
+
+def report(label: str, elapsed: float, copies: int, size: int) -> None:
+    print(
+        f"{label:<34} {elapsed:8.3f}s  {copies / elapsed:10,.0f} cópias/s"
+        f"  {copies * size / elapsed / 2**20:10,.1f} MB/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=2000)
+    parser.add_argument("--template-kb", type=int, default=60)
+    parser.add_argument("--large-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="docflow-copy-") as tmp:
+        root = Path(tmp)
+        template = root / "manifest_template.xlsx"
+        template.write_bytes(os.urandom(args.template_kb * 1024))
+        large = root / "databook.pdf"
+        large.write_bytes(os.urandom(args.large_mb * 2**20))
+
+        cases = (
+            ("template", template, args.copies),
+            ("arquivo grande", large, 3),
+        )
+        for name, source, copies in cases:
+            size = source.stat().st_size
+            legacy_manager, manager = FileSystemManager(), FileSystemManager()
+
+            async def legacy(src: Path, dst: Path) -> None:
+                await legacy_copy(legacy_manager, src, dst)
+
+            for label, copy in (
+                ("aiofiles (legado)", legacy),
+                ("copy_file", manager.copy_file),
+            ):
+                target = root / f"{name}-{label.split()[0]}"
+                elapsed = asyncio.run(run(copy, source, target, copies))
+                report(f"{name}: {label}", elapsed, copies, size)
+
+
+if __name__ == "__main__":
+    main()
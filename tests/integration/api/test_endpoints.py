@@ -31,6 +31,19 @@ app.dependency_overrides[get_validation_service] = override_get_validation_servi
 app.dependency_overrides[get_organization_service] = override_get_organization_service
 
 
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Caches em disco dos services ficam no tmp_path, fora da árvore do repositório."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(
+        settings, "MANIFEST_CACHE_PATH", str(tmp_path / "manifest_cache.db")
+    )
+    monkeypatch.setattr(
+        settings, "EXTRACTION_CACHE_PATH", str(tmp_path / "extraction_cache.db")
+    )
+
+
 def test_health_check():
     """Testa endpoint de health check."""
     response = client.get("/api/health")
@@ -107,3 +120,143 @@ def test_organize_lots_not_implemented():
     response = client.post("/api/organize", json=payload)
 
     assert response.status_code == 501
+
+
+def test_get_unknown_job_returns_404():
+    response = client.get("/api/jobs/inexistente")
+    assert response.status_code == 404
+
+
+def test_validation_job_runs_in_background(tmp_path):
+    """Submete a validação como job e consulta o resultado por polling."""
+    import time
+
+    from fastapi import FastAPI
+
+    from app.api.endpoints import router
+    from app.core.config import settings
+    from app.infrastructure.database import DatabaseManager
+    from app.infrastructure.job_queue import JobQueue
+
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(settings, "DATABASE_PATH", str(tmp_path / "jobs.db"))
+        db = DatabaseManager()
+        db.init_db()
+
+    service = MagicMock()
+    service.validate_batch = AsyncMock(
+        return_value=ValidationResult(
+            success=True, message="OK", validated_count=1, unrecognized_count=0
+        )
+    )
+    queue = JobQueue(db, progress_interval_seconds=0)
+    manifest = tmp_path / "manifesto.xlsx"
+    manifest.touch()
+
+    # Só as rotas da API: o lifespan do NiceGUI exige ui.run(). O TestClient
+    # como context manager mantém o mesmo event loop entre as requisições.
+    api = FastAPI()
+    api.include_router(router)
+
+    with patch("app.api.endpoints.job_queue", queue), patch(
+        "app.api.endpoints.get_validation_service", return_value=service
+    ), TestClient(api) as job_client:
+        response = job_client.post(
+            "/api/jobs/validate",
+            json={"manifest_path": str(manifest), "source_directory": str(tmp_path)},
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        for _ in range(200):
+            job = job_client.get(f"/api/jobs/{job_id}").json()
+            if job["status"] == "succeeded":
+                break
+            time.sleep(0.02)
+
+        assert job["status"] == "succeeded"
+        assert job["result"]["validated_count"] == 1
+        assert job_client.post(f"/api/jobs/{job_id}/cancel").status_code == 409
+
+        # Job concluído: o stream SSE entrega só o estado final
+        events = job_client.get(f"/api/jobs/{job_id}/events")
+        assert events.headers["content-type"].startswith("text/event-stream")
+        assert events.text.startswith("event: job\ndata: ")
+        assert '"status":"succeeded"' in events.text
+        assert job_client.get("/api/jobs/inexistente/events").status_code == 404
+    db.engine.dispose()
+
+
+def test_job_events_end_with_final_state_of_running_job(tmp_path):
+    """
+    Stream aberto com o job em execução: o evento finished do caso de uso
+    chega antes de o serviço terminar, e o último evento traz o estado final.
+    """
+    import asyncio
+
+    from fastapi import FastAPI
+
+    from app.api.endpoints import router
+    from app.core.config import settings
+    from app.domain.entities import ProgressEvent
+    from app.infrastructure.database import DatabaseManager
+    from app.infrastructure.job_queue import JobQueue
+
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(settings, "DATABASE_PATH", str(tmp_path / "jobs.db"))
+        db = DatabaseManager()
+        db.init_db()
+
+    async def validate_batch(manifest_path, source_directory, session_id, progress):
+        progress.report(ProgressEvent("matching", files_scanned=2, files_matched=1))
+        await asyncio.sleep(0.1)
+        progress.report(ProgressEvent("finished", files_scanned=2, files_matched=2))
+        # Como a gravação da sessão no ValidationService, depois do finished
+        await asyncio.sleep(0.3)
+        return ValidationResult(
+            success=True, message="OK", validated_count=2, unrecognized_count=0
+        )
+
+    service = MagicMock()
+    service.validate_batch = validate_batch
+    queue = JobQueue(db, progress_interval_seconds=0)
+    manifest = tmp_path / "manifesto.xlsx"
+    manifest.touch()
+
+    api = FastAPI()
+    api.include_router(router)
+
+    with patch("app.api.endpoints.job_queue", queue), patch(
+        "app.api.endpoints.get_validation_service", return_value=service
+    ), patch.object(settings, "PROGRESS_STREAM_INTERVAL_SECONDS", 0), TestClient(
+        api
+    ) as job_client:
+        response = job_client.post(
+            "/api/jobs/validate",
+            json={"manifest_path": str(manifest), "source_directory": str(tmp_path)},
+        )
+        job_id = response.json()["job_id"]
+        assert response.json()["status"] in ("queued", "running")
+
+        events = job_client.get(f"/api/jobs/{job_id}/events").text
+
+    db.engine.dispose()
+    messages = [m for m in events.split("\n\n") if m]
+    assert messages[0].startswith("event: progress\n")
+    assert '"stage":"finished"' in events
+    assert messages[-1].startswith("event: job\n")
+    assert '"status":"succeeded"' in messages[-1]
+    assert '"validated_count":2' in messages[-1]
+
+
+@pytest.mark.parametrize("path", ["/api/organize", "/api/jobs/organize"])
+def test_unknown_balancer_strategy_is_rejected(path, tmp_path):
+    """Estratégia desconhecida: 422 na requisição, sem criar o diretório de saída."""
+    output = tmp_path / "saida"
+    response = client.post(
+        path,
+        json={"output_directory": str(output), "balancer_strategy": "nope"},
+    )
+    assert response.status_code == 422
+    assert "Unknown balancer strategy" in response.text
+    assert not output.exists()
@@ -21,6 +21,19 @@ from app.services.validation_service import ValidationService
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Caches em disco dos services ficam no tmp_path, fora da árvore do repositório."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(
+        settings, "MANIFEST_CACHE_PATH", str(tmp_path / "manifest_cache.db")
+    )
+    monkeypatch.setattr(
+        settings, "EXTRACTION_CACHE_PATH", str(tmp_path / "extraction_cache.db")
+    )
+
+
 @pytest.fixture
 def test_db_manager(tmp_path):
     # Setup isolado do DB para este teste de integração
@@ -36,6 +49,7 @@ def test_db_manager(tmp_path):
     from sqlmodel import create_engine
 
     db_manager.engine = create_engine(f"sqlite:///{test_db}")
+    db_manager._initialized = False  # Banco novo: recria as tabelas
     db_manager.init_db()
 
     # Set session id (como faria o middleware/startup)
@@ -150,3 +164,128 @@ def test_full_flow_validate_then_organize(
     assert validated_files_passed[0].associated_manifest_item.document_code == "DOC-1"
 
     print("[TEST] Full flow verified!")
+
+
+def test_session_documents_endpoint_paginates(test_db_manager):
+    session_id = test_db_manager.create_session()
+    documents = [
+        DocumentFile(Path(f"c:/docs/{i}.pdf"), i, DocumentStatus.VALIDATED)
+        for i in range(5)
+    ]
+    test_db_manager.save_validated_documents(session_id, documents)
+
+    names = []
+    after_id = 0
+    while after_id is not None:
+        resp = client.get(
+            f"/api/sessions/{session_id}/documents",
+            params={"after_id": after_id, "limit": 2},
+        )
+        assert resp.status_code == 200
+        page = resp.json()
+        names += [item["filename"] for item in page["items"]]
+        after_id = page["next_after_id"]
+
+    assert names == [f"{i}.pdf" for i in range(5)]
+    assert (
+        client.get(
+            f"/api/sessions/{session_id}/documents", params={"limit": 0}
+        ).status_code
+        == 422
+    )
+
+
+def test_session_documents_endpoint_unknown_session(test_db_manager):
+    resp = client.get(f"/api/sessions/{uuid.uuid4()}/documents")
+
+    assert resp.status_code == 404
+
+
+@patch("app.api.endpoints.get_validation_service")
+@patch("app.api.endpoints.get_organization_service")
+def test_concurrent_sessions_do_not_clobber_each_other(
+    mock_get_org_service, mock_get_valid_service, test_db_manager, tmp_path
+):
+    """Cada /validate cria sua sessão; /organize usa a sessão informada."""
+    service = ValidationService(
+        manifest_repo=MagicMock(), file_repo=MagicMock(), db_manager=test_db_manager
+    )
+    service._Use_case.execute = AsyncMock(
+        side_effect=[
+            ValidationResult(
+                validated_count=1,
+                validated_files=[
+                    DocumentFile(Path(f"c:/{user}.pdf"), 1, DocumentStatus.VALIDATED)
+                ],
+            )
+            for user in ("ana", "bruno")
+        ]
+    )
+    mock_get_valid_service.return_value = service
+
+    org_service = OrganizationService(
+        file_manager=MagicMock(), db_manager=test_db_manager
+    )
+    org_service._use_case.execute = AsyncMock(
+        return_value=OrganizationResult(success=True, lots_created=1, files_moved=1)
+    )
+    mock_get_org_service.return_value = org_service
+
+    manifest = tmp_path / "manifest.xlsx"
+    manifest.touch()
+    payload = {"manifest_path": str(manifest), "source_directory": str(tmp_path)}
+    first = client.post("/api/validate", json=payload).json()["session_id"]
+    second = client.post("/api/validate", json=payload).json()["session_id"]
+
+    assert first != second
+    assert [d.filename for d in test_db_manager.get_validated_documents(first)] == [
+        "ana.pdf"
+    ]
+    assert test_db_manager.get_session(second).document_count == 1
+
+    resp = client.post(
+        "/api/organize",
+        json={"session_id": first, "output_directory": str(tmp_path / "out")},
+    )
+    assert resp.status_code == 200
+    passed = org_service._use_case.execute.call_args.kwargs["validated_files"]
+    assert [f.path.name for f in passed] == ["ana.pdf"]
+
+    resp = client.post(
+        "/api/organize",
+        json={"session_id": "desconhecida", "output_directory": str(tmp_path)},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_failed_validation_keeps_sessions_untouched(
+    test_db_manager, tmp_path, monkeypatch
+):
+    """Falha do caso de uso: nenhuma sessão criada, documentos da sessão mantidos."""
+    service = ValidationService(
+        manifest_repo=MagicMock(), file_repo=MagicMock(), db_manager=test_db_manager
+    )
+    session_id = test_db_manager.create_session(tmp_path / "m.xlsx", tmp_path)
+    test_db_manager.save_validated_documents(
+        session_id, [DocumentFile(Path("c:/ana.pdf"), 1, DocumentStatus.VALIDATED)]
+    )
+    service._Use_case.execute = AsyncMock(
+        return_value=ValidationResult(
+            success=False, message="Diretório de origem não encontrado"
+        )
+    )
+    create_session = MagicMock(wraps=test_db_manager.create_session)
+    monkeypatch.setattr(test_db_manager, "create_session", create_session)
+
+    revalidated = await service.validate_batch(
+        tmp_path / "m.xlsx", tmp_path / "ausente", session_id=session_id
+    )
+    new = await service.validate_batch(tmp_path / "m.xlsx", tmp_path / "ausente")
+
+    assert not revalidated.success and not new.success
+    assert new.session_id is None
+    create_session.assert_not_called()
+    assert [
+        d.filename for d in test_db_manager.get_validated_documents(session_id)
+    ] == ["ana.pdf"]
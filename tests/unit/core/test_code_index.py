@@ -0,0 +1,77 @@
+"""
+Testes unitários para app.domain.code_index.
+"""
+
+import random
+
+import pytest
+
+from app.domain.code_index import CodeSimilarityIndex
+
+
+def _brute_force(index, codes, name, limit, min_score):
+    """Pontua todos os códigos, sem o filtro de candidatos do índice."""
+    scored = []
+    for code in set(codes):
+        score = index.similarity(name, code)
+        if score >= min_score:
+            scored.append((-score, code))
+    return [code for _, code in sorted(scored)[:limit]]
+
+
+class TestCodeSimilarityIndex:
+    """Testes para CodeSimilarityIndex."""
+
+    def test_suggests_closest_code_first(self):
+        index = CodeSimilarityIndex(["DOC-001", "DOC-002", "REL-777", "DOC-010"])
+
+        suggestions = index.suggest("DOC-01", limit=2)
+
+        assert suggestions[0].document_code == "DOC-001"
+        assert len(suggestions) == 2
+        assert suggestions[0].score >= suggestions[1].score
+
+    def test_exact_code_scores_one(self):
+        index = CodeSimilarityIndex(["ELE-700-CHZ-247-FL04"])
+
+        [suggestion] = index.suggest("ele-700-chz-247-fl04")
+
+        assert suggestion.score == 1.0
+
+    def test_respects_min_score_and_limit(self):
+        index = CodeSimilarityIndex(["AAAA", "BBBB", "AAAB"])
+
+        assert index.suggest("ZZZZ") == []
+        assert index.similarity("AAAA", "CCCC") == 0.0
+        assert index.suggest("AAAA", limit=0) == []
+        assert len(index.suggest("AAAA", limit=1, min_score=0.1)) == 1
+
+    def test_common_prefix_weighs_less_than_distinctive_part(self):
+        codes = [f"CZ6_RNEST_U22_DOC-{i:04d}" for i in range(200)] + ["XYZ-0042"]
+        index = CodeSimilarityIndex(codes)
+
+        # O nome compartilha só o prefixo comum com os códigos do projeto
+        assert index.suggest("CZ6_RNEST_U22_FOTO", min_score=0.5) == []
+        assert index.suggest("XYZ-00042")[0].document_code == "XYZ-0042"
+
+    def test_ignores_empty_and_duplicate_codes(self):
+        index = CodeSimilarityIndex(["DOC-1", "", "DOC-1"])
+
+        assert len(index) == 1
+
+    @pytest.mark.parametrize("min_score", [0.3, 0.5, 0.7])
+    def test_matches_brute_force(self, min_score):
+        rng = random.Random(7)
+        codes = [
+            f"CZ6_RNEST_U22_{rng.choice(['ELE', 'MEC', 'CIV'])}-{rng.randint(0, 999):03d}"
+            f"-FL{rng.randint(0, 20):02d}"
+            for _ in range(500)
+        ]
+        index = CodeSimilarityIndex(codes)
+
+        for _ in range(100):
+            name = rng.choice(codes)
+            pos = rng.randrange(len(name))
+            name = name[:pos] + rng.choice("X9_-") + name[pos + 1 :]
+            found = [s.document_code for s in index.suggest(name, 5, min_score)]
+            assert found == _brute_force(index, codes, name, 5, min_score)
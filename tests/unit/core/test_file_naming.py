@@ -1,13 +1,76 @@
 """
 Testes unitários para app.domain.file_naming.
-Cobre get_filename_with_revision e generate_unique_filename.
+Cobre get_filename_with_revision, generate_unique_filename e strip_revision_suffix.
 """
 
+import random
+import re
 from pathlib import Path
 
 import pytest
 
-from app.domain.file_naming import generate_unique_filename, get_filename_with_revision
+from app.domain.file_naming import (
+    generate_unique_filename,
+    get_filename_with_revision,
+    strip_revision_suffix,
+)
+
+# Implementação original (um re.search + re.sub por padrão), usada como oráculo
+_LEGACY_REVISION_PATTERNS = [
+    r"_[A-Z]$",
+    r"_Rev\d+$",
+    r"_rev\d+$",
+    r"_\d+$",
+    r"_final$",
+    r"_temp$",
+    r"_old$",
+    r"_backup$",
+    r"_draft$",
+    r"_preliminary$",
+]
+
+
+def _legacy_base_name(file_name: str) -> str:
+    name_without_ext = Path(file_name).stem
+    for pattern in _LEGACY_REVISION_PATTERNS:
+        if re.search(pattern, name_without_ext, re.IGNORECASE):
+            return re.sub(pattern, "", name_without_ext, flags=re.IGNORECASE)
+    return name_without_ext
+
+
+def _generated_names(count: int, seed: int = 1234):
+    rng = random.Random(seed)
+    alphabet = "AZaz09_-.ſK é"
+    suffixes = [
+        "",
+        "_A",
+        "_z",
+        "_Rev3",
+        "_REV12",
+        "_rev",
+        "_0",
+        "_42",
+        "_final",
+        "_FINAL",
+        "_temp",
+        "_old",
+        "_backup",
+        "_draft",
+        "_preliminary",
+        "_AB",
+        "_",
+        "__A",
+        "_A_B",
+        "_final2",
+        "_ſ",
+        "_K",
+        "_A\n",
+        "_1.5",
+    ]
+    extensions = ["", ".pdf", ".DOCX", ".tar.gz", ".", "..", ".a"]
+    for _ in range(count):
+        body = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        yield body + rng.choice(suffixes) + rng.choice(extensions)
 
 
 class TestGetFilenameWithRevision:
@@ -78,3 +141,45 @@ class TestGenerateUniqueFilename:
         target = tmp_path / "new_file.pdf"
         result = generate_unique_filename(target)
         assert result == tmp_path / "new_file_001.pdf"
+
+
+class TestStripRevisionSuffix:
+    """Paridade de strip_revision_suffix com a implementação original."""
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [
+            (
+                "CZ6_RNEST_U22_3.1.1.1_ELE_RIR_ELE-700-CHZ-247-FL04.pdf",
+                "CZ6_RNEST_U22_3.1.1.1_ELE_RIR_ELE-700-CHZ-247-FL04",
+            ),
+            (
+                "CZ6_RNEST_U22_3.1.1.1_ELE_RIR_ELE-700-CHZ-247-FL04_A.pdf",
+                "CZ6_RNEST_U22_3.1.1.1_ELE_RIR_ELE-700-CHZ-247-FL04",
+            ),
+            ("DOC-123_Rev0.pdf", "DOC-123"),
+            ("DOC-123.pdf", "DOC-123"),
+            ("DOC-001_A.pdf", "DOC-001"),
+            ("REPORT-123_rev1.docx", "REPORT-123"),
+            ("COMPLEX_DOC_NAME_A.pdf", "COMPLEX_DOC_NAME"),
+            ("DOC_final.pdf", "DOC"),
+            ("DOC_AB.pdf", "DOC_AB"),
+            ("_A.pdf", ""),
+        ],
+    )
+    def test_known_examples(self, file_name, expected):
+        assert strip_revision_suffix(file_name) == expected
+        assert _legacy_base_name(file_name) == expected
+
+    @pytest.mark.parametrize(
+        "file_name",
+        ["", ".", "..", ".bashrc", "a.", "pasta/DOC_A.pdf", "DOC_A.pdf/", "x_1\n"],
+    )
+    def test_path_edge_cases(self, file_name):
+        assert strip_revision_suffix(file_name) == _legacy_base_name(file_name)
+
+    def test_generated_names_match_legacy(self):
+        for file_name in _generated_names(20000):
+            assert strip_revision_suffix(file_name) == _legacy_base_name(
+                file_name
+            ), file_name
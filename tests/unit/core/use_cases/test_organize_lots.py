@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -138,3 +139,387 @@ async def test_organize_lots_file_move_error():
     assert result.success is False
     assert "Erro na organização" in result.message
     assert result.files_moved == 0
+
+
+def _lot_files(count: int, prefix: str = "DOC") -> DocumentGroup:
+    files = [
+        DocumentFile(
+            path=Path(f"C:/source/{prefix}-{i:03d}.pdf"),
+            size_bytes=1024,
+            associated_manifest_item=ManifestItem(f"{prefix}-{i:03d}", "A", ""),
+        )
+        for i in range(count)
+    ]
+    return DocumentGroup(document_code=prefix, files=files)
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_moves_concurrently_within_limit():
+    """As movimentações de um lote rodam em paralelo, respeitando o limite."""
+    group = _lot_files(20)
+    mock_balancer = MagicMock()
+    mock_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[group])
+    ]
+
+    in_flight = 0
+    peak = 0
+
+    async def slow_move(source, destination):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock(side_effect=slow_move)
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock()
+
+    use_case = OrganizeLotsUseCase(
+        balancer=mock_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+        max_concurrent_moves=4,
+    )
+    result = await use_case.execute(
+        validated_files=group.files,
+        output_directory=Path("C:/output"),
+        master_template_path=Path("C:/template.xlsx"),
+        max_docs_per_lot=100,
+        start_sequence_number=1,
+        lot_name_pattern="LOT_XXXX",
+    )
+
+    assert result.success is True
+    assert result.files_moved == 20
+    assert peak == 4
+    # Diretório do lote criado uma única vez
+    mock_file_manager.create_directory.assert_awaited_once_with(
+        Path("C:/output/LOT_0001")
+    )
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_fills_manifest_while_next_lot_moves():
+    """O manifesto de um lote é gerado após seus arquivos, em paralelo ao lote seguinte."""
+    first, second = _lot_files(5, "AAA"), _lot_files(5, "BBB")
+    mock_balancer = MagicMock()
+    mock_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[first]),
+        OutputLot(lot_name="LOT_0002", groups=[second]),
+    ]
+
+    events = []
+    second_lot_moved = asyncio.Event()
+
+    async def record_move(source, destination):
+        await asyncio.sleep(0)
+        events.append(("move", destination.parent.name))
+        if events.count(("move", "LOT_0002")) == 5:
+            second_lot_moved.set()
+
+    async def record_fill(template_path, output_path, groups):
+        lot_name = output_path.parent.name
+        events.append(("fill", lot_name))
+        if lot_name == "LOT_0001":
+            # Só termina se o lote seguinte puder ser movido enquanto isso
+            await asyncio.wait_for(second_lot_moved.wait(), timeout=1)
+        events.append(("filled", lot_name))
+
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock(side_effect=record_move)
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock(side_effect=record_fill)
+
+    use_case = OrganizeLotsUseCase(
+        balancer=mock_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+        max_concurrent_moves=3,
+    )
+    result = await use_case.execute(
+        validated_files=first.files + second.files,
+        output_directory=Path("C:/output"),
+        master_template_path=Path("C:/template.xlsx"),
+        max_docs_per_lot=5,
+        start_sequence_number=1,
+        lot_name_pattern="LOT_XXXX",
+    )
+
+    assert result.success is True
+    assert events[:6] == [("move", "LOT_0001")] * 5 + [("fill", "LOT_0001")]
+    assert events.index(("filled", "LOT_0001")) > events.index(("move", "LOT_0002"))
+    last_move = max(i for i, e in enumerate(events) if e == ("move", "LOT_0002"))
+    assert events.index(("fill", "LOT_0002")) > last_move
+    assert ("filled", "LOT_0002") in events
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_manifest_error_fails_organization():
+    """Falha no preenchimento de um manifesto em segundo plano é reportada."""
+    first, second = _lot_files(2, "AAA"), _lot_files(2, "BBB")
+    mock_balancer = MagicMock()
+    mock_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[first]),
+        OutputLot(lot_name="LOT_0002", groups=[second]),
+    ]
+
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock()
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock(
+        side_effect=Exception("Template corrompido")
+    )
+
+    use_case = OrganizeLotsUseCase(
+        balancer=mock_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+    )
+    result = await use_case.execute(
+        validated_files=first.files + second.files,
+        output_directory=Path("C:/output"),
+        master_template_path=Path("C:/template.xlsx"),
+        max_docs_per_lot=2,
+        start_sequence_number=1,
+        lot_name_pattern="LOT_XXXX",
+    )
+
+    assert result.success is False
+    assert "Template corrompido" in result.message
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_same_destination_moves_in_order():
+    """Arquivos com o mesmo nome de destino são movidos em sequência, na ordem."""
+    item = ManifestItem("DOC-001", "B", "")
+    files = [
+        DocumentFile(
+            path=Path(f"C:/source/{folder}/DOC-001.pdf"),
+            size_bytes=1,
+            associated_manifest_item=item,
+        )
+        for folder in ("a", "b", "c")
+    ]
+    group = DocumentGroup(document_code="DOC-001", files=files)
+    mock_balancer = MagicMock()
+    mock_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[group])
+    ]
+
+    in_flight = 0
+    order = []
+
+    async def move(source, destination):
+        nonlocal in_flight
+        in_flight += 1
+        assert in_flight == 1
+        await asyncio.sleep(0)
+        order.append(source.parent.name)
+        in_flight -= 1
+
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock(side_effect=move)
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock()
+
+    use_case = OrganizeLotsUseCase(
+        balancer=mock_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+        max_concurrent_moves=8,
+    )
+    result = await use_case.execute(
+        validated_files=files,
+        output_directory=Path("C:/output"),
+        master_template_path=Path("C:/template.xlsx"),
+        max_docs_per_lot=100,
+        start_sequence_number=1,
+        lot_name_pattern="LOT_XXXX",
+    )
+
+    assert result.success is True
+    assert order == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_reports_transfer_stats():
+    """Cada lote informa arquivos, bytes e vazão da movimentação."""
+    group = _lot_files(3)
+    mock_balancer = MagicMock()
+    mock_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[group])
+    ]
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock()
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock()
+
+    use_case = OrganizeLotsUseCase(
+        balancer=mock_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+    )
+    result = await use_case.execute(
+        validated_files=group.files,
+        output_directory=Path("C:/output"),
+        master_template_path=Path("C:/template.xlsx"),
+        max_docs_per_lot=100,
+        start_sequence_number=1,
+        lot_name_pattern="LOT_XXXX",
+    )
+
+    [stats] = result.lot_stats
+    assert (stats.lot_name, stats.files, stats.bytes_moved) == ("LOT_0001", 3, 3072)
+    assert stats.seconds >= 0
+    assert stats.bytes_per_second >= 0
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_uses_balancer_given_to_execute():
+    """O balanceador passado a execute substitui o do construtor."""
+    group = _lot_files(2)
+    default_balancer = MagicMock()
+    run_balancer = MagicMock()
+    run_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[group])
+    ]
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock()
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock()
+
+    use_case = OrganizeLotsUseCase(
+        balancer=default_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+    )
+    result = await use_case.execute(
+        validated_files=group.files,
+        output_directory=Path("C:/output"),
+        master_template_path=Path("C:/template.xlsx"),
+        max_docs_per_lot=100,
+        start_sequence_number=1,
+        lot_name_pattern="LOT_XXXX",
+        balancer=run_balancer,
+    )
+
+    assert result.success
+    run_balancer.balance_lots.assert_called_once()
+    default_balancer.balance_lots.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_cancelled_by_reporter_finishes_started_moves():
+    """
+    Um reporter que interrompe (job cancelado) impede novas movimentações e
+    manifestos, e as movimentações em andamento terminam antes do retorno.
+    """
+    group = _lot_files(20)
+    mock_balancer = MagicMock()
+    mock_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[group])
+    ]
+
+    in_flight = 0
+    started = 0
+    finished = 0
+
+    async def slow_move(source, destination):
+        nonlocal in_flight, started, finished
+        in_flight += 1
+        started += 1
+        await asyncio.sleep(0.01 * (started % 3 + 1))
+        in_flight -= 1
+        finished += 1
+
+    class CancellingReporter:
+        def report(self, event):
+            if event.files_moved >= 2:
+                raise asyncio.CancelledError()
+
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock(side_effect=slow_move)
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock()
+
+    use_case = OrganizeLotsUseCase(
+        balancer=mock_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+        max_concurrent_moves=4,
+    )
+    with pytest.raises(asyncio.CancelledError):
+        await use_case.execute(
+            validated_files=group.files,
+            output_directory=Path("C:/output"),
+            master_template_path=Path("C:/template.xlsx"),
+            max_docs_per_lot=100,
+            start_sequence_number=1,
+            lot_name_pattern="LOT_XXXX",
+            progress=CancellingReporter(),
+        )
+
+    assert in_flight == 0
+    assert started == finished < 20
+    mock_template_filler.fill_and_save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_organize_lots_reports_progress():
+    """Cada arquivo movido e cada lote concluído geram um ProgressEvent."""
+    first, second = _lot_files(3), _lot_files(2, prefix="OUT")
+    mock_balancer = MagicMock()
+    mock_balancer.balance_lots.return_value = [
+        OutputLot(lot_name="LOT_0001", groups=[first]),
+        OutputLot(lot_name="LOT_0002", groups=[second]),
+    ]
+    mock_file_manager = MagicMock()
+    mock_file_manager.create_directory = AsyncMock()
+    mock_file_manager.move_file = AsyncMock()
+    mock_template_filler = MagicMock()
+    mock_template_filler.fill_and_save = AsyncMock()
+    progress = MagicMock()
+
+    use_case = OrganizeLotsUseCase(
+        balancer=mock_balancer,
+        file_manager=mock_file_manager,
+        template_filler=mock_template_filler,
+    )
+    await use_case.execute(
+        validated_files=first.files + second.files,
+        output_directory=Path("C:/output"),
+        master_template_path=Path("C:/template.xlsx"),
+        max_docs_per_lot=3,
+        start_sequence_number=1,
+        lot_name_pattern="LOT_XXXX",
+        progress=progress,
+    )
+
+    events = [call.args[0] for call in progress.report.call_args_list]
+    # Início + 5 arquivos + 2 lotes + finished
+    assert len(events) == 9
+    assert [e.files_moved for e in events if e.stage == "moving"] == [
+        0,
+        1,
+        2,
+        3,
+        3,
+        4,
+        5,
+        5,
+    ]
+    final = events[-1]
+    assert final.finished
+    assert (final.lots_moved, final.lots_total) == (2, 2)
+    assert (final.current, final.total) == (5, 5)
+    assert final.bytes_moved == final.bytes_total == 5 * 1024
@@ -133,3 +133,71 @@ async def test_resolve_renames_file_with_correct_name():
     mock_file_manager.rename_file.assert_awaited_once_with(
         Path("/docs/wrong_name.pdf"), "ELE-700-CHZ-247_A.pdf"
     )
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_streams_outcomes_as_files_finish():
+    """Resultados chegam na ordem de término e falhas não interrompem o lote."""
+    import asyncio
+
+    manifest = [ManifestItem("DOC-1", "A", ""), ManifestItem("DOC-2", "0", "")]
+    slow = DocumentFile(path=Path("/src/lento.pdf"), size_bytes=0)
+    fast = DocumentFile(path=Path("/src/rapido.pdf"), size_bytes=0)
+    missing = DocumentFile(path=Path("/src/fora.pdf"), size_bytes=0)
+    texts = {slow.path: "DOC-1", fast.path: "DOC-2", missing.path: "DOC-9"}
+
+    async def extract_text(file, profile_id):
+        await asyncio.sleep(0.05 if file is slow else 0)
+        return texts[file.path]
+
+    mock_content_extractor = MagicMock()
+    mock_content_extractor.extract_text = AsyncMock(side_effect=extract_text)
+    mock_code_extractor = MagicMock()
+    mock_code_extractor.find_code = AsyncMock(side_effect=lambda text, _: text)
+
+    use_case = _make_use_case(mock_content_extractor, mock_code_extractor)
+
+    outcomes = [
+        outcome
+        async for outcome in use_case.execute_batch(
+            [slow, fast, missing], "RIR", manifest
+        )
+    ]
+
+    assert outcomes[-1].file is slow
+    by_file = {id(o.file): o for o in outcomes}
+    assert by_file[id(slow)].success and by_file[id(fast)].success
+    assert by_file[id(missing)].error_type == "CodeNotInManifestError"
+    assert slow.path == Path("/src/DOC-1_A.pdf")
+    assert fast.path == Path("/src/DOC-2_0.pdf")
+
+
+@pytest.mark.asyncio
+async def test_resolve_with_code_locator_skips_full_extraction():
+    """Com code_locator, o código vem da leitura incremental do arquivo."""
+    file_to_resolve = DocumentFile(path=Path("/src/databook.pdf"), size_bytes=0)
+    mock_content_extractor = MagicMock()
+    mock_content_extractor.extract_text = AsyncMock()
+    mock_code_extractor = MagicMock()
+    mock_code_extractor.find_code = AsyncMock()
+    mock_locator = MagicMock()
+    mock_locator.locate_code = AsyncMock(return_value="DOC-123")
+
+    file_manager = MagicMock()
+    file_manager.rename_file = AsyncMock(
+        side_effect=lambda source, new_name: source.parent / new_name
+    )
+    use_case = ResolveExceptionUseCase(
+        content_extractor=mock_content_extractor,
+        code_extractor=mock_code_extractor,
+        file_manager=file_manager,
+        code_locator=mock_locator,
+    )
+
+    resolved = await use_case.execute(
+        file_to_resolve, "RIR", [ManifestItem("DOC-123", "0", "")]
+    )
+
+    assert resolved.path == Path("/src/DOC-123_0.pdf")
+    mock_locator.locate_code.assert_awaited_once_with(file_to_resolve, "RIR")
+    mock_content_extractor.extract_text.assert_not_called()
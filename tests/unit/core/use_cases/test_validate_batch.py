@@ -3,10 +3,25 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.domain.entities import DocumentFile, DocumentStatus, ManifestItem
+from app.domain.entities import (
+    DocumentFile,
+    DocumentStatus,
+    ManifestItem,
+    SourceIndexDelta,
+)
 from app.use_cases.validate_batch import ValidateBatchUseCase
 
 
+def _async_items(items):
+    """Cria um substituto para iter_items que entrega os itens em streaming."""
+
+    async def _iter_items(manifest_path):
+        for item in items:
+            yield item
+
+    return _iter_items
+
+
 @pytest.mark.asyncio
 async def test_validate_batch_happy_path():
     """
@@ -27,10 +42,8 @@ async def test_validate_batch_happy_path():
 
     # -- Criar Mocks dos Repositórios
     mock_manifest_repo = MagicMock()
-    # Usar AsyncMock ou return_value futuro para métodos async
-    mock_manifest_repo.load_from_file = AsyncMock(
-        return_value=[manifest_item1, manifest_item2]
-    )
+    # O manifesto é consumido em streaming (async iterator)
+    mock_manifest_repo.iter_items = _async_items([manifest_item1, manifest_item2])
 
     mock_file_repo = MagicMock()
     mock_file_repo.list_files = AsyncMock(return_value=[file1, file2, file3])
@@ -77,9 +90,7 @@ async def test_validate_batch_all_files_match():
     file2 = DocumentFile(path=Path("C:/fake/DOC-002_B.docx"), size_bytes=200)
 
     mock_manifest_repo = MagicMock()
-    mock_manifest_repo.load_from_file = AsyncMock(
-        return_value=[manifest_item1, manifest_item2]
-    )
+    mock_manifest_repo.iter_items = _async_items([manifest_item1, manifest_item2])
 
     mock_file_repo = MagicMock()
     mock_file_repo.list_files = AsyncMock(return_value=[file1, file2])
@@ -111,9 +122,7 @@ async def test_validate_batch_no_files_match():
     file2 = DocumentFile(path=Path("C:/fake/DOC-888_B.docx"), size_bytes=200)
 
     mock_manifest_repo = MagicMock()
-    mock_manifest_repo.load_from_file = AsyncMock(
-        return_value=[manifest_item1, manifest_item2]
-    )
+    mock_manifest_repo.iter_items = _async_items([manifest_item1, manifest_item2])
 
     mock_file_repo = MagicMock()
     mock_file_repo.list_files = AsyncMock(return_value=[file1, file2])
@@ -151,3 +160,206 @@ def test_get_file_base_name():
 
     # Testa caso com múltiplos underscores
     assert use_case._get_file_base_name("COMPLEX_DOC_NAME_A.pdf") == "COMPLEX_DOC_NAME"
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_duplicate_manifest_code_last_wins():
+    """
+    Testa que, com códigos duplicados no manifesto, o último item lido prevalece.
+    """
+    first = ManifestItem("DOC-001", "A", "Primeira ocorrência")
+    last = ManifestItem("DOC-001", "B", "Última ocorrência")
+    file1 = DocumentFile(path=Path("C:/fake/DOC-001.pdf"), size_bytes=100)
+
+    mock_manifest_repo = MagicMock()
+    mock_manifest_repo.iter_items = _async_items([first, last])
+    mock_file_repo = MagicMock()
+    mock_file_repo.list_files = AsyncMock(return_value=[file1])
+
+    use_case = ValidateBatchUseCase(
+        manifest_repo=mock_manifest_repo, file_repo=mock_file_repo
+    )
+    result = await use_case.execute(
+        manifest_path=Path("C:/fake/manifest.xlsx"), source_directory=Path("C:/fake/")
+    )
+
+    assert result.validated_count == 1
+    assert result.validated_files[0].associated_manifest_item is last
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_with_source_index_reuses_unchanged_matches():
+    """
+    Com o índice incremental, arquivos inalterados reaproveitam o código anterior
+    (mesmo que o nome atual não o produzisse) e só o delta é recasado.
+    """
+    item_old = ManifestItem("DOC-001", "A", "Documento 1")
+    item_new = ManifestItem("DOC-002", "0", "Documento 2")
+
+    unchanged = DocumentFile(path=Path("/src/renomeado.pdf"), size_bytes=100)
+    added = DocumentFile(path=Path("/src/DOC-002_0.pdf"), size_bytes=200)
+    stale = DocumentFile(path=Path("/src/lixo.pdf"), size_bytes=300)
+
+    delta = SourceIndexDelta(
+        added=[added],
+        unchanged=[unchanged, stale],
+        removed=[Path("/src/DOC-003.pdf")],
+        previous_codes={unchanged.path: "DOC-001", stale.path: None},
+        manifest_changed=False,
+        scan_id="scan-1",
+    )
+
+    mock_manifest_repo = MagicMock()
+    mock_manifest_repo.iter_items = _async_items([item_old, item_new])
+    mock_file_repo = MagicMock()
+    mock_file_repo.list_files = AsyncMock()
+    mock_index = MagicMock()
+    mock_index.refresh = AsyncMock(return_value=delta)
+    mock_index.record_matches = AsyncMock()
+
+    use_case = ValidateBatchUseCase(
+        manifest_repo=mock_manifest_repo,
+        file_repo=mock_file_repo,
+        source_index=mock_index,
+    )
+    result = await use_case.execute(Path("/m.xlsx"), Path("/src"))
+
+    mock_file_repo.list_files.assert_not_called()
+    assert {f.path for f in result.validated_files} == {unchanged.path, added.path}
+    assert unchanged.associated_manifest_item is item_old
+    assert result.unrecognized_files == [stale]
+    assert (result.added_count, result.changed_count, result.removed_count) == (
+        1,
+        0,
+        1,
+    )
+    mock_index.record_matches.assert_awaited_once_with(
+        "scan-1",
+        {unchanged.path: item_old, added.path: item_new, stale.path: None},
+    )
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_skips_manifest_when_nothing_changed():
+    """
+    Manifesto igual e arquivos inalterados: os itens salvos no índice são
+    reaproveitados e o manifesto nem é lido.
+    """
+    item = ManifestItem("DOC-001", "A", "Documento 1", {"FORMATO": "A1"})
+    known = DocumentFile(path=Path("/src/DOC-001_A.pdf"), size_bytes=100)
+    stale = DocumentFile(path=Path("/src/lixo.pdf"), size_bytes=300)
+    delta = SourceIndexDelta(
+        unchanged=[known, stale],
+        previous_codes={known.path: "DOC-001", stale.path: None},
+        previous_items={known.path: item},
+        manifest_changed=False,
+    )
+
+    mock_manifest_repo = MagicMock()
+    mock_manifest_repo.iter_items = MagicMock(side_effect=AssertionError("lido"))
+    mock_index = MagicMock()
+    mock_index.refresh = AsyncMock(return_value=delta)
+    mock_index.record_matches = AsyncMock()
+
+    # Sem sugestões, o não reconhecido inalterado também dispensa o manifesto
+    use_case = ValidateBatchUseCase(
+        mock_manifest_repo, MagicMock(), mock_index, suggestion_limit=0
+    )
+    result = await use_case.execute(Path("/m.xlsx"), Path("/src"))
+
+    assert result.success
+    assert result.validated_files == [known]
+    assert known.associated_manifest_item is item
+    assert result.unrecognized_files == [stale]
+    mock_manifest_repo.iter_items.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_with_source_index_rematches_when_manifest_changed():
+    """Se o manifesto mudou, os códigos anteriores são descartados."""
+    unchanged = DocumentFile(path=Path("/src/renomeado.pdf"), size_bytes=100)
+    delta = SourceIndexDelta(
+        unchanged=[unchanged],
+        previous_codes={unchanged.path: "DOC-001"},
+        manifest_changed=True,
+    )
+
+    mock_manifest_repo = MagicMock()
+    mock_manifest_repo.iter_items = _async_items([ManifestItem("DOC-001", "A", "")])
+    mock_index = MagicMock()
+    mock_index.refresh = AsyncMock(return_value=delta)
+    mock_index.record_matches = AsyncMock(side_effect=RuntimeError("db locked"))
+
+    use_case = ValidateBatchUseCase(mock_manifest_repo, MagicMock(), mock_index)
+    result = await use_case.execute(Path("/m.xlsx"), Path("/src"))
+
+    # Falha ao gravar o índice não invalida a validação
+    assert result.success
+    assert result.unrecognized_files == [unchanged]
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_suggests_codes_for_unrecognized_files():
+    """Arquivos não reconhecidos recebem sugestões de códigos parecidos."""
+    typo = DocumentFile(path=Path("/src/ELE-700-CHZ-247-FLO4_A.pdf"), size_bytes=1)
+    unrelated = DocumentFile(path=Path("/src/foto.jpg"), size_bytes=1)
+
+    mock_manifest_repo = MagicMock()
+    mock_manifest_repo.iter_items = _async_items(
+        [
+            ManifestItem("ELE-700-CHZ-247-FL04", "A", ""),
+            ManifestItem("MEC-100-XYZ-001-FL01", "0", ""),
+        ]
+    )
+    mock_file_repo = MagicMock()
+    mock_file_repo.list_files = AsyncMock(return_value=[typo, unrelated])
+
+    use_case = ValidateBatchUseCase(mock_manifest_repo, mock_file_repo)
+    result = await use_case.execute(Path("/m.xlsx"), Path("/src"))
+
+    assert result.unrecognized_count == 2
+    assert [s.document_code for s in result.suggestions[typo.path]] == [
+        "ELE-700-CHZ-247-FL04"
+    ]
+    assert unrelated.path not in result.suggestions
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_reports_progress_in_batches(monkeypatch):
+    """Etapas e contadores chegam ao reporter, em lotes de arquivos."""
+    import app.use_cases.validate_batch as validate_batch
+
+    monkeypatch.setattr(validate_batch, "PROGRESS_BATCH_SIZE", 2)
+    items = [ManifestItem(f"DOC-00{i}", "A", "") for i in range(1, 4)]
+    files = [
+        DocumentFile(path=Path(f"C:/fake/DOC-00{i}_A.pdf"), size_bytes=1)
+        for i in range(1, 6)
+    ]
+    mock_manifest_repo = MagicMock()
+    mock_manifest_repo.iter_items = _async_items(items)
+    mock_file_repo = MagicMock()
+    mock_file_repo.list_files = AsyncMock(return_value=files)
+    progress = MagicMock()
+
+    use_case = ValidateBatchUseCase(
+        manifest_repo=mock_manifest_repo,
+        file_repo=mock_file_repo,
+        suggestion_limit=0,
+    )
+    await use_case.execute(Path("C:/fake/manifest.xlsx"), Path("C:/fake"), progress)
+
+    events = [call.args[0] for call in progress.report.call_args_list]
+    assert [e.stage for e in events] == [
+        "scanning",
+        "reading_manifest",
+        "reading_manifest",
+        "matching",
+        "matching",
+        "matching",
+        "finished",
+    ]
+    assert [e.current for e in events if e.stage == "matching"] == [0, 2, 4]
+    final = events[-1]
+    assert (final.files_scanned, final.manifest_items) == (5, 3)
+    assert (final.files_matched, final.files_unrecognized) == (3, 2)
+    assert (final.current, final.total) == (5, 5)
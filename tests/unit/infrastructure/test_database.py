@@ -1,4 +1,7 @@
+import json
+import sqlite3
 import uuid
+from datetime import date, datetime
 from pathlib import Path
 
 import pytest
@@ -108,3 +111,177 @@ def test_save_overwrites_previous_session_data(db_manager):
     current = db_manager.get_validated_documents(session_id)
     assert len(current) == 1
     assert current[0].filename == "2.pdf"
+
+
+def test_save_in_chunks_keeps_other_sessions(db_manager, monkeypatch):
+    """Lotes maiores que o chunk são gravados inteiros; outras sessões ficam intactas."""
+    monkeypatch.setattr("app.infrastructure.database.SAVE_CHUNK_SIZE", 3)
+    other = [DocumentFile(Path("c:/outro.pdf"), 1, DocumentStatus.VALIDATED)]
+    db_manager.save_validated_documents("outra", other)
+
+    documents = [
+        DocumentFile(Path(f"c:/{i}.pdf"), i, DocumentStatus.VALIDATED)
+        for i in range(10)
+    ]
+    assert db_manager.save_validated_documents("atual", documents) == 10
+    assert db_manager.save_validated_documents("atual", documents[:4]) == 4
+
+    current = db_manager.get_validated_documents("atual")
+    assert sorted(d.size_bytes for d in current) == [0, 1, 2, 3]
+    assert all(d.validated_at is not None for d in current)
+    assert len(db_manager.get_validated_documents("outra")) == 1
+
+
+def test_save_empty_list_clears_session(db_manager):
+    """Revalidação sem documentos válidos remove os da validação anterior."""
+    documents = [
+        DocumentFile(Path(f"c:/{i}.pdf"), i, DocumentStatus.VALIDATED) for i in range(3)
+    ]
+    db_manager.save_validated_documents("atual", documents)
+    db_manager.save_validated_documents("outra", documents[:1])
+
+    assert db_manager.save_validated_documents("atual", []) == 0
+
+    assert db_manager.get_validated_documents("atual") == []
+    assert db_manager.get_session("atual").document_count == 0
+    assert len(db_manager.get_validated_documents("outra")) == 1
+
+
+def test_engine_applies_storage_profile(db_manager):
+    from app.core.config import settings
+
+    with db_manager.engine.connect() as conn:
+        values = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in ("journal_mode", "synchronous", "temp_store", "cache_size")
+        }
+
+    assert values["journal_mode"].upper() == settings.DATABASE_JOURNAL_MODE
+    assert values["synchronous"] == 1  # NORMAL
+    assert values["temp_store"] == 2  # MEMORY
+    assert values["cache_size"] == -settings.DATABASE_CACHE_SIZE_KB
+
+
+def test_concurrent_threads_use_separate_connections(db_manager):
+    """Threads simultâneas não compartilham (nem serializam em) uma conexão."""
+    import threading
+
+    barrier = threading.Barrier(3)
+    connections = []
+
+    def worker():
+        with Session(db_manager.engine) as db:
+            connections.append(id(db.connection().connection.dbapi_connection))
+            barrier.wait(timeout=5)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(connections)) == 3
+
+
+def test_keyset_pages_cover_session_in_order(db_manager):
+    documents = [
+        DocumentFile(Path(f"c:/{i}.pdf"), i, DocumentStatus.VALIDATED) for i in range(7)
+    ]
+    db_manager.save_validated_documents("paginada", documents)
+    db_manager.save_validated_documents("outra", documents[:2])
+
+    first = db_manager.get_validated_documents_page("paginada", limit=3)
+    second = db_manager.get_validated_documents_page(
+        "paginada", after_id=first[-1].id, limit=3
+    )
+    assert [d.size_bytes for d in first + second] == [0, 1, 2, 3, 4, 5]
+
+    streamed = list(db_manager.iter_validated_documents("paginada", page_size=3))
+    assert [d.size_bytes for d in streamed] == list(range(7))
+    assert list(db_manager.iter_validated_documents("vazia", page_size=3)) == []
+
+
+def test_sessions_are_tracked_with_document_counts(db_manager):
+    from sqlalchemy import inspect
+
+    session_id = db_manager.create_session(Path("c:/manifesto.xlsx"), Path("c:/docs"))
+
+    assert db_manager.session_id == session_id
+    assert db_manager.get_session(session_id).document_count == 0
+    assert db_manager.get_session("inexistente") is None
+
+    documents = [DocumentFile(Path("c:/a.pdf"), 1, DocumentStatus.VALIDATED)] * 3
+    db_manager.save_validated_documents(session_id, documents)
+    assert db_manager.get_session(session_id).document_count == 3
+
+    # Sessões não criadas explicitamente são registradas ao salvar
+    db_manager.save_validated_documents("legada", documents[:1])
+    assert db_manager.get_session("legada").document_count == 1
+
+    indexes = {
+        index["name"]: index["column_names"]
+        for index in inspect(db_manager.engine).get_indexes("validateddocument")
+    }
+    assert indexes["ix_validateddocument_session_code"] == [
+        "session_id",
+        "document_code",
+    ]
+
+
+def test_manifest_metadata_round_trip(db_manager):
+    session_id = db_manager.create_session()
+    doc = DocumentFile(
+        path=Path("c:/docs/file1.pdf"),
+        size_bytes=1024,
+        status=DocumentStatus.VALIDATED,
+        associated_manifest_item=ManifestItem(
+            "DOC-001",
+            "A",
+            "Design Doc",
+            {
+                "DISCIPLINA": "Elétrica",
+                "FORMATO": "A1",
+                "EMISSÃO": datetime(2024, 1, 15),
+                "PRAZO": date(2024, 2, 1),
+            },
+        ),
+    )
+
+    db_manager.save_validated_documents(session_id, [doc])
+    (row,) = db_manager.get_validated_documents(session_id)
+
+    assert json.loads(row.metadata_json)["EMISSÃO"] == {"$dt": "2024-01-15T00:00:00"}
+    # Datas voltam como date/datetime para o preenchimento do manifesto do lote
+    from app.services.organization_service import OrganizationService
+
+    (restored,) = OrganizationService._to_document_files([row])
+    assert restored.associated_manifest_item.metadata == (
+        doc.associated_manifest_item.metadata
+    )
+
+
+def test_init_db_adds_new_columns_to_existing_table(tmp_path, monkeypatch):
+    from app.core.config import settings
+
+    test_db = tmp_path / "old_schema.db"
+    with sqlite3.connect(test_db) as conn:
+        conn.execute(
+            "CREATE TABLE validateddocument (id INTEGER PRIMARY KEY, session_id "
+            "VARCHAR NOT NULL, path VARCHAR NOT NULL, filename VARCHAR NOT NULL, "
+            "size_bytes INTEGER NOT NULL, status VARCHAR NOT NULL, document_code "
+            "VARCHAR, revision VARCHAR, title VARCHAR, validated_at DATETIME NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO validateddocument (session_id, path, filename, size_bytes, "
+            "status, validated_at) VALUES ('s', 'a.pdf', 'a.pdf', 1, 'x', "
+            "'2024-01-01 00:00:00')"
+        )
+
+    monkeypatch.setattr(settings, "DATABASE_PATH", str(test_db))
+    manager = DatabaseManager()
+    manager.init_db()
+    try:
+        (row,) = manager.get_validated_documents("s")
+        assert row.metadata_json is None
+    finally:
+        manager.engine.dispose()
@@ -5,7 +5,51 @@ import pytest
 
 from app.core.interfaces import FileReadError
 from app.domain.entities import DocumentFile
-from app.infrastructure.extraction import ProfiledExtractorService
+from app.infrastructure.extraction import (
+    ProfiledExtractorService,
+    create_extraction_pool,
+    extract_text_from_pdf,
+    get_extraction_pool,
+    locate_code_in_pdf,
+    shutdown_extraction_pool,
+)
+
+
+def _build_pdf(path, pages):
+    """Grava um PDF mínimo com uma linha de texto (Helvetica) por página."""
+    count = len(pages)
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(count))
+    font_id = 3 + 2 * count
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>".encode(),
+    ]
+    for i, text in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources"
+            f" << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode()
+        )
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        data += b"%010d 00000 n \n" % offset
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(data))
+    return path
 
 
 # Mocks para PdfReader e docx.Document
@@ -116,3 +160,188 @@ profiles:
     # Caso 4: Perfil inexistente
     code4 = await service.find_code(text1, "INVALID_PROFILE")
     assert code4 is None
+
+
+@pytest.mark.asyncio
+async def test_extract_text_in_process_pool(tmp_path):
+    """A extração roda no executor informado (pool de processos)."""
+    import docx
+
+    files = []
+    for i in range(3):
+        path = tmp_path / f"doc_{i}.docx"
+        document = docx.Document()
+        document.add_paragraph(f"Código do Documento: DOC-{i:03d}")
+        document.save(path)
+        files.append(DocumentFile(path=path, size_bytes=path.stat().st_size))
+
+    with create_extraction_pool(max_workers=2) as pool:
+        service = ProfiledExtractorService(Path("dummy_config.yaml"), executor=pool)
+        texts = [await service.extract_text(f, "ANY") for f in files]
+
+    assert texts == [f"Código do Documento: DOC-{i:03d}" for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_is_reused_until_shutdown():
+    """O pool compartilhado é reaproveitado e recriado após o shutdown."""
+    pool = get_extraction_pool()
+    try:
+        assert get_extraction_pool() is pool
+    finally:
+        await shutdown_extraction_pool()
+
+    with pytest.raises(RuntimeError):
+        pool.submit(len, "")
+    replacement = get_extraction_pool()
+    try:
+        assert replacement is not pool
+    finally:
+        await shutdown_extraction_pool()
+
+
+@pytest.fixture
+def locate_config(tmp_path):
+    config_file = tmp_path / "profiles.yaml"
+    config_file.write_text(
+        """
+profiles:
+  RIR:
+    max_pages: 2
+    patterns:
+      - 'Codigo: ([A-Z]+-[0-9]+)'
+  ALL:
+    patterns:
+      - 'Codigo: ([A-Z]+-[0-9]+)'
+    """,
+        encoding="utf-8",
+    )
+    return config_file
+
+
+def test_locate_code_in_pdf_stops_at_first_match(tmp_path):
+    """A leitura para na página do código, sem extrair o restante."""
+    pdf = _build_pdf(
+        tmp_path / "databook.pdf",
+        ["Capa", "Codigo: DOC-123"] + [f"Anexo {i}" for i in range(50)],
+    )
+
+    code, pages_read = locate_code_in_pdf(pdf, ("Codigo: ([A-Z]+-[0-9]+)",))
+
+    assert (code, pages_read) == ("DOC-123", 2)
+
+
+def test_locate_code_in_pdf_respects_max_pages(tmp_path):
+    pdf = _build_pdf(tmp_path / "doc.pdf", ["Capa", "Indice", "Codigo: DOC-9"])
+
+    assert locate_code_in_pdf(pdf, ("Codigo: ([A-Z]+-[0-9]+)",), max_pages=2) == (
+        None,
+        2,
+    )
+    assert locate_code_in_pdf(pdf, ("Codigo: ([A-Z]+-[0-9]+)",)) == ("DOC-9", 3)
+
+
+def test_locate_code_in_pdf_matches_across_page_break(tmp_path):
+    pdf = _build_pdf(tmp_path / "doc.pdf", ["Texto Codigo:", " DOC-77 fim"])
+
+    code, _ = locate_code_in_pdf(pdf, ("Codigo: ([A-Z]+-[0-9]+)",))
+
+    assert code == "DOC-77"
+
+
+@pytest.mark.asyncio
+async def test_locate_code_uses_profile_page_budget(tmp_path, locate_config):
+    pdf = _build_pdf(tmp_path / "doc.pdf", ["Capa", "Indice", "Codigo: DOC-5"])
+    service = ProfiledExtractorService(locate_config)
+    file = DocumentFile(path=pdf, size_bytes=pdf.stat().st_size)
+
+    assert await service.locate_code(file, "RIR") is None
+    assert await service.locate_code(file, "ALL") == "DOC-5"
+    assert await service.locate_code(file, "UNKNOWN") is None
+
+
+@pytest.fixture
+def counting_reader():
+    """PdfReader real, contando quantas vezes um PDF é aberto."""
+    from PyPDF2 import PdfReader
+
+    opened = []
+
+    def _reader(stream):
+        opened.append(stream)
+        return PdfReader(stream)
+
+    with patch("app.infrastructure.extraction.PdfReader", side_effect=_reader):
+        yield opened
+
+
+@pytest.mark.asyncio
+async def test_extraction_cache_skips_parsing_on_retry(
+    tmp_path, locate_config, counting_reader
+):
+    """Troca de perfil e nova tentativa reaproveitam as páginas já extraídas."""
+    from app.infrastructure.disk_cache import ChunkedDiskCache
+    from app.infrastructure.extraction_cache import ExtractionCache
+
+    cache = ExtractionCache(
+        ChunkedDiskCache(tmp_path / "cache.db", max_bytes=10**8, max_entries=8)
+    )
+    pdf = _build_pdf(tmp_path / "doc.pdf", ["Capa", "Indice", "Codigo: DOC-5"])
+    file = DocumentFile(path=pdf, size_bytes=pdf.stat().st_size)
+    service = ProfiledExtractorService(locate_config, cache=cache)
+
+    # RIR lê só as 2 primeiras páginas, que ficam em cache
+    assert await service.locate_code(file, "RIR") is None
+    assert len(counting_reader) == 1
+    assert await service.locate_code(file, "RIR") is None
+    assert len(counting_reader) == 1
+
+    # ALL continua da página 3, sem reler as anteriores
+    assert await service.locate_code(file, "ALL") == "DOC-5"
+    assert len(counting_reader) == 2
+
+    # Documento completo em cache: nenhuma nova leitura
+    assert await service.locate_code(file, "ALL") == "DOC-5"
+    assert await service.extract_text(file, "ALL") == "CapaIndiceCodigo: DOC-5"
+    assert len(counting_reader) == 2
+
+    # Cópia com o mesmo conteúdo também é um acerto
+    copy = tmp_path / "copia.pdf"
+    copy.write_bytes(pdf.read_bytes())
+    copy_file = DocumentFile(path=copy, size_bytes=copy.stat().st_size)
+    assert await service.extract_text(copy_file, "ALL") == "CapaIndiceCodigo: DOC-5"
+    assert len(counting_reader) == 2
+
+
+def test_locate_code_in_pdf_keeps_pattern_priority_across_pages(tmp_path):
+    """Um padrão de menor prioridade na página 1 não vence o principal na página 2."""
+    patterns = ("Codigo: ([A-Z]+-[0-9]+)", "Ref ([A-Z]+-[0-9]+)")
+    pdf = _build_pdf(
+        tmp_path / "doc.pdf", ["Ref OLD-1", "Codigo: DOC-2", "Anexo", "Anexo"]
+    )
+
+    # O padrão principal encerra a leitura na página em que aparece
+    assert locate_code_in_pdf(pdf, patterns) == ("DOC-2", 2)
+    # Sem o principal dentro do limite, vale o melhor encontrado
+    assert locate_code_in_pdf(pdf, patterns, max_pages=1) == ("OLD-1", 1)
+
+
+@pytest.mark.asyncio
+async def test_locate_code_matches_full_text_priority(tmp_path):
+    config_file = tmp_path / "profiles.yaml"
+    config_file.write_text(
+        """
+profiles:
+  RIR:
+    patterns:
+      - 'Codigo: ([A-Z]+-[0-9]+)'
+      - 'Ref ([A-Z]+-[0-9]+)'
+    """,
+        encoding="utf-8",
+    )
+    pdf = _build_pdf(tmp_path / "doc.pdf", ["Ref OLD-1", "Anexo", "Codigo: DOC-2"])
+    file = DocumentFile(path=pdf, size_bytes=pdf.stat().st_size)
+    service = ProfiledExtractorService(config_file)
+
+    assert await service.locate_code(file, "RIR") == "DOC-2"
+    assert await service.find_code(extract_text_from_pdf(pdf), "RIR") == "DOC-2"
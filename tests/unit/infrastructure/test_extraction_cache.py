@@ -0,0 +1,66 @@
+import pytest
+
+from app.infrastructure.disk_cache import ChunkedDiskCache
+from app.infrastructure.extraction_cache import (
+    ExtractionCache,
+    decode_page,
+    encode_page,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(
+        ChunkedDiskCache(tmp_path / "cache.db", max_bytes=10**8, max_entries=8)
+    )
+
+
+def test_page_roundtrip():
+    assert decode_page(encode_page("Código: DOC-1\nç")) == "Código: DOC-1\nç"
+
+
+def test_key_depends_on_content_not_path(tmp_path):
+    a = tmp_path / "a.pdf"
+    b = tmp_path / "renomeado.pdf"
+    c = tmp_path / "c.pdf"
+    a.write_bytes(b"conteudo")
+    b.write_bytes(b"conteudo")
+    c.write_bytes(b"outro")
+
+    assert ExtractionCache.key_for(a) == ExtractionCache.key_for(b)
+    assert ExtractionCache.key_for(a) != ExtractionCache.key_for(c)
+
+
+def test_store_and_load(cache, tmp_path):
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"x")
+
+    assert cache.load("k") is None
+    cache.store("k", source, ["p1", "p2"], complete=True)
+
+    loaded = cache.load("k")
+    assert loaded.pages == ["p1", "p2"]
+    assert loaded.complete
+
+
+def test_partial_pages_are_extended(cache, tmp_path):
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"x")
+
+    cache.store("k", source, ["p1"], start=0, complete=False)
+    assert cache.load("k").complete is False
+
+    assert cache.store("k", source, ["p2", "p3"], start=1, complete=True)
+    loaded = cache.load("k")
+    assert loaded.pages == ["p1", "p2", "p3"]
+    assert loaded.complete
+
+
+def test_append_rejects_stale_start(cache, tmp_path):
+    """Outro leitor já estendeu a entrada: as páginas não são duplicadas."""
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"x")
+    cache.store("k", source, ["p1", "p2"], start=0, complete=False)
+
+    assert not cache.store("k", source, ["p2"], start=1, complete=False)
+    assert cache.load("k").pages == ["p1", "p2"]
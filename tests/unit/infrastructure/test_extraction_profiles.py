@@ -0,0 +1,160 @@
+import random
+import re
+
+import pytest
+
+from app.domain.exceptions import ProfileConfigError
+from app.infrastructure.extraction import ProfiledExtractorService
+from app.infrastructure.extraction_profiles import (
+    PATTERN_FLAGS,
+    compile_pattern_set,
+    compile_profiles,
+    optimize_pattern,
+)
+
+PROFILES_YAML = """
+profiles:
+  RIR:
+    max_pages: 3
+    patterns:
+      - '([A-Z0-9]+_[A-Z0-9]+_RIR_[A-Z0-9-]+)'
+      - 'Código:\\s*([A-Z0-9_-]+)'
+  PID:
+    patterns:
+      - '([A-Z0-9]+_[A-Z0-9]+_PID_[A-Z0-9-]+)'
+      - 'Código:\\s*([A-Z0-9_-]+)'
+  GENERIC:
+    max_pages: 5
+    patterns:
+      - 'DOC-\\d+'
+"""
+
+
+@pytest.fixture
+def service(tmp_path):
+    config = tmp_path / "profiles.yaml"
+    config.write_text(PROFILES_YAML, encoding="utf-8")
+    return ProfiledExtractorService(config)
+
+
+def test_invalid_regex_rejected_at_load(tmp_path):
+    config = tmp_path / "profiles.yaml"
+    config.write_text(
+        "profiles:\n  RIR:\n    patterns:\n      - 'RIR-(\\d+'\n", encoding="utf-8"
+    )
+
+    with pytest.raises(ProfileConfigError, match="RIR"):
+        ProfiledExtractorService(config)
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        {"patterns": "RIR-1"},
+        {"patterns": [1]},
+        {"patterns": ["x"], "max_pages": 0},
+        {"patterns": ["x"], "max_pages": "2"},
+    ],
+)
+def test_malformed_profiles_rejected(profile):
+    with pytest.raises(ProfileConfigError):
+        compile_profiles({"RIR": profile})
+
+
+@pytest.mark.asyncio
+async def test_find_code_match_reports_profile_and_pattern(service):
+    match = await service.find_code_match("Código: ABC-1", "PID")
+
+    assert match.code == "ABC-1"
+    assert match.profile_id == "PID"
+    assert match.pattern == "Código:\\s*([A-Z0-9_-]+)"
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_scans_all_profiles(service):
+    """AUTO avalia os padrões de todos os perfis e informa qual casou."""
+    text = "Capa\nU22_CVL_PID_B-1 e depois DOC-7"
+
+    match = await service.find_code_match(text, "AUTO")
+
+    assert match.code == "U22_CVL_PID_B-1"
+    assert match.profile_id == "PID"
+    assert await service.find_code("Anexo DOC-7", "AUTO") == "DOC-7"
+    assert await service.find_code("Código: X-1", "AUTO") == "X-1"
+    assert await service.find_code("nada", "AUTO") is None
+
+
+@pytest.mark.asyncio
+async def test_configured_generic_profile_keeps_its_own_patterns(service):
+    """O perfil GENERIC do YAML não é substituído pelo modo combinado."""
+    match = await service.find_code_match("U22_CVL_PID_B-1 e DOC-7", "GENERIC")
+
+    assert match.code == "DOC-7"
+    assert match.profile_id == "GENERIC"
+    assert await service.find_code("Código: X-1", "GENERIC") is None
+
+
+@pytest.mark.asyncio
+async def test_configured_auto_profile_takes_precedence(tmp_path):
+    config = tmp_path / "profiles.yaml"
+    config.write_text(
+        PROFILES_YAML + "  AUTO:\n    patterns:\n      - 'AUTO-\\d+'\n",
+        encoding="utf-8",
+    )
+    service = ProfiledExtractorService(config)
+
+    assert await service.find_code("DOC-7 AUTO-3", "AUTO") == "AUTO-3"
+    assert await service.find_code("Código: X-1", "AUTO") is None
+
+
+def test_combined_set_maps_groups_to_patterns():
+    pattern_set = compile_pattern_set(
+        ("A(?P<x>\\d)(\\d)", "B-(\\w+)", "C\\d+"), combined=True
+    )
+
+    assert pattern_set.combined is not None
+    assert pattern_set.search("zz B-ok A12") == ("ok", 1)
+    assert pattern_set.search("A12") == ("1", 0)
+    assert pattern_set.search("C77") == ("C77", 2)
+    assert pattern_set.search("nada") is None
+
+
+def test_backreferences_fall_back_to_ordered_search():
+    pattern_set = compile_pattern_set(("(\\w)\\1", "B-(\\w+)"), combined=True)
+
+    assert pattern_set.combined is None
+    assert pattern_set.search("B-x aa") == ("a", 0)
+
+
+@pytest.mark.parametrize(
+    "source, guarded",
+    [
+        ("([A-Z0-9]+_[A-Z]+_RIR_[A-Z0-9-]+)", True),
+        ("([A-Z0-9]+(?:_[A-Z0-9]+){3,}_[A-Z0-9-]+)", True),
+        ("Código:\\s*([A-Z]+)", False),
+        ("([A-Z]+)?_X", False),
+        ("([A-Z]+_X|[0-9]+_Y)", False),
+        ("[A-Z]+?_X", False),
+        ("([A-Z]+)_\\1", False),
+    ],
+)
+def test_optimize_pattern_only_guards_leading_class_runs(source, guarded):
+    assert optimize_pattern(source).startswith("(?<!") is guarded
+
+
+def test_optimized_patterns_find_the_same_codes():
+    rng = random.Random(3)
+    alphabet = "AB01_-. x\n"
+    sources = [
+        "([A-Z0-9]+_[A-Z0-9]+_[A-Z0-9.]+)",
+        "([A-Z0-9]+(?:_[A-Z0-9]+){2,}-[A-Z0-9]+)",
+        "[AB]+_0",
+    ]
+    for source in sources:
+        raw = re.compile(source, PATTERN_FLAGS)
+        fast = re.compile(optimize_pattern(source), PATTERN_FLAGS)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            expected = raw.search(text)
+            actual = fast.search(text)
+            assert (actual and actual.span()) == (expected and expected.span())
@@ -0,0 +1,191 @@
+import errno
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.domain.exceptions import FileOperationError
+from app.infrastructure import file_copy
+from app.infrastructure.file_copy import (
+    copy_contents,
+    copy_file,
+    move_across_devices,
+)
+from app.infrastructure.repositories import FileSystemManager
+
+
+@pytest.fixture(autouse=True)
+def reset_unsupported_strategies():
+    """Estratégias marcadas como não suportadas não vazam entre os testes."""
+    file_copy._unsupported.clear()
+    yield
+    file_copy._unsupported.clear()
+
+
+def _exdev_rename(self, target):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+
+def test_move_across_devices_copies_and_removes_source(tmp_path):
+    source = tmp_path / "origem" / "doc.pdf"
+    source.parent.mkdir()
+    payload = os.urandom(300_000)
+    source.write_bytes(payload)
+    os.utime(source, (1_600_000_000, 1_600_000_000))
+    destination = tmp_path / "saida" / "doc_A.pdf"
+    destination.parent.mkdir()
+
+    copied = move_across_devices(
+        source, destination, buffer_size=64 * 1024, verify_checksum=True
+    )
+
+    assert copied == len(payload)
+    assert destination.read_bytes() == payload
+    assert destination.stat().st_mtime == 1_600_000_000
+    assert not source.exists()
+    assert list(destination.parent.iterdir()) == [destination]
+
+
+def test_copy_contents_falls_back_when_kernel_copy_unsupported(tmp_path, monkeypatch):
+    def unsupported(*args):
+        raise OSError(errno.ENOSYS, "not supported")
+
+    monkeypatch.setattr(file_copy.os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(file_copy.os, "sendfile", unsupported, raising=False)
+
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"x" * 100_000)
+    target = tmp_path / "b.bin"
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        copied, strategy = copy_contents(src.fileno(), dst.fileno(), 4096)
+
+    assert (copied, strategy) == (100_000, "buffer")
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_move_across_devices_with_only_buffer_copy(tmp_path, monkeypatch):
+    """Sem cópia pelo kernel nem os.readv (ex: Windows), o buffer ainda move."""
+    monkeypatch.delattr(file_copy.os, "readv", raising=False)
+    monkeypatch.setattr(
+        file_copy,
+        "_copy_strategies",
+        lambda: (("buffer", file_copy._copy_with_buffer),),
+    )
+    source = tmp_path / "doc.pdf"
+    payload = os.urandom(300_000)
+    source.write_bytes(payload)
+    destination = tmp_path / "saida" / "doc.pdf"
+    destination.parent.mkdir()
+
+    assert move_across_devices(source, destination, buffer_size=64 * 1024) == len(
+        payload
+    )
+    assert destination.read_bytes() == payload
+    assert not source.exists()
+
+
+def test_move_across_devices_keeps_source_on_mismatch(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_copy, "copy_contents", lambda *args: (1, "buffer"))
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"conteudo")
+    destination = tmp_path / "saida" / "doc.pdf"
+    destination.parent.mkdir()
+
+    with pytest.raises(FileOperationError, match="incompleta"):
+        move_across_devices(source, destination)
+
+    assert source.read_bytes() == b"conteudo"
+    assert list(destination.parent.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_move_file_falls_back_to_copy_on_exdev(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "rename", _exdev_rename)
+    manager = FileSystemManager()
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"%PDF-1.4")
+    destination = tmp_path / "LOT_0001" / "doc_A.pdf"
+
+    await manager.move_file(source, destination)
+
+    assert destination.read_bytes() == b"%PDF-1.4"
+    assert not source.exists()
+
+
+def test_copy_file_skips_strategy_after_first_failure(tmp_path, monkeypatch):
+    calls = []
+
+    def unsupported(*args):
+        calls.append(args)
+        raise OSError(errno.EOPNOTSUPP, "not supported")
+
+    monkeypatch.setattr(file_copy, "_clone", unsupported)
+    monkeypatch.setattr(file_copy.os, "copy_file_range", unsupported, raising=False)
+    source = tmp_path / "template.xlsx"
+    source.write_bytes(b"PK" * 5000)
+
+    for i in range(3):
+        copied, strategy = copy_file(source, tmp_path / f"copy_{i}.xlsx")
+        assert copied == 10_000
+        assert strategy in ("sendfile", "buffer")
+
+    # Reflink e copy_file_range só são tentados na primeira cópia
+    assert len(calls) == 2
+    assert (tmp_path / "copy_2.xlsx").read_bytes() == source.read_bytes()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reflink só no Linux")
+@pytest.mark.parametrize("code", [errno.EINVAL, errno.EPERM, errno.EBADF])
+def test_copy_file_per_file_error_does_not_disable_strategy(
+    tmp_path, monkeypatch, code
+):
+    """Um erro que pode ser só deste arquivo não desativa a estratégia no volume."""
+    failures = [code]
+    calls = []
+
+    def clone(src_fd, dst_fd, buffer_size):
+        calls.append(src_fd)
+        if failures:
+            raise OSError(failures.pop(), "falha neste arquivo")
+        return file_copy._copy_with_buffer(src_fd, dst_fd, buffer_size)
+
+    monkeypatch.setattr(file_copy, "_clone", clone)
+    source = tmp_path / "template.xlsx"
+    source.write_bytes(b"PK" * 5000)
+
+    _, strategy = copy_file(source, tmp_path / "copy_0.xlsx")
+    assert strategy != "reflink"
+    assert file_copy._unsupported == set()
+
+    # O arquivo seguinte volta a usar a estratégia
+    assert copy_file(source, tmp_path / "copy_1.xlsx") == (10_000, "reflink")
+    assert len(calls) == 2
+    assert (tmp_path / "copy_0.xlsx").read_bytes() == source.read_bytes()
+
+
+def test_copy_file_rejects_size_mismatch(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_copy, "copy_contents", lambda *args: (1, "buffer"))
+    source = tmp_path / "template.xlsx"
+    source.write_bytes(b"conteudo")
+
+    with pytest.raises(FileOperationError, match="incompleta"):
+        copy_file(source, tmp_path / "lote.xlsx")
+
+
+@pytest.mark.asyncio
+async def test_copy_file_uses_aiofiles_without_zero_copy(tmp_path, monkeypatch):
+    from app.infrastructure import repositories
+
+    monkeypatch.setattr(repositories, "zero_copy_available", lambda: False)
+    monkeypatch.setattr(
+        repositories,
+        "copy_file",
+        lambda *args: pytest.fail("cópia pelo kernel indisponível"),
+    )
+    source = tmp_path / "template.xlsx"
+    source.write_bytes(b"conteudo")
+
+    await FileSystemManager().copy_file(source, tmp_path / "saida" / "lote.xlsx")
+
+    assert (tmp_path / "saida" / "lote.xlsx").read_bytes() == b"conteudo"
@@ -0,0 +1,154 @@
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session, select
+
+from app.domain.entities import ManifestItem
+from app.domain.models import IndexedFile, SourceIndexState
+from app.infrastructure.database import DatabaseManager
+from app.infrastructure.file_index import FileIndexRepository
+from app.infrastructure.repositories import FileRepository
+from app.infrastructure.scanner import ParallelDirectoryScanner
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    from app.core.config import settings
+
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(settings, "DATABASE_PATH", str(tmp_path / "index.db"))
+        manager = DatabaseManager()
+        manager.init_db()
+        yield manager
+        manager.engine.dispose()
+
+
+@pytest.fixture
+def source(tmp_path):
+    root = tmp_path / "src"
+    (root / "sub").mkdir(parents=True)
+    (root / "DOC-001_A.pdf").write_bytes(b"a")
+    (root / "sub" / "DOC-002.pdf").write_bytes(b"bb")
+    (root / "outro.txt").write_bytes(b"ccc")
+    manifest = tmp_path / "manifest.xlsx"
+    manifest.write_bytes(b"manifest")
+    return root, manifest
+
+
+@pytest.fixture
+def index(db_manager):
+    file_repo = FileRepository(ParallelDirectoryScanner(max_workers=2))
+    return FileIndexRepository(db_manager, file_repo)
+
+
+def _names(files):
+    return sorted(f.path.name for f in files)
+
+
+@pytest.mark.asyncio
+async def test_first_refresh_reports_everything_as_added(index, source):
+    root, manifest = source
+
+    delta = await index.refresh(root, manifest)
+
+    assert _names(delta.added) == ["DOC-001_A.pdf", "DOC-002.pdf", "outro.txt"]
+    assert delta.changed == [] and delta.unchanged == [] and delta.removed == []
+    assert delta.manifest_changed
+
+
+@pytest.mark.asyncio
+async def test_refresh_after_record_reports_only_delta(index, db_manager, source):
+    root, manifest = source
+    first = await index.refresh(root, manifest)
+    items = {
+        "DOC-001_A.pdf": ManifestItem(
+            "DOC-001", "A", "Documento 1", {"EMISSÃO": datetime(2024, 1, 15)}
+        ),
+        "DOC-002.pdf": ManifestItem("DOC-002", "0", "Documento 2"),
+    }
+    await index.record_matches(
+        first.scan_id, {f.path: items.get(f.path.name) for f in first.files}
+    )
+
+    # Novo arquivo, um alterado e um removido
+    (root / "DOC-003.pdf").write_bytes(b"d")
+    changed = root / "sub" / "DOC-002.pdf"
+    changed.write_bytes(b"bbbb")
+    os.utime(changed, ns=(1, 1))
+    (root / "outro.txt").unlink()
+
+    delta = await index.refresh(root, manifest)
+
+    assert _names(delta.added) == ["DOC-003.pdf"]
+    assert _names(delta.changed) == ["DOC-002.pdf"]
+    assert _names(delta.unchanged) == ["DOC-001_A.pdf"]
+    assert delta.removed == [root / "outro.txt"]
+    assert delta.previous_codes == {root / "DOC-001_A.pdf": "DOC-001"}
+    # O item volta completo (com datas), sem reler o manifesto
+    assert delta.previous_items == {root / "DOC-001_A.pdf": items["DOC-001_A.pdf"]}
+    assert not delta.manifest_changed
+
+    await index.record_matches(delta.scan_id, {f.path: None for f in delta.files})
+    with Session(db_manager.engine) as db:
+        rows = {
+            row.path: row.document_code for row in db.exec(select(IndexedFile)).all()
+        }
+        assert db.get(SourceIndexState, str(root.resolve())) is not None
+    assert rows == {
+        "DOC-001_A.pdf": None,
+        "sub/DOC-002.pdf": None,
+        "DOC-003.pdf": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_manifest_change_is_detected(index, source):
+    root, manifest = source
+    first = await index.refresh(root, manifest)
+    await index.record_matches(first.scan_id, {f.path: None for f in first.files})
+
+    manifest.write_bytes(b"manifest v2")
+
+    delta = await index.refresh(root, manifest)
+
+    assert delta.manifest_changed
+    assert len(delta.unchanged) == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_record_keeps_previous_reference(index, source):
+    root, manifest = source
+    await index.refresh(root, manifest)
+
+    # Nada gravado: a segunda varredura ainda vê tudo como novo
+    delta = await index.refresh(root, manifest)
+
+    assert len(delta.added) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scans_of_same_directory_keep_their_manifest(
+    index, db_manager, source
+):
+    """Duas validações simultâneas da mesma pasta, com manifestos diferentes."""
+    root, manifest = source
+    other_manifest = root.parent / "outro_manifesto.xlsx"
+    other_manifest.write_bytes(b"manifest v2")
+    item_a = ManifestItem("DOC-001", "A", "Pelo manifesto A")
+    item_b = ManifestItem("DOC-001", "B", "Pelo manifesto B")
+
+    scan_a = await index.refresh(root, manifest)
+    scan_b = await index.refresh(root, other_manifest)
+    assert scan_a.scan_id != scan_b.scan_id
+    await index.record_matches(scan_b.scan_id, {f.path: item_b for f in scan_b.files})
+    await index.record_matches(scan_a.scan_id, {f.path: item_a for f in scan_a.files})
+
+    # Gravado por último: manifesto A, com os itens casados por ele
+    delta = await index.refresh(root, manifest)
+    assert not delta.manifest_changed
+    assert list(delta.previous_items.values()) == [item_a] * 3
+    assert (await index.refresh(root, other_manifest)).manifest_changed
+    with Session(db_manager.engine) as db:
+        assert len(db.exec(select(IndexedFile)).all()) == 3
@@ -5,6 +5,7 @@ import pytest
 from app.domain.entities import DocumentFile
 from app.domain.exceptions import SourceDirectoryNotFoundError
 from app.infrastructure.repositories import FileRepository
+from app.infrastructure.scanner import ParallelDirectoryScanner
 
 
 @pytest.mark.asyncio
@@ -65,3 +66,35 @@ async def test_list_files_is_file(tmp_path):
         await repo.list_files(file_path)
 
     assert "Not a directory" in str(exc.value)
+
+
+@pytest.mark.asyncio
+async def test_list_files_parallel_matches_rglob(tmp_path):
+    """Testa que a varredura paralela encontra os mesmos arquivos do rglob."""
+    for d in range(5):
+        sub = tmp_path / f"dir_{d}" / "nested"
+        sub.mkdir(parents=True)
+        for f in range(4):
+            (sub / f"doc_{d}_{f}.pdf").write_bytes(b"x" * (f + 1))
+        (tmp_path / f"dir_{d}" / "top.pdf").write_text("top")
+
+    expected = {(str(p), p.stat().st_size) for p in tmp_path.rglob("*") if p.is_file()}
+
+    for workers in (1, 4):
+        repo = FileRepository(scanner=ParallelDirectoryScanner(max_workers=workers))
+        files = await repo.list_files(tmp_path)
+        assert {(str(f.path), f.size_bytes) for f in files} == expected
+
+
+def test_scanner_collects_stat_data(tmp_path):
+    """Testa que o scanner entrega tamanho, mtime e inode de cada arquivo."""
+    target = tmp_path / "file.pdf"
+    target.write_bytes(b"12345")
+
+    (entry,) = ParallelDirectoryScanner(max_workers=2).scan(tmp_path)
+    stat = target.stat()
+
+    assert entry.path == target
+    assert entry.size_bytes == 5
+    assert entry.mtime_ns == stat.st_mtime_ns
+    assert entry.inode == stat.st_ino
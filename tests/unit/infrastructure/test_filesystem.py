@@ -99,3 +99,18 @@ async def test_rename_file_source_not_found(tmp_path):
 
     with pytest.raises(FileOperationError, match="does not exist"):
         await manager.rename_file(source, "new_name.pdf")
+
+
+@pytest.mark.asyncio
+async def test_move_file_recreates_removed_directory(tmp_path):
+    """Diretório criado antes e removido por fora é recriado na movimentação."""
+    manager = FileSystemManager()
+    lot_dir = tmp_path / "LOT_0001"
+    await manager.create_directory(lot_dir)
+    lot_dir.rmdir()
+
+    source = tmp_path / "doc.pdf"
+    source.write_text("content")
+    await manager.move_file(source, lot_dir / "doc.pdf")
+
+    assert (lot_dir / "doc.pdf").read_text() == "content"
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.domain.entities import JobStatus, ProgressEvent
+from app.infrastructure.database import DatabaseManager
+from app.infrastructure.job_queue import JobProgress, JobQueue
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    from app.core.config import settings
+
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(settings, "DATABASE_PATH", str(tmp_path / "test_jobs.db"))
+        manager = DatabaseManager()
+        manager.init_db()
+        yield manager
+        manager.engine.dispose()
+
+
+async def _wait_finished(queue: JobQueue, job_id: str, timeout: float = 5.0):
+    async def poll():
+        while True:
+            job = await queue.get(job_id)
+            if JobStatus(job.status).finished:
+                return job
+            await asyncio.sleep(0.01)
+
+    return await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_job_succeeds_with_result_and_progress(db_manager):
+    queue = JobQueue(db_manager, progress_interval_seconds=0)
+
+    async def runner(progress: JobProgress):
+        progress.update(current=3, total=3, message="done")
+        return {"lots_created": 2}
+
+    job_id = await queue.submit("organize", {"session_id": "s1"}, runner)
+    job = await _wait_finished(queue, job_id)
+    await queue.shutdown()
+
+    assert job.status == JobStatus.SUCCEEDED.value
+    assert json.loads(job.result_json) == {"lots_created": 2}
+    assert json.loads(job.request_json) == {"session_id": "s1"}
+    assert (job.progress_current, job.progress_total) == (3, 3)
+    assert job.progress_message == "done"
+    assert job.started_at is not None and job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_job_failure_records_error(db_manager):
+    queue = JobQueue(db_manager)
+
+    async def runner(progress: JobProgress):
+        raise ValueError("manifesto inválido")
+
+    job_id = await queue.submit("validate", {}, runner)
+    job = await _wait_finished(queue, job_id)
+    await queue.shutdown()
+
+    assert job.status == JobStatus.FAILED.value
+    assert job.error == "ValueError: manifesto inválido"
+    assert job.result_json is None
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_cancel_queued_and_running(db_manager):
+    queue = JobQueue(db_manager, max_concurrent_jobs=1)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    ran = []
+
+    async def blocking(progress: JobProgress):
+        ran.append("blocking")
+        started.set()
+        await release.wait()
+        progress.report(ProgressEvent("moving", lots_total=1, files_total=1))
+        ran.append("after cancel")
+        return {}
+
+    async def queued(progress: JobProgress):
+        ran.append("queued")
+        return {}
+
+    running_id = await queue.submit("organize", {}, blocking)
+    queued_id = await queue.submit("organize", {}, queued)
+    await asyncio.wait_for(started.wait(), 5)
+
+    # Só um job por vez: o segundo continua na fila
+    assert (await queue.get(queued_id)).status == JobStatus.QUEUED.value
+
+    cancelled = await queue.cancel(queued_id)
+    assert cancelled.status == JobStatus.CANCELLED.value
+
+    # Em execução: para no próximo evento de progresso
+    cancelling = await queue.cancel(running_id)
+    assert cancelling.status == JobStatus.CANCELLING.value
+    release.set()
+    cancelled = await _wait_finished(queue, running_id)
+    assert cancelled.status == JobStatus.CANCELLED.value
+    assert cancelled.finished_at is not None
+
+    # O worker segue ativo após o cancelamento
+    after_id = await queue.submit("organize", {}, queued)
+    job = await _wait_finished(queue, after_id)
+    await queue.shutdown()
+
+    assert job.status == JobStatus.SUCCEEDED.value
+    assert ran == ["blocking", "queued"]
+
+
+@pytest.mark.asyncio
+async def test_start_fails_jobs_left_unfinished(db_manager):
+    queued_id = db_manager.create_job("validate", "{}")
+    running_id = db_manager.create_job("organize", "{}")
+    done_id = db_manager.create_job("organize", "{}")
+    db_manager.update_job(running_id, status=JobStatus.RUNNING.value)
+    db_manager.update_job(done_id, status=JobStatus.SUCCEEDED.value)
+
+    queue = JobQueue(db_manager)
+    await queue.start()
+    await queue.shutdown()
+
+    for job_id in (queued_id, running_id):
+        job = db_manager.get_job(job_id)
+        assert job.status == JobStatus.FAILED.value
+        assert job.error.startswith("Interrupted")
+    assert db_manager.get_job(done_id).status == JobStatus.SUCCEEDED.value
+
+
+@pytest.mark.asyncio
+async def test_progress_writes_are_throttled(db_manager, monkeypatch):
+    job_id = db_manager.create_job("validate", "{}")
+    writes = []
+    original = db_manager.update_job
+
+    def counting_update(job_id, **values):
+        writes.append(values)
+        return original(job_id, **values)
+
+    monkeypatch.setattr(db_manager, "update_job", counting_update)
+    progress = JobProgress(db_manager, job_id, interval_seconds=60)
+
+    for i in range(1, 1001):
+        progress.update(current=i, total=1000)
+    final = await progress.flush()
+
+    assert len(writes) == 1
+    assert final["progress_current"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_reported_events_reach_stream_and_database(db_manager):
+    queue = JobQueue(db_manager, progress_interval_seconds=0)
+    release = asyncio.Event()
+
+    async def runner(progress: JobProgress):
+        progress.report(ProgressEvent("moving", lots_total=2, files_total=8))
+        await release.wait()
+        progress.report(
+            ProgressEvent(
+                "finished", lots_total=2, lots_moved=2, files_total=8, files_moved=8
+            )
+        )
+        return {}
+
+    job_id = await queue.submit("organize", {}, runner)
+    stream = queue.progress_stream(job_id)
+    updates = stream.updates(interval_seconds=0)
+    assert (await asyncio.wait_for(updates.__anext__(), 5)).stage == "moving"
+
+    release.set()
+    assert (await asyncio.wait_for(updates.__anext__(), 5)).finished
+    job = await _wait_finished(queue, job_id)
+    await queue.shutdown()
+
+    assert queue.progress_stream(job_id) is None
+    assert stream.closed
+    assert (job.progress_current, job.progress_total) == (8, 8)
+    assert job.progress_message == "finished"
+
+
+@pytest.mark.asyncio
+async def test_cancel_waits_for_thread_pool_work_and_skips_persisting(db_manager):
+    """O trabalho já no thread pool termina; nada é gravado depois dele."""
+    queue = JobQueue(db_manager, progress_interval_seconds=0)
+    in_executor = threading.Event()
+    gate = threading.Event()
+    saved = []
+
+    def scan():
+        in_executor.set()
+        gate.wait(5)
+
+    async def runner(progress: JobProgress):
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, scan)
+        progress.report(ProgressEvent("finished", files_scanned=1, files_matched=1))
+        saved.append("session")
+        return {}
+
+    job_id = await queue.submit("validate", {}, runner)
+    await asyncio.get_event_loop().run_in_executor(None, in_executor.wait, 5)
+
+    job = await queue.cancel(job_id)
+    assert job.status == JobStatus.CANCELLING.value
+    assert queue.progress_stream(job_id) is not None
+
+    gate.set()
+    job = await _wait_finished(queue, job_id)
+    await queue.shutdown()
+
+    assert job.status == JobStatus.CANCELLED.value
+    assert saved == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_after_job_finished_keeps_final_state(db_manager):
+    queue = JobQueue(db_manager)
+
+    async def runner(progress: JobProgress):
+        return {"lots_created": 1}
+
+    job_id = await queue.submit("organize", {}, runner)
+    await _wait_finished(queue, job_id)
+
+    assert not db_manager.mark_job_cancelling(job_id)
+    job = await queue.cancel(job_id)
+    await queue.shutdown()
+    assert job.status == JobStatus.SUCCEEDED.value
@@ -0,0 +1,241 @@
+import math
+import random
+from pathlib import Path
+
+import pytest
+
+from app.domain.entities import DocumentFile, DocumentGroup, ManifestItem, OutputLot
+from app.domain.exceptions import OrganizationError
+from app.infrastructure.services import (
+    ConstrainedLotBalancerService,
+    DisciplineLotBalancerService,
+    GreedyLotBalancerService,
+    KarmarkarKarpLotBalancerService,
+    available_balancers,
+    create_balancer,
+    register_balancer,
+)
+
+
+def _legacy_balance(groups, max_docs_per_lot):
+    """Atribuição gulosa por min() sobre os lotes, como referência."""
+    if not groups:
+        return []
+    sorted_groups = sorted(
+        groups, key=lambda g: sum(f.size_bytes for f in g.files), reverse=True
+    )
+    if max_docs_per_lot <= 0:
+        max_docs_per_lot = len(sorted_groups) or 1
+    num_lots = max(1, math.ceil(len(sorted_groups) / max_docs_per_lot))
+    lots = [OutputLot(lot_name=f"Lote_{i + 1}") for i in range(num_lots)]
+    for group in sorted_groups:
+        min(lots, key=lambda lot: lot.total_size_bytes).groups.append(group)
+    return lots
+
+
+def _groups(sizes):
+    return [
+        DocumentGroup(
+            document_code=f"DOC-{i:04d}",
+            files=[
+                DocumentFile(path=Path(f"DOC-{i:04d}_{j}.pdf"), size_bytes=size)
+                for j, size in enumerate(file_sizes)
+            ],
+        )
+        for i, file_sizes in enumerate(sizes)
+    ]
+
+
+def _assignment(lots):
+    return [(lot.lot_name, [g.document_code for g in lot.groups]) for lot in lots]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_docs_per_lot", [1, 3, 7, 50, 0])
+def test_balance_lots_matches_greedy_assignment(seed, max_docs_per_lot):
+    rng = random.Random(seed)
+    # Poucos tamanhos distintos: muitos empates entre grupos e entre lotes
+    sizes = [
+        [rng.choice([0, 10, 20, 30]) for _ in range(rng.randint(0, 3))]
+        for _ in range(60)
+    ]
+    groups = _groups(sizes)
+
+    lots = GreedyLotBalancerService().balance_lots(groups, max_docs_per_lot)
+
+    assert _assignment(lots) == _assignment(_legacy_balance(groups, max_docs_per_lot))
+
+
+def test_balance_lots_empty():
+    assert GreedyLotBalancerService().balance_lots([], 10) == []
+
+
+def test_balance_lots_spreads_bytes():
+    groups = _groups([[100], [60], [50], [40], [10]])
+
+    lots = GreedyLotBalancerService().balance_lots(groups, 3)
+
+    assert [lot.total_size_bytes for lot in lots] == [140, 120]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_constrained_balancer_honors_all_limits(seed):
+    rng = random.Random(seed)
+    sizes = [
+        [rng.randint(1, 100) for _ in range(rng.randint(1, 4))] for _ in range(200)
+    ]
+    groups = _groups(sizes)
+    balancer = ConstrainedLotBalancerService(
+        max_bytes_per_lot=800, max_groups_per_lot=12
+    )
+
+    lots = balancer.balance_lots(groups, 20)
+
+    assert sorted(g.document_code for lot in lots for g in lot.groups) == sorted(
+        g.document_code for g in groups
+    )
+    for lot in lots:
+        assert len(lot.files) <= 20
+        assert lot.total_size_bytes <= 800
+        assert len(lot.groups) <= 12
+    report = balancer.last_report
+    assert report.lots_used == len(lots)
+    assert report.lower_bound <= report.lots_used
+    assert report.oversized_groups == 0
+
+
+def test_constrained_balancer_lower_bound_uses_tightest_limit():
+    # 10 grupos de 2 arquivos e 50 bytes: arquivos exigem 4 lotes, bytes 3
+    groups = _groups([[25, 25]] * 10)
+    balancer = ConstrainedLotBalancerService(max_bytes_per_lot=200)
+
+    lots = balancer.balance_lots(groups, 6)
+
+    assert balancer.last_report.lower_bound == 4
+    assert len(lots) == 4
+    assert [lot.lot_name for lot in lots] == ["Lote_1", "Lote_2", "Lote_3", "Lote_4"]
+
+
+def test_constrained_balancer_isolates_oversized_groups():
+    groups = _groups([[500], [10], [10, 10, 10, 10]])
+    balancer = ConstrainedLotBalancerService(max_bytes_per_lot=100)
+
+    lots = balancer.balance_lots(groups, 3)
+
+    assert [[g.document_code for g in lot.groups] for lot in lots] == [
+        ["DOC-0001"],
+        ["DOC-0000"],
+        ["DOC-0002"],
+    ]
+    assert balancer.last_report.oversized_groups == 2
+    assert balancer.last_report.excess_lots == 0
+
+
+def test_constrained_balancer_repair_empties_light_lot():
+    # First-fit decreasing sozinho usa 4 lotes; os grupos do lote menos
+    # ocupado cabem nos demais
+    sizes = [[30], [5, 5, 5], [60], [30, 30, 30], [30], [50]]
+    unrepaired = ConstrainedLotBalancerService(
+        max_bytes_per_lot=100, max_groups_per_lot=3, repair_attempts=0
+    )
+    balancer = ConstrainedLotBalancerService(
+        max_bytes_per_lot=100, max_groups_per_lot=3
+    )
+
+    assert len(unrepaired.balance_lots(_groups(sizes), 5)) == 4
+    lots = balancer.balance_lots(_groups(sizes), 5)
+
+    assert len(lots) == balancer.last_report.lower_bound == 3
+    for lot in lots:
+        assert lot.total_size_bytes <= 100
+        assert len(lot.files) <= 5
+        assert len(lot.groups) <= 3
+
+
+def test_constrained_balancer_empty():
+    balancer = ConstrainedLotBalancerService(max_bytes_per_lot=100)
+
+    assert balancer.balance_lots([], 10) == []
+    assert balancer.last_report.lots_used == 0
+
+
+def test_karmarkar_karp_beats_greedy_on_classic_instance():
+    # {8, 7, 6, 5, 4} em 2 lotes: guloso 17/13, diferenciação 16/14
+    groups = _groups([[8], [7], [6], [5], [4]])
+
+    greedy = GreedyLotBalancerService().balance_lots(groups, 3)
+    differencing = KarmarkarKarpLotBalancerService().balance_lots(groups, 3)
+
+    assert sorted(lot.total_size_bytes for lot in greedy) == [13, 17]
+    assert sorted(lot.total_size_bytes for lot in differencing) == [14, 16]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_karmarkar_karp_assigns_every_group_once(seed):
+    rng = random.Random(seed)
+    groups = _groups(
+        [[rng.randint(1, 1000) for _ in range(rng.randint(1, 3))] for _ in range(300)]
+    )
+
+    lots = KarmarkarKarpLotBalancerService().balance_lots(groups, 7)
+
+    assert len(lots) == math.ceil(300 / 7)
+    assert sorted(g.document_code for lot in lots for g in lot.groups) == sorted(
+        g.document_code for g in groups
+    )
+    sizes = [lot.total_size_bytes for lot in lots]
+    greedy = [
+        lot.total_size_bytes
+        for lot in GreedyLotBalancerService().balance_lots(groups, 7)
+    ]
+    assert max(sizes) - min(sizes) <= max(greedy) - min(greedy)
+
+
+def test_discipline_balancer_never_mixes_disciplines():
+    groups = _groups([[10], [20], [30], [40], [50]])
+    disciplines = ["Elétrica", "Civil", "Elétrica", None, "Civil"]
+    for group, discipline in zip(groups, disciplines):
+        group.files[0].associated_manifest_item = ManifestItem(
+            group.document_code,
+            "A",
+            "",
+            {"DISCIPLINA": discipline} if discipline else {},
+        )
+
+    lots = DisciplineLotBalancerService().balance_lots(groups, 1)
+
+    assert [[g.document_code for g in lot.groups] for lot in lots] == [
+        ["DOC-0003"],
+        ["DOC-0004"],
+        ["DOC-0001"],
+        ["DOC-0002"],
+        ["DOC-0000"],
+    ]
+    assert [lot.lot_name for lot in lots] == [f"Lote_{i}" for i in range(1, 6)]
+
+
+def test_registry_creates_strategies_by_name():
+    assert set(available_balancers()) >= {
+        "greedy",
+        "karmarkar_karp",
+        "ffd",
+        "discipline",
+    }
+    assert isinstance(
+        create_balancer("karmarkar_karp"), KarmarkarKarpLotBalancerService
+    )
+    assert isinstance(create_balancer("ffd"), ConstrainedLotBalancerService)
+
+    with pytest.raises(OrganizationError, match="Unknown balancer strategy"):
+        create_balancer("round_robin")
+
+
+def test_registry_accepts_new_strategies(monkeypatch):
+    from app.infrastructure import services
+
+    monkeypatch.setattr(
+        services, "_BALANCER_STRATEGIES", dict(services._BALANCER_STRATEGIES)
+    )
+    register_balancer("single", lambda: GreedyLotBalancerService())
+
+    assert isinstance(create_balancer("single"), GreedyLotBalancerService)
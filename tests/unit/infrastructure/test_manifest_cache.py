@@ -0,0 +1,161 @@
+import datetime as dt
+import os
+from pathlib import Path
+
+import pytest
+
+from app.domain.entities import ManifestItem
+from app.infrastructure.disk_cache import ChunkedDiskCache
+from app.infrastructure.manifest_cache import (
+    CachedManifestRepository,
+    decode_manifest_chunk,
+    encode_manifest_chunk,
+)
+
+
+class _CountingRepo:
+    """Repositório falso que conta quantas vezes o manifesto foi lido."""
+
+    def __init__(self, items):
+        self.items = items
+        self.reads = 0
+
+    async def load_from_file(self, file_path):
+        return list(self.items)
+
+    async def iter_items(self, file_path):
+        self.reads += 1
+        for item in self.items:
+            yield item
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ChunkedDiskCache(tmp_path / "cache.db", max_bytes=10**8, max_entries=8)
+
+
+def _items(n):
+    return [
+        ManifestItem(f"DOC-{i:03d}", "A", f"Titulo {i}", {"DISCIPLINA": "ELE"})
+        for i in range(n)
+    ]
+
+
+def test_chunk_roundtrip_preserves_metadata_types():
+    """Testa que a serialização preserva datas e números do metadata."""
+    item = ManifestItem(
+        "DOC-001",
+        "0",
+        "Título com acento",
+        {
+            "EMISSÃO": dt.datetime(2024, 5, 1, 10, 30),
+            "PRAZO": dt.date(2024, 6, 1),
+            "FOLHAS": 3,
+            "PESO": 1.5,
+        },
+    )
+
+    assert decode_manifest_chunk(encode_manifest_chunk([item])) == [item]
+
+
+@pytest.mark.asyncio
+async def test_second_load_is_served_from_cache(tmp_path, cache):
+    """Testa que um manifesto inalterado não é relido do repositório original."""
+    manifest = tmp_path / "manifest.xlsx"
+    manifest.write_bytes(b"conteudo do manifesto")
+    inner = _CountingRepo(_items(25))
+    repo = CachedManifestRepository(inner, cache, chunk_size=10)
+
+    first = await repo.load_from_file(manifest)
+    second = await repo.load_from_file(manifest)
+
+    assert inner.reads == 1
+    assert first == second == inner.items
+
+
+@pytest.mark.asyncio
+async def test_changed_manifest_invalidates_cache(tmp_path, cache):
+    """Testa que mudar o conteúdo do arquivo força nova leitura."""
+    manifest = tmp_path / "manifest.xlsx"
+    manifest.write_bytes(b"versao 1")
+    inner = _CountingRepo(_items(3))
+    repo = CachedManifestRepository(inner, cache)
+
+    await repo.load_from_file(manifest)
+    manifest.write_bytes(b"versao 2 com outro tamanho")
+    await repo.load_from_file(manifest)
+
+    assert inner.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_is_not_cached(tmp_path, cache):
+    """Testa que uma leitura interrompida não grava entrada parcial."""
+    manifest = tmp_path / "manifest.xlsx"
+    manifest.write_bytes(b"conteudo")
+    inner = _CountingRepo(_items(5))
+    repo = CachedManifestRepository(inner, cache)
+
+    stream = repo.iter_items(manifest)
+    await stream.__anext__()
+    await stream.aclose()
+    await repo.load_from_file(manifest)
+
+    assert inner.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_corrupt_cache_chunk_falls_back_to_manifest(tmp_path, cache):
+    """Testa que uma falha no meio da leitura do cache relê o arquivo sem duplicar itens."""
+    manifest = tmp_path / "manifest.xlsx"
+    manifest.write_bytes(b"conteudo")
+    inner = _CountingRepo(_items(25))
+    repo = CachedManifestRepository(inner, cache, chunk_size=10)
+    await repo.load_from_file(manifest)
+
+    key = repo._cache_key(manifest)
+    with cache._connect() as conn:
+        conn.execute(
+            "UPDATE cache_chunks SET payload = ? WHERE key = ? AND seq = 1",
+            (b"corrompido", key),
+        )
+
+    items = await repo.load_from_file(manifest)
+
+    assert items == inner.items
+    assert inner.reads == 2
+    # A entrada corrompida é regravada pela releitura
+    assert await repo.load_from_file(manifest) == inner.items
+    assert inner.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_lookup_error_reads_manifest_directly(tmp_path, cache, monkeypatch):
+    """Testa que um erro ao consultar o cache não quebra a leitura."""
+    manifest = tmp_path / "manifest.xlsx"
+    manifest.write_bytes(b"conteudo")
+    inner = _CountingRepo(_items(3))
+    repo = CachedManifestRepository(inner, cache)
+    await repo.load_from_file(manifest)
+
+    def broken(key):
+        raise OSError("disk I/O error")
+
+    monkeypatch.setattr(cache, "get_entry", broken)
+
+    assert await repo.load_from_file(manifest) == inner.items
+    assert inner.reads == 2
+
+
+def test_lru_eviction_drops_least_recently_used(tmp_path):
+    """Testa o despejo LRU quando o limite de entradas é excedido."""
+    cache = ChunkedDiskCache(tmp_path / "lru.db", max_bytes=10**8, max_entries=2)
+
+    cache.put("a", source="a", chunks=[b"1"])
+    cache.put("b", source="b", chunks=[b"2"])
+    assert cache.get_entry("a") is not None  # "a" passa a ser o mais recente
+    cache.put("c", source="c", chunks=[b"3"])
+
+    assert cache.get_entry("b") is None
+    assert list(cache.iter_chunks("a")) == [b"1"]
+    assert list(cache.iter_chunks("c")) == [b"3"]
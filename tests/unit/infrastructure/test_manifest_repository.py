@@ -101,3 +101,69 @@ async def test_load_from_file_parse_error(mock_openpyxl_load):
             await repo.load_from_file(file_path)
 
     assert "Error parsing manifest" in str(exc.value)
+
+
+def _write_manifest(path: Path, rows_count: int) -> None:
+    """Cria um manifesto real com cabeçalho e `rows_count` linhas de dados."""
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Documento", "Revisão", "Título", "DISCIPLINA"])
+    for i in range(rows_count):
+        ws.append([f"DOC-{i:04d}", "A", f"Titulo {i}", "ELE"])
+    wb.save(path)
+
+
+@pytest.mark.asyncio
+async def test_iter_items_streams_all_rows(tmp_path):
+    """Testa que o streaming entrega os mesmos itens do carregamento completo."""
+    manifest = tmp_path / "manifest.xlsx"
+    _write_manifest(manifest, 25)
+
+    repo = ManifestRepository()
+    streamed = [item async for item in repo.iter_items(manifest, chunk_size=4)]
+    loaded = await repo.load_from_file(manifest)
+
+    assert len(streamed) == 25
+    assert streamed == loaded
+    assert streamed[0].document_code == "DOC-0000"
+    assert streamed[0].metadata["DISCIPLINA"] == "ELE"
+
+
+@pytest.mark.asyncio
+async def test_iter_items_early_stop_releases_reader(tmp_path):
+    """Testa que abandonar o streaming no meio encerra a leitura sem travar."""
+    manifest = tmp_path / "manifest.xlsx"
+    _write_manifest(manifest, 50)
+
+    repo = ManifestRepository()
+    stream = repo.iter_items(manifest, chunk_size=2)
+    first = [await stream.__anext__() for _ in range(3)]
+    await stream.aclose()
+
+    assert [i.document_code for i in first] == ["DOC-0000", "DOC-0001", "DOC-0002"]
+
+
+@pytest.mark.asyncio
+async def test_iter_items_not_found():
+    """Testa erro no streaming quando o arquivo não existe."""
+    repo = ManifestRepository()
+
+    with patch("pathlib.Path.exists", return_value=False):
+        with pytest.raises(ManifestReadError):
+            async for _ in repo.iter_items(Path("non_existent.xlsx")):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_iter_items_parse_error(mock_openpyxl_load):
+    """Testa que falhas de leitura no streaming viram ManifestParseError."""
+    mock_openpyxl_load.side_effect = Exception("Corrupted file")
+
+    repo = ManifestRepository()
+
+    with patch("pathlib.Path.exists", return_value=True):
+        with pytest.raises(ManifestParseError):
+            async for _ in repo.iter_items(Path("corrupted.xlsx")):
+                pass
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.domain.entities import ProgressEvent
+from app.infrastructure.progress import ProgressStream
+
+
+async def _collect(stream: ProgressStream, interval: float):
+    return [event async for event in stream.updates(interval)]
+
+
+@pytest.mark.asyncio
+async def test_updates_coalesce_to_latest_event():
+    stream = ProgressStream()
+    consumer = asyncio.ensure_future(_collect(stream, interval=0.05))
+    await asyncio.sleep(0)
+
+    stream.report(ProgressEvent("matching", files_scanned=10_000))
+    await asyncio.sleep(0)  # O consumidor entrega o primeiro e espera o intervalo
+    for i in range(1, 10_001):
+        stream.report(ProgressEvent("matching", files_scanned=10_000, files_matched=i))
+    stream.report(ProgressEvent("finished", files_scanned=10_000, files_matched=10_000))
+    await asyncio.sleep(0.1)
+    # O evento finished não encerra a leitura: só o close
+    assert not consumer.done()
+    stream.close()
+
+    events = await asyncio.wait_for(consumer, 5)
+    assert [e.stage for e in events] == ["matching", "finished"]
+    assert events[-1].current == 10_000
+
+
+@pytest.mark.asyncio
+async def test_updates_end_when_closed_and_serve_late_subscribers():
+    stream = ProgressStream()
+    stream.report(ProgressEvent("moving", lots_total=1, files_total=4, files_moved=1))
+    first = asyncio.ensure_future(_collect(stream, interval=0))
+    second = asyncio.ensure_future(_collect(stream, interval=0))
+    await asyncio.sleep(0.01)
+    stream.close()
+
+    for consumer in (first, second):
+        events = await asyncio.wait_for(consumer, 5)
+        assert [(e.current, e.total) for e in events] == [(1, 4)]
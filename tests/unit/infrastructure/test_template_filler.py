@@ -9,7 +9,7 @@ from app.infrastructure.template_filler import OpenpyxlTemplateFiller
 
 @pytest.mark.asyncio
 async def test_fill_and_save_success():
-    """Testa preenchimento do template com mocks."""
+    """Testa preenchimento do template copiado (sem modelo em memória) com mocks."""
 
     # Mock do FileSystemManager
     mock_file_manager = MagicMock()
@@ -20,6 +20,7 @@ async def test_fill_and_save_success():
     with (
         patch("openpyxl.load_workbook") as mock_load,
         patch("pathlib.Path.exists", return_value=True),
+        patch.object(OpenpyxlTemplateFiller, "_get_template", return_value=None),
     ):
         mock_wb = MagicMock()
         mock_sheet = MagicMock()
@@ -61,3 +62,316 @@ async def test_fill_and_save_success():
         # 4. Verifica chamadas de preenchimento (insert_rows ou cell)
         # Como passamos 1 item, deve chamar insert_rows ou setar celulas
         assert mock_sheet.insert_rows.called or mock_sheet.cell.called
+
+
+def _build_template(
+    path: Path, extra_sheet: bool = False, footer_merge: bool = True
+) -> Path:
+    import openpyxl
+    from openpyxl.styles import Font, PatternFill
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Manifesto"
+    sheet.append(["CÓDIGO", "REVISÃO", "TÍTULO", "ARQUIVO", "FORMATO"])
+    sheet["A1"].font = Font(bold=True, color="FF0000")
+    sheet.append(["FIM"])
+    sheet.append(["Emitido por", None, "Engenharia"])
+    if footer_merge:
+        sheet.merge_cells("A3:B3")
+    sheet["C3"].fill = PatternFill("solid", start_color="DDDDDD")
+    sheet.row_dimensions[3].height = 30
+    sheet.column_dimensions["J"].width = 42
+    sheet.freeze_panes = "A2"
+    if extra_sheet:
+        workbook.create_sheet("Instruções")["A1"] = "Preencher até FIM"
+    workbook.save(path)
+    return path
+
+
+def _groups(count: int):
+    groups = []
+    for i in range(count):
+        item = ManifestItem(f"DOC-{i:03d}", "B", f"Documento {i}", {"FORMATO": "A1"})
+        file = DocumentFile(
+            Path(f"/origem/DOC-{i:03d}.pdf"),
+            size_bytes=10,
+            associated_manifest_item=item,
+        )
+        groups.append(DocumentGroup(f"DOC-{i:03d}", [file]))
+    return groups
+
+
+def _sheet_snapshot(sheet):
+    return [
+        [
+            (
+                cell.value,
+                cell.font.b,
+                cell.fill.fgColor.rgb,
+                cell.border.left.style,
+                cell.alignment.horizontal,
+            )
+            for cell in row
+        ]
+        for row in sheet.iter_rows()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fill_and_save_in_memory_matches_copied_template(tmp_path):
+    """O manifesto montado pelo modelo é igual ao preenchido sobre a cópia."""
+    import shutil
+
+    import openpyxl
+
+    from app.infrastructure.repositories import FileSystemManager
+
+    # Sem mesclagem no rodapé: insert_rows não a desloca na cópia preenchida
+    template = _build_template(tmp_path / "template.xlsx", footer_merge=False)
+    filler = OpenpyxlTemplateFiller(FileSystemManager())
+    data = _groups(3)
+
+    output = tmp_path / "LOT_0001" / "LOT_0001.xlsx"
+    await filler.fill_and_save(template, output, data)
+
+    legacy_output = tmp_path / "legacy.xlsx"
+    shutil.copy(template, legacy_output)
+    filler._fill_workbook_sync(legacy_output, data)
+
+    sheet = openpyxl.load_workbook(output).active
+    legacy = openpyxl.load_workbook(legacy_output).active
+    assert sheet.title == "Manifesto"
+    assert _sheet_snapshot(sheet) == _sheet_snapshot(legacy)
+    assert [row[0].value for row in sheet.iter_rows(min_row=2, max_row=5)] == [
+        "DOC-000",
+        "DOC-001",
+        "DOC-002",
+        "FIM",
+    ]
+    assert sheet.freeze_panes == "A2"
+    assert sheet.column_dimensions["J"].width == 42
+    assert sheet.column_dimensions["C"].width == 60
+
+
+@pytest.mark.asyncio
+async def test_fill_and_save_shifts_footer_merges(tmp_path):
+    """Mesclagens e alturas do rodapé acompanham as linhas inseridas."""
+    import openpyxl
+
+    from app.infrastructure.repositories import FileSystemManager
+
+    template = _build_template(tmp_path / "template.xlsx")
+    filler = OpenpyxlTemplateFiller(FileSystemManager())
+
+    output = tmp_path / "LOT_0001.xlsx"
+    await filler.fill_and_save(template, output, _groups(3))
+
+    sheet = openpyxl.load_workbook(output).active
+    assert [str(r) for r in sheet.merged_cells.ranges] == ["A6:B6"]
+    assert sheet["A6"].value == "Emitido por"
+    assert sheet["B3"].value == "B"
+    assert sheet.row_dimensions[6].height == 30
+
+
+@pytest.mark.asyncio
+async def test_fill_and_save_parses_template_once(tmp_path):
+    """O template é lido uma vez e relido apenas se o arquivo mudar."""
+    import os
+
+    from app.infrastructure import template_filler
+    from app.infrastructure.repositories import FileSystemManager
+
+    template = _build_template(tmp_path / "template.xlsx")
+    filler = OpenpyxlTemplateFiller(FileSystemManager())
+
+    with patch.object(
+        template_filler, "parse_template", wraps=template_filler.parse_template
+    ) as parse:
+        for i in range(3):
+            await filler.fill_and_save(template, tmp_path / f"L{i}.xlsx", _groups(2))
+        assert parse.call_count == 1
+
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        await filler.fill_and_save(template, tmp_path / "L3.xlsx", _groups(2))
+        assert parse.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fill_and_save_copies_unsupported_template(tmp_path):
+    """Templates com mais de uma aba continuam sendo copiados e preenchidos."""
+    import openpyxl
+
+    from app.infrastructure.repositories import FileSystemManager
+
+    template = _build_template(tmp_path / "template.xlsx", extra_sheet=True)
+    manager = FileSystemManager()
+    filler = OpenpyxlTemplateFiller(manager)
+
+    with patch.object(manager, "copy_file", wraps=manager.copy_file) as copy_file:
+        output = tmp_path / "LOT_0001.xlsx"
+        await filler.fill_and_save(template, output, _groups(2))
+        copy_file.assert_awaited_once_with(template, output)
+
+    workbook = openpyxl.load_workbook(output)
+    assert workbook.sheetnames == ["Manifesto", "Instruções"]
+    assert workbook.active["A2"].value == "DOC-000"
+
+
+def _format_per_cell(sheet, data_start_row: int, num_data_rows: int) -> None:
+    """Formatação anterior (objetos de estilo por célula), como referência."""
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    from app.infrastructure.template_filler import _COLUMN_WIDTHS
+
+    thin = Side(style="thin")
+    for col in range(1, 10):
+        cell = sheet.cell(row=1, column=col)
+        cell.fill = PatternFill(
+            start_color="FFFF00", end_color="FFFF00", fill_type="solid"
+        )
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+    for r in range(data_start_row, data_start_row + num_data_rows):
+        for c in range(1, 10):
+            cell = sheet.cell(row=r, column=c)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal="left", vertical="center")
+    for col_letter, width in _COLUMN_WIDTHS.items():
+        sheet.column_dimensions[col_letter].width = width
+
+
+def _rendered_style(cell):
+    return (
+        cell.font.b,
+        cell.font.name,
+        cell.font.sz,
+        cell.fill.fill_type,
+        cell.fill.fgColor.rgb,
+        tuple(
+            getattr(cell.border, side).style
+            for side in ("left", "right", "top", "bottom")
+        ),
+        cell.alignment.horizontal,
+        cell.alignment.vertical,
+        cell.number_format,
+    )
+
+
+def test_apply_formatting_named_styles_look_the_same(tmp_path):
+    """Os estilos nomeados reproduzem a formatação feita célula a célula."""
+    import openpyxl
+
+    filler = OpenpyxlTemplateFiller(MagicMock())
+    paths = {}
+    for name, formatter in (
+        ("named", filler._apply_formatting),
+        ("per_cell", _format_per_cell),
+    ):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["CÓDIGO", "REVISÃO"])
+        for i in range(20):
+            sheet.append([f"DOC-{i:03d}", "A"])
+        formatter(sheet, 2, 20)
+        paths[name] = tmp_path / f"{name}.xlsx"
+        workbook.save(paths[name])
+
+    named = openpyxl.load_workbook(paths["named"]).active
+    per_cell = openpyxl.load_workbook(paths["per_cell"]).active
+    for row_named, row_per_cell in zip(named.iter_rows(), per_cell.iter_rows()):
+        for a, b in zip(row_named, row_per_cell):
+            assert _rendered_style(a) == _rendered_style(b), a.coordinate
+    assert named["A1"].style == "Manifesto - Cabeçalho"
+    assert named["I21"].style == "Manifesto - Dados"
+
+
+def test_apply_formatting_registers_styles_once(tmp_path):
+    import openpyxl
+
+    filler = OpenpyxlTemplateFiller(MagicMock())
+    workbook = openpyxl.Workbook()
+    filler._apply_formatting(workbook.active, 2, 3)
+    filler._apply_formatting(workbook.active, 2, 3)
+
+    assert workbook.named_styles.count("Manifesto - Dados") == 1
+    assert workbook.named_styles.count("Manifesto - Cabeçalho") == 1
+
+
+@pytest.mark.asyncio
+async def test_fill_and_save_matches_per_cell_formatting_on_fixture(tmp_path):
+    """
+    O manifesto gerado é igual ao da implementação anterior (cópia do template
+    e formatação célula a célula), inclusive no formato das datas.
+    """
+    import shutil
+    from copy import copy
+    from datetime import date, datetime
+
+    import openpyxl
+
+    from app.infrastructure.repositories import FileSystemManager
+
+    template = Path(__file__).parents[2] / "fixtures" / "template_exemplo.xlsx"
+    data = _groups(3)
+    for i, group in enumerate(data):
+        metadata = group.files[0].associated_manifest_item.metadata
+        metadata["DISCIPLINA"] = date(2024, 1, i + 1)
+        metadata["PROPÓSITO"] = datetime(2024, 1, i + 1, 8, 30)
+
+    filler = OpenpyxlTemplateFiller(FileSystemManager())
+    output = tmp_path / "LOT_0001.xlsx"
+    await filler.fill_and_save(template, output, data)
+
+    baseline_output = tmp_path / "baseline.xlsx"
+    shutil.copy(template, baseline_output)
+    baseline_filler = OpenpyxlTemplateFiller(MagicMock())
+    baseline_filler._apply_formatting = _format_per_cell
+    baseline_filler._fill_workbook_sync(baseline_output, data)
+
+    sheet = openpyxl.load_workbook(output).active
+    baseline = openpyxl.load_workbook(baseline_output).active
+    assert sheet.max_row == baseline.max_row == 4
+    for row, baseline_row in zip(sheet.iter_rows(), baseline.iter_rows()):
+        for cell, baseline_cell in zip(row, baseline_row):
+            assert cell.value == baseline_cell.value, cell.coordinate
+            assert _rendered_style(cell) == _rendered_style(
+                baseline_cell
+            ), cell.coordinate
+            assert copy(cell.font) == copy(baseline_cell.font), cell.coordinate
+            assert copy(cell.border) == copy(baseline_cell.border), cell.coordinate
+    assert sheet["F2"].number_format == "yyyy-mm-dd"
+    assert sheet["H2"].number_format == baseline["H2"].number_format != "General"
+    assert {
+        letter: dimension.width for letter, dimension in sheet.column_dimensions.items()
+    } == {
+        letter: dimension.width
+        for letter, dimension in baseline.column_dimensions.items()
+    }
+
+
+def test_apply_formatting_keeps_existing_cell_formats(tmp_path):
+    """Fonte, preenchimento e formato próprios das células de dados são mantidos."""
+    import openpyxl
+    from openpyxl.styles import Font, PatternFill
+
+    filler = OpenpyxlTemplateFiller(MagicMock())
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet["A1"].number_format = "@"
+    sheet["A2"] = 0.25
+    sheet["A2"].number_format = "0.00%"
+    sheet["B2"].font = Font(italic=True)
+    sheet["C2"].fill = PatternFill("solid", start_color="DDDDDD")
+
+    filler._apply_formatting(sheet, 2, 1)
+
+    assert sheet["A1"].number_format == "@"
+    assert sheet["A1"].font.b
+    assert sheet["A2"].number_format == "0.00%"
+    assert sheet["B2"].font.i
+    assert sheet["C2"].fill.fgColor.rgb == "00DDDDDD"
+    assert sheet["A2"].border.left.style == "thin"
+    assert sheet["C2"].style == "Manifesto - Dados"
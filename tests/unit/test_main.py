@@ -0,0 +1,46 @@
+import pytest
+
+from app import main
+from app.core.config import settings
+
+
+def test_run_exits_on_invalid_profiles(tmp_path, monkeypatch):
+    config_file = tmp_path / "profiles.yaml"
+    config_file.write_text(
+        """
+profiles:
+  RIR:
+    patterns:
+      - 'Codigo: ([A-Z]+'
+    """,
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(settings, "PROFILES_CONFIG_PATH", str(config_file))
+    started = []
+    monkeypatch.setattr(main.ui, "run", lambda **kwargs: started.append(kwargs))
+
+    with pytest.raises(SystemExit) as exc_info:
+        main.run()
+
+    assert exc_info.value.code != 0
+    assert started == []
+
+
+def test_run_starts_with_valid_profiles(tmp_path, monkeypatch):
+    config_file = tmp_path / "profiles.yaml"
+    config_file.write_text(
+        """
+profiles:
+  RIR:
+    patterns:
+      - 'Codigo: ([A-Z]+-[0-9]+)'
+    """,
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(settings, "PROFILES_CONFIG_PATH", str(config_file))
+    started = []
+    monkeypatch.setattr(main.ui, "run", lambda **kwargs: started.append(kwargs))
+
+    main.run()
+
+    assert len(started) == 1